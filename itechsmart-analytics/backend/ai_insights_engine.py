@@ -7,8 +7,13 @@ from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 import json
-import math
+import os
 import statistics
+import time
+
+import numpy as np
+
+from app.core.model_registry import fingerprint, model_registry
 
 from .models_ai import (
     AIModel,
@@ -88,19 +93,8 @@ class AIInsightsEngine:
             train_data = training_data[:split_idx]
             val_data = training_data[split_idx:]
 
-            # Simulate training based on model type
-            if model.model_type == ModelType.TIME_SERIES:
-                metrics = self._train_time_series_model(model, train_data, val_data)
-            elif model.model_type == ModelType.CLASSIFICATION:
-                metrics = self._train_classification_model(model, train_data, val_data)
-            elif model.model_type == ModelType.REGRESSION:
-                metrics = self._train_regression_model(model, train_data, val_data)
-            elif model.model_type == ModelType.ANOMALY_DETECTION:
-                metrics = self._train_anomaly_model(model, train_data, val_data)
-            elif model.model_type == ModelType.FORECASTING:
-                metrics = self._train_forecasting_model(model, train_data, val_data)
-            else:
-                metrics = self._train_clustering_model(model, train_data, val_data)
+            fitted = self._register_estimator(model, train_data)
+            metrics = self._evaluate(model, fitted, train_data, val_data)
 
             # Update model with metrics
             model.accuracy = metrics.get("accuracy")
@@ -128,62 +122,207 @@ class AIInsightsEngine:
             self.db.commit()
             raise e
 
-    def _train_time_series_model(
-        self, model: AIModel, train_data: List, val_data: List
-    ) -> Dict:
-        """Train time series model (ARIMA, Prophet, etc.)"""
-        # Simulate time series training
-        return {
-            "rmse": 0.15,
-            "mae": 0.12,
-            "r2_score": 0.85,
-            "mape": 8.5,  # Mean Absolute Percentage Error
-        }
+    def _register_estimator(
+        self, model: AIModel, train_data: List[Dict]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Fit an estimator on the model's features and add it to the registry
+
+        Time series models, and models without features (or without a target
+        for supervised types), keep the simulated predictors.
+
+        Returns:
+            The registered estimator bundle, or None if none was fitted
+        """
+        from sklearn.cluster import KMeans
+        from sklearn.ensemble import (
+            IsolationForest,
+            RandomForestClassifier,
+            RandomForestRegressor,
+        )
+        from sklearn.linear_model import LinearRegression, LogisticRegression
+
+        features = model.features or []
+        target = model.target_variable
+        supervised = model.model_type in [
+            ModelType.CLASSIFICATION,
+            ModelType.REGRESSION,
+        ]
+        if not features or model.model_type in [
+            ModelType.TIME_SERIES,
+            ModelType.FORECASTING,
+        ]:
+            return None
+        if supervised:
+            train_data = [row for row in train_data if row.get(target) is not None]
+        if not train_data:
+            return None
+
+        categories = self._feature_categories(features, train_data)
+        X = self._feature_matrix(features, train_data, categories=categories)
+        present = ~np.isnan(X)
+        counts = present.sum(axis=0)
+        fill = np.divide(
+            np.nansum(X, axis=0), counts, out=np.zeros(len(features)), where=counts > 0
+        )
+        X[~present] = np.broadcast_to(fill, X.shape)[~present]
+        y = np.array([row[target] for row in train_data]) if supervised else None
+
+        forest = "forest" in (model.algorithm or "").lower()
+        if model.model_type == ModelType.CLASSIFICATION:
+            if len(np.unique(y)) < 2:
+                return None
+            estimator = (
+                RandomForestClassifier(random_state=42)
+                if forest
+                else LogisticRegression(max_iter=1000)
+            )
+        elif model.model_type == ModelType.REGRESSION:
+            y = y.astype(float)
+            estimator = (
+                RandomForestRegressor(random_state=42) if forest else LinearRegression()
+            )
+        elif model.model_type == ModelType.ANOMALY_DETECTION:
+            estimator = IsolationForest(random_state=42)
+        else:
+            estimator = KMeans(n_clusters=min(3, len(X)), n_init=10, random_state=42)
 
-    def _train_classification_model(
-        self, model: AIModel, train_data: List, val_data: List
-    ) -> Dict:
-        """Train classification model"""
-        return {
-            "accuracy": 0.92,
-            "precision": 0.89,
-            "recall": 0.91,
-            "f1_score": 0.90,
-            "auc_roc": 0.94,
+        params = estimator.get_params()
+        estimator.set_params(
+            **{k: v for k, v in (model.hyperparameters or {}).items() if k in params}
+        )
+        estimator.fit(X, y)
+
+        fitted = {
+            "estimator": estimator,
+            "features": list(features),
+            "fill": fill,
+            "categories": categories,
         }
+        if model.model_type == ModelType.REGRESSION:
+            residuals = y - estimator.predict(X)
+            fitted["interval"] = float(1.96 * np.std(residuals))  # 95% CI
+            fitted["confidence"] = float(np.clip(estimator.score(X, y), 0, 1))
+
+        model.model_version = fingerprint(
+            X,
+            y if supervised else np.empty(0),
+            json.dumps(model.hyperparameters or {}, sort_keys=True, default=str),
+            model.algorithm or "",
+        )
+        model.model_path = model_registry.put(
+            self._registry_key(model), fitted, fingerprint=model.model_version
+        )
+        if model.model_path:
+            model.model_size_mb = os.path.getsize(model.model_path) / (1024 * 1024)
+        return fitted
 
-    def _train_regression_model(
-        self, model: AIModel, train_data: List, val_data: List
-    ) -> Dict:
-        """Train regression model"""
-        return {"rmse": 0.18, "mae": 0.14, "r2_score": 0.88, "mse": 0.032}
+    def _registry_key(self, model: AIModel) -> str:
+        return f"ai-model-{model.id}"
 
-    def _train_anomaly_model(
-        self, model: AIModel, train_data: List, val_data: List
-    ) -> Dict:
-        """Train anomaly detection model"""
-        return {
-            "precision": 0.87,
-            "recall": 0.84,
-            "f1_score": 0.855,
-            "false_positive_rate": 0.05,
-        }
+    def _evaluate(
+        self,
+        model: AIModel,
+        fitted: Optional[Dict[str, Any]],
+        train_data: List[Dict],
+        val_data: List[Dict],
+    ) -> Dict[str, float]:
+        """
+        Score the trained model on the validation split
+
+        Uses the training rows when the split leaves no validation rows.
+        Time series models are scored by their trend predictor against the
+        target; models without a fitted estimator report no metrics.
+        """
+        from sklearn import metrics as sk_metrics
+
+        rows = val_data or train_data
+        target = model.target_variable
+        if model.model_type in [
+            ModelType.TIME_SERIES,
+            ModelType.FORECASTING,
+            ModelType.CLASSIFICATION,
+            ModelType.REGRESSION,
+        ]:
+            rows = [row for row in rows if target and row.get(target) is not None]
 
-    def _train_forecasting_model(
-        self, model: AIModel, train_data: List, val_data: List
-    ) -> Dict:
-        """Train forecasting model"""
-        return {"rmse": 0.16, "mae": 0.13, "mape": 9.2, "smape": 8.8}  # Symmetric MAPE
+        if model.model_type in [ModelType.TIME_SERIES, ModelType.FORECASTING]:
+            if not rows:
+                return {}
+            predicted = np.array(
+                [
+                    p["predicted_value"]
+                    for p in self._predict_time_series(model, rows, 1)
+                ]
+            )
+            y = np.array([row[target] for row in rows], dtype=float)
+            return self._regression_metrics(y, predicted)
 
-    def _train_clustering_model(
-        self, model: AIModel, train_data: List, val_data: List
-    ) -> Dict:
-        """Train clustering model"""
-        return {
-            "silhouette_score": 0.72,
-            "davies_bouldin_index": 0.65,
-            "calinski_harabasz_score": 450.5,
+        if fitted is None or not rows:
+            return {}
+
+        X = self._feature_matrix(
+            fitted["features"], rows, fitted["fill"], fitted["categories"]
+        )
+        estimator = fitted["estimator"]
+
+        if model.model_type == ModelType.CLASSIFICATION:
+            y = np.array([row[target] for row in rows])
+            predicted = estimator.predict(X)
+            metrics = {
+                "accuracy": sk_metrics.accuracy_score(y, predicted),
+                "precision": sk_metrics.precision_score(
+                    y, predicted, average="weighted", zero_division=0
+                ),
+                "recall": sk_metrics.recall_score(
+                    y, predicted, average="weighted", zero_division=0
+                ),
+                "f1_score": sk_metrics.f1_score(
+                    y, predicted, average="weighted", zero_division=0
+                ),
+            }
+            positive = y == estimator.classes_[-1]
+            if len(estimator.classes_) == 2 and 0 < positive.sum() < len(y):
+                metrics["auc_roc"] = sk_metrics.roc_auc_score(
+                    positive, estimator.predict_proba(X)[:, 1]
+                )
+        elif model.model_type == ModelType.REGRESSION:
+            y = np.array([row[target] for row in rows], dtype=float)
+            return self._regression_metrics(y, estimator.predict(X))
+        elif model.model_type == ModelType.ANOMALY_DETECTION:
+            metrics = {"anomaly_rate": np.mean(estimator.predict(X) == -1)}
+        else:
+            labels = estimator.predict(X)
+            if not 2 <= len(np.unique(labels)) < len(X):
+                return {}
+            metrics = {
+                "silhouette_score": sk_metrics.silhouette_score(X, labels),
+                "davies_bouldin_index": sk_metrics.davies_bouldin_score(X, labels),
+                "calinski_harabasz_score": sk_metrics.calinski_harabasz_score(
+                    X, labels
+                ),
+            }
+
+        return {name: float(value) for name, value in metrics.items()}
+
+    def _regression_metrics(
+        self, y: np.ndarray, predicted: np.ndarray
+    ) -> Dict[str, float]:
+        """Error metrics of numeric predictions against their targets"""
+        errors = predicted - y
+        mse = float(np.mean(errors**2))
+        metrics = {
+            "rmse": float(np.sqrt(mse)),
+            "mae": float(np.mean(np.abs(errors))),
+            "mse": mse,
         }
+        total = float(((y - y.mean()) ** 2).sum())
+        if total > 0:
+            metrics["r2_score"] = 1 - float((errors**2).sum()) / total
+        nonzero = y != 0
+        if nonzero.any():
+            metrics["mape"] = float(np.mean(np.abs(errors[nonzero] / y[nonzero])) * 100)
+        return metrics
 
     def deploy_model(self, model_id: int) -> Dict[str, Any]:
         """Deploy a trained model for predictions"""
@@ -222,6 +361,44 @@ class AIInsightsEngine:
         prediction_horizon: Optional[int] = None,
     ) -> Prediction:
         """Make a prediction using a deployed model"""
+        model = self._get_deployed_model(model_id)
+        prediction = self._score(model, [input_data], prediction_horizon)[0]
+
+        self.db.add(prediction)
+        self.db.commit()
+        self.db.refresh(prediction)
+
+        return prediction
+
+    def batch_predict(
+        self,
+        model_id: int,
+        input_data_list: List[Dict[str, Any]],
+        prediction_horizon: Optional[int] = None,
+    ) -> List[Prediction]:
+        """
+        Make batch predictions
+
+        The model is loaded once, every input row goes into one feature
+        matrix scored with a single estimator call, and all predictions are
+        inserted in one transaction.
+        """
+        model = self._get_deployed_model(model_id)
+        predictions = self._score(model, input_data_list, prediction_horizon)
+
+        self.db.add_all(predictions)
+        self.db.flush()
+        ids = [prediction.id for prediction in predictions]
+        self.db.commit()
+        # Commit expires the rows; reload them in one query rather than one
+        # per prediction when they are read
+        if ids:
+            self.db.query(Prediction).filter(Prediction.id.in_(ids)).all()
+
+        return predictions
+
+    def _get_deployed_model(self, model_id: int) -> AIModel:
+        """Load a deployed model or raise ValueError"""
         model = (
             self.db.query(AIModel)
             .filter(
@@ -235,329 +412,497 @@ class AIInsightsEngine:
         if not model:
             raise ValueError(f"Deployed model {model_id} not found")
 
-        # Simulate prediction based on model type
+        return model
+
+    def _score(
+        self, model: AIModel, rows: List[Dict[str, Any]], horizon: Optional[int]
+    ) -> List[Prediction]:
+        """Score rows with one vectorized call and build their Prediction records"""
+        if not rows:
+            return []
+        start = time.perf_counter()
+
+        fitted = None
+        if model.model_path:
+            fitted = model_registry.get(
+                self._registry_key(model), fingerprint=model.model_version
+            )
+            if fitted is None:
+                raise ValueError(
+                    f"Trained estimator for model {model.id} is missing or out "
+                    "of date; retrain the model"
+                )
+
         if model.model_type in [ModelType.TIME_SERIES, ModelType.FORECASTING]:
-            result = self._predict_time_series(model, input_data, prediction_horizon)
+            results = self._predict_time_series(model, rows, horizon)
         elif model.model_type == ModelType.CLASSIFICATION:
-            result = self._predict_classification(model, input_data)
+            results = self._predict_classification(fitted, rows)
         elif model.model_type == ModelType.REGRESSION:
-            result = self._predict_regression(model, input_data)
+            results = self._predict_regression(fitted, rows)
         elif model.model_type == ModelType.ANOMALY_DETECTION:
-            result = self._predict_anomaly(model, input_data)
+            results = self._predict_anomaly(fitted, rows)
         else:
-            result = self._predict_clustering(model, input_data)
-
-        # Create prediction record
-        prediction = Prediction(
-            tenant_id=self.tenant_id,
-            model_id=model_id,
-            prediction_type=model.model_type.value,
-            input_data=input_data,
-            predicted_value=result["predicted_value"],
-            confidence_score=result["confidence_score"],
-            lower_bound=result.get("lower_bound"),
-            upper_bound=result.get("upper_bound"),
-            confidence_level=result.get("confidence_level", 0.95),
-            prediction_horizon=prediction_horizon,
-            status=PredictionStatus.COMPLETED,
-            execution_time_ms=result.get("execution_time_ms", 50),
-        )
-
-        self.db.add(prediction)
-        self.db.commit()
-        self.db.refresh(prediction)
-
-        return prediction
+            results = self._predict_clustering(fitted, rows)
+
+        # Amortized over the batch
+        execution_time_ms = round((time.perf_counter() - start) * 1000 / len(rows))
+
+        return [
+            Prediction(
+                tenant_id=self.tenant_id,
+                model_id=model.id,
+                prediction_type=model.model_type.value,
+                input_data=input_data,
+                predicted_value=result["predicted_value"],
+                confidence_score=result["confidence_score"],
+                lower_bound=result.get("lower_bound"),
+                upper_bound=result.get("upper_bound"),
+                confidence_level=result.get("confidence_level", 0.95),
+                prediction_horizon=horizon,
+                status=PredictionStatus.COMPLETED,
+                execution_time_ms=execution_time_ms,
+            )
+            for input_data, result in zip(rows, results)
+        ]
+
+    def _feature_categories(
+        self, features: List[str], rows: List[Dict[str, Any]]
+    ) -> Dict[str, Dict[str, int]]:
+        """Codes for the values of every feature that isn't numeric"""
+        categories = {}
+        for feature in features:
+            values = [row.get(feature) for row in rows]
+            try:
+                np.array(values, dtype=float)
+            except (TypeError, ValueError):
+                labels = sorted({str(value) for value in values if value is not None})
+                categories[feature] = {label: code for code, label in enumerate(labels)}
+        return categories
+
+    def _feature_matrix(
+        self,
+        features: List[str],
+        rows: List[Dict[str, Any]],
+        fill: Optional[np.ndarray] = None,
+        categories: Optional[Dict[str, Dict[str, int]]] = None,
+    ) -> np.ndarray:
+        """
+        One float column per feature
+
+        Features in ``categories`` take their category code; missing values
+        and unseen categories take ``fill`` (or NaN).
+        """
+        categories = categories or {}
+        X = np.empty((len(rows), len(features)))
+        for j, feature in enumerate(features):
+            values = [row.get(feature) for row in rows]
+            codes = categories.get(feature)
+            if codes is not None:
+                X[:, j] = [
+                    np.nan if value is None else codes.get(str(value), np.nan)
+                    for value in values
+                ]
+                continue
+            try:
+                X[:, j] = np.array(values, dtype=float)
+            except (TypeError, ValueError):
+                raise ValueError(f"Feature '{feature}' must be numeric")
+        missing = np.isnan(X)
+        if fill is not None and missing.any():
+            X[missing] = np.broadcast_to(fill, X.shape)[missing]
+        return X
 
     def _predict_time_series(
-        self, model: AIModel, input_data: Dict, horizon: int
-    ) -> Dict:
-        """Make time series prediction"""
+        self, model: AIModel, rows: List[Dict], horizon: Optional[int]
+    ) -> List[Dict]:
+        """Make time series predictions"""
         # Simulate prediction
-        base_value = input_data.get("last_value", 100)
-        trend = input_data.get("trend", 0.02)
-
-        predicted_value = base_value * (1 + trend * (horizon or 1))
-
-        return {
-            "predicted_value": predicted_value,
-            "confidence_score": 0.85,
-            "lower_bound": predicted_value * 0.9,
-            "upper_bound": predicted_value * 1.1,
-            "confidence_level": 0.95,
-        }
-
-    def _predict_classification(self, model: AIModel, input_data: Dict) -> Dict:
-        """Make classification prediction"""
-        # Simulate classification
-        classes = ["Class_A", "Class_B", "Class_C"]
-        probabilities = [0.65, 0.25, 0.10]
-
-        return {
-            "predicted_value": {
-                "class": classes[0],
-                "probabilities": dict(zip(classes, probabilities)),
-            },
-            "confidence_score": probabilities[0],
-        }
-
-    def _predict_regression(self, model: AIModel, input_data: Dict) -> Dict:
-        """Make regression prediction"""
-        # Simulate regression
-        predicted_value = sum(input_data.values()) * 1.5 if input_data else 100
-
-        return {
-            "predicted_value": predicted_value,
-            "confidence_score": 0.88,
-            "lower_bound": predicted_value * 0.92,
-            "upper_bound": predicted_value * 1.08,
-        }
-
-    def _predict_anomaly(self, model: AIModel, input_data: Dict) -> Dict:
-        """Detect anomaly"""
-        # Simulate anomaly detection
-        anomaly_score = 0.15  # Low score = normal
+        base_value = np.array([row.get("last_value", 100) for row in rows], dtype=float)
+        trend = np.array([row.get("trend", 0.02) for row in rows], dtype=float)
+
+        predicted = base_value * (1 + trend * (horizon or 1))
+
+        return [
+            {
+                "predicted_value": value,
+                "confidence_score": 0.85,
+                "lower_bound": value * 0.9,
+                "upper_bound": value * 1.1,
+                "confidence_level": 0.95,
+            }
+            for value in predicted.tolist()
+        ]
+
+    def _predict_classification(
+        self, fitted: Optional[Dict], rows: List[Dict]
+    ) -> List[Dict]:
+        """Make classification predictions"""
+        if fitted is None:
+            # Simulate classification
+            classes = ["Class_A", "Class_B", "Class_C"]
+            probabilities = np.tile([0.65, 0.25, 0.10], (len(rows), 1))
+        else:
+            X = self._feature_matrix(
+                fitted["features"], rows, fitted["fill"], fitted.get("categories")
+            )
+            estimator = fitted["estimator"]
+            classes = estimator.classes_.tolist()
+            probabilities = estimator.predict_proba(X)
+
+        best = probabilities.argmax(axis=1)
+        return [
+            {
+                "predicted_value": {
+                    "class": classes[index],
+                    "probabilities": dict(zip(classes, row)),
+                },
+                "confidence_score": row[index],
+            }
+            for index, row in zip(best.tolist(), probabilities.tolist())
+        ]
+
+    def _predict_regression(
+        self, fitted: Optional[Dict], rows: List[Dict]
+    ) -> List[Dict]:
+        """Make regression predictions"""
+        if fitted is None:
+            # Simulate regression
+            predicted = np.array(
+                [sum(row.values()) * 1.5 if row else 100 for row in rows], dtype=float
+            )
+            lower, upper = predicted * 0.92, predicted * 1.08
+            confidence = 0.88
+        else:
+            X = self._feature_matrix(
+                fitted["features"], rows, fitted["fill"], fitted.get("categories")
+            )
+            predicted = fitted["estimator"].predict(X)
+            lower = predicted - fitted["interval"]
+            upper = predicted + fitted["interval"]
+            confidence = fitted["confidence"]
+
+        return [
+            {
+                "predicted_value": value,
+                "confidence_score": confidence,
+                "lower_bound": low,
+                "upper_bound": high,
+            }
+            for value, low, high in zip(
+                predicted.tolist(), lower.tolist(), upper.tolist()
+            )
+        ]
+
+    def _predict_anomaly(self, fitted: Optional[Dict], rows: List[Dict]) -> List[Dict]:
+        """Detect anomalies"""
+        if fitted is None:
+            # Simulate anomaly detection
+            anomaly_score = 0.15  # Low score = normal
+            return [
+                {
+                    "predicted_value": {
+                        "is_anomaly": anomaly_score > 0.5,
+                        "anomaly_score": anomaly_score,
+                    },
+                    "confidence_score": 0.92,
+                }
+                for _ in rows
+            ]
 
-        return {
-            "predicted_value": {
-                "is_anomaly": anomaly_score > 0.5,
-                "anomaly_score": anomaly_score,
-            },
-            "confidence_score": 0.92,
-        }
+        X = self._feature_matrix(
+            fitted["features"], rows, fitted["fill"], fitted.get("categories")
+        )
+        estimator = fitted["estimator"]
+        # Isolation forest scores: close to 1 is anomalous, below 0.5 normal
+        scores = -estimator.score_samples(X)
+        is_anomaly = estimator.predict(X) == -1
+        confidence = np.where(is_anomaly, scores, 1 - scores)
+
+        return [
+            {
+                "predicted_value": {"is_anomaly": flag, "anomaly_score": score},
+                "confidence_score": conf,
+            }
+            for flag, score, conf in zip(
+                is_anomaly.tolist(), scores.tolist(), confidence.tolist()
+            )
+        ]
+
+    def _predict_clustering(
+        self, fitted: Optional[Dict], rows: List[Dict]
+    ) -> List[Dict]:
+        """Assign to clusters"""
+        if fitted is None:
+            return [
+                {
+                    "predicted_value": {"cluster_id": 2, "distance_to_centroid": 0.35},
+                    "confidence_score": 0.78,
+                }
+                for _ in rows
+            ]
 
-    def _predict_clustering(self, model: AIModel, input_data: Dict) -> Dict:
-        """Assign to cluster"""
-        return {
-            "predicted_value": {"cluster_id": 2, "distance_to_centroid": 0.35},
-            "confidence_score": 0.78,
-        }
+        X = self._feature_matrix(
+            fitted["features"], rows, fitted["fill"], fitted.get("categories")
+        )
+        distances = fitted["estimator"].transform(X)
+        cluster = distances.argmin(axis=1)
+        ordered = np.sort(distances, axis=1)
+        nearest = ordered[:, 0]
+        # Margin to the runner-up centroid: 1 = unambiguous, 0 = on the border
+        confidence = np.ones(len(rows))
+        if distances.shape[1] > 1:
+            runner_up = ordered[:, 1]
+            confidence = np.divide(
+                runner_up - nearest,
+                runner_up,
+                out=np.zeros(len(rows)),
+                where=runner_up > 0,
+            )
 
-    def batch_predict(
-        self, model_id: int, input_data_list: List[Dict[str, Any]]
-    ) -> List[Prediction]:
-        """Make batch predictions"""
-        predictions = []
-        for input_data in input_data_list:
-            prediction = self.make_prediction(model_id, input_data)
-            predictions.append(prediction)
-        return predictions
+        return [
+            {
+                "predicted_value": {"cluster_id": c, "distance_to_centroid": d},
+                "confidence_score": conf,
+            }
+            for c, d, conf in zip(
+                cluster.tolist(), nearest.tolist(), confidence.tolist()
+            )
+        ]
 
     # ==================== INSIGHTS GENERATION ====================
 
     def generate_insights(
         self, data: List[Dict[str, Any]], metrics: List[str], time_range_days: int = 30
     ) -> List[Insight]:
-        """Generate AI-powered insights from data"""
+        """
+        Generate AI-powered insights from data
+
+        The metrics are loaded once into a rows x metrics array; each analysis
+        is a vectorized pass over all metrics, and the resulting insights are
+        inserted in a single transaction.
+        """
+        values, present = self._metric_matrix(data, metrics)
         insights = []
 
         # Anomaly detection
-        anomaly_insights = self._detect_anomalies(data, metrics)
-        insights.extend(anomaly_insights)
+        insights.extend(self._detect_anomalies(values, present, metrics))
 
         # Trend analysis
-        trend_insights = self._analyze_trends(data, metrics, time_range_days)
-        insights.extend(trend_insights)
+        insights.extend(self._analyze_trends(values, present, metrics, time_range_days))
 
         # Pattern recognition
-        pattern_insights = self._recognize_patterns(data, metrics)
-        insights.extend(pattern_insights)
+        insights.extend(self._recognize_patterns(values, present, metrics))
 
         # Correlation analysis
-        correlation_insights = self._analyze_correlations(data, metrics)
-        insights.extend(correlation_insights)
+        insights.extend(self._analyze_correlations(values, present, metrics))
 
+        if insights:
+            self.db.add_all(insights)
+            self.db.commit()
         return insights
 
-    def _detect_anomalies(self, data: List[Dict], metrics: List[str]) -> List[Insight]:
-        """Detect anomalies in data"""
+    def _metric_matrix(
+        self, data: List[Dict], metrics: List[str]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Load metric values into a float array with one column per metric
+
+        Returns:
+            Tuple of (values, present mask); missing and null values are NaN
+        """
+        values = np.empty((len(data), len(metrics)))
+        for column, metric in enumerate(metrics):
+            values[:, column] = np.array([d.get(metric) for d in data], dtype=float)
+        return values, ~np.isnan(values)
+
+    def _column_stats(
+        self, values: np.ndarray, present: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Per-metric count, mean and deviations from the mean (0 if missing)"""
+        counts = present.sum(axis=0)
+        means = np.where(present, values, 0.0).sum(axis=0) / np.maximum(counts, 1)
+        deviations = np.where(present, values - means, 0.0)
+        return counts, means, deviations
+
+    def _detect_anomalies(
+        self, values: np.ndarray, present: np.ndarray, metrics: List[str]
+    ) -> List[Insight]:
+        """Detect values more than 3 standard deviations from the metric mean"""
         insights = []
+        counts, means, deviations = self._column_stats(values, present)
+        variances = (deviations**2).sum(axis=0) / np.maximum(counts - 1, 1)
+        stdevs = np.sqrt(variances) * (counts > 1)
+
+        outliers = present & (stdevs > 0) & (np.abs(deviations) > 3 * stdevs)
+        # Transposed so insights come out metric by metric, in row order
+        for column, row in zip(*np.nonzero(outliers.T)):
+            metric = metrics[column]
+            mean, stdev = float(means[column]), float(stdevs[column])
+            value = float(values[row, column])
+            deviation = ((value - mean) / mean) * 100 if mean else 0.0
+
+            insights.append(
+                Insight(
+                    tenant_id=self.tenant_id,
+                    insight_type=InsightType.ANOMALY,
+                    severity=(
+                        InsightSeverity.HIGH
+                        if abs(deviation) > 50
+                        else InsightSeverity.MEDIUM
+                    ),
+                    title=f"Anomaly detected in {metric}",
+                    description=f"Value {value:.2f} deviates {abs(deviation):.1f}% from expected {mean:.2f}",
+                    affected_metrics=[metric],
+                    anomaly_score=abs(value - mean) / stdev,
+                    expected_value=mean,
+                    actual_value=value,
+                    deviation_percentage=deviation,
+                    statistical_significance=0.99,
+                    detection_date=datetime.utcnow(),
+                )
+            )
 
-        for metric in metrics:
-            values = [d.get(metric, 0) for d in data if metric in d]
-            if not values:
-                continue
-
-            mean = statistics.mean(values)
-            stdev = statistics.stdev(values) if len(values) > 1 else 0
-
-            # Check for anomalies (values > 3 standard deviations)
-            for i, value in enumerate(values):
-                if stdev > 0 and abs(value - mean) > 3 * stdev:
-                    deviation = ((value - mean) / mean) * 100
-
-                    insight = Insight(
-                        tenant_id=self.tenant_id,
-                        insight_type=InsightType.ANOMALY,
-                        severity=(
-                            InsightSeverity.HIGH
-                            if abs(deviation) > 50
-                            else InsightSeverity.MEDIUM
-                        ),
-                        title=f"Anomaly detected in {metric}",
-                        description=f"Value {value:.2f} deviates {abs(deviation):.1f}% from expected {mean:.2f}",
-                        affected_metrics=[metric],
-                        anomaly_score=abs(value - mean) / stdev if stdev > 0 else 0,
-                        expected_value=mean,
-                        actual_value=value,
-                        deviation_percentage=deviation,
-                        statistical_significance=0.99,
-                        detection_date=datetime.utcnow(),
-                    )
-                    self.db.add(insight)
-                    insights.append(insight)
-
-        self.db.commit()
         return insights
 
     def _analyze_trends(
-        self, data: List[Dict], metrics: List[str], days: int
+        self, values: np.ndarray, present: np.ndarray, metrics: List[str], days: int
     ) -> List[Insight]:
-        """Analyze trends in data"""
+        """Least-squares slope of each metric against its observation index"""
         insights = []
+        counts, _, deviations = self._column_stats(values, present)
+
+        # x is the position of each value among the metric's observations
+        positions = np.cumsum(present, axis=0) - 1
+        dx = np.where(present, positions - (counts - 1) / 2, 0.0)
+        numerator = (dx * deviations).sum(axis=0)
+        denominator = (dx**2).sum(axis=0)
+        slopes = np.divide(
+            numerator, denominator, out=np.zeros(len(metrics)), where=denominator > 0
+        )
 
-        for metric in metrics:
-            values = [d.get(metric, 0) for d in data if metric in d]
-            if len(values) < 2:
-                continue
-
-            # Simple linear trend
-            n = len(values)
-            x = list(range(n))
-            x_mean = sum(x) / n
-            y_mean = sum(values) / n
-
-            numerator = sum((x[i] - x_mean) * (values[i] - y_mean) for i in range(n))
-            denominator = sum((x[i] - x_mean) ** 2 for i in range(n))
-
-            if denominator > 0:
-                slope = numerator / denominator
-
-                # Determine trend direction and strength
-                if abs(slope) > 0.1:
-                    direction = "increasing" if slope > 0 else "decreasing"
-                    strength = min(abs(slope), 1.0)
-
-                    insight = Insight(
-                        tenant_id=self.tenant_id,
-                        insight_type=InsightType.TREND,
-                        severity=(
-                            InsightSeverity.MEDIUM
-                            if strength > 0.5
-                            else InsightSeverity.LOW
-                        ),
-                        title=f"{direction.capitalize()} trend in {metric}",
-                        description=f"{metric} is {direction} with strength {strength:.2f}",
-                        affected_metrics=[metric],
-                        trend_direction=direction,
-                        trend_strength=strength,
-                        trend_duration_days=days,
-                        statistical_significance=0.85,
-                        detection_date=datetime.utcnow(),
-                    )
-                    self.db.add(insight)
-                    insights.append(insight)
+        for column in np.flatnonzero((counts >= 2) & (np.abs(slopes) > 0.1)):
+            metric = metrics[column]
+            slope = float(slopes[column])
+            direction = "increasing" if slope > 0 else "decreasing"
+            strength = min(abs(slope), 1.0)
+
+            insights.append(
+                Insight(
+                    tenant_id=self.tenant_id,
+                    insight_type=InsightType.TREND,
+                    severity=(
+                        InsightSeverity.MEDIUM
+                        if strength > 0.5
+                        else InsightSeverity.LOW
+                    ),
+                    title=f"{direction.capitalize()} trend in {metric}",
+                    description=f"{metric} is {direction} with strength {strength:.2f}",
+                    affected_metrics=[metric],
+                    trend_direction=direction,
+                    trend_strength=strength,
+                    trend_duration_days=days,
+                    statistical_significance=0.85,
+                    detection_date=datetime.utcnow(),
+                )
+            )
 
-        self.db.commit()
         return insights
 
     def _recognize_patterns(
-        self, data: List[Dict], metrics: List[str]
+        self, values: np.ndarray, present: np.ndarray, metrics: List[str]
     ) -> List[Insight]:
-        """Recognize patterns in data"""
+        """Weekly seasonality: day-of-week means that differ from each other"""
         insights = []
+        counts = present.sum(axis=0)
+        filled = np.where(present, values, 0.0)
+        weekday = (np.cumsum(present, axis=0) - 1) % 7
+
+        weekly_avg = np.zeros((7, len(metrics)))
+        for day in range(7):
+            on_day = present & (weekday == day)
+            weekly_avg[day] = (filled * on_day).sum(axis=0) / np.maximum(
+                on_day.sum(axis=0), 1
+            )
+        variance = np.var(weekly_avg, axis=0, ddof=1)
+        # Ignore rounding noise in the means of constant metrics
+        varies = variance > 1e-12 * (weekly_avg**2).mean(axis=0)
+
+        # Need at least a week of data
+        for column in np.flatnonzero((counts >= 7) & varies):
+            metric = metrics[column]
+            insights.append(
+                Insight(
+                    tenant_id=self.tenant_id,
+                    insight_type=InsightType.PATTERN,
+                    severity=InsightSeverity.INFO,
+                    title=f"Weekly pattern detected in {metric}",
+                    description=f"{metric} shows recurring weekly patterns",
+                    affected_metrics=[metric],
+                    pattern_type="weekly",
+                    pattern_frequency="weekly",
+                    statistical_significance=0.75,
+                    detection_date=datetime.utcnow(),
+                )
+            )
 
-        for metric in metrics:
-            values = [d.get(metric, 0) for d in data if metric in d]
-            if len(values) < 7:  # Need at least a week of data
-                continue
-
-            # Check for weekly patterns
-            if len(values) >= 7:
-                weekly_avg = [statistics.mean(values[i::7]) for i in range(7)]
-                variance = statistics.variance(weekly_avg) if len(weekly_avg) > 1 else 0
-
-                if variance > 0:
-                    insight = Insight(
-                        tenant_id=self.tenant_id,
-                        insight_type=InsightType.PATTERN,
-                        severity=InsightSeverity.INFO,
-                        title=f"Weekly pattern detected in {metric}",
-                        description=f"{metric} shows recurring weekly patterns",
-                        affected_metrics=[metric],
-                        pattern_type="weekly",
-                        pattern_frequency="weekly",
-                        statistical_significance=0.75,
-                        detection_date=datetime.utcnow(),
-                    )
-                    self.db.add(insight)
-                    insights.append(insight)
-
-        self.db.commit()
         return insights
 
     def _analyze_correlations(
-        self, data: List[Dict], metrics: List[str]
+        self, values: np.ndarray, present: np.ndarray, metrics: List[str]
     ) -> List[Insight]:
-        """Analyze correlations between metrics"""
+        """
+        Pearson correlation between every pair of metrics
+
+        The full matrix is built from a few matrix products; each pair uses
+        the rows where both metrics are present.
+        """
         insights = []
 
         if len(metrics) < 2:
             return insights
 
-        # Check correlations between pairs of metrics
-        for i in range(len(metrics)):
-            for j in range(i + 1, len(metrics)):
-                metric1, metric2 = metrics[i], metrics[j]
-
-                values1 = [
-                    d.get(metric1, 0) for d in data if metric1 in d and metric2 in d
-                ]
-                values2 = [
-                    d.get(metric2, 0) for d in data if metric1 in d and metric2 in d
-                ]
+        _, _, centered = self._column_stats(values, present)
+        mask = present.astype(float)
+        pairs = mask.T @ mask  # rows where both metrics are present
+        sums = centered.T @ mask  # sums[i, j]: sum of metric i over those rows
+        squares = (centered**2).T @ mask
+        products = centered.T @ centered
+
+        spread = pairs * squares
+        variance = spread - sums**2
+        # Constant metrics leave only rounding noise; treat them as zero
+        variance = np.where(variance > spread * 1e-12, variance, 0.0)
+        covariance = pairs * products - sums * sums.T
+        denominator = np.sqrt(variance * variance.T)
+        correlation = np.divide(
+            covariance,
+            denominator,
+            out=np.zeros_like(covariance),
+            where=denominator > 0,
+        )
 
-                if len(values1) < 3:
-                    continue
-
-                # Calculate correlation
-                correlation = self._calculate_correlation(values1, values2)
-
-                if abs(correlation) > 0.7:  # Strong correlation
-                    insight = Insight(
-                        tenant_id=self.tenant_id,
-                        insight_type=InsightType.CORRELATION,
-                        severity=InsightSeverity.MEDIUM,
-                        title=f"Strong correlation between {metric1} and {metric2}",
-                        description=f"Correlation coefficient: {correlation:.2f}",
-                        affected_metrics=[metric1, metric2],
-                        statistical_significance=abs(correlation),
-                        detection_date=datetime.utcnow(),
-                    )
-                    self.db.add(insight)
-                    insights.append(insight)
+        first, second = np.triu_indices(len(metrics), k=1)
+        strong = (pairs[first, second] >= 3) & (
+            np.abs(correlation[first, second]) > 0.7  # Strong correlation
+        )
+        for i, j in zip(first[strong], second[strong]):
+            metric1, metric2 = metrics[i], metrics[j]
+            coefficient = float(correlation[i, j])
+            insights.append(
+                Insight(
+                    tenant_id=self.tenant_id,
+                    insight_type=InsightType.CORRELATION,
+                    severity=InsightSeverity.MEDIUM,
+                    title=f"Strong correlation between {metric1} and {metric2}",
+                    description=f"Correlation coefficient: {coefficient:.2f}",
+                    affected_metrics=[metric1, metric2],
+                    statistical_significance=abs(coefficient),
+                    detection_date=datetime.utcnow(),
+                )
+            )
 
-        self.db.commit()
         return insights
 
-    def _calculate_correlation(self, x: List[float], y: List[float]) -> float:
-        """Calculate Pearson correlation coefficient"""
-        n = len(x)
-        if n == 0:
-            return 0
-
-        mean_x = sum(x) / n
-        mean_y = sum(y) / n
-
-        numerator = sum((x[i] - mean_x) * (y[i] - mean_y) for i in range(n))
-        denominator_x = sum((x[i] - mean_x) ** 2 for i in range(n))
-        denominator_y = sum((y[i] - mean_y) ** 2 for i in range(n))
-
-        if denominator_x == 0 or denominator_y == 0:
-            return 0
-
-        return numerator / (math.sqrt(denominator_x) * math.sqrt(denominator_y))
-
     # ==================== RECOMMENDATIONS ====================
 
     def generate_recommendations(self, insight_id: int) -> List[Recommendation]:
@@ -696,7 +1041,8 @@ class AIInsightsEngine:
         accuracy = self._calculate_accuracy(data)
         consistency = self._calculate_consistency(data)
         validity = self._calculate_validity(data)
-        uniqueness = self._calculate_uniqueness(data)
+        unique_rows = self._count_unique_rows(data)
+        uniqueness = unique_rows / len(data)
 
         # Overall score (weighted average)
         overall = (
@@ -709,9 +1055,7 @@ class AIInsightsEngine:
 
         # Count issues
         missing_count = sum(1 for row in data for v in row.values() if v is None)
-        duplicate_count = len(data) - len(
-            set(json.dumps(d, sort_keys=True) for d in data)
-        )
+        duplicate_count = len(data) - unique_rows
 
         quality_score = DataQualityScore(
             tenant_id=self.tenant_id,
@@ -762,8 +1106,18 @@ class AIInsightsEngine:
         if not data:
             return 1.0
 
-        unique_rows = len(set(json.dumps(d, sort_keys=True) for d in data))
-        return unique_rows / len(data)
+        return self._count_unique_rows(data) / len(data)
+
+    def _count_unique_rows(self, data: List[Dict]) -> int:
+        """Count distinct rows by hashing their items (key order ignored)"""
+        unique = set()
+        for row in data:
+            try:
+                unique.add(frozenset(row.items()))
+            except TypeError:
+                # Nested lists/dicts aren't hashable; fall back to JSON
+                unique.add(json.dumps(row, sort_keys=True, default=str))
+        return len(unique)
 
     # ==================== FEATURE IMPORTANCE ====================
 
@@ -4,11 +4,13 @@ REST API for report generation and management
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Dict, List, Optional, Any
 from pydantic import BaseModel
 
 from app.core.report_generator import (
+    EXPORT_CHUNK_SIZE,
     ReportGenerator,
     ReportFormat,
     ReportFrequency,
@@ -56,6 +58,10 @@ class ExportDataRequest(BaseModel):
     date_range: Optional[Dict[str, str]] = None
 
 
+class StreamExportRequest(ExportDataRequest):
+    chunk_size: int = EXPORT_CHUNK_SIZE
+
+
 @router.post("/")
 async def create_report(
     request: ReportCreateRequest, db: Session = Depends(get_db)
@@ -311,6 +317,83 @@ async def export_data(
     return result
 
 
+@router.post("/export/stream")
+async def stream_export(
+    request: StreamExportRequest, db: Session = Depends(get_db)
+) -> StreamingResponse:
+    """
+    Stream raw data as CSV, JSON Lines or Parquet
+
+    Data is fetched and encoded chunk by chunk while the response is sent.
+    The ``X-Export-Id`` response header identifies the export for
+    ``GET /export/{export_id}/progress``.
+
+    Args:
+        data_source_id: Data source ID
+        metrics: Metrics to export
+        format: Export format (csv, jsonl, parquet)
+        date_range: Optional date range
+        chunk_size: Records per chunk
+
+    Returns:
+        Streaming file download
+    """
+
+    generator = ReportGenerator(db)
+
+    try:
+        format_enum = ReportFormat(request.format)
+        content_type = generator.export_content_type(format_enum)
+    except ValueError:
+        raise HTTPException(
+            status_code=400, detail=f"Invalid streaming format: {request.format}"
+        )
+
+    if request.chunk_size < 1:
+        raise HTTPException(status_code=400, detail="chunk_size must be positive")
+
+    export_id = generator.new_export_id()
+    stream = generator.export_stream(
+        request.data_source_id,
+        request.metrics,
+        format_enum,
+        request.date_range,
+        chunk_size=request.chunk_size,
+        export_id=export_id,
+    )
+
+    return StreamingResponse(
+        stream,
+        media_type=content_type,
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="export-{export_id}.{format_enum.value}"'
+            ),
+            "X-Export-Id": export_id,
+        },
+    )
+
+
+@router.get("/export/{export_id}/progress")
+async def get_export_progress(export_id: str) -> Dict[str, Any]:
+    """
+    Get streaming export progress
+
+    Args:
+        export_id: Export ID from the ``X-Export-Id`` header
+
+    Returns:
+        Status, records and bytes exported so far
+    """
+
+    progress = ReportGenerator.get_export_progress(export_id)
+
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Export not found")
+
+    return progress
+
+
 @router.get("/templates/executive-summary")
 async def generate_executive_summary(
     data_sources: List[int] = Query(...),
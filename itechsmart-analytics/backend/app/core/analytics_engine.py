@@ -13,6 +13,8 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
 import warnings
 
+from app.core.model_registry import fingerprint, model_registry
+
 warnings.filterwarnings("ignore")
 
 
@@ -56,29 +58,21 @@ class AnalyticsEngine:
         X = data[["day"]].values
         y = data[metric].values
 
-        # Choose model
-        if model_type == "auto":
-            model_type = self._select_best_model(X, y)
-
-        # Train model
-        if model_type == "rf":
-            model = RandomForestRegressor(n_estimators=100, random_state=42)
-        else:
-            from sklearn.linear_model import LinearRegression
-
-            model = LinearRegression()
-
-        model.fit(X, y)
+        # Reuse the fitted model while the history it was fitted on is unchanged
+        fitted = model_registry.get_or_fit(
+            f"forecast-{metric}-{model_type}",
+            lambda: self._fit_forecast_model(X, y, model_type),
+            fingerprint=fingerprint(X, y),
+        )
+        model = fitted["model"]
+        model_type = fitted["model_type"]
 
         # Generate forecast
         last_day = data["day"].max()
         future_days = np.array([[last_day + i] for i in range(1, horizon + 1)])
         forecast_values = model.predict(future_days)
 
-        # Calculate confidence intervals (simplified)
-        residuals = y - model.predict(X)
-        std_error = np.std(residuals)
-        confidence_interval = 1.96 * std_error  # 95% CI
+        confidence_interval = fitted["confidence_interval"]
 
         forecast_dates = [
             data["timestamp"].max() + timedelta(days=i) for i in range(1, horizon + 1)
@@ -96,7 +90,7 @@ class AnalyticsEngine:
                 }
                 for date, value in zip(forecast_dates, forecast_values)
             ],
-            "accuracy_score": float(model.score(X, y)),
+            "accuracy_score": fitted["accuracy_score"],
             "generated_at": datetime.utcnow().isoformat(),
         }
 
@@ -370,6 +364,36 @@ class AnalyticsEngine:
 
     # Helper methods
 
+    def _fit_forecast_model(
+        self, X: np.ndarray, y: np.ndarray, model_type: str
+    ) -> Dict[str, Any]:
+        """Fit a forecasting model and the statistics reported with it"""
+
+        # Choose model
+        if model_type == "auto":
+            model_type = self._select_best_model(X, y)
+
+        # Train model
+        if model_type == "rf":
+            model = RandomForestRegressor(n_estimators=100, random_state=42)
+        else:
+            from sklearn.linear_model import LinearRegression
+
+            model = LinearRegression()
+
+        model.fit(X, y)
+
+        # Calculate confidence intervals (simplified)
+        residuals = y - model.predict(X)
+        std_error = np.std(residuals)
+
+        return {
+            "model": model,
+            "model_type": model_type,
+            "confidence_interval": float(1.96 * std_error),  # 95% CI
+            "accuracy_score": float(model.score(X, y)),
+        }
+
     def _select_best_model(self, X: np.ndarray, y: np.ndarray) -> str:
         """Select best forecasting model based on data characteristics"""
 
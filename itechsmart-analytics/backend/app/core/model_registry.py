@@ -0,0 +1,239 @@
+"""
+iTechSmart Analytics - Model Registry
+Keeps fitted estimators in an in-memory LRU cache backed by serialized
+artifacts on disk, so models are fitted once and reused across requests
+"""
+
+from typing import Any, Callable, Dict, Optional
+from collections import OrderedDict
+import hashlib
+import logging
+import os
+import pickle
+import re
+import tempfile
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MODEL_ARTIFACT_DIR = os.getenv("MODEL_ARTIFACT_DIR", "./model_artifacts")
+MODEL_CACHE_SIZE = int(os.getenv("MODEL_CACHE_SIZE", "32"))
+
+
+def fingerprint(*arrays: Any) -> str:
+    """
+    Digest of the data a model is fitted on
+
+    Args:
+        arrays: Arrays (or array-likes) the model depends on
+
+    Returns:
+        32-character hex digest; equal data gives an equal digest
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        array = np.asarray(array)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        if array.dtype.kind == "O":
+            digest.update(repr(array.tolist()).encode())
+        else:
+            digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    """
+    Fitted estimators by key, most recently used kept in memory
+
+    Every entry carries the fingerprint of the data it was fitted on. A
+    lookup with a different fingerprint is a miss, so a stale model is
+    refitted instead of served. Entries evicted from memory (or fitted by
+    another worker process) are reloaded from their pickle artifact.
+    """
+
+    def __init__(
+        self,
+        capacity: int = MODEL_CACHE_SIZE,
+        artifact_dir: Optional[str] = MODEL_ARTIFACT_DIR,
+    ):
+        self.capacity = capacity
+        self.artifact_dir = artifact_dir
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.fits = 0
+
+    def artifact_path(self, key: str) -> Optional[str]:
+        """
+        Where the artifact for ``key`` is stored (None if memory-only)
+
+        The file name is the key with unsafe characters replaced, plus a
+        digest of the exact key, so keys that sanitize alike don't collide
+        """
+        if not self.artifact_dir:
+            return None
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+        safe = re.sub(r"[^\w.-]", "_", key)[:100]
+        return os.path.join(self.artifact_dir, f"{safe}-{digest}.pkl")
+
+    def get(self, key: str, fingerprint: Optional[str] = None) -> Optional[Any]:
+        """
+        Look up a fitted model
+
+        Args:
+            key: Registry key
+            fingerprint: Expected data fingerprint (any if None)
+
+        Returns:
+            The model, or None if it is missing or was fitted on other data
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not self._matches(entry, fingerprint):
+                entry = self._load(key)
+                if entry is None or not self._matches(entry, fingerprint):
+                    self.misses += 1
+                    return None
+                self.loads += 1
+                self._remember(key, entry)
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return entry["model"]
+
+    def put(
+        self,
+        key: str,
+        model: Any,
+        fingerprint: Optional[str] = None,
+        persist: bool = True,
+    ) -> Optional[str]:
+        """
+        Register a fitted model
+
+        Args:
+            key: Registry key
+            model: Fitted model (must be picklable when persisted)
+            fingerprint: Fingerprint of the data the model was fitted on
+            persist: Also write the artifact to disk
+
+        Returns:
+            Artifact path, or None if the model is kept in memory only
+        """
+        entry = {"key": key, "model": model, "fingerprint": fingerprint}
+        path = self._save(key, entry) if persist else None
+        with self._lock:
+            self._remember(key, entry)
+        return path
+
+    def get_or_fit(
+        self,
+        key: str,
+        fit: Callable[[], Any],
+        fingerprint: Optional[str] = None,
+        persist: bool = True,
+    ) -> Any:
+        """
+        Return the registered model, fitting and registering it on a miss
+
+        Args:
+            key: Registry key
+            fit: Called without arguments to produce the fitted model
+            fingerprint: Fingerprint of the data ``fit`` uses
+            persist: Also write a newly fitted model to disk
+
+        Returns:
+            Fitted model
+        """
+        model = self.get(key, fingerprint)
+        if model is None:
+            model = fit()
+            self.fits += 1
+            self.put(key, model, fingerprint, persist=persist)
+        return model
+
+    def evict(self, key: str, delete_artifact: bool = False) -> bool:
+        """
+        Drop a model from memory (and optionally its artifact)
+
+        Returns:
+            True if anything was removed
+        """
+        with self._lock:
+            removed = self._entries.pop(key, None) is not None
+        path = self.artifact_path(key)
+        if delete_artifact and path and os.path.exists(path):
+            os.remove(path)
+            removed = True
+        return removed
+
+    def clear(self):
+        """Drop all in-memory models (artifacts stay on disk)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache occupancy and hit/miss counters"""
+        with self._lock:
+            return {
+                "cached_models": len(self._entries),
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+                "artifact_loads": self.loads,
+                "fits": self.fits,
+                "artifact_dir": self.artifact_dir,
+            }
+
+    # Helper methods
+
+    @staticmethod
+    def _matches(entry: Dict[str, Any], fingerprint: Optional[str]) -> bool:
+        return fingerprint is None or entry["fingerprint"] == fingerprint
+
+    def _remember(self, key: str, entry: Dict[str, Any]):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            evicted, _ = self._entries.popitem(last=False)
+            logger.debug(f"Evicted model {evicted} from memory")
+
+    def _save(self, key: str, entry: Dict[str, Any]) -> Optional[str]:
+        path = self.artifact_path(key)
+        if not path:
+            return None
+        os.makedirs(self.artifact_dir, exist_ok=True)
+        # Write to a temporary file first so readers never see a partial pickle
+        fd, tmp_path = tempfile.mkstemp(dir=self.artifact_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return path
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self.artifact_path(key)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Failed to load model artifact {path}: {e}")
+            return None
+        if entry.get("key") != key:
+            logger.warning(f"Model artifact {path} belongs to another key")
+            return None
+        return entry
+
+
+# Global model registry
+model_registry = ModelRegistry()
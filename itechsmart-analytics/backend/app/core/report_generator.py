@@ -3,15 +3,49 @@ iTechSmart Analytics - Report Generator
 Automated report generation with multiple formats and delivery options
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, AsyncIterator, Awaitable, Callable, Tuple
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from enum import Enum
 import pandas as pd
+import asyncio
+import csv
 import json
-from io import BytesIO
+import logging
+import os
+import time
+import uuid
+import weakref
+from io import BytesIO, StringIO
 import base64
 
+EXPORT_CHUNK_SIZE = 10000
+MAX_TRACKED_EXPORTS = 100
+MAX_CONCURRENT_FRAGMENTS = 8
+MAX_CONCURRENT_SCHEDULED_RUNS = 4
+FRAGMENT_CACHE_SIZE = 256
+FRAGMENT_TTL = timedelta(minutes=15)
+PRERENDER_LEAD = timedelta(minutes=10)
+
+logger = logging.getLogger(__name__)
+
+# Event loop -> semaphores by name
+_semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _shared_semaphore(name: str, limit: int) -> asyncio.Semaphore:
+    """
+    Semaphore shared by every ReportGenerator on the running event loop
+
+    Generators are created per request, so a per-instance semaphore would
+    not bound the process as a whole.
+    """
+    semaphores = _semaphores.setdefault(asyncio.get_running_loop(), {})
+    if name not in semaphores:
+        semaphores[name] = asyncio.Semaphore(limit)
+    return semaphores[name]
+
 
 class ReportFormat(str, Enum):
     """Supported report formats"""
@@ -21,6 +55,8 @@ class ReportFormat(str, Enum):
     CSV = "csv"
     HTML = "html"
     JSON = "json"
+    JSONL = "jsonl"
+    PARQUET = "parquet"
 
 
 class ReportFrequency(str, Enum):
@@ -43,6 +79,287 @@ class DeliveryMethod(str, Enum):
     STORAGE = "storage"
 
 
+class _CsvEncoder:
+    """
+    Encodes record chunks as CSV
+
+    The header is every column seen in the first non-empty chunk, in order
+    of first appearance; records missing a column get an empty cell. A later
+    chunk with new columns raises ValueError instead of dropping them.
+    """
+
+    content_type = "text/csv"
+
+    def __init__(self):
+        self._buffer = StringIO()
+        self._writer = None
+
+    def encode(self, records: List[Dict[str, Any]]) -> bytes:
+        if not records:
+            return b""
+        if self._writer is None:
+            columns = list(dict.fromkeys(key for record in records for key in record))
+            self._writer = csv.DictWriter(self._buffer, fieldnames=columns)
+            self._writer.writeheader()
+        else:
+            extra = set().union(*records) - set(self._writer.fieldnames)
+            if extra:
+                raise ValueError(f"CSV export chunk has new columns: {sorted(extra)}")
+        self._writer.writerows(records)
+        return self._drain()
+
+    def close(self) -> bytes:
+        return b""
+
+    def _drain(self) -> bytes:
+        data = self._buffer.getvalue().encode()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+
+class _JsonlEncoder:
+    """Encodes record chunks as JSON Lines"""
+
+    content_type = "application/x-ndjson"
+
+    def encode(self, records: List[Dict[str, Any]]) -> bytes:
+        return "".join(
+            json.dumps(record, default=str) + "\n" for record in records
+        ).encode()
+
+    def close(self) -> bytes:
+        return b""
+
+
+class _ByteSink:
+    """Write-only file object whose contents are handed out chunk by chunk"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class _ParquetEncoder:
+    """
+    Encodes each record chunk as a Parquet row group
+
+    The schema is inferred from the first chunk. Later chunks are inferred
+    on their own and cast to it; a chunk with new columns, or a column whose
+    type changed, raises ValueError instead of being coerced.
+    """
+
+    content_type = "application/vnd.apache.parquet"
+
+    def __init__(self):
+        import pyarrow  # noqa: F401 - fail before the export starts
+
+        self._sink = _ByteSink()
+        self._writer = None
+
+    def encode(self, records: List[Dict[str, Any]]) -> bytes:
+        import pyarrow.parquet as pq
+
+        if not records:
+            return b""
+        if self._writer is None:
+            columns = list(dict.fromkeys(key for record in records for key in record))
+            table = self._table(records, columns)
+            self._writer = pq.ParquetWriter(self._sink, table.schema)
+        else:
+            table = self._conform(records)
+        self._writer.write_table(table)
+        return self._sink.drain()
+
+    @staticmethod
+    def _table(records: List[Dict[str, Any]], columns: List[str]):
+        import pyarrow as pa
+
+        return pa.table(
+            {
+                name: pa.array([record.get(name) for record in records])
+                for name in columns
+            }
+        )
+
+    def _conform(self, records: List[Dict[str, Any]]):
+        """Infer a later chunk's table and cast it to the file schema"""
+        import pyarrow as pa
+
+        schema = self._writer.schema
+        extra = set().union(*records) - set(schema.names)
+        if extra:
+            raise ValueError(f"Parquet export chunk has new columns: {sorted(extra)}")
+
+        table = self._table(records, schema.names)
+        for field, inferred in zip(schema, table.schema.types):
+            numeric = all(
+                pa.types.is_integer(t) or pa.types.is_floating(t)
+                for t in (field.type, inferred)
+            )
+            if (
+                inferred != field.type
+                and not numeric
+                and not pa.types.is_null(inferred)
+            ):
+                raise ValueError(
+                    f"Parquet export column '{field.name}' changed type "
+                    f"from {field.type} to {inferred}"
+                )
+        try:
+            return table.cast(schema, safe=True)
+        except pa.ArrowInvalid as e:
+            raise ValueError(f"Parquet export chunk doesn't fit the schema: {e}")
+
+    def close(self) -> bytes:
+        if self._writer is None:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            # Still produce a valid (empty) Parquet file
+            self._writer = pq.ParquetWriter(self._sink, pa.schema([]))
+        self._writer.close()
+        return self._sink.drain()
+
+
+STREAMING_ENCODERS = {
+    "csv": _CsvEncoder,
+    "jsonl": _JsonlEncoder,
+    "parquet": _ParquetEncoder,
+}
+
+# Progress of recent streaming exports by export ID (oldest dropped first)
+export_progress: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+
+class FragmentCache:
+    """
+    Report fragments (fetched data plus summary) by data source, metrics,
+    date range and filters
+
+    Shared by all ReportGenerator instances so reports over the same data
+    reuse each other's work. Entries expire after ``ttl``; concurrent
+    requests for a fragment that is still rendering await the same render.
+    """
+
+    def __init__(
+        self, ttl: timedelta = FRAGMENT_TTL, max_entries: int = FRAGMENT_CACHE_SIZE
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]" = (
+            OrderedDict()
+        )
+        self._pending: Dict[Tuple, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(
+        data_sources: List[Any],
+        metrics: List[str],
+        date_range: Optional[Dict[str, str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Tuple:
+        """Cache key of a fragment"""
+        return (
+            tuple(sorted(str(source) for source in data_sources)),
+            tuple(sorted(metrics)),
+            json.dumps(date_range or {}, sort_keys=True),
+            json.dumps(filters or {}, sort_keys=True, default=str),
+        )
+
+    async def get_or_render(
+        self, key: Tuple, render: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """
+        Return a cached fragment, rendering it on a miss
+
+        Fragments are shared between reports and must not be modified.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        task = asyncio.ensure_future(render())
+        self._pending[key] = task
+
+        def store(task: asyncio.Future):
+            self._pending.pop(key, None)
+            if not task.cancelled() and task.exception() is None:
+                self._store(key, task.result())
+
+        task.add_done_callback(store)
+        return await asyncio.shield(task)
+
+    def invalidate(self, data_source: Optional[Any] = None) -> int:
+        """
+        Drop cached fragments
+
+        Args:
+            data_source: Only drop fragments reading this source (all if None)
+
+        Returns:
+            Number of fragments dropped
+        """
+        keys = [
+            key
+            for key in self._entries
+            if data_source is None or str(data_source) in key[0]
+        ]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache occupancy and hit/miss counters"""
+        return {
+            "fragments": len(self._entries),
+            "rendering": len(self._pending),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _store(self, key: Tuple, fragment: Dict[str, Any]):
+        self._entries[key] = (time.monotonic() + self.ttl.total_seconds(), fragment)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+# Fragments shared by all report generators
+fragment_cache = FragmentCache()
+
+
 class ReportGenerator:
     """Generate and deliver analytics reports"""
 
@@ -114,13 +431,13 @@ class ReportGenerator:
             # Get report definition
             report = await self._get_report(report_id)
 
-            # Fetch data
-            data = await self._fetch_report_data(
+            # Fetch data, one cached fragment per data source
+            data, summary = await self._fetch_fragments(
                 report["data_sources"], report["metrics"], date_range, filters
             )
 
             # Generate report content
-            content = await self._generate_content(report, data, date_range)
+            content = await self._generate_content(report, data, summary, date_range)
 
             # Format report
             formatted_report = await self._format_report(
@@ -188,6 +505,119 @@ class ReportGenerator:
 
         return schedule
 
+    async def run_scheduled_report(self, schedule_id: int) -> Dict[str, Any]:
+        """
+        Generate and deliver a scheduled report, then schedule its next run
+
+        The next run is scheduled whether or not this one succeeded, so a
+        failing report is retried at its next period rather than every poll.
+
+        Args:
+            schedule_id: Schedule ID
+
+        Returns:
+            Delivery result
+        """
+
+        schedule = self.scheduled_reports.get(schedule_id)
+        if not schedule:
+            return {"success": False, "error": f"Schedule {schedule_id} not found"}
+
+        try:
+            result = await self.generate_report(
+                schedule["report_id"],
+                self._schedule_date_range(schedule),
+                schedule["filters"],
+            )
+            if result["success"]:
+                result = await self.deliver_report(
+                    result,
+                    DeliveryMethod(schedule["delivery_method"]),
+                    schedule["delivery_config"],
+                )
+        except Exception as e:
+            logger.exception(f"Scheduled report {schedule_id} failed")
+            result = {"success": False, "error": str(e)}
+
+        schedule["last_run"] = datetime.utcnow().isoformat()
+        schedule["last_error"] = None if result.get("success") else result.get("error")
+        schedule["run_count"] += 1
+        schedule["next_run"] = self._calculate_next_run(
+            ReportFrequency(schedule["frequency"])
+        )
+
+        return result
+
+    async def prerender_due_reports(
+        self, now: Optional[datetime] = None, lead: timedelta = PRERENDER_LEAD
+    ) -> List[int]:
+        """
+        Warm the fragment cache for scheduled reports that run soon
+
+        Each active schedule whose next run is within ``lead`` is rendered
+        once per run, so the run itself only formats cached fragments.
+
+        Args:
+            now: Current time (UTC now by default)
+            lead: How long before the next run to pre-render
+
+        Returns:
+            IDs of the schedules that were pre-rendered
+        """
+
+        now = now or datetime.utcnow()
+        due = [
+            schedule
+            for schedule in self.scheduled_reports.values()
+            if schedule["status"] == "active"
+            and schedule.get("prerendered_for") != schedule["next_run"]
+            and now >= datetime.fromisoformat(schedule["next_run"]) - lead
+        ]
+
+        async def prerender(schedule: Dict[str, Any]):
+            report = await self._get_report(schedule["report_id"])
+            await self._fetch_fragments(
+                report["data_sources"],
+                report["metrics"],
+                self._schedule_date_range(schedule),
+                schedule["filters"],
+            )
+            schedule["prerendered_for"] = schedule["next_run"]
+
+        await asyncio.gather(*(prerender(schedule) for schedule in due))
+
+        return [schedule["id"] for schedule in due]
+
+    async def run_scheduler(self, poll_seconds: float = 60):
+        """
+        Pre-render and run scheduled reports as they come due
+
+        Due reports run concurrently, at most MAX_CONCURRENT_SCHEDULED_RUNS
+        at a time across all generators; one failing report doesn't stop
+        the others or the loop.
+        """
+
+        async def run(schedule_id: int):
+            async with _shared_semaphore("scheduled", MAX_CONCURRENT_SCHEDULED_RUNS):
+                await self.run_scheduled_report(schedule_id)
+
+        while True:
+            try:
+                await self.prerender_due_reports()
+            except Exception:
+                logger.exception("Pre-rendering scheduled reports failed")
+
+            now = datetime.utcnow()
+            due = [
+                schedule["id"]
+                for schedule in list(self.scheduled_reports.values())
+                if schedule["status"] == "active"
+                and datetime.fromisoformat(schedule["next_run"]) <= now
+            ]
+            await asyncio.gather(*(run(schedule_id) for schedule_id in due))
+
+            await asyncio.sleep(poll_seconds)
+
     async def deliver_report(
         self,
         report_data: Dict[str, Any],
@@ -246,17 +676,19 @@ class ReportGenerator:
         # Get dashboard configuration
         dashboard = await self._get_dashboard(dashboard_id)
 
-        # Generate report for each widget
-        widget_reports = []
-        for widget in dashboard.get("widgets", []):
-            widget_data = await self._generate_widget_report(widget)
-            widget_reports.append(widget_data)
+        # Generate report for each widget concurrently
+        widget_reports = await asyncio.gather(
+            *(
+                self._generate_widget_report(widget)
+                for widget in dashboard.get("widgets", [])
+            )
+        )
 
         # Combine into single report
         report_content = {
             "dashboard_name": dashboard["name"],
             "generated_at": datetime.utcnow().isoformat(),
-            "widgets": widget_reports,
+            "widgets": list(widget_reports),
         }
 
         # Format report
@@ -274,6 +706,8 @@ class ReportGenerator:
         title: str,
         sections: List[Dict[str, Any]],
         format: ReportFormat = ReportFormat.PDF,
+        data_sources: Optional[List[int]] = None,
+        date_range: Optional[Dict[str, str]] = None,
     ) -> Dict[str, Any]:
         """
         Create custom report with multiple sections
@@ -282,22 +716,27 @@ class ReportGenerator:
             title: Report title
             sections: List of report sections
             format: Output format
+            data_sources: Data sources for sections that don't name their own
+            date_range: Optional date range
 
         Returns:
             Generated custom report
         """
 
+        # Generate sections concurrently
+        section_reports = await asyncio.gather(
+            *(
+                self._generate_section(section, data_sources or [], date_range)
+                for section in sections
+            )
+        )
+
         report_content = {
             "title": title,
             "generated_at": datetime.utcnow().isoformat(),
-            "sections": [],
+            "sections": list(section_reports),
         }
 
-        # Generate each section
-        for section in sections:
-            section_data = await self._generate_section(section)
-            report_content["sections"].append(section_data)
-
         # Format report
         formatted = await self._format_report(format.value, report_content, "custom")
 
@@ -353,6 +792,140 @@ class ReportGenerator:
             "data": output,
         }
 
+    async def export_stream(
+        self,
+        data_source_id: int,
+        metrics: List[str],
+        format: ReportFormat,
+        date_range: Optional[Dict[str, str]] = None,
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+        export_id: Optional[str] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Export raw data incrementally
+
+        Source data is pulled ``chunk_size`` records at a time and each chunk
+        is encoded and yielded before the next is fetched, so memory stays
+        bounded by one chunk regardless of the export size. Progress is
+        published in ``export_progress`` under ``export_id``.
+
+        Args:
+            data_source_id: Data source ID
+            metrics: Metrics to export
+            format: Export format (csv, jsonl or parquet)
+            date_range: Optional date range
+            chunk_size: Records fetched and encoded per chunk
+            export_id: Progress key (generated if omitted)
+
+        Yields:
+            Encoded bytes of the export file
+        """
+
+        encoder = self._export_encoder(format)
+        progress = self._track_export(export_id or self.new_export_id(), format)
+
+        try:
+            async for records in self._iter_report_data(
+                [data_source_id], metrics, date_range, chunk_size=chunk_size
+            ):
+                data = encoder.encode(records)
+                progress["records_exported"] += len(records)
+                progress["bytes_exported"] += len(data)
+                progress["chunks"] += 1
+                if data:
+                    yield data
+
+            data = encoder.close()
+            progress["bytes_exported"] += len(data)
+            if data:
+                yield data
+            progress["status"] = "completed"
+        except Exception as e:
+            progress["status"] = "failed"
+            progress["error"] = str(e)
+            raise
+        finally:
+            if progress["status"] == "running":
+                progress["status"] = "cancelled"
+            progress["finished_at"] = datetime.utcnow().isoformat()
+
+    async def export_to_file(
+        self,
+        data_source_id: int,
+        metrics: List[str],
+        format: ReportFormat,
+        path: str,
+        date_range: Optional[Dict[str, str]] = None,
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+        export_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Export raw data incrementally to a local file
+
+        Chunks are written to ``<path>.part`` as they are encoded and the
+        file is renamed to ``path`` once the export completes.
+
+        Args:
+            data_source_id: Data source ID
+            metrics: Metrics to export
+            format: Export format (csv, jsonl or parquet)
+            path: Destination file
+            date_range: Optional date range
+            chunk_size: Records fetched and encoded per chunk
+            export_id: Progress key (generated if omitted)
+
+        Returns:
+            Export result with record count and file size
+        """
+
+        export_id = export_id or self.new_export_id()
+        partial_path = f"{path}.part"
+
+        try:
+            with open(partial_path, "wb") as f:
+                async for data in self.export_stream(
+                    data_source_id,
+                    metrics,
+                    format,
+                    date_range,
+                    chunk_size=chunk_size,
+                    export_id=export_id,
+                ):
+                    f.write(data)
+            os.replace(partial_path, path)
+        except Exception as e:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            return {"success": False, "export_id": export_id, "error": str(e)}
+
+        progress = export_progress.get(export_id, {})
+        return {
+            "success": True,
+            "export_id": export_id,
+            "format": format.value,
+            "records": progress.get("records_exported", 0),
+            "size_bytes": os.path.getsize(path),
+            "path": path,
+        }
+
+    @staticmethod
+    def new_export_id() -> str:
+        """Generate an ID to follow a streaming export's progress"""
+        return uuid.uuid4().hex
+
+    @staticmethod
+    def get_export_progress(export_id: str) -> Optional[Dict[str, Any]]:
+        """Progress of a streaming export, if it is still tracked"""
+        return export_progress.get(export_id)
+
+    @staticmethod
+    def export_content_type(format: ReportFormat) -> str:
+        """Media type of a streaming export"""
+        encoder = STREAMING_ENCODERS.get(format.value)
+        if encoder is None:
+            raise ValueError(f"Streaming export does not support {format.value}")
+        return encoder.content_type
+
     # Report Templates
 
     async def create_executive_summary(
@@ -371,7 +944,7 @@ class ReportGenerator:
         ]
 
         return await self.create_custom_report(
-            "Executive Summary", sections, ReportFormat.PDF
+            "Executive Summary", sections, ReportFormat.PDF, data_sources, date_range
         )
 
     async def create_performance_report(
@@ -394,7 +967,7 @@ class ReportGenerator:
         ]
 
         return await self.create_custom_report(
-            "Performance Report", sections, ReportFormat.PDF
+            "Performance Report", sections, ReportFormat.PDF, data_sources, date_range
         )
 
     # Private helper methods
@@ -419,25 +992,115 @@ class ReportGenerator:
         filters: Optional[Dict[str, Any]] = None,
     ) -> List[Dict[str, Any]]:
         """Fetch data for report"""
-        # In production, fetch from actual data sources
-        return []
+        data = []
+        async for records in self._iter_report_data(
+            data_sources, metrics, date_range, filters
+        ):
+            data.extend(records)
+        return data
+
+    async def _iter_report_data(
+        self,
+        data_sources: List[int],
+        metrics: List[str],
+        date_range: Optional[Dict[str, str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Fetch data for report in chunks of at most ``chunk_size`` records"""
+        # In production, page through the actual data sources
+        records: List[Dict[str, Any]] = []
+        for start in range(0, len(records), chunk_size):
+            yield records[start : start + chunk_size]
+
+    async def _get_fragment(
+        self,
+        data_source: Any,
+        metrics: List[str],
+        date_range: Optional[Dict[str, str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Data and summary of one source, from the fragment cache if possible"""
+
+        async def render() -> Dict[str, Any]:
+            async with _shared_semaphore("render", MAX_CONCURRENT_FRAGMENTS):
+                data = await self._fetch_report_data(
+                    [data_source], metrics, date_range, filters
+                )
+                summary = await asyncio.to_thread(self._summarize, data, metrics)
+            return {"data": data, "summary": summary}
+
+        return await fragment_cache.get_or_render(
+            fragment_cache.key([data_source], metrics, date_range, filters), render
+        )
+
+    async def _fetch_fragments(
+        self,
+        data_sources: List[Any],
+        metrics: List[str],
+        date_range: Optional[Dict[str, str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Fetch the fragments of several sources concurrently and combine them"""
+
+        fragments = await asyncio.gather(
+            *(
+                self._get_fragment(source, metrics, date_range, filters)
+                for source in data_sources
+            )
+        )
+
+        if len(fragments) == 1:
+            return fragments[0]["data"], fragments[0]["summary"]
+
+        data = [record for fragment in fragments for record in fragment["data"]]
+        summary = await asyncio.to_thread(self._summarize, data, metrics)
+        return data, summary
+
+    def _summarize(
+        self, data: List[Dict[str, Any]], metrics: List[str]
+    ) -> Dict[str, Any]:
+        """Summary statistics of raw records"""
+        df = pd.DataFrame(data) if data else pd.DataFrame()
+        return self._generate_summary(df, metrics)
+
+    def _export_encoder(self, format: ReportFormat):
+        """Incremental encoder for a streaming export format"""
+        self.export_content_type(format)
+        return STREAMING_ENCODERS[format.value]()
+
+    def _track_export(self, export_id: str, format: ReportFormat) -> Dict[str, Any]:
+        """Register a streaming export in ``export_progress``"""
+        progress = {
+            "export_id": export_id,
+            "format": format.value,
+            "status": "running",
+            "records_exported": 0,
+            "bytes_exported": 0,
+            "chunks": 0,
+            "started_at": datetime.utcnow().isoformat(),
+            "finished_at": None,
+        }
+        export_progress[export_id] = progress
+        while len(export_progress) > MAX_TRACKED_EXPORTS:
+            export_progress.popitem(last=False)
+        return progress
 
     async def _generate_content(
         self,
         report: Dict[str, Any],
         data: List[Dict[str, Any]],
+        summary: Dict[str, Any],
         date_range: Optional[Dict[str, str]],
     ) -> Dict[str, Any]:
         """Generate report content"""
 
-        df = pd.DataFrame(data) if data else pd.DataFrame()
-
         content = {
             "title": report["name"],
             "description": report.get("description", ""),
             "generated_at": datetime.utcnow().isoformat(),
             "date_range": date_range,
-            "summary": self._generate_summary(df, report["metrics"]),
+            "summary": summary,
             "data": data,
         }
 
@@ -547,28 +1210,70 @@ class ReportGenerator:
 
     async def _generate_widget_report(self, widget: Dict[str, Any]) -> Dict[str, Any]:
         """Generate report for widget"""
-        return {"title": widget.get("title"), "type": widget.get("type"), "data": []}
+        config = widget.get("config", {})
+        metrics = config.get("metrics") or (
+            [config["metric"]] if config.get("metric") else []
+        )
+
+        data: List[Dict[str, Any]] = []
+        summary: Dict[str, Any] = {}
+        if widget.get("data_source") is not None and metrics:
+            data, summary = await self._fetch_fragments(
+                [widget["data_source"]], metrics, config.get("date_range")
+            )
+
+        return {
+            "title": widget.get("title"),
+            "type": widget.get("type"),
+            "data": data,
+            "summary": summary,
+        }
 
-    async def _generate_section(self, section: Dict[str, Any]) -> Dict[str, Any]:
+    async def _generate_section(
+        self,
+        section: Dict[str, Any],
+        data_sources: List[int],
+        date_range: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
         """Generate report section"""
+        content: Dict[str, Any] = {}
+        sources = section.get("data_sources", data_sources)
+        if sources and section.get("metrics"):
+            _, summary = await self._fetch_fragments(
+                sources, section["metrics"], date_range
+            )
+            content["summary"] = summary
+
         return {
             "title": section.get("title"),
             "type": section.get("type"),
-            "content": {},
+            "content": content,
         }
 
     def _calculate_next_run(self, frequency: ReportFrequency) -> str:
         """Calculate next run time"""
+        return (datetime.utcnow() + self._frequency_delta(frequency)).isoformat()
+
+    def _frequency_delta(self, frequency: ReportFrequency) -> timedelta:
+        """Time between runs of a schedule"""
         if frequency == ReportFrequency.DAILY:
-            delta = timedelta(days=1)
+            return timedelta(days=1)
         elif frequency == ReportFrequency.WEEKLY:
-            delta = timedelta(weeks=1)
+            return timedelta(weeks=1)
         elif frequency == ReportFrequency.MONTHLY:
-            delta = timedelta(days=30)
+            return timedelta(days=30)
         else:
-            delta = timedelta(days=90)
+            return timedelta(days=90)
 
-        return (datetime.utcnow() + delta).isoformat()
+    def _schedule_date_range(self, schedule: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Date range a scheduled run covers: the period ending at its next run
+
+        Pre-rendering and the run use the same range, so they share fragments.
+        """
+        end = datetime.fromisoformat(schedule["next_run"])
+        start = end - self._frequency_delta(ReportFrequency(schedule["frequency"]))
+        return {"start": start.isoformat(), "end": end.isoformat()}
 
     def _generate_id(self) -> int:
         """Generate unique ID"""
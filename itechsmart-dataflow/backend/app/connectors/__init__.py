@@ -13,6 +13,7 @@ from .base import (
     list_connectors,
     CONNECTOR_REGISTRY,
 )
+from .local import CSVConnector, JSONLConnector, SQLiteConnector
 
 __all__ = [
     "BaseConnector",
@@ -21,6 +22,9 @@ __all__ = [
     "PostgreSQLConnector",
     "MySQLConnector",
     "MongoDBConnector",
+    "CSVConnector",
+    "JSONLConnector",
+    "SQLiteConnector",
     "get_connector",
     "list_connectors",
     "CONNECTOR_REGISTRY",
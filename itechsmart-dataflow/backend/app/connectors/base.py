@@ -79,6 +79,37 @@ class SourceConnector(BaseConnector):
         """Get total record count"""
         pass
 
+    async def get_partitions(self) -> List[Any]:
+        """Independently readable partitions (one by default)"""
+        return [None]
+
+    async def read_partition(
+        self, partition: Any, batch_size: int = 1000
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Read one partition in batches (the whole source by default)"""
+        async for batch in self.read(batch_size=batch_size):
+            yield batch
+
+    async def read_incremental(
+        self, cursor_column: str, since: Any = None, batch_size: int = 1000
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Read records with ``cursor_column >= since`` in cursor order
+
+        The default implementation scans the whole source and sorts the
+        matching records in memory; connectors that can push the predicate
+        and ordering down to the source should override it.
+        """
+        matched = []
+        async for batch in self.read(batch_size=batch_size):
+            for record in batch:
+                cursor = record.get(cursor_column)
+                if cursor is not None and (since is None or cursor >= since):
+                    matched.append(record)
+        matched.sort(key=lambda record: record[cursor_column])
+        for start in range(0, len(matched), batch_size):
+            yield matched[start : start + batch_size]
+
 
 class DestinationConnector(BaseConnector):
     """Base destination connector"""
@@ -0,0 +1,504 @@
+"""
+Local file and SQLite connectors
+
+Used for development, tests and small deployments. Reads are partitioned
+(one partition per file, or per key range for SQLite) so the execution
+engine can read them in parallel; blocking I/O runs in worker threads.
+"""
+
+from abc import abstractmethod
+from typing import Dict, Any, List, Optional, Iterator
+import asyncio
+import csv
+import glob
+import itertools
+import json
+import os
+import sqlite3
+
+from .base import (
+    SourceConnector,
+    DestinationConnector,
+    ConnectorMetadata,
+    CONNECTOR_REGISTRY,
+)
+
+
+async def _iterate_in_thread(iterator: Iterator[Any]):
+    """Drive a blocking iterator from a worker thread, one item at a time"""
+    sentinel = object()
+    while True:
+        item = await asyncio.to_thread(next, iterator, sentinel)
+        if item is sentinel:
+            return
+        yield item
+
+
+def _chunked(rows: Iterator[Any], batch_size: int) -> Iterator[List[Any]]:
+    """Group an iterator into lists of at most batch_size items"""
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _coerce(value: str) -> Any:
+    """Best-effort conversion of a CSV cell to int, float or None"""
+    if value == "":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def _quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+# SQLite partition holding the rows whose partition column is NULL
+_NULL_PARTITION = "null"
+
+
+class _FileConnector(SourceConnector, DestinationConnector):
+    """
+    Shared behaviour for line-oriented local files
+
+    ``path`` may be a glob pattern when reading; each matching file is one
+    partition. Writes append to ``path``.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.path = config.get("path", "")
+
+    def _files(self) -> List[str]:
+        if glob.has_magic(self.path):
+            return sorted(glob.glob(self.path))
+        return [self.path] if os.path.exists(self.path) else []
+
+    @abstractmethod
+    def _read_file(self, path: str, batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+        """Read one file in batches"""
+        pass
+
+    @abstractmethod
+    def _write_records(self, records: List[Dict[str, Any]]) -> int:
+        """Append records to ``path`` and return how many were written"""
+        pass
+
+    async def connect(self) -> bool:
+        return True
+
+    async def disconnect(self) -> bool:
+        return True
+
+    async def test_connection(self) -> Dict[str, Any]:
+        files = self._files()
+        if not files:
+            return {"success": False, "message": f"No files match {self.path}"}
+        return {"success": True, "message": f"Found {len(files)} file(s)"}
+
+    async def get_partitions(self) -> List[Any]:
+        return self._files()
+
+    async def read_partition(
+        self, partition: Any, batch_size: int = 1000
+    ) -> Iterator[List[Dict[str, Any]]]:
+        async for batch in _iterate_in_thread(self._read_file(partition, batch_size)):
+            yield batch
+
+    async def read(self, batch_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        for path in self._files():
+            async for batch in self.read_partition(path, batch_size):
+                yield batch
+
+    async def get_record_count(self) -> int:
+        count = 0
+        async for batch in self.read(batch_size=10000):
+            count += len(batch)
+        return count
+
+    async def write(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        if not records:
+            return {"success": True, "records_written": 0}
+        written = await asyncio.to_thread(self._write_records, records)
+        return {"success": True, "records_written": written}
+
+    async def create_table(self, schema: Dict[str, Any]) -> bool:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        return True
+
+    async def truncate(self) -> bool:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        return True
+
+
+class CSVConnector(_FileConnector):
+    """CSV file connector"""
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.delimiter = config.get("delimiter", ",")
+        self.infer_types = config.get("infer_types", True)
+        self._fieldnames: Optional[List[str]] = None
+
+    def _read_file(self, path: str, batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            rows = csv.DictReader(f, delimiter=self.delimiter)
+            if self.infer_types:
+                rows = ({k: _coerce(v) for k, v in row.items()} for row in rows)
+            yield from _chunked(rows, batch_size)
+
+    def _write_records(self, records: List[Dict[str, Any]]) -> int:
+        exists = os.path.exists(self.path) and os.path.getsize(self.path) > 0
+
+        if self._fieldnames is None:
+            if exists:
+                with open(self.path, "r", newline="", encoding="utf-8") as f:
+                    self._fieldnames = next(csv.reader(f, delimiter=self.delimiter))
+            else:
+                # Column order of first appearance across the first batch
+                self._fieldnames = list(dict.fromkeys(k for r in records for k in r))
+
+        with open(self.path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(
+                f,
+                fieldnames=self._fieldnames,
+                delimiter=self.delimiter,
+                extrasaction="ignore",
+            )
+            if not exists:
+                writer.writeheader()
+            writer.writerows(records)
+        return len(records)
+
+    async def get_schema(self) -> Dict[str, Any]:
+        files = self._files()
+        if not files:
+            return {"path": self.path, "columns": []}
+        with open(files[0], "r", newline="", encoding="utf-8") as f:
+            columns = next(csv.reader(f, delimiter=self.delimiter), [])
+        return {"path": self.path, "files": len(files), "columns": columns}
+
+    async def truncate(self) -> bool:
+        self._fieldnames = None
+        return await super().truncate()
+
+    @classmethod
+    def get_metadata(cls) -> ConnectorMetadata:
+        return ConnectorMetadata(
+            id="csv",
+            name="CSV",
+            type="file",
+            category="both",
+            version="1.0.0",
+            description="Local CSV file connector",
+            capabilities=["read", "write", "schema_discovery", "partitioned_read"],
+        )
+
+
+class JSONLConnector(_FileConnector):
+    """JSON Lines file connector"""
+
+    def _read_file(self, path: str, batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+        with open(path, "r", encoding="utf-8") as f:
+            rows = (json.loads(line) for line in f if line.strip())
+            yield from _chunked(rows, batch_size)
+
+    def _write_records(self, records: List[Dict[str, Any]]) -> int:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(r, default=str) + "\n" for r in records)
+        return len(records)
+
+    async def get_schema(self) -> Dict[str, Any]:
+        columns: List[str] = []
+        for path in self._files()[:1]:
+            for batch in self._read_file(path, 100):
+                columns = list(dict.fromkeys(k for r in batch for k in r))
+                break
+        return {"path": self.path, "columns": columns}
+
+    @classmethod
+    def get_metadata(cls) -> ConnectorMetadata:
+        return ConnectorMetadata(
+            id="jsonl",
+            name="JSON Lines",
+            type="file",
+            category="both",
+            version="1.0.0",
+            description="Local JSON Lines file connector",
+            capabilities=["read", "write", "schema_discovery", "partitioned_read"],
+        )
+
+
+class SQLiteConnector(SourceConnector, DestinationConnector):
+    """
+    SQLite table connector
+
+    Reads are split into ``partitions`` contiguous ranges of
+    ``partition_column`` (rowid by default), plus one partition for NULLs;
+    each partition is read over its own connection. Columns holding text or
+    blobs are read as a single partition. Writes create the table on first
+    use.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.database = config.get("database", ":memory:")
+        self.table = config.get("table", "records")
+        self.partitions = max(1, int(config.get("partitions", 1)))
+        self.partition_column = config.get("partition_column", "rowid")
+        self.connection: Optional[sqlite3.Connection] = None
+        self._columns: Optional[List[str]] = None
+        self._write_lock = asyncio.Lock()
+
+    def _open(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.database, check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    async def connect(self) -> bool:
+        try:
+            if self.connection is None:
+                self.connection = await asyncio.to_thread(self._open)
+            return True
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to connect: {e}")
+            return False
+
+    async def disconnect(self) -> bool:
+        if self.connection is not None:
+            await asyncio.to_thread(self.connection.close)
+            self.connection = None
+        return True
+
+    async def test_connection(self) -> Dict[str, Any]:
+        try:
+            await self.connect()
+            return {
+                "success": True,
+                "message": "Connection successful",
+                "version": f"SQLite {sqlite3.sqlite_version}",
+            }
+        except Exception as e:
+            return {"success": False, "message": str(e)}
+
+    def _query(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        if self.connection is None:
+            self.connection = self._open()
+        return self.connection.execute(sql, params).fetchall()
+
+    def _table_columns(self) -> List[str]:
+        rows = self._query(f"PRAGMA table_info({_quote_identifier(self.table)})")
+        return [row["name"] for row in rows]
+
+    async def get_schema(self) -> Dict[str, Any]:
+        columns = await asyncio.to_thread(self._table_columns)
+        return {"database": self.database, "table": self.table, "columns": columns}
+
+    def _partition_expression(self) -> str:
+        if self.partition_column == "rowid":
+            return "rowid"
+        return _quote_identifier(self.partition_column)
+
+    async def get_partitions(self) -> List[Any]:
+        if self.partitions == 1:
+            return [None]
+
+        column = self._partition_expression()
+        table = _quote_identifier(self.table)
+        sql = (
+            f"SELECT MIN({column}), MAX({column}), COUNT(*) - COUNT({column}) "
+            f"FROM {table}"
+        )
+        low, high, nulls = (await asyncio.to_thread(self._query, sql))[0]
+        partitions: List[Any] = [_NULL_PARTITION] if nulls else []
+        if low is None:
+            return partitions
+
+        if isinstance(low, int) and isinstance(high, int):
+            step = max(1, -(-(high - low + 1) // self.partitions))
+            ranges = [
+                (start, start + step, False) for start in range(low, high + 1, step)
+            ]
+        elif isinstance(low, (int, float)) and isinstance(high, (int, float)):
+            # REAL bounds: equal-width ranges, the last one including high
+            width = (high - low) / self.partitions
+            edges = [low + width * i for i in range(self.partitions)] + [high]
+            ranges = [
+                (start, end, i == self.partitions - 1)
+                for i, (start, end) in enumerate(zip(edges, edges[1:]))
+                if start < end or i == self.partitions - 1
+            ]
+        else:
+            # Text and blob values have no meaningful arithmetic ranges
+            return [None]
+        return ranges + partitions
+
+    def _read_range(
+        self, partition: Any, batch_size: int
+    ) -> Iterator[List[Dict[str, Any]]]:
+        column = self._partition_expression()
+        sql = f"SELECT * FROM {_quote_identifier(self.table)}"
+        params: tuple = ()
+        if partition == _NULL_PARTITION:
+            sql += f" WHERE {column} IS NULL"
+        elif partition is not None:
+            low, high, inclusive = partition
+            upper = "<=" if inclusive else "<"
+            sql += f" WHERE {column} >= ? AND {column} {upper} ?"
+            params = (low, high)
+        sql += f" ORDER BY {column}"
+
+        connection = self._open()
+        try:
+            cursor = connection.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield [dict(row) for row in rows]
+        finally:
+            connection.close()
+
+    async def read_partition(
+        self, partition: Any, batch_size: int = 1000
+    ) -> Iterator[List[Dict[str, Any]]]:
+        async for batch in _iterate_in_thread(self._read_range(partition, batch_size)):
+            yield batch
+
+    async def read(self, batch_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        async for batch in self.read_partition(None, batch_size):
+            yield batch
+
+    def _read_since(
+        self, cursor_column: str, since: Any, batch_size: int
+    ) -> Iterator[List[Dict[str, Any]]]:
+        column = _quote_identifier(cursor_column)
+        table = _quote_identifier(self.table)
+        sql = f"SELECT * FROM {table} WHERE {column} IS NOT NULL"
+        params: tuple = ()
+        if since is not None:
+            sql += f" AND {column} >= ?"
+            params = (since,)
+        sql += f" ORDER BY {column}, rowid"
+
+        connection = self._open()
+        try:
+            cursor = connection.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield [dict(row) for row in rows]
+        finally:
+            connection.close()
+
+    async def read_incremental(
+        self, cursor_column: str, since: Any = None, batch_size: int = 1000
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Read rows at or after ``since``, filtered and ordered in SQLite"""
+        rows = self._read_since(cursor_column, since, batch_size)
+        async for batch in _iterate_in_thread(rows):
+            yield batch
+
+    async def get_record_count(self) -> int:
+        sql = f"SELECT COUNT(*) FROM {_quote_identifier(self.table)}"
+        return (await asyncio.to_thread(self._query, sql))[0][0]
+
+    def _insert(self, records: List[Dict[str, Any]]) -> int:
+        if self._columns is None:
+            self._columns = self._table_columns()
+            if not self._columns:
+                self._create(list(dict.fromkeys(k for r in records for k in r)))
+
+        columns = self._columns
+        sql = "INSERT INTO {} ({}) VALUES ({})".format(
+            _quote_identifier(self.table),
+            ", ".join(_quote_identifier(c) for c in columns),
+            ", ".join("?" for _ in columns),
+        )
+        with self.connection:
+            self.connection.executemany(
+                sql, ([r.get(c) for c in columns] for r in records)
+            )
+        return len(records)
+
+    def _create(self, columns: List[str], types: Optional[Dict[str, str]] = None):
+        types = types or {}
+        definition = ", ".join(
+            f"{_quote_identifier(c)} {types.get(c, '')}".strip() for c in columns
+        )
+        with self.connection:
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {_quote_identifier(self.table)} "
+                f"({definition})"
+            )
+        self._columns = columns
+
+    async def write(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        if not records:
+            return {"success": True, "records_written": 0}
+        await self.connect()
+        async with self._write_lock:
+            written = await asyncio.to_thread(self._insert, records)
+        return {"success": True, "records_written": written}
+
+    async def create_table(self, schema: Dict[str, Any]) -> bool:
+        """Create the table from {"columns": {name: sqlite_type}}"""
+        await self.connect()
+        columns = schema.get("columns", {})
+        if isinstance(columns, dict):
+            await asyncio.to_thread(self._create, list(columns), columns)
+        else:
+            await asyncio.to_thread(self._create, list(columns))
+        return True
+
+    async def truncate(self) -> bool:
+        await self.connect()
+
+        def delete():
+            if self._table_columns():
+                with self.connection:
+                    self.connection.execute(
+                        f"DELETE FROM {_quote_identifier(self.table)}"
+                    )
+
+        await asyncio.to_thread(delete)
+        return True
+
+    @classmethod
+    def get_metadata(cls) -> ConnectorMetadata:
+        return ConnectorMetadata(
+            id="sqlite",
+            name="SQLite",
+            type="database",
+            category="both",
+            version="1.0.0",
+            description="Local SQLite database connector",
+            capabilities=[
+                "read",
+                "write",
+                "schema_discovery",
+                "partitioned_read",
+                "incremental",
+            ],
+        )
+
+
+CONNECTOR_REGISTRY.update(
+    {
+        "csv": CSVConnector,
+        "jsonl": JSONLConnector,
+        "sqlite": SQLiteConnector,
+    }
+)
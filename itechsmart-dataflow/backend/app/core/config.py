@@ -93,6 +93,10 @@ class Settings(BaseSettings):
     PIPELINE_TIMEOUT_SECONDS: int = 3600
     RETRY_ATTEMPTS: int = 3
     RETRY_DELAY_SECONDS: int = 60
+    PIPELINE_BATCH_SIZE: int = 1000
+    PIPELINE_PARALLELISM: int = 4
+    PIPELINE_MAX_IN_FLIGHT_BATCHES: int = 8
+    PIPELINE_CHECKPOINT_DIR: str = "checkpoints"
 
     # Data Quality
     ENABLE_DATA_QUALITY: bool = True
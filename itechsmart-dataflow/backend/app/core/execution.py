@@ -0,0 +1,437 @@
+"""
+iTechSmart DataFlow - Pipeline Execution Engine
+Streams batches from a source connector through transformations and data
+quality rules into a destination connector
+"""
+
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+import asyncio
+import logging
+import time
+
+from .incremental import IncrementalTracker
+from .quality import QualityCheck, QualityMonitor, compile_rule
+from ..transformers import (
+    ColumnBatch,
+    DropNulls,
+    Enrich,
+    Expression,
+    FieldPredicate,
+    Filter,
+    HashAggregate,
+    HashJoin,
+    Map,
+    Operator,
+    Project,
+    parse_condition,
+)
+
+logger = logging.getLogger(__name__)
+
+Record = Dict[str, Any]
+Batch = List[Record]
+
+
+def compile_transformation(
+    transform_type: str, config: Dict[str, Any]
+) -> List[Operator]:
+    """
+    Compile one pipeline transformation into vectorized operators
+
+    Args:
+        transform_type: TransformationType value
+        config: Transformation config
+
+    Returns:
+        Operators to apply in order
+    """
+    if transform_type == "filter":
+        if "condition" in config:
+            return [Filter(parse_condition(config["condition"]))]
+        if "expression" in config:
+            return [Filter(Expression(config["expression"]))]
+        predicate = FieldPredicate(
+            config.get("field"), config.get("operator", "eq"), config.get("value")
+        )
+        return [Filter(predicate)]
+
+    if transform_type == "map":
+        operators: List[Operator] = []
+        if config.get("columns"):
+            operators.append(Map(config["columns"]))
+        if config.get("fields") or config.get("rename"):
+            operators.append(Project(config.get("fields"), config.get("rename")))
+        return operators
+
+    if transform_type == "enrich":
+        return [Enrich(config.get("values", {}))]
+
+    if transform_type == "validate":
+        return [DropNulls(config.get("required", []))]
+
+    if transform_type == "aggregate":
+        return [
+            HashAggregate(config.get("group_by", []), config.get("aggregations", {}))
+        ]
+
+    if transform_type == "join" and "records" in config:
+        return [
+            HashJoin(
+                ColumnBatch.from_records(config["records"]),
+                on=config.get("on"),
+                left_on=config.get("left_on"),
+                right_on=config.get("right_on"),
+                how=config.get("how", "inner"),
+            )
+        ]
+
+    raise ValueError(
+        f"Transformation '{transform_type}' is not supported by streaming execution"
+    )
+
+
+class ExecutionResult:
+    """Counters collected while executing a pipeline"""
+
+    def __init__(self):
+        self.records_extracted = 0
+        self.records_transformed = 0
+        self.records_rejected = 0
+        self.records_loaded = 0
+        self.batches = 0
+        self.partitions = 0
+        self.peak_in_flight = 0
+        self.quality_violations: Dict[str, int] = {}
+        self.quality_samples: Dict[str, List[Record]] = {}
+        self.quality_seconds = 0.0
+        self.records_skipped = 0
+        self.late_records = 0
+        self.watermark: Any = None
+        self.duration_seconds = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "records_extracted": self.records_extracted,
+            "records_transformed": self.records_transformed,
+            "records_rejected": self.records_rejected,
+            "records_loaded": self.records_loaded,
+            "batches": self.batches,
+            "partitions": self.partitions,
+            "peak_in_flight_batches": self.peak_in_flight,
+            "quality_violations": dict(self.quality_violations),
+            "quality_samples": dict(self.quality_samples),
+            "quality_seconds": round(self.quality_seconds, 3),
+            "records_skipped": self.records_skipped,
+            "late_records": self.late_records,
+            "watermark": self.watermark,
+            "duration_seconds": round(self.duration_seconds, 3),
+        }
+
+
+class PipelineExecutor:
+    """
+    Streaming, partitioned pipeline executor
+
+    Up to ``parallelism`` readers pull source partitions and stream batches to
+    ``parallelism`` transform workers, which run transformations and quality
+    rules in worker threads; a single writer loads results in arrival order.
+    At most ``max_in_flight`` batches exist between reading and loading, so a
+    slow destination blocks the readers instead of buffering the source.
+
+    Batches are converted to columnar form once and run through vectorized
+    operators (app.transformers). An aggregate transformation folds batches
+    into partial state and its result is loaded after the source is drained.
+
+    Incremental runs read one cursor-ordered stream from the tracker's
+    watermark and commit each batch to the tracker once it is loaded.
+    """
+
+    def __init__(
+        self, batch_size: int = 1000, parallelism: int = 4, max_in_flight: int = 8
+    ):
+        self.batch_size = max(1, batch_size)
+        self.parallelism = max(1, parallelism)
+        self.max_in_flight = max(1, max_in_flight)
+
+    @staticmethod
+    def _process(
+        batch: Any,
+        operators: List[Operator],
+        monitor: Optional[QualityMonitor],
+    ) -> Tuple[Batch, int]:
+        """
+        Transform a batch and apply quality rules (runs in a worker thread)
+
+        Returns:
+            Tuple of (records to load, records after transformation)
+        """
+        if isinstance(batch, list):
+            if not batch or (not operators and monitor is None):
+                return batch, len(batch)
+            batch = ColumnBatch.from_records(batch)
+
+        for op in operators:
+            batch = op.apply(batch)
+        transformed = batch.num_rows
+
+        if monitor is not None and transformed:
+            keep = monitor.evaluate(batch)
+            if not keep.all():
+                batch = batch.filter(keep)
+
+        return batch.to_records(), transformed
+
+    @staticmethod
+    def _partial(
+        records: Batch,
+        operators: List[Operator],
+        aggregate: HashAggregate,
+        monitor: Optional[QualityMonitor],
+    ) -> Tuple[Optional[ColumnBatch], int, int]:
+        """
+        Pre-aggregation operators, quality rules and partial aggregate of
+        one batch; only records passing the rules are aggregated
+
+        Returns:
+            Tuple of (partial state or None if no record passed, records
+            after transformation, records aggregated)
+        """
+        batch = ColumnBatch.from_records(records)
+        for op in operators:
+            batch = op.apply(batch)
+        transformed = batch.num_rows
+
+        if monitor is not None and transformed:
+            keep = monitor.evaluate(batch)
+            if not keep.all():
+                batch = batch.filter(keep)
+
+        if not batch.num_rows:
+            return None, transformed, 0
+        return aggregate.partial(batch), transformed, batch.num_rows
+
+    async def execute(
+        self,
+        source,
+        destination,
+        transformations: Iterable[Any] = (),
+        quality_rules: Iterable[Any] = (),
+        incremental: Optional[IncrementalTracker] = None,
+    ) -> ExecutionResult:
+        """
+        Run source -> transformations -> quality rules -> destination
+
+        Args:
+            source: SourceConnector to read from
+            destination: DestinationConnector to load into
+            transformations: Objects with ``transform_type`` and ``config``
+            quality_rules: QualityChecks, or objects with ``rule_id``,
+                ``condition`` and ``severity``; records failing a critical
+                rule are rejected
+            incremental: Tracker for an incremental run; rows are read from
+                its watermark and each loaded batch is checkpointed
+
+        Returns:
+            ExecutionResult with record counts and quality violations
+        """
+        operators: List[Operator] = []
+        for t in transformations:
+            operators += compile_transformation(
+                getattr(t.transform_type, "value", t.transform_type), t.config
+            )
+        checks = [
+            (
+                rule
+                if isinstance(rule, QualityCheck)
+                else compile_rule(rule.rule_id, rule.condition, rule.severity)
+            )
+            for rule in quality_rules
+        ]
+        monitor = QualityMonitor(checks) if checks else None
+
+        # An aggregation consumes the whole stream: operators before it run
+        # per batch into partial state, the rest run once on the result
+        aggregate: Optional[HashAggregate] = None
+        post: List[Operator] = []
+        for index, op in enumerate(operators):
+            if isinstance(op, HashAggregate):
+                aggregate = op
+                operators, post = operators[:index], operators[index + 1 :]
+                break
+
+        if aggregate is not None:
+            aggregate.reset()
+
+        result = ExecutionResult()
+        start = time.perf_counter()
+
+        await source.connect()
+        await destination.connect()
+        try:
+            if incremental is None:
+                partitions = await source.get_partitions()
+            else:
+                # Checkpoints need a single stream in cursor order
+                partitions = [None]
+            result.partitions = len(partitions)
+
+            def open_stream(partition: Any):
+                if incremental is None:
+                    return source.read_partition(partition, self.batch_size)
+                return source.read_incremental(
+                    incremental.cursor_column, incremental.since, self.batch_size
+                )
+
+            pending: asyncio.Queue = asyncio.Queue()
+            for partition in partitions:
+                pending.put_nowait(partition)
+            batches: asyncio.Queue = asyncio.Queue()
+            loads: asyncio.Queue = asyncio.Queue()
+            slots = asyncio.Semaphore(self.max_in_flight)
+            in_flight = 0
+
+            async def read():
+                nonlocal in_flight
+                while not pending.empty():
+                    partition = pending.get_nowait()
+                    stream = open_stream(partition)
+                    try:
+                        while True:
+                            # Backpressure: wait for a free slot before reading
+                            await slots.acquire()
+                            try:
+                                batch = await stream.__anext__()
+                            except StopAsyncIteration:
+                                slots.release()
+                                break
+                            in_flight += 1
+                            result.peak_in_flight = max(
+                                result.peak_in_flight, in_flight
+                            )
+                            seq = None
+                            if incremental is not None:
+                                seq, batch = incremental.admit(batch)
+                            await batches.put((seq, batch))
+                    finally:
+                        await stream.aclose()
+
+            # Sequence numbers of batches folded into the aggregate; they are
+            # committed together with the aggregate's result
+            aggregated: List[int] = []
+
+            async def process(seqs: List[int], batch: Any):
+                batch, transformed = await asyncio.to_thread(
+                    self._process, batch, operators, monitor
+                )
+                result.records_transformed += transformed
+                result.records_rejected += transformed - len(batch)
+                await loads.put((seqs, batch))
+
+            async def transform():
+                while True:
+                    item = await batches.get()
+                    if item is None:
+                        return
+                    seq, batch = item
+                    seqs = [] if seq is None else [seq]
+                    result.records_extracted += len(batch)
+                    if aggregate is None:
+                        await process(seqs, batch)
+                        continue
+
+                    if batch:
+                        partial, transformed, kept = await asyncio.to_thread(
+                            self._partial, batch, operators, aggregate, monitor
+                        )
+                        result.records_transformed += transformed
+                        result.records_rejected += transformed - kept
+                        if partial is not None:
+                            aggregate.add_partial(partial)
+                    aggregated.extend(seqs)
+                    # Nothing to load yet; let the writer free the slot
+                    await loads.put(([], []))
+
+            async def load():
+                nonlocal in_flight
+                while True:
+                    item = await loads.get()
+                    if item is None:
+                        return
+                    seqs, batch = item
+                    if batch:
+                        response = await destination.write(batch)
+                        if not response.get("success", True):
+                            raise RuntimeError(
+                                response.get("error", "Destination write failed")
+                            )
+                        result.records_loaded += response.get("records_written", 0)
+                    if seqs:
+                        await asyncio.to_thread(incremental.commit, seqs)
+                    result.batches += 1
+                    in_flight -= 1
+                    slots.release()
+
+            readers = [
+                asyncio.create_task(read())
+                for _ in range(min(self.parallelism, len(partitions)))
+            ]
+            workers = [
+                asyncio.create_task(transform()) for _ in range(self.parallelism)
+            ]
+            writer = asyncio.create_task(load())
+
+            async def drain():
+                nonlocal in_flight
+                # Close each stage once the one feeding it has finished
+                await asyncio.gather(*readers)
+                for _ in workers:
+                    batches.put_nowait(None)
+                await asyncio.gather(*workers)
+                if aggregate is not None:
+                    await slots.acquire()
+                    in_flight += 1
+                    aggregated_result = await asyncio.to_thread(aggregate.result)
+                    # Quality rules already ran on the records aggregated
+                    records, _ = await asyncio.to_thread(
+                        self._process, aggregated_result, post, None
+                    )
+                    await loads.put((aggregated, records))
+                loads.put_nowait(None)
+                await writer
+
+            tasks = readers + workers + [writer, asyncio.create_task(drain())]
+            try:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+                for task in done:
+                    if not task.cancelled() and task.exception() is not None:
+                        raise task.exception()
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+            if incremental is not None:
+                incremental.finish()
+        finally:
+            await source.disconnect()
+            await destination.disconnect()
+            if monitor is not None:
+                report = monitor.report()
+                result.quality_violations = monitor.violations
+                result.quality_samples = {
+                    rule_id: stats["samples"]
+                    for rule_id, stats in report.items()
+                    if stats["samples"]
+                }
+                result.quality_seconds = monitor.seconds
+            if incremental is not None:
+                result.records_skipped = incremental.records_skipped
+                result.late_records = incremental.late_records
+                result.watermark = incremental.watermark
+            result.duration_seconds = time.perf_counter() - start
+
+        logger.info(
+            f"Executed pipeline: {result.records_loaded}/{result.records_extracted} "
+            f"records loaded in {result.batches} batches "
+            f"from {result.partitions} partitions"
+        )
+        return result
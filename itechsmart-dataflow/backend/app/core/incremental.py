@@ -0,0 +1,223 @@
+"""
+iTechSmart DataFlow - Incremental Extraction
+Per-pipeline high-watermarks on a cursor column, persisted as checkpoint files
+after every committed batch so interrupted runs resume where they stopped
+"""
+
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+from datetime import datetime, timedelta
+import hashlib
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+Record = Dict[str, Any]
+
+
+def _encode_cursor(value: Any) -> Any:
+    """JSON-safe cursor value (datetimes are tagged so they round-trip)"""
+    if isinstance(value, datetime):
+        return {"datetime": value.isoformat()}
+    return value
+
+
+def _decode_cursor(value: Any) -> Any:
+    if isinstance(value, dict) and "datetime" in value:
+        return datetime.fromisoformat(value["datetime"])
+    return value
+
+
+def _rewind(cursor: Any, lookback: float) -> Any:
+    """
+    Move a cursor value back by the late-data lookback
+
+    Numeric cursors move by ``lookback`` units; datetimes and ISO-8601
+    strings move by ``lookback`` seconds.
+    """
+    if not lookback or cursor is None:
+        return cursor
+    if isinstance(cursor, datetime):
+        return cursor - timedelta(seconds=lookback)
+    if isinstance(cursor, str):
+        shifted = datetime.fromisoformat(cursor) - timedelta(seconds=lookback)
+        # Keep the source's date/time separator so strings compare correctly
+        separator = cursor[10] if len(cursor) > 10 else "T"
+        return shifted.isoformat(sep=separator)
+    return cursor - lookback
+
+
+class CheckpointStore:
+    """JSON checkpoint files, one per pipeline"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, pipeline_id: str) -> str:
+        return os.path.join(self.directory, f"{pipeline_id}.json")
+
+    def load(self, pipeline_id: str) -> Optional[Dict[str, Any]]:
+        """Last saved checkpoint, or None if the pipeline has none"""
+        try:
+            with open(self._path(pipeline_id), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, pipeline_id: str, state: Dict[str, Any]):
+        """Atomically replace the checkpoint (write, fsync, rename)"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(pipeline_id)
+        temporary = f"{path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, path)
+
+    def delete(self, pipeline_id: str) -> bool:
+        try:
+            os.remove(self._path(pipeline_id))
+            return True
+        except FileNotFoundError:
+            return False
+
+
+class IncrementalTracker:
+    """
+    Watermark and exactly-once bookkeeping for one incremental run
+
+    The source is read in cursor order from ``rewind(watermark, lookback)``.
+    Every batch gets a sequence number when it is read; once the destination
+    has committed it, ``commit`` folds it into the checkpoint. The watermark
+    only advances over the contiguous prefix of committed batches, and the
+    fingerprints of committed rows at or above the rewound watermark are kept,
+    so re-read rows (after a crash, or inside the lookback window) are dropped
+    instead of loaded twice. Rows that show up inside the lookback window with
+    a cursor below the watermark are counted as late.
+
+    Rows are fingerprinted by ``key`` plus cursor, or by their full contents
+    when no key is configured (identical rows are then loaded once).
+    """
+
+    def __init__(
+        self,
+        store: CheckpointStore,
+        pipeline_id: str,
+        cursor_column: str,
+        key: Optional[List[str]] = None,
+        lookback: float = 0,
+    ):
+        self.store = store
+        self.pipeline_id = pipeline_id
+        self.cursor_column = cursor_column
+        self.key = list(key) if key else None
+        self.lookback = lookback
+
+        state = store.load(pipeline_id) or {}
+        if state and state.get("cursor_column") != cursor_column:
+            raise ValueError(
+                f"Checkpoint for pipeline {pipeline_id} tracks "
+                f"'{state.get('cursor_column')}', not '{cursor_column}'"
+            )
+        self.watermark = _decode_cursor(state.get("watermark"))
+        self.seen: Dict[str, Any] = {
+            fingerprint: _decode_cursor(cursor)
+            for fingerprint, cursor in state.get("seen", {}).items()
+        }
+        self.resumed = state.get("status") == "running"
+        self.records_committed = 0
+        self.records_skipped = 0
+        self.late_records = 0
+
+        self._start_watermark = self.watermark
+        self._next_seq = 0
+        self._committed_through = -1
+        self._pending: Dict[int, Tuple[Any, Dict[str, Any]]] = {}
+        self._done: Dict[int, Any] = {}
+
+    @property
+    def since(self) -> Any:
+        """Inclusive lower bound on the cursor for this run's read"""
+        return _rewind(self.watermark, self.lookback)
+
+    def _fingerprint(self, record: Record) -> str:
+        if self.key:
+            payload = [record.get(k) for k in self.key]
+            payload.append(record.get(self.cursor_column))
+        else:
+            payload = record
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+        return hashlib.blake2b(encoded, digest_size=12).hexdigest()
+
+    def admit(self, batch: List[Record]) -> Tuple[int, List[Record]]:
+        """
+        Register a batch read from the source
+
+        Returns:
+            Tuple of (sequence number to commit later, records not yet loaded)
+        """
+        column = self.cursor_column
+        fresh: List[Record] = []
+        fingerprints: Dict[str, Any] = {}
+        last = None
+        for record in batch:
+            cursor = record.get(column)
+            if cursor is None:
+                continue
+            if last is None or cursor > last:
+                last = cursor
+            fingerprint = self._fingerprint(record)
+            if fingerprint in self.seen or fingerprint in fingerprints:
+                self.records_skipped += 1
+                continue
+            if self._start_watermark is not None and cursor < self._start_watermark:
+                self.late_records += 1
+            fingerprints[fingerprint] = cursor
+            fresh.append(record)
+
+        seq = self._next_seq
+        self._next_seq += 1
+        self._pending[seq] = (last, fingerprints)
+        return seq, fresh
+
+    def commit(self, seqs: Iterable[int]):
+        """Record batches as loaded and persist the checkpoint"""
+        for seq in seqs:
+            last, fingerprints = self._pending.pop(seq)
+            self.seen.update(fingerprints)
+            self.records_committed += len(fingerprints)
+            self._done[seq] = last
+
+        advanced = False
+        while self._committed_through + 1 in self._done:
+            self._committed_through += 1
+            last = self._done.pop(self._committed_through)
+            if last is not None and (self.watermark is None or last > self.watermark):
+                self.watermark = last
+                advanced = True
+
+        if advanced:
+            # Later batches are above the watermark, so this keeps their rows
+            floor = self.since
+            self.seen = {f: c for f, c in self.seen.items() if c >= floor}
+
+        self._save("running")
+
+    def finish(self):
+        """Mark the run complete; the next run starts from the watermark"""
+        self._save("completed")
+
+    def _save(self, status: str):
+        self.store.save(
+            self.pipeline_id,
+            {
+                "pipeline_id": self.pipeline_id,
+                "cursor_column": self.cursor_column,
+                "status": status,
+                "watermark": _encode_cursor(self.watermark),
+                "seen": {f: _encode_cursor(c) for f, c in self.seen.items()},
+                "updated_at": datetime.utcnow().isoformat(),
+            },
+        )
@@ -0,0 +1,212 @@
+"""
+iTechSmart DataFlow - Data Quality Checks
+Compiles DataQualityRule conditions into vectorized checks over column batches
+and accumulates violation counts and sample rows while a pipeline streams
+"""
+
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+import re
+import threading
+import time
+
+import numpy as np
+
+from ..transformers import Column, ColumnBatch, parse_condition
+
+_UNIQUE = re.compile(r"^\s*unique\s*\(\s*(\w+(?:\s*,\s*\w+)*)\s*\)\s*$", re.IGNORECASE)
+_REFERENCES = re.compile(r"^\s*(\w+)\s+references\s+([\w-]+)\.(\w+)\s*$", re.IGNORECASE)
+
+
+class UniqueCheck:
+    """
+    Key columns never repeat across the whole stream
+
+    Keys go into a hash set shared by all batches; a batch without
+    duplicates costs two set operations. The first occurrence of a key
+    passes and later ones fail. Rows with a null key part are not checked.
+    """
+
+    def __init__(self, keys: List[str]):
+        self.keys = list(keys)
+        self.columns = set(keys)
+        self._seen: set = set()
+        self._lock = threading.Lock()
+
+    def mask(self, batch: ColumnBatch) -> np.ndarray:
+        passed = np.ones(batch.num_rows, dtype=bool)
+        columns = [batch.column(key) for key in self.keys]
+        valid = np.ones(batch.num_rows, dtype=bool)
+        for column in columns:
+            valid &= column.valid
+
+        parts = [column.values.tolist() for column in columns]
+        keys = parts[0] if len(parts) == 1 else list(zip(*parts))
+        rows = None
+        if not valid.all():
+            rows = np.flatnonzero(valid)
+            keys = [keys[row] for row in rows.tolist()]
+
+        with self._lock:
+            distinct = set(keys)
+            if len(distinct) == len(keys) and self._seen.isdisjoint(distinct):
+                self._seen |= distinct
+                return passed
+
+            # Only batches that contain duplicates pay for a per-row pass
+            duplicate = np.zeros(len(keys), dtype=bool)
+            for index, key in enumerate(keys):
+                if key in self._seen:
+                    duplicate[index] = True
+                else:
+                    self._seen.add(key)
+
+        if rows is None:
+            return ~duplicate
+        passed[rows[duplicate]] = False
+        return passed
+
+
+class ReferentialCheck:
+    """
+    Column values exist in a reference set (e.g. another source's keys)
+
+    Numeric columns are matched against the sorted reference keys with
+    ``np.isin``; other values are looked up in a hash set. Nulls fail.
+    """
+
+    def __init__(self, column: str, values: Iterable[Any]):
+        self.column = column
+        self.columns = {column}
+        self._values = {v for v in values if v is not None}
+        reference = Column.from_values(list(self._values))
+        self._sorted = None
+        if reference.values.dtype.kind in "biuf":
+            self._sorted = np.sort(reference.values)
+
+    def mask(self, batch: ColumnBatch) -> np.ndarray:
+        column = batch.column(self.column)
+        values = column.values
+        if self._sorted is not None and values.dtype.kind in "biuf":
+            found = np.isin(values, self._sorted)
+        else:
+            lookup = np.frompyfunc(self._values.__contains__, 1, 1)
+            found = lookup(values).astype(bool)
+        return found & column.valid
+
+
+class QualityCheck:
+    """A compiled rule: predicate plus whether failing rows are rejected"""
+
+    def __init__(self, rule_id: str, predicate: Any, critical: bool = False):
+        self.rule_id = rule_id
+        self.predicate = predicate
+        self.critical = critical
+
+
+def parse_reference(condition: str) -> Optional[Tuple[str, str]]:
+    """``(source, column)`` named by a ``col references source.column`` rule"""
+    match = _REFERENCES.match(condition)
+    if not match:
+        return None
+    return match.group(2), match.group(3)
+
+
+def compile_rule(
+    rule_id: str,
+    condition: str,
+    severity: str,
+    reference: Optional[Iterable[Any]] = None,
+) -> QualityCheck:
+    """
+    Compile a rule condition into a vectorized check
+
+    Besides ``parse_condition`` syntax (not-null, comparisons, ``between``,
+    ``matches``), conditions may be ``unique(col[, col...])`` or
+    ``col references source.column``.
+
+    Args:
+        rule_id: Rule the check reports violations for
+        condition: Rule condition
+        severity: Rows failing a ``critical`` rule are rejected
+        reference: Allowed values for a ``references`` rule
+
+    Returns:
+        QualityCheck for the rule
+    """
+    match = _UNIQUE.match(condition)
+    if match:
+        predicate: Any = UniqueCheck([k.strip() for k in match.group(1).split(",")])
+    elif _REFERENCES.match(condition):
+        if reference is None:
+            raise ValueError(f"Reference values for {condition!r} were not loaded")
+        predicate = ReferentialCheck(_REFERENCES.match(condition).group(1), reference)
+    else:
+        predicate = parse_condition(condition)
+    return QualityCheck(rule_id, predicate, severity == "critical")
+
+
+class QualityMonitor:
+    """
+    Runs a pipeline's checks on every batch and keeps streaming statistics
+
+    ``evaluate`` is called from transform worker threads; per-rule counters
+    and the first ``sample_size`` failing rows are updated under a lock.
+    """
+
+    def __init__(self, checks: List[QualityCheck], sample_size: int = 5):
+        self.checks = checks
+        self.sample_size = sample_size
+        self.seconds = 0.0
+        self._stats: Dict[str, Dict[str, Any]] = {
+            check.rule_id: {"checked": 0, "violations": 0, "samples": []}
+            for check in checks
+        }
+        self._lock = threading.Lock()
+
+    def evaluate(self, batch: ColumnBatch) -> np.ndarray:
+        """
+        Check a batch
+
+        Returns:
+            Mask of rows that pass every critical rule
+        """
+        start = time.perf_counter()
+        keep = np.ones(batch.num_rows, dtype=bool)
+        findings = []
+        for check in self.checks:
+            passed = check.predicate.mask(batch)
+            failed = np.flatnonzero(~passed)
+            samples: List[Dict[str, Any]] = []
+            if len(failed):
+                if check.critical:
+                    keep &= passed
+                wanted = self.sample_size - len(self._stats[check.rule_id]["samples"])
+                if wanted > 0:
+                    samples = batch.take(failed[:wanted]).to_records()
+            findings.append((check.rule_id, len(failed), samples))
+
+        with self._lock:
+            for rule_id, failed_count, samples in findings:
+                stats = self._stats[rule_id]
+                stats["checked"] += batch.num_rows
+                stats["violations"] += failed_count
+                room = self.sample_size - len(stats["samples"])
+                stats["samples"].extend(samples[:room])
+            self.seconds += time.perf_counter() - start
+        return keep
+
+    @property
+    def violations(self) -> Dict[str, int]:
+        """Violation counts of rules that failed at least once"""
+        return {
+            rule_id: stats["violations"]
+            for rule_id, stats in self._stats.items()
+            if stats["violations"]
+        }
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """Per-rule rows checked, violations and sample failing rows"""
+        return {
+            rule_id: {**stats, "samples": list(stats["samples"])}
+            for rule_id, stats in self._stats.items()
+        }
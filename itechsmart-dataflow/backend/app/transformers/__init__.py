@@ -2,4 +2,36 @@
 Data transformers package
 """
 
-__all__ = []
+from .columnar import Column, ColumnBatch
+from .expressions import Expression, FieldPredicate, compile_expression, parse_condition
+from .operators import (
+    Operator,
+    Filter,
+    Project,
+    Map,
+    Enrich,
+    DropNulls,
+    HashAggregate,
+    HashJoin,
+    aggregate,
+    factorize,
+)
+
+__all__ = [
+    "Column",
+    "ColumnBatch",
+    "Expression",
+    "FieldPredicate",
+    "compile_expression",
+    "parse_condition",
+    "Operator",
+    "Filter",
+    "Project",
+    "Map",
+    "Enrich",
+    "DropNulls",
+    "HashAggregate",
+    "HashJoin",
+    "aggregate",
+    "factorize",
+]
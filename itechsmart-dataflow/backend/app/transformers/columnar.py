@@ -0,0 +1,229 @@
+"""
+Columnar record batches
+
+NumPy-backed column storage for vectorized transformations. Each column is
+a values array plus an optional boolean null mask, so numeric columns keep
+their native dtype when they contain nulls. Row dicts are converted once per
+batch at the connector boundary.
+"""
+
+from itertools import repeat
+from typing import Dict, List, Any, Iterable, Optional, Sequence
+import numpy as np
+
+
+def _infer(values: Sequence[Any]) -> Optional[np.ndarray]:
+    """Typed (bool/int/float) array for Python values, None if not numeric"""
+    if not len(values):
+        return None
+    try:
+        typed = np.array(values)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    if typed.ndim == 1 and typed.dtype.kind in "biuf":
+        return typed
+    return None
+
+
+class Column:
+    """One column: values array and null mask (None when there are no nulls)"""
+
+    __slots__ = ("values", "nulls")
+
+    def __init__(self, values: np.ndarray, nulls: Optional[np.ndarray] = None):
+        self.values = values
+        self.nulls = nulls if nulls is not None and nulls.any() else None
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @classmethod
+    def from_values(cls, values: Sequence[Any]) -> "Column":
+        """Build a column from Python values, inferring a numeric dtype"""
+        data = np.empty(len(values), dtype=object)
+        data[:] = values
+        nulls = np.equal(data, None)
+        has_nulls = bool(nulls.any())
+
+        typed = _infer(data[~nulls].tolist() if has_nulls else values)
+        if typed is None:
+            return cls(data, nulls if has_nulls else None)
+        if not has_nulls:
+            return cls(typed)
+
+        filled = np.zeros(len(data), dtype=typed.dtype)
+        filled[~nulls] = typed
+        return cls(filled, nulls)
+
+    @classmethod
+    def nulls_of(cls, length: int) -> "Column":
+        return cls(np.full(length, None, dtype=object), np.ones(length, dtype=bool))
+
+    @property
+    def valid(self) -> np.ndarray:
+        if self.nulls is None:
+            return np.ones(len(self.values), dtype=bool)
+        return ~self.nulls
+
+    def take(self, indices: np.ndarray) -> "Column":
+        """
+        Gather rows by position
+
+        Negative indices produce nulls (used for unmatched outer-join rows).
+        """
+        missing = indices < 0
+        if not missing.any():
+            nulls = self.nulls[indices] if self.nulls is not None else None
+            return Column(self.values[indices], nulls)
+
+        safe = np.where(missing, 0, indices)
+        if len(self.values):
+            values = self.values[safe]
+        else:
+            values = np.full(len(indices), None, dtype=object)
+        nulls = missing if self.nulls is None else (missing | self.nulls[safe])
+        return Column(values, nulls)
+
+    def filter(self, mask: np.ndarray) -> "Column":
+        nulls = self.nulls[mask] if self.nulls is not None else None
+        return Column(self.values[mask], nulls)
+
+    def to_list(self) -> List[Any]:
+        """Python values with None for nulls"""
+        values = self.values.tolist()
+        if self.nulls is not None:
+            for index in np.flatnonzero(self.nulls).tolist():
+                values[index] = None
+        return values
+
+
+class ColumnBatch:
+    """A batch of rows stored column by column"""
+
+    def __init__(self, columns: Dict[str, Column], num_rows: Optional[int] = None):
+        self.columns = columns
+        if num_rows is None:
+            num_rows = len(next(iter(columns.values()))) if columns else 0
+        self.num_rows = num_rows
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self.columns)
+
+    @classmethod
+    def from_records(cls, records: Sequence[Dict[str, Any]]) -> "ColumnBatch":
+        """Convert row dicts; columns appear in order of first occurrence"""
+        names = list(records[0]) if records else []
+        if len(set().union(*records)) != len(names):
+            # Sparse records: fall back to an ordered scan of every key
+            names = list(dict.fromkeys(k for r in records for k in r))
+        return cls(
+            {n: Column.from_values([r.get(n) for r in records]) for n in names},
+            len(records),
+        )
+
+    @classmethod
+    def from_pydict(cls, data: Dict[str, Sequence[Any]]) -> "ColumnBatch":
+        """Build from {name: values}; NumPy arrays are used as-is"""
+        columns = {
+            name: (
+                Column(values)
+                if isinstance(values, np.ndarray)
+                else Column.from_values(values)
+            )
+            for name, values in data.items()
+        }
+        return cls(columns)
+
+    @classmethod
+    def from_arrow(cls, table) -> "ColumnBatch":
+        """Convert a pyarrow Table or RecordBatch (requires pyarrow)"""
+        import pyarrow.types as pa_types
+
+        columns = {}
+        for name, array in zip(table.column_names, table.columns):
+            nulls = array.is_null().to_numpy(zero_copy_only=False)
+            if pa_types.is_boolean(array.type):
+                values = array.fill_null(False).to_numpy(zero_copy_only=False)
+            elif pa_types.is_integer(array.type) or pa_types.is_floating(array.type):
+                values = array.fill_null(0).to_numpy(zero_copy_only=False)
+            elif pa_types.is_temporal(array.type):
+                values = np.empty(len(array), dtype=object)
+                values[:] = array.to_pylist()
+            else:
+                values = array.to_numpy(zero_copy_only=False).astype(object)
+            columns[name] = Column(values, nulls)
+        return cls(columns, table.num_rows)
+
+    def to_arrow(self):
+        """Convert to a pyarrow Table (requires pyarrow)"""
+        import pyarrow as pa
+
+        arrays = {}
+        for name, column in self.columns.items():
+            if column.values.dtype.kind in "biuf":
+                arrays[name] = pa.array(column.values, mask=column.nulls)
+            else:
+                arrays[name] = pa.array(column.to_list())
+        return pa.table(arrays)
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Convert back to row dicts"""
+        names = list(self.columns)
+        if not names:
+            return [{} for _ in range(self.num_rows)]
+        values = [column.to_list() for column in self.columns.values()]
+        return list(map(dict, map(zip, repeat(names), zip(*values))))
+
+    def column(self, name: str) -> Column:
+        """Column by name; missing columns read as all-null"""
+        column = self.columns.get(name)
+        if column is None:
+            return Column.nulls_of(self.num_rows)
+        return column
+
+    def select(self, names: Iterable[str]) -> "ColumnBatch":
+        return ColumnBatch({n: self.column(n) for n in names}, self.num_rows)
+
+    def rename(self, mapping: Dict[str, str]) -> "ColumnBatch":
+        return ColumnBatch(
+            {mapping.get(n, n): c for n, c in self.columns.items()}, self.num_rows
+        )
+
+    def with_columns(self, columns: Dict[str, Column]) -> "ColumnBatch":
+        return ColumnBatch({**self.columns, **columns}, self.num_rows)
+
+    def filter(self, mask: np.ndarray) -> "ColumnBatch":
+        return ColumnBatch(
+            {n: c.filter(mask) for n, c in self.columns.items()}, int(mask.sum())
+        )
+
+    def take(self, indices: np.ndarray) -> "ColumnBatch":
+        return ColumnBatch(
+            {n: c.take(indices) for n, c in self.columns.items()}, len(indices)
+        )
+
+    @classmethod
+    def concat(cls, batches: Sequence["ColumnBatch"]) -> "ColumnBatch":
+        """Stack batches; columns missing from a batch are null there"""
+        batches = [b for b in batches if b.num_rows]
+        if not batches:
+            return cls({}, 0)
+        if len(batches) == 1:
+            return batches[0]
+        names = list(dict.fromkeys(n for b in batches for n in b.columns))
+        columns = {}
+        for name in names:
+            parts = [b.column(name) for b in batches]
+            values = [p.values for p in parts]
+            dtypes = {v.dtype for v in values}
+            if len(dtypes) > 1 and any(d.kind not in "biuf" for d in dtypes):
+                values = [v.astype(object) for v in values]
+            nulls = None
+            if any(p.nulls is not None for p in parts):
+                nulls = np.concatenate([~p.valid for p in parts])
+            columns[name] = Column(np.concatenate(values), nulls)
+        return cls(columns, sum(b.num_rows for b in batches))
@@ -0,0 +1,477 @@
+"""
+Vectorized expressions over column batches
+
+Expressions are written in a small Python-like syntax, e.g.
+``price * quantity`` or ``amount >= 20 and status in ('paid', 'shipped')``,
+parsed once with ``ast`` and evaluated with NumPy over whole columns.
+Comparisons involving nulls are null (SQL semantics); filters drop them.
+"""
+
+from typing import Dict, List, Any, Callable, Set, Union
+import ast
+import json
+import operator
+import re
+import numpy as np
+
+from .columnar import Column, ColumnBatch
+
+Value = Union[Column, Any]
+
+_ARITHMETIC = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.true_divide,
+    ast.FloorDiv: np.floor_divide,
+    ast.Mod: np.mod,
+    ast.Pow: np.power,
+}
+
+_UNARY = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+    ast.Not: operator.not_,
+}
+
+_COMPARISON = {
+    ast.Eq: np.equal,
+    ast.NotEq: np.not_equal,
+    ast.Lt: np.less,
+    ast.LtE: np.less_equal,
+    ast.Gt: np.greater,
+    ast.GtE: np.greater_equal,
+}
+
+
+def _elementwise(func: Callable[[Any], Any]) -> Callable[[np.ndarray], np.ndarray]:
+    ufunc = np.frompyfunc(func, 1, 1)
+    return lambda values: ufunc(values).astype(object)
+
+
+# Single-argument functions callable from expressions
+FUNCTIONS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "abs": np.abs,
+    "sqrt": np.sqrt,
+    "log": np.log,
+    "exp": np.exp,
+    "floor": np.floor,
+    "ceil": np.ceil,
+    "round": np.round,
+    "lower": _elementwise(str.lower),
+    "upper": _elementwise(str.upper),
+    "strip": _elementwise(str.strip),
+    "length": _elementwise(len),
+    "str": _elementwise(str),
+}
+
+
+def _parts(value: Value, length: int):
+    """(values, nulls) for a column or a broadcast scalar"""
+    if isinstance(value, Column):
+        return value.values, value.nulls
+    if value is None:
+        return np.full(length, None, dtype=object), np.ones(length, dtype=bool)
+    return value, None
+
+
+def _combine_nulls(*masks):
+    result = None
+    for mask in masks:
+        if mask is not None:
+            result = mask if result is None else (result | mask)
+    return result
+
+
+def _apply(ufunc, left: Value, right: Value, length: int) -> Column:
+    """Apply a binary ufunc, skipping null slots of object columns"""
+    left_values, left_nulls = _parts(left, length)
+    right_values, right_nulls = _parts(right, length)
+    nulls = _combine_nulls(left_nulls, right_nulls)
+
+    with np.errstate(all="ignore"):
+        if nulls is None or not _is_object(left_values, right_values):
+            return Column(np.asarray(ufunc(left_values, right_values)), nulls)
+
+        # None can't take part in Python-level operations; evaluate valid slots
+        valid = ~nulls
+        result = np.empty(length, dtype=object)
+        result[valid] = ufunc(_subset(left_values, valid), _subset(right_values, valid))
+        return Column(result, nulls)
+
+
+def _is_object(*values) -> bool:
+    return any(isinstance(v, np.ndarray) and v.dtype == object for v in values)
+
+
+def _subset(values, mask: np.ndarray):
+    return values[mask] if isinstance(values, np.ndarray) else values
+
+
+def _truth(value: Value, length: int):
+    """(true, null) masks of a boolean operand"""
+    values, nulls = _parts(value, length)
+    values = np.broadcast_to(np.asarray(values, dtype=bool), (length,))
+    if nulls is None:
+        return values, np.zeros(length, dtype=bool)
+    return values & ~nulls, nulls
+
+
+class Expression:
+    """
+    A compiled expression
+
+    Args:
+        source: Expression text; bare names refer to columns
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self.tree = ast.parse(source.strip(), mode="eval").body
+        self.columns: Set[str] = set()
+        self._validate(self.tree)
+
+    def __repr__(self) -> str:
+        return f"Expression({self.source!r})"
+
+    def _validate(self, node: ast.AST):
+        """Reject anything outside the supported subset"""
+        if isinstance(node, ast.Name):
+            self.columns.add(node.id)
+        elif isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+                raise ValueError(f"Unsupported function in {self.source!r}")
+            if len(node.args) != 1 or node.keywords:
+                raise ValueError(f"Functions take one argument: {self.source!r}")
+            self._validate(node.args[0])
+        elif isinstance(node, ast.BinOp) and type(node.op) in _ARITHMETIC:
+            self._validate(node.left)
+            self._validate(node.right)
+        elif isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY:
+            self._validate(node.operand)
+        elif isinstance(node, ast.BoolOp):
+            for value in node.values:
+                self._validate(value)
+        elif isinstance(node, ast.Compare):
+            for child in [node.left, *node.comparators]:
+                self._validate(child)
+        elif isinstance(node, (ast.Tuple, ast.List)):
+            try:
+                ast.literal_eval(node)
+            except ValueError:
+                raise ValueError(f"Only literal lists are allowed: {self.source!r}")
+        elif not isinstance(node, ast.Constant):
+            raise ValueError(
+                f"Unsupported syntax {type(node).__name__} in {self.source!r}"
+            )
+
+    def evaluate(self, batch: ColumnBatch) -> Value:
+        """Evaluate to a Column (or a scalar for constant expressions)"""
+        return self._eval(self.tree, batch)
+
+    def mask(self, batch: ColumnBatch) -> np.ndarray:
+        """Boolean row mask; null results are False"""
+        true, _ = _truth(self.evaluate(batch), batch.num_rows)
+        return np.array(true, dtype=bool)
+
+    def _eval(self, node: ast.AST, batch: ColumnBatch) -> Value:
+        length = batch.num_rows
+
+        if isinstance(node, ast.Name):
+            return batch.column(node.id)
+
+        if isinstance(node, ast.Constant):
+            return node.value
+
+        if isinstance(node, (ast.Tuple, ast.List)):
+            return list(ast.literal_eval(node))
+
+        if isinstance(node, ast.BinOp):
+            return _apply(
+                _ARITHMETIC[type(node.op)],
+                self._eval(node.left, batch),
+                self._eval(node.right, batch),
+                length,
+            )
+
+        if isinstance(node, ast.UnaryOp):
+            operand = self._eval(node.operand, batch)
+            if not isinstance(operand, Column):
+                # Constant operand, e.g. a negative literal
+                return _UNARY[type(node.op)](operand)
+            if isinstance(node.op, ast.Not):
+                true, nulls = _truth(operand, length)
+                return Column(~true & ~nulls, nulls)
+            values, nulls = _parts(operand, length)
+            if isinstance(node.op, ast.USub):
+                return Column(np.negative(values), nulls)
+            return Column(np.asarray(values), nulls)
+
+        if isinstance(node, ast.BoolOp):
+            return self._boolean(node, batch)
+
+        if isinstance(node, ast.Compare):
+            return self._compare(node, batch)
+
+        if isinstance(node, ast.Call):
+            values, nulls = _parts(self._eval(node.args[0], batch), length)
+            func = FUNCTIONS[node.func.id]
+            if nulls is None or values.dtype != object:
+                with np.errstate(all="ignore"):
+                    return Column(np.asarray(func(values)), nulls)
+            result = np.empty(length, dtype=object)
+            result[~nulls] = func(values[~nulls])
+            return Column(result, nulls)
+
+        raise ValueError(f"Cannot evaluate {type(node).__name__}")
+
+    def _boolean(self, node: ast.BoolOp, batch: ColumnBatch) -> Column:
+        """Three-valued and/or"""
+        length = batch.num_rows
+        operands = [_truth(self._eval(v, batch), length) for v in node.values]
+        is_and = isinstance(node.op, ast.And)
+
+        true, nulls = operands[0]
+        false = ~true & ~nulls
+        for other_true, other_nulls in operands[1:]:
+            other_false = ~other_true & ~other_nulls
+            if is_and:
+                true, false = true & other_true, false | other_false
+            else:
+                true, false = true | other_true, false & other_false
+        nulls = ~true & ~false
+        return Column(true, nulls)
+
+    def _compare(self, node: ast.Compare, batch: ColumnBatch) -> Column:
+        """Comparisons, including chains like ``0 <= x < 10``"""
+        length = batch.num_rows
+        result = None
+        left = self._eval(node.left, batch)
+
+        for op, comparator in zip(node.ops, node.comparators):
+            right = self._eval(comparator, batch)
+
+            if isinstance(op, (ast.Is, ast.IsNot)):
+                if right is not None:
+                    raise ValueError(f"'is' only compares with None: {self.source!r}")
+                _, nulls = _parts(left, length)
+                nulls = np.zeros(length, dtype=bool) if nulls is None else nulls
+                current = Column(nulls if isinstance(op, ast.Is) else ~nulls)
+            elif isinstance(op, (ast.In, ast.NotIn)):
+                values, nulls = _parts(left, length)
+                found = np.isin(values, np.array(right, dtype=object))
+                if isinstance(op, ast.NotIn):
+                    found = ~found
+                current = Column(np.asarray(found, dtype=bool), nulls)
+            else:
+                current = _apply(_COMPARISON[type(op)], left, right, length)
+                if current.values.dtype == object:
+                    current = Column(current.values.astype(bool), current.nulls)
+
+            if result is None:
+                result = current
+            else:
+                true, nulls = _truth(result, length)
+                other_true, other_nulls = _truth(current, length)
+                result = Column(true & other_true, nulls | other_nulls)
+            left = right
+
+        return result
+
+
+def compile_expression(expression: Union[str, Expression]) -> Expression:
+    """Return an Expression, parsing text if needed"""
+    if isinstance(expression, Expression):
+        return expression
+    return Expression(expression)
+
+
+_MATCH_CACHE_SIZE = 100_000
+
+_FIELD_OPERATORS = {
+    "eq": np.equal,
+    "ne": np.not_equal,
+    "gt": np.greater,
+    "gte": np.greater_equal,
+    "lt": np.less,
+    "lte": np.less_equal,
+    "=": np.equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+}
+
+
+class FieldPredicate:
+    """
+    ``field <op> value`` for configs that name fields and operators directly
+
+    Operators: eq/ne/gt/gte/lt/lte (or their symbols), in, contains,
+    between (``value`` is an inclusive ``(low, high)`` pair), matches (regular
+    expression search), is_null and not_null. ``eq``/``ne`` against None test
+    for nulls. Values of incomparable types don't match.
+    """
+
+    def __init__(self, field: str, op: str = "eq", value: Any = None):
+        if op in ("eq", "=", "==") and value is None:
+            op = "is_null"
+        elif op in ("ne", "!=") and value is None:
+            op = "not_null"
+        if op not in _FIELD_OPERATORS and op not in (
+            "in",
+            "contains",
+            "between",
+            "matches",
+            "is_null",
+            "not_null",
+        ):
+            raise ValueError(f"Unsupported operator: {op}")
+
+        self.field = field
+        self.op = op
+        self.value = value
+        self.columns: Set[str] = {field}
+        if op == "between":
+            low, high = value
+            self._bounds = (
+                FieldPredicate(field, "gte", low),
+                FieldPredicate(field, "lte", high),
+            )
+        elif op == "matches":
+            self._pattern = re.compile(value)
+            # Results per distinct value, shared by every batch
+            self._matches: Dict[Any, bool] = {}
+
+    def __repr__(self) -> str:
+        return f"FieldPredicate({self.field!r}, {self.op!r}, {self.value!r})"
+
+    def evaluate(self, batch: ColumnBatch) -> Column:
+        column = batch.column(self.field)
+        if self.op == "is_null":
+            return Column(~column.valid)
+        if self.op == "not_null":
+            return Column(column.valid)
+
+        values, nulls = column.values, column.nulls
+        if self.op == "in":
+            found = np.isin(values, np.array(list(self.value), dtype=object))
+            return Column(np.asarray(found, dtype=bool), nulls)
+        if self.op == "contains":
+            needle = str(self.value)
+            contains = np.frompyfunc(lambda v: needle in str(v), 1, 1)
+            return Column(contains(values).astype(bool), nulls)
+        if self.op == "between":
+            low, high = self._bounds
+            return Column(low.mask(batch) & high.mask(batch), nulls)
+        if self.op == "matches":
+            return Column(self._search(values), nulls)
+
+        try:
+            compare = _FIELD_OPERATORS[self.op]
+            result = _apply(compare, column, self.value, len(values))
+            return Column(result.values.astype(bool), result.nulls)
+        except TypeError:
+            # Mixed types in an object column: compare row by row
+            def safe(v):
+                try:
+                    return bool(compare(v, self.value))
+                except TypeError:
+                    return False
+
+            return Column(np.frompyfunc(safe, 1, 1)(values).astype(bool), nulls)
+
+    def _search(self, values: np.ndarray) -> np.ndarray:
+        """Regex search, evaluated once per distinct value across batches"""
+        search = self._pattern.search
+        found = self._matches
+        if len(found) > _MATCH_CACHE_SIZE:
+            # Replace rather than clear: other worker threads may be reading
+            found = self._matches = {}
+        items = values.tolist()
+        for value in dict.fromkeys(items).keys() - found.keys():
+            found[value] = search(str(value)) is not None
+        return np.fromiter(map(found.__getitem__, items), dtype=bool, count=len(items))
+
+    def mask(self, batch: ColumnBatch) -> np.ndarray:
+        true, _ = _truth(self.evaluate(batch), batch.num_rows)
+        return np.array(true, dtype=bool)
+
+
+class Conjunction:
+    """All of several predicates"""
+
+    def __init__(self, predicates: List[Any]):
+        self.predicates = predicates
+        self.columns: Set[str] = set().union(*(p.columns for p in predicates))
+
+    def evaluate(self, batch: ColumnBatch) -> Column:
+        return Column(self.mask(batch))
+
+    def mask(self, batch: ColumnBatch) -> np.ndarray:
+        result = np.ones(batch.num_rows, dtype=bool)
+        for predicate in self.predicates:
+            result &= predicate.mask(batch)
+        return result
+
+
+_NULL_CHECK = re.compile(r"^\s*(\w+)\s+is\s+(not\s+)?null\s*$", re.IGNORECASE)
+_COMPARISON_CLAUSE = re.compile(r"^\s*(\w+)\s*(>=|<=|!=|==|=|>|<)\s*(.+?)\s*$")
+_BETWEEN = re.compile(r"^\s*(\w+)\s+between\s+(.+?)\s*$", re.IGNORECASE)
+_MATCHES = re.compile(r"^\s*(\w+)\s+matches\s+(.+?)\s*$", re.IGNORECASE)
+_CONJUNCTION = re.compile(r"\s+and\s+", re.IGNORECASE)
+
+
+def _literal(text: str) -> Any:
+    """Parse a condition literal: JSON scalar, quoted string or bare word"""
+    try:
+        return json.loads(text)
+    except ValueError:
+        if len(text) >= 2 and text[0] == text[-1] == "'":
+            return text[1:-1]
+        return text
+
+
+def parse_condition(condition: str):
+    """
+    Compile a rule condition such as ``"amount >= 0 and email is not null"``
+
+    Supports ``is [not] null``, ``=, ==, !=, >, >=, <, <=`` comparisons
+    against JSON literals, ``between <low> and <high>`` and
+    ``matches '<regex>'``, joined with ``and``.
+    """
+    clauses = _CONJUNCTION.split(condition.strip())
+    predicates = []
+    while clauses:
+        clause = clauses.pop(0)
+        match = _BETWEEN.match(clause)
+        if match:
+            if not clauses:
+                raise ValueError(f"Cannot parse condition: {condition!r}")
+            bounds = (_literal(match.group(2)), _literal(clauses.pop(0).strip()))
+            predicates.append(FieldPredicate(match.group(1), "between", bounds))
+            continue
+
+        match = _MATCHES.match(clause)
+        if match:
+            pattern = str(_literal(match.group(2)))
+            predicates.append(FieldPredicate(match.group(1), "matches", pattern))
+            continue
+
+        match = _NULL_CHECK.match(clause)
+        if match:
+            op = "not_null" if match.group(2) else "is_null"
+            predicates.append(FieldPredicate(match.group(1), op))
+            continue
+
+        match = _COMPARISON_CLAUSE.match(clause)
+        if not match:
+            raise ValueError(f"Cannot parse condition: {condition!r}")
+        field, op, literal = match.groups()
+        predicates.append(FieldPredicate(field, op, _literal(literal)))
+
+    if len(predicates) == 1:
+        return predicates[0]
+    return Conjunction(predicates)
@@ -0,0 +1,483 @@
+"""
+Vectorized transformation operators
+
+Each operator maps a ColumnBatch to a new ColumnBatch using whole-column
+NumPy operations. Only user-defined Python callables run per row.
+"""
+
+from typing import Dict, List, Any, Callable, Optional, Sequence, Tuple, Union
+import re
+import numpy as np
+
+from .columnar import Column, ColumnBatch
+from .expressions import Expression, compile_expression
+
+RowFunction = Callable[[Dict[str, Any]], Any]
+
+
+class Operator:
+    """Base class: a batch-to-batch transformation"""
+
+    def apply(self, batch: ColumnBatch) -> ColumnBatch:
+        raise NotImplementedError
+
+    def __call__(self, batch: ColumnBatch) -> ColumnBatch:
+        return self.apply(batch)
+
+
+class Filter(Operator):
+    """
+    Keep rows matching a predicate
+
+    Args:
+        predicate: Expression text, a compiled predicate (anything with a
+            ``mask(batch)`` method) or a row function (per-row fallback)
+    """
+
+    def __init__(self, predicate: Union[str, Expression, RowFunction, Any]):
+        if isinstance(predicate, str):
+            predicate = compile_expression(predicate)
+        self.predicate = predicate
+
+    def apply(self, batch: ColumnBatch) -> ColumnBatch:
+        if hasattr(self.predicate, "mask"):
+            mask = self.predicate.mask(batch)
+        else:
+            mask = np.fromiter(
+                (bool(self.predicate(r)) for r in batch.to_records()),
+                dtype=bool,
+                count=batch.num_rows,
+            )
+        return batch.filter(mask)
+
+
+class Project(Operator):
+    """Select and/or rename columns (no data is copied)"""
+
+    def __init__(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        rename: Optional[Dict[str, str]] = None,
+    ):
+        self.columns = list(columns) if columns else None
+        self.rename = rename or {}
+
+    def apply(self, batch: ColumnBatch) -> ColumnBatch:
+        if self.columns:
+            batch = batch.select(self.columns)
+        if self.rename:
+            batch = batch.rename(self.rename)
+        return batch
+
+
+class Map(Operator):
+    """
+    Compute new columns
+
+    Args:
+        columns: Output name -> expression text, Expression or row function.
+            Expressions are vectorized; row functions are the per-row UDF
+            fallback and receive each record as a dict. Later outputs may
+            refer to earlier ones.
+    """
+
+    def __init__(self, columns: Dict[str, Union[str, Expression, RowFunction]]):
+        self.columns = {
+            name: compile_expression(e) if isinstance(e, (str, Expression)) else e
+            for name, e in columns.items()
+        }
+
+    def apply(self, batch: ColumnBatch) -> ColumnBatch:
+        for name, expression in self.columns.items():
+            if isinstance(expression, Expression):
+                result = expression.evaluate(batch)
+                if not isinstance(result, Column):
+                    result = Column.from_values([result] * batch.num_rows)
+            else:
+                result = Column.from_values([expression(r) for r in batch.to_records()])
+            batch = batch.with_columns({name: result})
+        return batch
+
+
+class Enrich(Operator):
+    """Add constant-valued columns"""
+
+    def __init__(self, values: Dict[str, Any]):
+        self.values = values
+
+    def apply(self, batch: ColumnBatch) -> ColumnBatch:
+        return batch.with_columns(
+            {
+                name: Column.from_values([value] * batch.num_rows)
+                for name, value in self.values.items()
+            }
+        )
+
+
+class DropNulls(Operator):
+    """Drop rows with a null in any of the given columns"""
+
+    def __init__(self, columns: Sequence[str]):
+        self.columns = list(columns)
+
+    def apply(self, batch: ColumnBatch) -> ColumnBatch:
+        mask = np.ones(batch.num_rows, dtype=bool)
+        for name in self.columns:
+            mask &= batch.column(name).valid
+        return batch.filter(mask)
+
+
+def _factorize_column(column: Column) -> Tuple[np.ndarray, int]:
+    """Dense integer codes for a column's values; nulls get their own code"""
+    values = column.values
+    if column.nulls is not None:
+        values = values[~column.nulls]
+
+    if values.dtype != object:
+        uniques, codes = np.unique(values, return_inverse=True)
+        size = len(uniques)
+    else:
+        # Hash Python objects; sorting them would compare in Python
+        index: Dict[Any, int] = {}
+        codes = np.fromiter(
+            (index.setdefault(v, len(index)) for v in values.tolist()),
+            dtype=np.int64,
+            count=len(values),
+        )
+        size = len(index)
+
+    if column.nulls is None:
+        return codes.astype(np.int64, copy=False), size
+
+    full = np.full(len(column), size, dtype=np.int64)
+    full[~column.nulls] = codes
+    return full, size + 1
+
+
+def factorize(columns: Sequence[Column]) -> Tuple[np.ndarray, int]:
+    """
+    Dense group codes over one or more key columns
+
+    Returns:
+        Tuple of (codes, number of groups); codes run from 0 to groups - 1
+    """
+    codes, size = _factorize_column(columns[0])
+    for column in columns[1:]:
+        part, part_size = _factorize_column(column)
+        # Re-densify after each key so combined codes never overflow
+        _, codes = np.unique(codes * part_size + part, return_inverse=True)
+        size = int(codes.max()) + 1 if len(codes) else 0
+    return codes, size
+
+
+_AGGREGATE = re.compile(r"^\s*(\w+)\s*\(\s*(\*|\w+)\s*\)\s*$")
+_REDUCERS = {"sum": np.add, "min": np.minimum, "max": np.maximum}
+AGGREGATE_FUNCTIONS = ("count", "sum", "mean", "avg", "min", "max")
+
+
+def _reduce(
+    batch: ColumnBatch,
+    func: str,
+    source: Optional[str],
+    order: np.ndarray,
+    sorted_codes: np.ndarray,
+    groups: int,
+) -> Column:
+    """Per-group reduction of one column over rows sorted by group code"""
+    if source is None:
+        return Column(np.bincount(sorted_codes, minlength=groups))
+
+    column = batch.column(source)
+    values = column.values[order]
+    codes = sorted_codes
+    if column.nulls is not None:
+        keep = ~column.nulls[order]
+        values, codes = values[keep], codes[keep]
+
+    if func == "count":
+        return Column(np.bincount(codes, minlength=groups))
+    if not len(values):
+        return Column.nulls_of(groups)
+    if func == "sum" and values.dtype == bool:
+        values = values.astype(np.int64)
+
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    reduced = _REDUCERS[func].reduceat(values, starts)
+
+    result = np.zeros(groups, dtype=reduced.dtype)
+    if reduced.dtype == object:
+        result = np.full(groups, None, dtype=object)
+    result[codes[starts]] = reduced
+    nulls = np.ones(groups, dtype=bool)
+    nulls[codes[starts]] = False
+    return Column(result, nulls)
+
+
+def aggregate(
+    batch: ColumnBatch,
+    group_by: Sequence[str],
+    specs: Sequence[Tuple[str, str, Optional[str]]],
+) -> ColumnBatch:
+    """
+    Sort-based grouped reduction
+
+    Args:
+        batch: Input rows
+        group_by: Key columns (empty for a single global group)
+        specs: (output, function, source column or None for count(*)) with
+            function one of count/sum/min/max
+
+    Returns:
+        One row per group: key columns followed by outputs
+    """
+    rows = batch.num_rows
+    if not rows:
+        names = list(group_by) + [out for out, _, _ in specs]
+        return ColumnBatch({n: Column(np.empty(0, dtype=object)) for n in names}, 0)
+
+    if group_by:
+        codes, groups = factorize([batch.column(key) for key in group_by])
+    else:
+        codes, groups = np.zeros(rows, dtype=np.int64), 1
+
+    order = np.argsort(codes, kind="stable")
+    sorted_codes = codes[order]
+    # Codes are dense, so group g starts at the g-th boundary
+    first = order[np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])]
+
+    columns = {key: batch.column(key).take(first) for key in group_by}
+    for out, func, source in specs:
+        columns[out] = _reduce(batch, func, source, order, sorted_codes, groups)
+    return ColumnBatch(columns, groups)
+
+
+class HashAggregate(Operator):
+    """
+    Grouped aggregation that can run over a stream of batches
+
+    ``apply`` aggregates a single batch. For streams, ``update`` (or
+    ``partial`` + ``add_partial``) folds each batch into mergeable partial
+    state (sums, counts, mins, maxes) and ``result`` combines it, so memory
+    is bounded by the number of groups rather than rows.
+
+    Args:
+        group_by: Key column names
+        aggregations: Output name -> ``"func(column)"`` or ``(func, column)``,
+            with func one of count, sum, mean/avg, min, max; ``count(*)``
+            counts rows
+    """
+
+    COMPACT_EVERY = 32
+
+    def __init__(
+        self,
+        group_by: Sequence[str],
+        aggregations: Dict[str, Union[str, Tuple[str, str]]],
+    ):
+        if not aggregations:
+            raise ValueError("At least one aggregation is required")
+
+        self.group_by = list(group_by)
+        self.aggregations: List[Tuple[str, str, Optional[str]]] = []
+        for out, spec in aggregations.items():
+            if isinstance(spec, str):
+                match = _AGGREGATE.match(spec)
+                if not match:
+                    raise ValueError(f"Cannot parse aggregation: {spec!r}")
+                func, source = match.groups()
+            else:
+                func, source = spec
+            func = "mean" if func.lower() == "avg" else func.lower()
+            if func not in AGGREGATE_FUNCTIONS:
+                raise ValueError(f"Unsupported aggregation: {func}")
+            if source == "*":
+                if func != "count":
+                    raise ValueError(f"{func}(*) is not supported")
+                source = None
+            self.aggregations.append((out, func, source))
+
+        # Partial specs over input rows and merge specs over partial rows
+        self._partial_specs = []
+        self._merge_specs = []
+        for out, func, source in self.aggregations:
+            if func == "mean":
+                self._partial_specs += [
+                    (f"{out}__sum", "sum", source),
+                    (f"{out}__count", "count", source),
+                ]
+                self._merge_specs += [
+                    (f"{out}__sum", "sum", f"{out}__sum"),
+                    (f"{out}__count", "sum", f"{out}__count"),
+                ]
+            else:
+                self._partial_specs.append((out, func, source))
+                merge = "sum" if func == "count" else func
+                self._merge_specs.append((out, merge, out))
+
+        self._partials: List[ColumnBatch] = []
+
+    def partial(self, batch: ColumnBatch) -> ColumnBatch:
+        """Mergeable partial aggregate of one batch"""
+        return aggregate(batch, self.group_by, self._partial_specs)
+
+    def combine(self, partials: Sequence[ColumnBatch]) -> ColumnBatch:
+        """Merge partial aggregates into one"""
+        return aggregate(ColumnBatch.concat(partials), self.group_by, self._merge_specs)
+
+    def finalize(self, state: ColumnBatch) -> ColumnBatch:
+        """Turn partial state into output columns"""
+        columns = {key: state.column(key) for key in self.group_by}
+        for out, func, _ in self.aggregations:
+            if func != "mean":
+                columns[out] = state.column(out)
+                continue
+
+            total = state.column(f"{out}__sum")
+            count = state.column(f"{out}__count")
+            nulls = count.values == 0
+            if total.nulls is not None:
+                nulls |= total.nulls
+            with np.errstate(all="ignore"):
+                mean = np.true_divide(
+                    total.values.astype(np.float64), np.maximum(count.values, 1)
+                )
+            columns[out] = Column(mean, nulls)
+        return ColumnBatch(columns, state.num_rows)
+
+    def apply(self, batch: ColumnBatch) -> ColumnBatch:
+        return self.finalize(self.partial(batch))
+
+    def add_partial(self, partial: ColumnBatch):
+        """Fold a partial aggregate into the running state"""
+        self._partials.append(partial)
+        if len(self._partials) >= self.COMPACT_EVERY:
+            self._partials = [self.combine(self._partials)]
+
+    def update(self, batch: ColumnBatch):
+        """Fold a batch into the running state"""
+        self.add_partial(self.partial(batch))
+
+    def result(self) -> ColumnBatch:
+        """Aggregate over every batch seen so far"""
+        return self.finalize(self.combine(self._partials))
+
+    def reset(self):
+        self._partials = []
+
+
+def _key_array(
+    batch: ColumnBatch, keys: Sequence[str]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Join key values (tuples for composite keys) and a valid-row mask"""
+    columns = [batch.column(key) for key in keys]
+    valid = np.ones(batch.num_rows, dtype=bool)
+    for column in columns:
+        valid &= column.valid
+    if len(columns) == 1:
+        return columns[0].values, valid
+    as_tuple = np.frompyfunc(lambda *parts: parts, len(columns), 1)
+    return as_tuple(*(c.values for c in columns)), valid
+
+
+class HashJoin(Operator):
+    """
+    Join each batch (the probe side) against a prebuilt right-hand batch
+
+    Numeric build keys are sorted once and every probe batch is matched with
+    vectorized binary search; other keys (strings, composite keys) go into a
+    hash index. Matches are expanded with NumPy index arithmetic. Null keys
+    never match.
+
+    Args:
+        right: Build-side rows (e.g. a dimension table)
+        on: Key column(s) present on both sides
+        left_on: Probe-side key column(s) when names differ
+        right_on: Build-side key column(s) when names differ
+        how: "inner" or "left"
+        suffix: Appended to build-side column names that collide
+    """
+
+    def __init__(
+        self,
+        right: ColumnBatch,
+        on: Union[str, Sequence[str], None] = None,
+        left_on: Union[str, Sequence[str], None] = None,
+        right_on: Union[str, Sequence[str], None] = None,
+        how: str = "inner",
+        suffix: str = "_right",
+    ):
+        if how not in ("inner", "left"):
+            raise ValueError(f"Unsupported join type: {how}")
+        left_on = left_on or on
+        right_on = right_on or on
+        if not left_on or not right_on:
+            raise ValueError("Join keys are required")
+
+        self.left_on = [left_on] if isinstance(left_on, str) else list(left_on)
+        self.right_on = [right_on] if isinstance(right_on, str) else list(right_on)
+        if len(self.left_on) != len(self.right_on):
+            raise ValueError("left_on and right_on must have the same length")
+
+        self.how = how
+        self.suffix = suffix
+        self.right = right
+        self.payload = [n for n in right.column_names if n not in self.right_on]
+
+        keys, valid = _key_array(right, self.right_on)
+        rows = np.flatnonzero(valid)
+        self._index: Optional[Dict[Any, List[int]]] = None
+        if keys.dtype == object:
+            self._build_hash_index(keys, rows)
+        else:
+            order = np.argsort(keys[rows], kind="stable")
+            self._order = rows[order]
+            self._sorted_keys = keys[self._order]
+
+    def _build_hash_index(self, keys: np.ndarray, rows: np.ndarray):
+        self._index = {}
+        for row, key in zip(rows.tolist(), keys[rows].tolist()):
+            self._index.setdefault(key, []).append(row)
+
+    def _match(self, keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(match counts, right row indices in probe order) for valid keys"""
+        if self._index is None:
+            try:
+                starts = np.searchsorted(self._sorted_keys, keys, side="left")
+                ends = np.searchsorted(self._sorted_keys, keys, side="right")
+                counts = ends - starts
+                offsets = np.arange(counts.sum()) - np.repeat(
+                    np.cumsum(counts) - counts, counts
+                )
+                return counts, self._order[np.repeat(starts, counts) + offsets]
+            except TypeError:
+                right_keys, valid = _key_array(self.right, self.right_on)
+                self._build_hash_index(right_keys, np.flatnonzero(valid))
+
+        matches = [self._index.get(key, ()) for key in keys.tolist()]
+        counts = np.fromiter((len(m) for m in matches), dtype=np.int64, count=len(keys))
+        rows = [row for m in matches for row in m]
+        return counts, np.array(rows, dtype=np.int64)
+
+    def apply(self, batch: ColumnBatch) -> ColumnBatch:
+        keys, valid = _key_array(batch, self.left_on)
+        probe_rows = np.flatnonzero(valid)
+        counts, right_index = self._match(keys[probe_rows])
+        left_index = np.repeat(probe_rows, counts)
+
+        if self.how == "left":
+            matched = np.zeros(batch.num_rows, dtype=bool)
+            matched[probe_rows[counts > 0]] = True
+            unmatched = np.flatnonzero(~matched)
+            left_index = np.concatenate([left_index, unmatched])
+            right_index = np.concatenate(
+                [right_index, np.full(len(unmatched), -1, dtype=np.int64)]
+            )
+            # Restore probe order
+            order = np.argsort(left_index, kind="stable")
+            left_index, right_index = left_index[order], right_index[order]
+
+        columns = {n: c.take(left_index) for n, c in batch.columns.items()}
+        for name in self.payload:
+            out = name if name not in columns else f"{name}{self.suffix}"
+            columns[out] = self.right.column(name).take(right_index)
+        return ColumnBatch(columns, len(left_index))
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Transformation Benchmark
+Compares the vectorized columnar operators with equivalent row-dict loops
+"""
+
+import random
+import sys
+import os
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from app.transformers import (
+    ColumnBatch,
+    Filter,
+    HashAggregate,
+    HashJoin,
+    Map,
+    Project,
+)
+
+
+def make_records(rows: int):
+    """Synthetic order rows with a few nulls"""
+    rng = random.Random(42)
+    regions = ["north", "south", "east", "west"]
+    return [
+        {
+            "order_id": i,
+            "customer_id": rng.randrange(10000),
+            "region": rng.choice(regions),
+            "price": None if i % 97 == 0 else round(rng.uniform(1, 500), 2),
+            "quantity": rng.randint(1, 10),
+        }
+        for i in range(rows)
+    ]
+
+
+def row_filter(records):
+    return [
+        r
+        for r in records
+        if r["price"] is not None and r["price"] > 100 and r["region"] != "west"
+    ]
+
+
+def row_project(records):
+    return [{"id": r["order_id"], "price": r["price"]} for r in records]
+
+
+def row_map(records):
+    return [
+        {
+            **r,
+            "total": r["price"] * r["quantity"] if r["price"] is not None else None,
+        }
+        for r in records
+    ]
+
+
+def row_aggregate(records):
+    groups = {}
+    for r in records:
+        state = groups.setdefault(r["region"], [0, 0.0, 0])
+        state[0] += 1
+        if r["price"] is not None:
+            state[1] += r["price"]
+            state[2] += 1
+    return [
+        {"region": k, "orders": n, "avg_price": s / c if c else None}
+        for k, (n, s, c) in groups.items()
+    ]
+
+
+def row_join(records, customers):
+    index = {}
+    for c in customers:
+        index.setdefault(c["customer_id"], []).append(c)
+    return [
+        {**r, **{k: v for k, v in c.items() if k != "customer_id"}}
+        for r in records
+        for c in index.get(r["customer_id"], ())
+    ]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def run_benchmark(rows: int):
+    print(f"Generating {rows:,} rows...")
+    records = make_records(rows)
+    customers = [
+        {"customer_id": i, "segment": "enterprise" if i % 7 == 0 else "smb"}
+        for i in range(0, 10000, 2)
+    ]
+
+    batch, to_columns = timed(ColumnBatch.from_records, records)
+    customer_batch = ColumnBatch.from_records(customers)
+    _, to_rows = timed(batch.to_records)
+    print(f"Row dicts -> columns {to_columns:>8.3f} s")
+    print(f"Columns -> row dicts {to_rows:>8.3f} s")
+    print("-" * 50)
+
+    cases = [
+        (
+            "filter",
+            lambda: row_filter(records),
+            Filter("price > 100 and region != 'west'"),
+        ),
+        ("project", lambda: row_project(records), Project(["order_id", "price"])),
+        ("map", lambda: row_map(records), Map({"total": "price * quantity"})),
+        (
+            "hash-aggregate",
+            lambda: row_aggregate(records),
+            HashAggregate(
+                ["region"], {"orders": "count(*)", "avg_price": "avg(price)"}
+            ),
+        ),
+        (
+            "hash-join",
+            lambda: row_join(records, customers),
+            HashJoin(customer_batch, on="customer_id"),
+        ),
+    ]
+
+    print(f"{'operator':<16}{'row-dict':>10}{'columnar':>10}{'speedup':>10}")
+    for name, baseline, operator in cases:
+        expected, row_seconds = timed(baseline)
+        result, column_seconds = timed(operator.apply, batch)
+        assert len(result) == len(expected), name
+        print(
+            f"{name:<16}{row_seconds:>9.3f}s{column_seconds:>9.3f}s"
+            f"{row_seconds / max(column_seconds, 1e-9):>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print("📊 iTechSmart DataFlow - Transformation Benchmark")
+    print("=" * 50)
+    print(f"NumPy {np.__version__}")
+    run_benchmark(rows)
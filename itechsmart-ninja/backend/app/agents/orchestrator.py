@@ -61,6 +61,14 @@ class TaskPlan:
                     return step
         return None
 
+    def get_ready_steps(self) -> List[Dict[str, Any]]:
+        """Get all pending steps whose dependencies are met"""
+        return [
+            step
+            for step in self.steps
+            if step["status"] == "pending" and self._dependencies_met(step)
+        ]
+
     def _dependencies_met(self, step: Dict[str, Any]) -> bool:
         """Check if step dependencies are met"""
         for dep_num in step["dependencies"]:
@@ -89,6 +97,14 @@ class TaskPlan:
             self.steps[step_number - 1]["error"] = error
             self.steps[step_number - 1]["completed_at"] = datetime.utcnow()
 
+    def mark_step_cancelled(self, step_number: int):
+        """Mark an unfinished step as cancelled"""
+        if 0 < step_number <= len(self.steps):
+            step = self.steps[step_number - 1]
+            if step["status"] in ("pending", "queued", "running"):
+                step["status"] = "cancelled"
+                step["completed_at"] = datetime.utcnow()
+
     def get_progress(self) -> float:
         """Get execution progress (0-100)"""
         if not self.steps:
@@ -106,11 +122,32 @@ class TaskPlan:
         return any(step["status"] == "failed" for step in self.steps)
 
 
+# Max concurrent steps per agent; agents not listed use the default
+DEFAULT_AGENT_CONCURRENCY = {
+    "researcher": 3,
+    "coder": 2,
+    "writer": 2,
+    "analyst": 2,
+    "debugger": 1,
+}
+
+
 class MultiAgentOrchestrator:
     """Orchestrates multiple agents to complete complex tasks"""
 
-    def __init__(self, ai_provider: str = "openai"):
+    def __init__(
+        self,
+        ai_provider: str = "openai",
+        agent_concurrency: Optional[Dict[str, int]] = None,
+        default_concurrency: int = 1,
+    ):
         self.ai_provider = ai_provider
+        self.agent_concurrency = {
+            **DEFAULT_AGENT_CONCURRENCY,
+            **(agent_concurrency or {}),
+        }
+        self.default_concurrency = default_concurrency
+        self._agent_semaphores: Dict[str, asyncio.Semaphore] = {}
 
         # Initialize all agents
         self.agents: Dict[str, BaseAgent] = {
@@ -356,38 +393,66 @@ class MultiAgentOrchestrator:
     async def _execute_plan(
         self, plan: TaskPlan, progress_callback=None
     ) -> Dict[str, Any]:
-        """Execute a task plan"""
+        """
+        Execute a task plan
+
+        Every step whose dependencies are met is dispatched immediately, so
+        independent steps run concurrently (bounded per agent) and dependents
+        start as soon as their own inputs are ready. Progress is reported as
+        each step finishes; the first failure cancels the remaining steps.
+        """
         results = []
+        running: Dict[asyncio.Task, Dict[str, Any]] = {}
 
-        while not plan.is_complete() and not plan.has_failed():
-            # Get next executable step
-            next_step = plan.get_next_step()
-
-            if not next_step:
-                # No more executable steps (might be waiting for dependencies)
-                if not plan.is_complete():
-                    logger.error(
-                        "No executable steps but plan not complete - deadlock detected"
-                    )
+        try:
+            while True:
+                if not plan.has_failed():
+                    for step in plan.get_ready_steps():
+                        step["status"] = "queued"
+                        task = asyncio.ensure_future(self._execute_step(step, plan))
+                        running[task] = step
+
+                if not running:
+                    if not plan.is_complete() and not plan.has_failed():
+                        logger.error(
+                            "No executable steps but plan not complete - deadlock detected"
+                        )
                     break
-                break
-
-            # Execute step
-            step_result = await self._execute_step(next_step, plan)
-            results.append(step_result)
-
-            # Update progress
-            if progress_callback:
-                await progress_callback(
-                    {
-                        "task_id": plan.task_id,
-                        "progress": plan.get_progress(),
-                        "current_step": next_step["step_number"],
-                        "total_steps": len(plan.steps),
-                        "step_result": step_result,
-                    }
+
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
                 )
 
+                for task in sorted(done, key=lambda t: running[t]["step_number"]):
+                    step = running.pop(task)
+                    step_result = task.result()
+                    results.append(step_result)
+
+                    # Update progress
+                    if progress_callback:
+                        await progress_callback(
+                            {
+                                "task_id": plan.task_id,
+                                "progress": plan.get_progress(),
+                                "current_step": step["step_number"],
+                                "total_steps": len(plan.steps),
+                                "running_steps": sorted(
+                                    s["step_number"] for s in running.values()
+                                ),
+                                "step_result": step_result,
+                            }
+                        )
+
+                if plan.has_failed() and running:
+                    await self._cancel_steps(running, plan)
+        finally:
+            if running:
+                await self._cancel_steps(running, plan)
+
+        if plan.has_failed():
+            for step in plan.steps:
+                plan.mark_step_cancelled(step["step_number"])
+
         # Compile final result
         final_result = {
             "success": plan.is_complete() and not plan.has_failed(),
@@ -406,9 +471,35 @@ class MultiAgentOrchestrator:
 
         return final_result
 
+    async def _cancel_steps(
+        self, running: Dict[asyncio.Task, Dict[str, Any]], plan: TaskPlan
+    ):
+        """Cancel in-flight steps and wait for them to unwind"""
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+
+        for step in running.values():
+            plan.mark_step_cancelled(step["step_number"])
+        running.clear()
+
+    def _agent_semaphore(self, agent_name: str) -> asyncio.Semaphore:
+        """Per-agent concurrency limiter"""
+        semaphore = self._agent_semaphores.get(agent_name)
+        if semaphore is None:
+            limit = self.agent_concurrency.get(agent_name, self.default_concurrency)
+            semaphore = asyncio.Semaphore(max(1, limit))
+            self._agent_semaphores[agent_name] = semaphore
+        return semaphore
+
     async def _execute_step(
         self, step: Dict[str, Any], plan: TaskPlan
     ) -> Dict[str, Any]:
+        """Execute a single step once its agent has capacity"""
+        async with self._agent_semaphore(step["agent"]):
+            return await self._run_step(step, plan)
+
+    async def _run_step(self, step: Dict[str, Any], plan: TaskPlan) -> Dict[str, Any]:
         """Execute a single step"""
         step_number = step["step_number"]
         agent_name = step["agent"]
@@ -222,7 +222,7 @@ async def get_messages(
     Get messages from channel
 
     Returns messages in reverse chronological order
-    Supports pagination with 'before' parameter
+    Supports pagination with 'before' parameter (pass 'next_cursor')
     """
     channel = chat_service.get_channel(channel_id)
 
@@ -235,8 +235,14 @@ async def get_messages(
     messages = chat_service.get_messages(
         channel_id=channel_id, limit=limit, before=before
     )
+    next_cursor = messages[-1]["message_id"] if len(messages) == limit else None
 
-    return {"success": True, "messages": messages, "count": len(messages)}
+    return {
+        "success": True,
+        "messages": messages,
+        "count": len(messages),
+        "next_cursor": next_cursor,
+    }
 
 
 @router.put("/messages/{message_id}", response_model=MessageResponse)
@@ -383,7 +389,7 @@ async def get_read_receipts(message_id: str, user_id: str = Query(...)):
 
     Shows who has read the message
     """
-    receipts = chat_service.read_receipts.get(message_id, [])
+    receipts = chat_service.get_read_receipts(message_id)
 
     return {
         "success": True,
@@ -13,12 +13,22 @@ from ..core.file_parser import (
     ParsedContent,
     FileType,
     ParsingStatus,
+    UPLOAD_CHUNK_SIZE,
     get_file_manager,
 )
 
 router = APIRouter(prefix="/file-parsing", tags=["file-parsing"])
 
 
+async def _read_chunks(file: UploadFile):
+    """Yield an upload in fixed-size chunks instead of reading it whole"""
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        yield chunk
+
+
 # Response Models
 class FileMetadataResponse(BaseModel):
     """Response with file metadata"""
@@ -85,13 +95,10 @@ async def upload_file(
     - Code: PY, JS, JAVA, CPP
     """
     try:
-        # Read file content
-        content = await file.read()
-
-        # Upload file
-        metadata = await manager.upload_file(
+        # Stream file content to storage
+        metadata = await manager.upload_stream(
             filename=file.filename,
-            content=content,
+            chunks=_read_chunks(file),
             user_id=user_id,
             mime_type=file.content_type,
         )
@@ -122,10 +129,9 @@ async def upload_multiple_files(
         uploaded_files = []
 
         for file in files:
-            content = await file.read()
-            metadata = await manager.upload_file(
+            metadata = await manager.upload_stream(
                 filename=file.filename,
-                content=content,
+                chunks=_read_chunks(file),
                 user_id=user_id,
                 mime_type=file.content_type,
             )
@@ -331,6 +337,8 @@ async def health_check(manager: FileManager = Depends(get_file_manager)):
             "type_breakdown": type_counts,
             "supported_types": [t.value for t in FileType],
             "storage_path": manager.storage_path,
+            "unique_blobs": len(manager.blob_refs),
+            "cached_parses": len(manager.parse_cache),
         }
 
     except Exception as e:
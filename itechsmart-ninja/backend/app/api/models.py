@@ -28,6 +28,7 @@ class CompletionRequest(BaseModel):
     temperature: float = 0.7
     max_tokens: Optional[int] = None
     stream: bool = False
+    use_cache: Optional[bool] = None
 
 
 class CompletionResponse(BaseModel):
@@ -38,6 +39,7 @@ class CompletionResponse(BaseModel):
     usage: Dict[str, int]
     cost: float
     finish_reason: str
+    cached: bool = False
 
 
 class ModelComparisonRequest(BaseModel):
@@ -166,6 +168,7 @@ async def generate_completion(
             temperature=request.temperature,
             max_tokens=request.max_tokens,
             stream=request.stream,
+            use_cache=request.use_cache,
         )
 
         if request.stream:
@@ -217,7 +220,12 @@ async def get_usage_statistics(
     """
     stats = enhanced_ai_manager.get_usage_stats(model_id)
 
-    return {"success": True, "model_id": model_id, "stats": stats}
+    return {
+        "success": True,
+        "model_id": model_id,
+        "stats": stats,
+        "cache": enhanced_ai_manager.get_cache_stats(),
+    }
 
 
 @router.get("/providers/status")
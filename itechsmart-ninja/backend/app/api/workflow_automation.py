@@ -16,6 +16,7 @@ from ..core.workflow_engine import (
     WorkflowStatus,
     TriggerType,
     ActionType,
+    ExecutionMode,
     get_workflow_engine,
 )
 
@@ -40,6 +41,9 @@ class WorkflowActionRequest(BaseModel):
     config: Dict[str, Any] = Field(..., description="Action configuration")
     next_action: Optional[str] = Field(default=None, description="Next action ID")
     on_error: Optional[str] = Field(default=None, description="Error handler action ID")
+    depends_on: List[str] = Field(
+        default_factory=list, description="Upstream action IDs (DAG mode)"
+    )
 
 
 class CreateWorkflowRequest(BaseModel):
@@ -51,6 +55,9 @@ class CreateWorkflowRequest(BaseModel):
     actions: List[WorkflowActionRequest] = Field(..., description="Workflow actions")
     created_by: str = Field(..., description="User ID")
     tags: Optional[List[str]] = Field(default=None, description="Tags")
+    execution_mode: str = Field(
+        default="sequential", description="Execution mode (sequential or dag)"
+    )
 
 
 class ExecuteWorkflowRequest(BaseModel):
@@ -75,6 +82,7 @@ class WorkflowResponse(BaseModel):
     updated_at: str
     version: int
     tags: List[str]
+    execution_mode: str
 
 
 class WorkflowExecutionResponse(BaseModel):
@@ -117,6 +125,8 @@ async def create_workflow(
     **Trigger Types:** manual, scheduled, event, webhook, api
     **Action Types:** http_request, run_code, send_email, send_notification, create_file,
                      transform_data, conditional, loop, delay, ai_task
+    **Execution Modes:** sequential (follow next_action), dag (run actions
+                         concurrently once their depends_on actions complete)
     """
     try:
         trigger = WorkflowTrigger(
@@ -133,6 +143,7 @@ async def create_workflow(
                 config=action.config,
                 next_action=action.next_action,
                 on_error=action.on_error,
+                depends_on=action.depends_on,
             )
             for action in request.actions
         ]
@@ -144,6 +155,7 @@ async def create_workflow(
             actions=actions,
             created_by=request.created_by,
             tags=request.tags,
+            execution_mode=ExecutionMode(request.execution_mode),
         )
 
         return WorkflowResponse(**workflow.to_dict())
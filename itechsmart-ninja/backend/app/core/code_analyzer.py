@@ -4,14 +4,381 @@ Analyzes code quality, performance, and security
 """
 
 import ast
+import hashlib
+import json
 import os
 import re
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever checks change so cached results are recomputed
+ANALYZER_VERSION = 2
+
+# Fewer changed files than this are analyzed inline (pool startup dominates)
+PARALLEL_THRESHOLD = 8
+
+SQL_PATTERNS = [
+    re.compile(r"execute\(['&quot;].*%s.*['&quot;]\s*%"),
+    re.compile(r"execute\(['&quot;].*\+.*['&quot;]\)"),
+    re.compile(r"execute\(.*\.format\("),
+]
+
+SECRET_PATTERNS = [
+    re.compile(r"password\s*=\s*['&quot;][^'&quot;]+['&quot;]", re.IGNORECASE),
+    re.compile(r"api_key\s*=\s*['&quot;][^'&quot;]+['&quot;]", re.IGNORECASE),
+    re.compile(r"secret\s*=\s*['&quot;][^'&quot;]+['&quot;]", re.IGNORECASE),
+    re.compile(r"token\s*=\s*['&quot;][^'&quot;]+['&quot;]", re.IGNORECASE),
+]
+
+
+class _AnalysisVisitor:
+    """
+    Single-pass AST visitor running every check
+
+    Subtree facts (loops inside a loop, decision points inside a function,
+    appends inside a for loop) are derived from running counters captured on
+    entry and compared on exit, so each node is visited exactly once.
+    """
+
+    def __init__(self):
+        self.quality: Dict[str, List[Dict]] = {
+            "long_function": [],
+            "too_many_arguments": [],
+            "nested_loops": [],
+            "magic_number": [],
+        }
+        self.performance: Dict[str, List[Dict]] = {
+            "string_concat_in_loop": [],
+            "loop_append": [],
+            "global_variable": [],
+        }
+        self.security: Dict[str, List[Dict]] = {
+            "dangerous_function": [],
+            "insecure_random": [],
+        }
+        self.best_practices: Dict[str, List[Dict]] = {
+            "bare_except": [],
+            "mutable_default": [],
+            "print_statement": [],
+        }
+        self.complexity = {
+            "cyclomatic": 0,
+            "functions": 0,
+            "classes": 0,
+            "max_function_complexity": 0,
+        }
+        self.documentation = {
+            "functions_documented": 0,
+            "functions_total": 0,
+            "classes_documented": 0,
+            "classes_total": 0,
+            "coverage": 0.0,
+        }
+
+        # Running counters for subtree aggregates
+        self.loops = 0
+        self.decisions = 0
+        self.concats = 0
+        self.appends = 0
+
+    def visit(self, node: ast.AST):
+        if isinstance(node, ast.FunctionDef):
+            self._visit_function(node)
+        elif isinstance(node, (ast.For, ast.While)):
+            self._visit_loop(node)
+        else:
+            self._check_node(node)
+            for child in ast.iter_child_nodes(node):
+                self.visit(child)
+
+    def _visit_function(self, node: ast.FunctionDef):
+        self._check_function(node)
+        decisions = self.decisions
+
+        for child in ast.iter_child_nodes(node):
+            self.visit(child)
+
+        func_complexity = 1 + self.decisions - decisions
+        self.complexity["cyclomatic"] += func_complexity
+        self.complexity["max_function_complexity"] = max(
+            self.complexity["max_function_complexity"], func_complexity
+        )
+
+    def _visit_loop(self, node: ast.AST):
+        self.decisions += 1
+        loops, concats, appends = self.loops, self.concats, self.appends
+        self.loops += 1
+
+        for child in ast.iter_child_nodes(node):
+            self.visit(child)
+
+        nested_loops = self.loops - loops
+        if nested_loops > 2:
+            self.quality["nested_loops"].append(
+                {
+                    "type": "nested_loops",
+                    "severity": "medium",
+                    "line": node.lineno,
+                    "message": f"Deeply nested loops detected ({nested_loops} levels)",
+                    "suggestion": "Consider refactoring to reduce nesting",
+                }
+            )
+
+        # One issue per += in the loop body, nested loops included
+        for _ in range(self.concats - concats):
+            self.performance["string_concat_in_loop"].append(
+                {
+                    "type": "string_concat_in_loop",
+                    "severity": "medium",
+                    "line": node.lineno,
+                    "message": "String concatenation in loop detected",
+                    "suggestion": "Use list.append() and ''.join() instead",
+                }
+            )
+
+        if isinstance(node, ast.For) and self.appends > appends:
+            self.performance["loop_append"].append(
+                {
+                    "type": "loop_append",
+                    "severity": "low",
+                    "line": node.lineno,
+                    "message": "Loop with append() detected",
+                    "suggestion": "Consider using list comprehension",
+                }
+            )
+
+    def _check_function(self, node: ast.FunctionDef):
+        func_lines = node.end_lineno - node.lineno
+        if func_lines > 50:
+            self.quality["long_function"].append(
+                {
+                    "type": "long_function",
+                    "severity": "medium",
+                    "line": node.lineno,
+                    "message": f"Function '{node.name}' is {func_lines} lines long (>50)",
+                    "suggestion": "Consider breaking into smaller functions",
+                }
+            )
+
+        num_args = len(node.args.args)
+        if num_args > 5:
+            self.quality["too_many_arguments"].append(
+                {
+                    "type": "too_many_arguments",
+                    "severity": "low",
+                    "line": node.lineno,
+                    "message": f"Function '{node.name}' has {num_args} arguments (>5)",
+                    "suggestion": "Consider using a config object or dataclass",
+                }
+            )
+
+        for default in node.args.defaults:
+            if isinstance(default, (ast.List, ast.Dict, ast.Set)):
+                self.best_practices["mutable_default"].append(
+                    {
+                        "type": "mutable_default",
+                        "severity": "high",
+                        "line": node.lineno,
+                        "message": f"Mutable default argument in '{node.name}'",
+                        "suggestion": "Use None and initialize in function body",
+                    }
+                )
+
+        self.complexity["functions"] += 1
+        self.documentation["functions_total"] += 1
+        if ast.get_docstring(node):
+            self.documentation["functions_documented"] += 1
+
+    def _check_node(self, node: ast.AST):
+        if isinstance(node, ast.Call):
+            self._check_call(node)
+
+        elif isinstance(node, ast.Constant):
+            value = node.value
+            if (
+                isinstance(value, (int, float))
+                and not isinstance(value, bool)
+                and value not in [0, 1, -1]
+            ):
+                self.quality["magic_number"].append(
+                    {
+                        "type": "magic_number",
+                        "severity": "low",
+                        "line": node.lineno,
+                        "message": f"Magic number {value} found",
+                        "suggestion": "Consider using a named constant",
+                    }
+                )
+
+        elif isinstance(node, ast.AugAssign):
+            if isinstance(node.op, ast.Add) and isinstance(node.target, ast.Name):
+                self.concats += 1
+
+        elif isinstance(node, ast.Global):
+            self.performance["global_variable"].append(
+                {
+                    "type": "global_variable",
+                    "severity": "medium",
+                    "line": node.lineno,
+                    "message": "Global variable usage detected",
+                    "suggestion": "Avoid global state, use function parameters",
+                }
+            )
+
+        elif isinstance(node, ast.ExceptHandler):
+            self.decisions += 1
+            if node.type is None:
+                self.best_practices["bare_except"].append(
+                    {
+                        "type": "bare_except",
+                        "severity": "medium",
+                        "line": node.lineno,
+                        "message": "Bare except clause detected",
+                        "suggestion": "Catch specific exceptions",
+                    }
+                )
+
+        elif isinstance(node, ast.If):
+            self.decisions += 1
+
+        elif isinstance(node, ast.BoolOp):
+            self.decisions += len(node.values) - 1
+
+        elif isinstance(node, ast.ClassDef):
+            self.complexity["classes"] += 1
+            self.documentation["classes_total"] += 1
+            if ast.get_docstring(node):
+                self.documentation["classes_documented"] += 1
+
+    def _check_call(self, node: ast.Call):
+        func = node.func
+        if isinstance(func, ast.Name):
+            if func.id in ["eval", "exec"]:
+                self.security["dangerous_function"].append(
+                    {
+                        "type": "dangerous_function",
+                        "severity": "critical",
+                        "line": node.lineno,
+                        "message": f"Dangerous function '{func.id}' used",
+                        "suggestion": "Avoid eval/exec, use safer alternatives",
+                    }
+                )
+            elif func.id == "print":
+                self.best_practices["print_statement"].append(
+                    {
+                        "type": "print_statement",
+                        "severity": "low",
+                        "line": node.lineno,
+                        "message": "print() statement found",
+                        "suggestion": "Use logging module instead",
+                    }
+                )
+
+        elif isinstance(func, ast.Attribute):
+            if func.attr == "append":
+                self.appends += 1
+            if isinstance(func.value, ast.Name) and func.value.id == "random":
+                self.security["insecure_random"].append(
+                    {
+                        "type": "insecure_random",
+                        "severity": "medium",
+                        "line": node.lineno,
+                        "message": "Using 'random' module for security",
+                        "suggestion": "Use 'secrets' module for cryptographic purposes",
+                    }
+                )
+
+
+def _flatten(groups: Dict[str, List[Dict]]) -> List[Dict]:
+    """Concatenate issue groups in check order, each sorted by line"""
+    issues = []
+    for group in groups.values():
+        issues.extend(sorted(group, key=lambda issue: issue["line"]))
+    return issues
+
+
+def _check_content_patterns(content: str) -> List[Dict]:
+    """Regex-based security checks (SQL injection, hardcoded secrets)"""
+    issues = []
+
+    for pattern in SQL_PATTERNS:
+        if pattern.search(content):
+            issues.append(
+                {
+                    "type": "sql_injection_risk",
+                    "severity": "critical",
+                    "message": "Potential SQL injection vulnerability",
+                    "suggestion": "Use parameterized queries",
+                }
+            )
+
+    line_starts = None
+    for pattern in SECRET_PATTERNS:
+        for match in pattern.finditer(content):
+            if line_starts is None:
+                line_starts = [m.end() for m in re.finditer("\n", content)]
+            issues.append(
+                {
+                    "type": "hardcoded_secret",
+                    "severity": "high",
+                    "line": bisect_right(line_starts, match.start()) + 1,
+                    "message": "Potential hardcoded secret detected",
+                    "suggestion": "Use environment variables or secret management",
+                }
+            )
+
+    return issues
+
+
+def analyze_source(content: str) -> Dict[str, Any]:
+    """
+    Analyze Python source text with a single AST pass
+
+    Module-level so it can run in worker processes.
+
+    Args:
+        content: Python source code
+
+    Returns:
+        Analysis dict (without the "file" key), or {"error": ...}
+    """
+    try:
+        tree = ast.parse(content)
+    except SyntaxError as e:
+        return {"error": f"Syntax error: {e}"}
+
+    try:
+        visitor = _AnalysisVisitor()
+        visitor.visit(tree)
+    except Exception as e:
+        return {"error": f"Analysis error: {e}"}
+
+    security_issues = _flatten({"eval": visitor.security["dangerous_function"]})
+    security_issues += _check_content_patterns(content)
+    security_issues += _flatten({"random": visitor.security["insecure_random"]})
+
+    documentation = visitor.documentation
+    total = documentation["functions_total"] + documentation["classes_total"]
+    if total > 0:
+        documentation["coverage"] = (
+            documentation["functions_documented"] + documentation["classes_documented"]
+        ) / total
+
+    return {
+        "lines": len(content.split("\n")),
+        "quality_issues": _flatten(visitor.quality),
+        "performance_issues": _flatten(visitor.performance),
+        "security_issues": security_issues,
+        "complexity": visitor.complexity,
+        "documentation": documentation,
+        "best_practices": _flatten(visitor.best_practices),
+    }
+
 
 class CodeAnalyzer:
     """
@@ -21,11 +388,28 @@ class CodeAnalyzer:
     3. Security vulnerabilities
     4. Best practice violations
     5. Optimization opportunities
+
+    Project analysis is incremental: results are cached by content hash in
+    ``cache_path`` and only files whose content changed are re-analyzed,
+    fanned out across a process pool.
     """
 
-    def __init__(self, project_root: Path):
+    def __init__(
+        self,
+        project_root: Path,
+        cache_path: Optional[Path] = None,
+        max_workers: Optional[int] = None,
+    ):
         self.project_root = project_root
         self.backend_root = project_root / "backend"
+        self.cache_path = cache_path or project_root / ".code_analyzer_cache.json"
+        self.max_workers = max_workers
+
+        # relative path -> {"mtime_ns", "size", "sha256"}
+        self.file_index: Dict[str, Dict[str, Any]] = {}
+        # sha256 -> analysis without the "file" key
+        self.results_cache: Dict[str, Dict[str, Any]] = {}
+        self._cache_loaded = False
 
     def analyze_file(self, file_path: Path) -> Dict[str, Any]:
         """Analyze a single Python file"""
@@ -33,36 +417,31 @@ class CodeAnalyzer:
         if not file_path.exists():
             return {"error": "File not found"}
 
+        relative = str(file_path.relative_to(self.project_root))
+
         try:
-            content = file_path.read_text()
-            tree = ast.parse(content)
-
-            analysis = {
-                "file": str(file_path.relative_to(self.project_root)),
-                "lines": len(content.split("\n")),
-                "quality_issues": self._check_quality(tree, content),
-                "performance_issues": self._check_performance(tree, content),
-                "security_issues": self._check_security(tree, content),
-                "complexity": self._calculate_complexity(tree),
-                "documentation": self._check_documentation(tree, content),
-                "best_practices": self._check_best_practices(tree, content),
-            }
-
-            return analysis
-
-        except SyntaxError as e:
-            return {
-                "file": str(file_path.relative_to(self.project_root)),
-                "error": f"Syntax error: {e}",
-            }
+            content = file_path.read_bytes().decode("utf-8", errors="replace")
         except Exception as e:
-            return {
-                "file": str(file_path.relative_to(self.project_root)),
-                "error": f"Analysis error: {e}",
-            }
+            return {"file": relative, "error": f"Analysis error: {e}"}
+
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        analysis = self.results_cache.get(digest)
+        if analysis is None:
+            analysis = analyze_source(content)
+            self.results_cache[digest] = analysis
+
+        return {"file": relative, **analysis}
+
+    def analyze_project(self, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Analyze entire project
 
-    def analyze_project(self) -> Dict[str, Any]:
-        """Analyze entire project"""
+        Args:
+            use_cache: Reuse cached results for unchanged files
+
+        Returns:
+            Aggregated analysis; "files_reanalyzed" counts cache misses
+        """
 
         results = {
             "files_analyzed": 0,
@@ -75,361 +454,157 @@ class CodeAnalyzer:
                 "documentation": [],
             },
             "files": [],
+            "files_reanalyzed": 0,
         }
 
-        # Analyze all Python files
-        for py_file in self.backend_root.rglob("*.py"):
-            if self._should_analyze(py_file):
-                analysis = self.analyze_file(py_file)
-
-                if "error" not in analysis:
-                    results["files_analyzed"] += 1
-                    results["total_lines"] += analysis["lines"]
-                    results["files"].append(analysis)
-
-                    # Collect issues
-                    results["issues"]["quality"].extend(analysis["quality_issues"])
-                    results["issues"]["performance"].extend(
-                        analysis["performance_issues"]
-                    )
-                    results["issues"]["security"].extend(analysis["security_issues"])
+        if use_cache:
+            self._load_cache()
+        else:
+            self.file_index.clear()
+            self.results_cache.clear()
+
+        file_index: Dict[str, Dict[str, Any]] = {}
+        pending: Dict[str, str] = {}  # sha256 -> content
+
+        for py_file in sorted(self.backend_root.rglob("*.py")):
+            if not self._should_analyze(py_file):
+                continue
+
+            relative = str(py_file.relative_to(self.project_root))
+            entry = self._index_file(py_file, relative, pending)
+            if entry is not None:
+                file_index[relative] = entry
+
+        # Analyze changed content, in parallel when worth it
+        results["files_reanalyzed"] = len(pending)
+        self.results_cache.update(self._analyze_contents(pending))
+
+        for relative, entry in file_index.items():
+            analysis = self.results_cache.get(entry["sha256"])
+            if analysis is None or "error" in analysis:
+                continue
+
+            results["files_analyzed"] += 1
+            results["total_lines"] += analysis["lines"]
+            results["files"].append({"file": relative, **analysis})
+
+            # Collect issues
+            results["issues"]["quality"].extend(analysis["quality_issues"])
+            results["issues"]["performance"].extend(analysis["performance_issues"])
+            results["issues"]["security"].extend(analysis["security_issues"])
+
+        # Drop results for content no longer in the tree
+        live = {entry["sha256"] for entry in file_index.values()}
+        self.results_cache = {
+            digest: analysis
+            for digest, analysis in self.results_cache.items()
+            if digest in live
+        }
+        self.file_index = file_index
+        self._save_cache()
 
         # Calculate overall quality score
         results["quality_score"] = self._calculate_quality_score(results)
 
         return results
 
-    def _should_analyze(self, file_path: Path) -> bool:
-        """Check if file should be analyzed"""
+    def _index_file(
+        self, py_file: Path, relative: str, pending: Dict[str, str]
+    ) -> Optional[Dict[str, Any]]:
+        """Stat a file and queue its content for analysis if it changed"""
+        try:
+            stat = py_file.stat()
+        except OSError:
+            return None
+
+        cached = self.file_index.get(relative)
+        if (
+            cached
+            and cached["mtime_ns"] == stat.st_mtime_ns
+            and cached["size"] == stat.st_size
+            and cached["sha256"] in self.results_cache
+        ):
+            return cached
 
-        # Skip test files, migrations, etc.
-        skip_patterns = ["__pycache__", ".pytest_cache", "migrations", "venv", ".venv"]
+        try:
+            content = py_file.read_bytes().decode("utf-8", errors="replace")
+        except OSError as e:
+            logger.warning(f"Cannot read {relative}: {e}")
+            return None
 
-        for pattern in skip_patterns:
-            if pattern in str(file_path):
-                return False
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        if digest not in self.results_cache:
+            pending[digest] = content
 
-        return True
+        return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": digest}
 
-    def _check_quality(self, tree: ast.AST, content: str) -> List[Dict]:
-        """Check code quality issues"""
-        issues = []
-
-        # Check for long functions
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                func_lines = node.end_lineno - node.lineno
-                if func_lines > 50:
-                    issues.append(
-                        {
-                            "type": "long_function",
-                            "severity": "medium",
-                            "line": node.lineno,
-                            "message": f"Function '{node.name}' is {func_lines} lines long (>50)",
-                            "suggestion": "Consider breaking into smaller functions",
-                        }
-                    )
-
-        # Check for too many arguments
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                num_args = len(node.args.args)
-                if num_args > 5:
-                    issues.append(
-                        {
-                            "type": "too_many_arguments",
-                            "severity": "low",
-                            "line": node.lineno,
-                            "message": f"Function '{node.name}' has {num_args} arguments (>5)",
-                            "suggestion": "Consider using a config object or dataclass",
-                        }
-                    )
-
-        # Check for nested loops (complexity)
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.For, ast.While)):
-                nested_loops = sum(
-                    1 for n in ast.walk(node) if isinstance(n, (ast.For, ast.While))
-                )
-                if nested_loops > 2:
-                    issues.append(
-                        {
-                            "type": "nested_loops",
-                            "severity": "medium",
-                            "line": node.lineno,
-                            "message": f"Deeply nested loops detected ({nested_loops} levels)",
-                            "suggestion": "Consider refactoring to reduce nesting",
-                        }
-                    )
-
-        # Check for magic numbers
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Num):
-                if node.n not in [0, 1, -1] and isinstance(node.n, (int, float)):
-                    issues.append(
-                        {
-                            "type": "magic_number",
-                            "severity": "low",
-                            "line": node.lineno,
-                            "message": f"Magic number {node.n} found",
-                            "suggestion": "Consider using a named constant",
-                        }
-                    )
-
-        return issues
-
-    def _check_performance(self, tree: ast.AST, content: str) -> List[Dict]:
-        """Check performance issues"""
-        issues = []
-
-        # Check for inefficient string concatenation in loops
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.For, ast.While)):
-                for child in ast.walk(node):
-                    if isinstance(child, ast.AugAssign) and isinstance(
-                        child.op, ast.Add
-                    ):
-                        if isinstance(child.target, ast.Name):
-                            issues.append(
-                                {
-                                    "type": "string_concat_in_loop",
-                                    "severity": "medium",
-                                    "line": node.lineno,
-                                    "message": "String concatenation in loop detected",
-                                    "suggestion": "Use list.append() and ''.join() instead",
-                                }
-                            )
-
-        # Check for repeated list.append in comprehension
-        for node in ast.walk(tree):
-            if isinstance(node, ast.For):
-                appends = [
-                    n
-                    for n in ast.walk(node)
-                    if isinstance(n, ast.Call)
-                    and isinstance(n.func, ast.Attribute)
-                    and n.func.attr == "append"
-                ]
-                if len(appends) > 0:
-                    issues.append(
-                        {
-                            "type": "loop_append",
-                            "severity": "low",
-                            "line": node.lineno,
-                            "message": "Loop with append() detected",
-                            "suggestion": "Consider using list comprehension",
-                        }
-                    )
-
-        # Check for global variables
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Global):
-                issues.append(
-                    {
-                        "type": "global_variable",
-                        "severity": "medium",
-                        "line": node.lineno,
-                        "message": "Global variable usage detected",
-                        "suggestion": "Avoid global state, use function parameters",
-                    }
-                )
+    def _analyze_contents(self, pending: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """Analyze source texts keyed by hash, fanning out to processes"""
+        if len(pending) < PARALLEL_THRESHOLD or self.max_workers == 1:
+            return {digest: analyze_source(text) for digest, text in pending.items()}
 
-        return issues
-
-    def _check_security(self, tree: ast.AST, content: str) -> List[Dict]:
-        """Check security issues"""
-        issues = []
-
-        # Check for eval/exec usage
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Call):
-                if isinstance(node.func, ast.Name):
-                    if node.func.id in ["eval", "exec"]:
-                        issues.append(
-                            {
-                                "type": "dangerous_function",
-                                "severity": "critical",
-                                "line": node.lineno,
-                                "message": f"Dangerous function '{node.func.id}' used",
-                                "suggestion": "Avoid eval/exec, use safer alternatives",
-                            }
-                        )
-
-        # Check for SQL injection risks
-        sql_patterns = [
-            r"execute\(['&quot;].*%s.*['&quot;]\s*%",
-            r"execute\(['&quot;].*\+.*['&quot;]\)",
-            r"execute\(.*\.format\(",
-        ]
-
-        for pattern in sql_patterns:
-            if re.search(pattern, content):
-                issues.append(
-                    {
-                        "type": "sql_injection_risk",
-                        "severity": "critical",
-                        "message": "Potential SQL injection vulnerability",
-                        "suggestion": "Use parameterized queries",
-                    }
-                )
-
-        # Check for hardcoded secrets
-        secret_patterns = [
-            r"password\s*=\s*['&quot;][^'&quot;]+['&quot;]",
-            r"api_key\s*=\s*['&quot;][^'&quot;]+['&quot;]",
-            r"secret\s*=\s*['&quot;][^'&quot;]+['&quot;]",
-            r"token\s*=\s*['&quot;][^'&quot;]+['&quot;]",
-        ]
-
-        for pattern in secret_patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-            for match in matches:
-                line_num = content[: match.start()].count("\n") + 1
-                issues.append(
-                    {
-                        "type": "hardcoded_secret",
-                        "severity": "high",
-                        "line": line_num,
-                        "message": "Potential hardcoded secret detected",
-                        "suggestion": "Use environment variables or secret management",
-                    }
+        digests = list(pending)
+        try:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                analyses = executor.map(
+                    analyze_source,
+                    (pending[digest] for digest in digests),
+                    chunksize=max(1, len(digests) // ((os.cpu_count() or 1) * 4)),
                 )
+                return dict(zip(digests, analyses))
+        except Exception as e:
+            logger.warning(f"Parallel analysis failed, falling back to serial: {e}")
+            return {digest: analyze_source(text) for digest, text in pending.items()}
 
-        # Check for insecure random
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Call):
-                if isinstance(node.func, ast.Attribute):
-                    if (
-                        isinstance(node.func.value, ast.Name)
-                        and node.func.value.id == "random"
-                    ):
-                        issues.append(
-                            {
-                                "type": "insecure_random",
-                                "severity": "medium",
-                                "line": node.lineno,
-                                "message": "Using 'random' module for security",
-                                "suggestion": "Use 'secrets' module for cryptographic purposes",
-                            }
-                        )
-
-        return issues
-
-    def _calculate_complexity(self, tree: ast.AST) -> Dict[str, Any]:
-        """Calculate code complexity metrics"""
-
-        complexity = {
-            "cyclomatic": 0,
-            "functions": 0,
-            "classes": 0,
-            "max_function_complexity": 0,
-        }
+    def _load_cache(self):
+        """Load persisted results once per analyzer"""
+        if self._cache_loaded:
+            return
+        self._cache_loaded = True
 
-        # Count functions and classes
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                complexity["functions"] += 1
-                func_complexity = self._calculate_cyclomatic_complexity(node)
-                complexity["cyclomatic"] += func_complexity
-                complexity["max_function_complexity"] = max(
-                    complexity["max_function_complexity"], func_complexity
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable analysis cache: {e}")
+            return
+
+        if data.get("version") != ANALYZER_VERSION:
+            return
+
+        self.file_index = data.get("files", {})
+        self.results_cache = data.get("results", {})
+
+    def _save_cache(self):
+        """Persist results atomically"""
+        tmp_path = f"{self.cache_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "version": ANALYZER_VERSION,
+                        "files": self.file_index,
+                        "results": self.results_cache,
+                    },
+                    f,
                 )
-            elif isinstance(node, ast.ClassDef):
-                complexity["classes"] += 1
-
-        return complexity
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"Failed to save analysis cache: {e}")
 
-    def _calculate_cyclomatic_complexity(self, node: ast.AST) -> int:
-        """Calculate cyclomatic complexity for a function"""
-        complexity = 1  # Base complexity
-
-        for child in ast.walk(node):
-            # Add 1 for each decision point
-            if isinstance(child, (ast.If, ast.While, ast.For, ast.ExceptHandler)):
-                complexity += 1
-            elif isinstance(child, ast.BoolOp):
-                complexity += len(child.values) - 1
-
-        return complexity
+    def _should_analyze(self, file_path: Path) -> bool:
+        """Check if file should be analyzed"""
 
-    def _check_documentation(self, tree: ast.AST, content: str) -> Dict[str, Any]:
-        """Check documentation quality"""
+        # Skip test files, migrations, etc.
+        skip_patterns = ["__pycache__", ".pytest_cache", "migrations", "venv", ".venv"]
 
-        doc_stats = {
-            "functions_documented": 0,
-            "functions_total": 0,
-            "classes_documented": 0,
-            "classes_total": 0,
-            "coverage": 0.0,
-        }
+        for pattern in skip_patterns:
+            if pattern in str(file_path):
+                return False
 
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                doc_stats["functions_total"] += 1
-                if ast.get_docstring(node):
-                    doc_stats["functions_documented"] += 1
-
-            elif isinstance(node, ast.ClassDef):
-                doc_stats["classes_total"] += 1
-                if ast.get_docstring(node):
-                    doc_stats["classes_documented"] += 1
-
-        total = doc_stats["functions_total"] + doc_stats["classes_total"]
-        documented = doc_stats["functions_documented"] + doc_stats["classes_documented"]
-
-        if total > 0:
-            doc_stats["coverage"] = documented / total
-
-        return doc_stats
-
-    def _check_best_practices(self, tree: ast.AST, content: str) -> List[Dict]:
-        """Check Python best practices"""
-        issues = []
-
-        # Check for bare except
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ExceptHandler):
-                if node.type is None:
-                    issues.append(
-                        {
-                            "type": "bare_except",
-                            "severity": "medium",
-                            "line": node.lineno,
-                            "message": "Bare except clause detected",
-                            "suggestion": "Catch specific exceptions",
-                        }
-                    )
-
-        # Check for mutable default arguments
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                for default in node.args.defaults:
-                    if isinstance(default, (ast.List, ast.Dict, ast.Set)):
-                        issues.append(
-                            {
-                                "type": "mutable_default",
-                                "severity": "high",
-                                "line": node.lineno,
-                                "message": f"Mutable default argument in '{node.name}'",
-                                "suggestion": "Use None and initialize in function body",
-                            }
-                        )
-
-        # Check for print statements (should use logging)
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Call):
-                if isinstance(node.func, ast.Name) and node.func.id == "print":
-                    issues.append(
-                        {
-                            "type": "print_statement",
-                            "severity": "low",
-                            "line": node.lineno,
-                            "message": "print() statement found",
-                            "suggestion": "Use logging module instead",
-                        }
-                    )
-
-        return issues
+        return True
 
     def _calculate_quality_score(self, results: Dict) -> float:
         """Calculate overall quality score (0-10)"""
@@ -5,12 +5,15 @@ Provides persistent session memory with infinite context support
 
 import json
 import hashlib
-from typing import Dict, Any, List, Optional
+import heapq
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
 import logging
 
+from .memory_index import InvertedIndex, RecencyIndex
+
 logger = logging.getLogger(__name__)
 
 
@@ -66,7 +69,7 @@ class ContextMemory:
 
     Features:
     - Persistent storage across sessions
-    - Semantic search
+    - BM25-ranked search over an incremental inverted index
     - Context compression
     - Priority-based retention
     - Tag-based organization
@@ -84,6 +87,19 @@ class ContextMemory:
         self.created_at = datetime.utcnow()
         self.last_accessed = datetime.utcnow()
 
+        # Retrieval indexes, maintained incrementally on add/remove
+        self.text_index = InvertedIndex()
+        self.recency = RecencyIndex()
+        self.recency_by_type: Dict[ContextType, RecencyIndex] = {
+            context_type: RecencyIndex() for context_type in ContextType
+        }
+        self.token_counts: Dict[str, int] = {}
+        # (priority, timestamp, seq, entry_id) min-heap for eviction; an item
+        # is live while its seq matches the entry's in _eviction_seqs
+        self._eviction_heap: List[Tuple[int, datetime, int, str]] = []
+        self._eviction_seqs: Dict[str, int] = {}
+        self._eviction_seq = 0
+
     def add(
         self,
         content: Any,
@@ -120,13 +136,7 @@ class ContextMemory:
         )
 
         # Store entry
-        self.entries[entry_id] = entry
-
-        # Update indices
-        for tag in entry.tags:
-            if tag not in self.index:
-                self.index[tag] = []
-            self.index[tag].append(entry_id)
+        self._index_entry(entry)
 
         # Update history
         if context_type == ContextType.CONVERSATION:
@@ -167,15 +177,16 @@ class ContextMemory:
         self, limit: int = 10, context_type: Optional[ContextType] = None
     ) -> List[ContextEntry]:
         """Get recent entries"""
-        entries = list(self.entries.values())
+        recency = self.recency_by_type[context_type] if context_type else self.recency
 
-        if context_type:
-            entries = [e for e in entries if e.context_type == context_type]
+        entries = []
+        for entry_id in recency.newest():
+            if len(entries) >= limit:
+                break
+            entries.append(self.entries[entry_id])
 
-        entries.sort(key=lambda e: e.timestamp, reverse=True)
         self.last_accessed = datetime.utcnow()
-
-        return entries[:limit]
+        return entries
 
     def get_conversation_history(
         self, limit: Optional[int] = None
@@ -205,25 +216,21 @@ class ContextMemory:
             limit: Maximum results
 
         Returns:
-            List of matching entries
+            List of matching entries, best BM25 match first
         """
-        query_lower = query.lower()
-        results = []
-
-        for entry in self.entries.values():
-            if context_type and entry.context_type != context_type:
-                continue
-
-            # Simple text search (can be enhanced with embeddings)
-            content_str = str(entry.content).lower()
-            if query_lower in content_str:
-                results.append(entry)
+        type_filter = None
+        if context_type:
+            type_filter = lambda eid: self.entries[eid].context_type == context_type
 
-        # Sort by relevance (timestamp for now)
-        results.sort(key=lambda e: e.timestamp, reverse=True)
+        ranked = self.text_index.top(
+            query,
+            limit,
+            doc_filter=type_filter,
+            tie_breaker=lambda eid: self.entries[eid].timestamp,
+        )
         self.last_accessed = datetime.utcnow()
 
-        return results[:limit]
+        return [self.entries[entry_id] for entry_id, _ in ranked]
 
     def get_context_window(
         self, max_tokens: int = 8000, context_type: Optional[ContextType] = None
@@ -245,8 +252,7 @@ class ContextMemory:
         total_tokens = 0
 
         for entry in entries:
-            content_str = str(entry.content)
-            estimated_tokens = len(content_str) // 4
+            estimated_tokens = self.token_counts[entry.entry_id]
 
             if total_tokens + estimated_tokens <= max_tokens:
                 window.append(entry)
@@ -319,11 +325,9 @@ class ContextMemory:
         """Clear context memory"""
         if context_type:
             # Clear specific type
-            to_remove = [
-                eid for eid, e in self.entries.items() if e.context_type == context_type
-            ]
+            to_remove = list(self.recency_by_type[context_type].oldest())
             for eid in to_remove:
-                del self.entries[eid]
+                self._remove_entry(eid)
 
             # Update histories
             if context_type == ContextType.CONVERSATION:
@@ -336,6 +340,13 @@ class ContextMemory:
             self.index.clear()
             self.conversation_history.clear()
             self.task_history.clear()
+            self.text_index.clear()
+            self.recency.clear()
+            for recency in self.recency_by_type.values():
+                recency.clear()
+            self.token_counts.clear()
+            self._eviction_heap.clear()
+            self._eviction_seqs.clear()
 
         logger.info(f"Cleared context memory for session {self.session_id}")
 
@@ -367,13 +378,7 @@ class ContextMemory:
                 metadata=entry_data["metadata"],
                 tags=entry_data["tags"],
             )
-            self.entries[entry.entry_id] = entry
-
-            # Rebuild index
-            for tag in entry.tags:
-                if tag not in self.index:
-                    self.index[tag] = []
-                self.index[tag].append(entry.entry_id)
+            self._index_entry(entry)
 
         self.conversation_history = data["conversation_history"]
         self.task_history = data["task_history"]
@@ -387,27 +392,76 @@ class ContextMemory:
         combined = f"{content_str}{timestamp}"
         return hashlib.sha256(combined.encode()).hexdigest()[:16]
 
+    def _index_entry(self, entry: ContextEntry):
+        """Store entry and update tag, text, recency and eviction indexes"""
+        entry_id = entry.entry_id
+        if entry_id in self.entries:
+            # Replacing an entry: drop its old postings and heap item first
+            self._remove_entry(entry_id)
+        self.entries[entry_id] = entry
+
+        for tag in entry.tags:
+            if tag not in self.index:
+                self.index[tag] = []
+            self.index[tag].append(entry_id)
+
+        # Stringify once; reused for search and token estimates
+        content_str = str(entry.content)
+        self.text_index.add(entry_id, content_str)
+        self.token_counts[entry_id] = len(content_str) // 4  # 1 token ≈ 4 chars
+
+        self.recency.add(entry_id, entry.timestamp)
+        self.recency_by_type[entry.context_type].add(entry_id, entry.timestamp)
+
+        self._eviction_seq += 1
+        self._eviction_seqs[entry_id] = self._eviction_seq
+        heapq.heappush(
+            self._eviction_heap,
+            (entry.priority.value, entry.timestamp, self._eviction_seq, entry_id),
+        )
+
+    def _remove_entry(self, entry_id: str) -> Optional[ContextEntry]:
+        """Remove entry from storage and all indexes"""
+        entry = self.entries.pop(entry_id, None)
+        if entry is None:
+            return None
+
+        for tag in entry.tags:
+            tagged = self.index.get(tag)
+            if tagged and entry_id in tagged:
+                tagged.remove(entry_id)
+
+        self.text_index.remove(entry_id)
+        self.token_counts.pop(entry_id, None)
+        self.recency.remove(entry_id)
+        self.recency_by_type[entry.context_type].remove(entry_id)
+        self._eviction_seqs.pop(entry_id, None)
+        return entry
+
     def _compress_memory(self):
         """Compress memory by removing low-priority old entries"""
         if len(self.entries) <= self.max_entries:
             return
 
-        # Sort entries by priority and age
-        entries_list = list(self.entries.values())
-        entries_list.sort(key=lambda e: (e.priority.value, e.timestamp))
-
-        # Remove oldest low-priority entries
-        to_remove = entries_list[: len(entries_list) - self.max_entries]
-
-        for entry in to_remove:
-            del self.entries[entry.entry_id]
+        # Drop stale heap items left behind by clear()/re-imports
+        if len(self._eviction_heap) > 2 * len(self.entries):
+            self._eviction_heap = [
+                item
+                for item in self._eviction_heap
+                if self._eviction_seqs.get(item[3]) == item[2]
+            ]
+            heapq.heapify(self._eviction_heap)
 
-            # Update index
-            for tag in entry.tags:
-                if tag in self.index and entry.entry_id in self.index[tag]:
-                    self.index[tag].remove(entry.entry_id)
+        # Pop oldest low-priority entries off the eviction heap
+        removed = 0
+        while len(self.entries) > self.max_entries and self._eviction_heap:
+            _, _, seq, entry_id = heapq.heappop(self._eviction_heap)
+            if self._eviction_seqs.get(entry_id) != seq:
+                continue
+            self._remove_entry(entry_id)
+            removed += 1
 
-        logger.info(f"Compressed memory: removed {len(to_remove)} entries")
+        logger.info(f"Compressed memory: removed {removed} entries")
 
 
 class ContextMemoryManager:
@@ -3,10 +3,14 @@ File Upload & Parsing Manager for iTechSmart Ninja
 Handles multi-format file uploads and content extraction
 """
 
+import asyncio
 import logging
+import sys
 import uuid
 import mimetypes
-from typing import Dict, List, Optional, Any, BinaryIO
+from concurrent.futures import Executor, ProcessPoolExecutor
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, List, Optional, Any, Iterable, Tuple, Union
 from datetime import datetime
 from dataclasses import dataclass, asdict
 from enum import Enum
@@ -136,6 +140,14 @@ class FileParser:
         reader = csv.DictReader(io.StringIO(text))
         return list(reader)
 
+    @staticmethod
+    def parse_csv_file(file_path: str) -> List[Dict[str, Any]]:
+        """Parse CSV file row by row without loading the raw text"""
+        import csv
+
+        with open(file_path, "r", encoding="utf-8", newline="") as f:
+            return list(csv.DictReader(f))
+
     @staticmethod
     def parse_xml(content: bytes) -> Dict[str, Any]:
         """Parse XML file"""
@@ -178,7 +190,9 @@ class FileParser:
                 return {
                     "text": "\n\n".join(text_content),
                     "page_count": len(reader.pages),
-                    "metadata": reader.metadata,
+                    "metadata": {
+                        str(k): str(v) for k, v in (reader.metadata or {}).items()
+                    },
                 }
         except ImportError:
             logger.warning("PyPDF2 not installed, using basic extraction")
@@ -219,23 +233,26 @@ class FileParser:
         try:
             import openpyxl
 
-            workbook = openpyxl.load_workbook(file_path)
-
-            sheets = {}
-            for sheet_name in workbook.sheetnames:
-                sheet = workbook[sheet_name]
+            workbook = openpyxl.load_workbook(file_path, read_only=True)
+            try:
+                sheets = {}
+                for sheet_name in workbook.sheetnames:
+                    sheet = workbook[sheet_name]
 
-                data = []
-                for row in sheet.iter_rows(values_only=True):
-                    data.append(list(row))
+                    data = []
+                    for row in sheet.iter_rows(values_only=True):
+                        data.append(list(row))
 
-                sheets[sheet_name] = data
+                    sheets[sheet_name] = data
 
-            return {
-                "sheets": sheets,
-                "sheet_names": workbook.sheetnames,
-                "sheet_count": len(workbook.sheetnames),
-            }
+                return {
+                    "sheets": sheets,
+                    "sheet_names": workbook.sheetnames,
+                    "sheet_count": len(workbook.sheetnames),
+                }
+            finally:
+                # Read-only workbooks keep the file open until closed
+                workbook.close()
         except ImportError:
             logger.warning("openpyxl not installed")
             return {"text": "XLSX parsing requires openpyxl"}
@@ -283,17 +300,183 @@ class FileParser:
             return {"text": content.decode("utf-8")}
 
 
+def parse_file_content(file_path: str, file_type: FileType) -> Dict[str, Any]:
+    """
+    Parse a stored file into ParsedContent fields
+
+    Module-level so it can run in a worker process; the file is read from
+    disk by the worker instead of being shipped through the pool.
+
+    Args:
+        file_path: Path of the stored file
+        file_type: Detected file type
+
+    Returns:
+        Dict of ParsedContent field values
+    """
+    parser = FileParser()
+    fields: Dict[str, Any] = {}
+
+    def read() -> bytes:
+        with open(file_path, "rb") as f:
+            return f.read()
+
+    def count_words():
+        if fields.get("text_content"):
+            fields["word_count"] = len(fields["text_content"].split())
+
+    # Parse based on file type
+    if file_type == FileType.TXT:
+        fields["text_content"] = parser.parse_text(read())
+        fields["word_count"] = len(fields["text_content"].split())
+
+    elif file_type == FileType.JSON:
+        data = parser.parse_json(read())
+        fields["structured_data"] = data
+        fields["text_content"] = str(data)
+
+    elif file_type == FileType.CSV:
+        data = parser.parse_csv_file(file_path)
+        fields["structured_data"] = {"rows": data}
+        fields["text_content"] = str(data)
+
+    elif file_type == FileType.XML:
+        data = parser.parse_xml(read())
+        fields["structured_data"] = data
+        fields["text_content"] = str(data)
+
+    elif file_type == FileType.PDF:
+        data = parser.parse_pdf(file_path)
+        fields["text_content"] = data.get("text")
+        fields["page_count"] = data.get("page_count")
+        fields["metadata"] = data.get("metadata", {})
+        count_words()
+
+    elif file_type == FileType.DOCX:
+        data = parser.parse_docx(file_path)
+        fields["text_content"] = data.get("text")
+        fields["structured_data"] = {"tables": data.get("tables", [])}
+        count_words()
+
+    elif file_type == FileType.XLSX:
+        data = parser.parse_xlsx(file_path)
+        fields["structured_data"] = data
+        fields["text_content"] = str(data)
+
+    elif file_type == FileType.MARKDOWN:
+        data = parser.parse_markdown(read())
+        fields["text_content"] = data.get("text")
+        fields["structured_data"] = {"headers": data.get("headers", [])}
+        count_words()
+
+    elif file_type == FileType.HTML:
+        data = parser.parse_html(read())
+        fields["text_content"] = data.get("text")
+        fields["structured_data"] = {
+            "links": data.get("links", []),
+            "images": data.get("images", []),
+        }
+        fields["metadata"] = {"title": data.get("title")}
+        count_words()
+
+    else:
+        fields["text_content"] = f"Parsing not supported for {file_type.value}"
+
+    return fields
+
+
+class _ReadOnlyDict(dict):
+    """dict that rejects mutation, so cached parse results can be shared"""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Parsed content is shared with the parse cache")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return (_ReadOnlyDict, (dict(self),))
+
+
+def _freeze(value: Any) -> Tuple[Any, int]:
+    """
+    Make a parse result read-only and estimate its size
+
+    dicts become read-only dicts and lists become tuples, so callers can
+    share one cached result without copying it.
+
+    Returns:
+        (frozen value, approximate size in bytes)
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        items = {}
+        for key, item in value.items():
+            items[key], item_size = _freeze(item)
+            size += sys.getsizeof(key) + item_size
+        return _ReadOnlyDict(items), size
+    if isinstance(value, (list, tuple)):
+        items = []
+        for item in value:
+            frozen, item_size = _freeze(item)
+            items.append(frozen)
+            size += item_size
+        return tuple(items), size
+    return value, size
+
+
+# Upload chunk size for streaming reads/writes
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
 class FileManager:
-    """Manages file uploads and parsing"""
+    """
+    Manages file uploads and parsing
 
-    def __init__(self, storage_path: str = "/workspace/uploads"):
-        """Initialize file manager"""
+    Uploads are streamed to disk in chunks and hashed in the same pass.
+    Blobs are content-addressed by SHA-256, so identical uploads share one
+    stored copy and one parse result.
+    """
+
+    def __init__(
+        self,
+        storage_path: str = "/workspace/uploads",
+        parse_workers: Optional[int] = None,
+        parse_executor: Optional[Executor] = None,
+        max_cached_parses: int = 256,
+        max_cache_bytes: int = 64 * 1024 * 1024,
+    ):
+        """
+        Initialize file manager
+
+        Args:
+            storage_path: Root directory for stored blobs
+            parse_workers: Worker processes for parsing (default: CPU count)
+            parse_executor: Custom executor for parsing (overrides parse_workers)
+            max_cached_parses: Parse results kept in the LRU parse cache
+            max_cache_bytes: Approximate memory budget of the parse cache;
+                larger results are returned but not cached
+        """
         self.storage_path = storage_path
         self.files: Dict[str, FileMetadata] = {}
         self.parsed_content: Dict[str, ParsedContent] = {}
 
-        # Create storage directory
-        os.makedirs(storage_path, exist_ok=True)
+        # Content-addressed storage: sha256 -> number of files referencing it
+        self.blob_refs: Dict[str, int] = {}
+        # sha256 -> read-only parsed fields and their approximate size,
+        # shared by every file with that content
+        self.parse_cache: "OrderedDict[str, Tuple[Dict[str, Any], int]]" = OrderedDict()
+        self.parse_cache_bytes = 0
+        self.max_cached_parses = max_cached_parses
+        self.max_cache_bytes = max_cache_bytes
+        self._parse_tasks: Dict[str, asyncio.Future] = {}
+
+        self.parse_workers = parse_workers
+        self._executor = parse_executor
+
+        # Create storage directories
+        os.makedirs(os.path.join(storage_path, "blobs"), exist_ok=True)
+        os.makedirs(os.path.join(storage_path, "incoming"), exist_ok=True)
 
         logger.info(f"FileManager initialized with storage path: {storage_path}")
 
@@ -334,11 +517,15 @@ class FileManager:
 
         return type_map.get(ext, FileType.UNKNOWN)
 
-    def _calculate_hashes(self, content: bytes) -> tuple:
-        """Calculate MD5 and SHA256 hashes"""
-        md5 = hashlib.md5(content).hexdigest()
-        sha256 = hashlib.sha256(content).hexdigest()
-        return md5, sha256
+    def _blob_path(self, sha256: str) -> str:
+        """Path of the stored blob for a content hash"""
+        return os.path.join(self.storage_path, "blobs", sha256[:2], sha256)
+
+    def _get_executor(self) -> Executor:
+        """Create the parsing worker pool on first use"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.parse_workers)
+        return self._executor
 
     async def upload_file(
         self,
@@ -356,6 +543,33 @@ class FileManager:
             user_id: User ID
             mime_type: Optional MIME type
 
+        Returns:
+            FileMetadata object
+        """
+        return await self.upload_stream(filename, [content], user_id, mime_type)
+
+    async def upload_stream(
+        self,
+        filename: str,
+        chunks: Union[AsyncIterator[bytes], Iterable[bytes]],
+        user_id: str,
+        mime_type: Optional[str] = None,
+        max_size: Optional[int] = None,
+    ) -> FileMetadata:
+        """
+        Upload a file from a stream of chunks with bounded memory
+
+        Each chunk is hashed (MD5 and SHA-256) and written in a single pass.
+        If a blob with the same SHA-256 already exists the new copy is
+        discarded and the existing blob is shared.
+
+        Args:
+            filename: Original filename
+            chunks: Async or sync iterable of byte chunks
+            user_id: User ID
+            mime_type: Optional MIME type
+            max_size: Optional maximum size in bytes
+
         Returns:
             FileMetadata object
         """
@@ -370,13 +584,36 @@ class FileManager:
         # Detect file type
         file_type = self._detect_file_type(filename, mime_type)
 
-        # Calculate hashes
-        md5, sha256 = self._calculate_hashes(content)
+        md5 = hashlib.md5()
+        sha256 = hashlib.sha256()
+        size = 0
+
+        incoming_path = os.path.join(self.storage_path, "incoming", file_id)
+        try:
+            with open(incoming_path, "wb") as f:
+                async for chunk in self._iter_chunks(chunks):
+                    size += len(chunk)
+                    if max_size is not None and size > max_size:
+                        raise ValueError(f"File exceeds {max_size} bytes")
+                    md5.update(chunk)
+                    sha256.update(chunk)
+                    await asyncio.to_thread(f.write, chunk)
+
+            digest = sha256.hexdigest()
+            blob_path = self._blob_path(digest)
+            if digest in self.blob_refs or os.path.exists(blob_path):
+                # Duplicate content, keep the existing blob
+                os.remove(incoming_path)
+                logger.info(f"File {filename} deduplicated against blob {digest}")
+            else:
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                os.replace(incoming_path, blob_path)
+        except BaseException:
+            if os.path.exists(incoming_path):
+                os.remove(incoming_path)
+            raise
 
-        # Save file
-        file_path = os.path.join(self.storage_path, f"{file_id}_{filename}")
-        with open(file_path, "wb") as f:
-            f.write(content)
+        self.blob_refs[digest] = self.blob_refs.get(digest, 0) + 1
 
         # Create metadata
         metadata = FileMetadata(
@@ -384,9 +621,9 @@ class FileManager:
             filename=filename,
             file_type=file_type,
             mime_type=mime_type,
-            size_bytes=len(content),
-            hash_md5=md5,
-            hash_sha256=sha256,
+            size_bytes=size,
+            hash_md5=md5.hexdigest(),
+            hash_sha256=digest,
             uploaded_at=datetime.now(),
             uploaded_by=user_id,
         )
@@ -396,6 +633,69 @@ class FileManager:
         logger.info(f"File {filename} uploaded with ID {file_id}")
         return metadata
 
+    @staticmethod
+    async def _iter_chunks(
+        chunks: Union[AsyncIterator[bytes], Iterable[bytes]]
+    ) -> AsyncIterator[bytes]:
+        """Normalize sync and async chunk sources, splitting large chunks"""
+        if hasattr(chunks, "__aiter__"):
+            async for chunk in chunks:
+                for i in range(0, len(chunk), UPLOAD_CHUNK_SIZE):
+                    yield chunk[i : i + UPLOAD_CHUNK_SIZE]
+        else:
+            for chunk in chunks:
+                view = memoryview(chunk)
+                for i in range(0, len(view), UPLOAD_CHUNK_SIZE):
+                    yield view[i : i + UPLOAD_CHUNK_SIZE]
+
+    async def _parse_by_hash(
+        self, sha256: str, file_path: str, file_type: FileType
+    ) -> Dict[str, Any]:
+        """
+        Parse content once per hash, sharing in-flight work between callers
+
+        The fields are read-only and shared with the cache and other
+        callers, so hits cost no copy
+        """
+        cache_key = f"{sha256}:{file_type.value}"
+        cached = self.parse_cache.get(cache_key)
+        if cached is not None:
+            self.parse_cache.move_to_end(cache_key)
+            return cached[0]
+
+        task = self._parse_tasks.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._run_parse(cache_key, file_path, file_type)
+            )
+            self._parse_tasks[cache_key] = task
+
+        # Shielded so one cancelled caller doesn't cancel the shared parse
+        return await asyncio.shield(task)
+
+    async def _run_parse(
+        self, cache_key: str, file_path: str, file_type: FileType
+    ) -> Dict[str, Any]:
+        """Run parse_file_content in the worker pool and cache the result"""
+        loop = asyncio.get_running_loop()
+        try:
+            fields = await loop.run_in_executor(
+                self._get_executor(), parse_file_content, file_path, file_type
+            )
+            fields, size = _freeze(fields)
+            if size <= self.max_cache_bytes:
+                self.parse_cache[cache_key] = (fields, size)
+                self.parse_cache_bytes += size
+                while (
+                    len(self.parse_cache) > self.max_cached_parses
+                    or self.parse_cache_bytes > self.max_cache_bytes
+                ):
+                    _, (_, evicted) = self.parse_cache.popitem(last=False)
+                    self.parse_cache_bytes -= evicted
+            return fields
+        finally:
+            self._parse_tasks.pop(cache_key, None)
+
     async def parse_file(self, file_id: str) -> ParsedContent:
         """
         Parse a file and extract content
@@ -410,7 +710,7 @@ class FileManager:
         if not metadata:
             raise ValueError(f"File {file_id} not found")
 
-        file_path = os.path.join(self.storage_path, f"{file_id}_{metadata.filename}")
+        file_path = self._blob_path(metadata.hash_sha256)
 
         parsed = ParsedContent(
             file_id=file_id,
@@ -426,75 +726,12 @@ class FileManager:
         )
 
         try:
-            # Read file content
-            with open(file_path, "rb") as f:
-                content = f.read()
-
-            parser = FileParser()
-
-            # Parse based on file type
-            if metadata.file_type == FileType.TXT:
-                text = parser.parse_text(content)
-                parsed.text_content = text
-                parsed.word_count = len(text.split())
-
-            elif metadata.file_type == FileType.JSON:
-                data = parser.parse_json(content)
-                parsed.structured_data = data
-                parsed.text_content = str(data)
-
-            elif metadata.file_type == FileType.CSV:
-                data = parser.parse_csv(content)
-                parsed.structured_data = {"rows": data}
-                parsed.text_content = str(data)
-
-            elif metadata.file_type == FileType.XML:
-                data = parser.parse_xml(content)
-                parsed.structured_data = data
-                parsed.text_content = str(data)
-
-            elif metadata.file_type == FileType.PDF:
-                data = parser.parse_pdf(file_path)
-                parsed.text_content = data.get("text")
-                parsed.page_count = data.get("page_count")
-                parsed.metadata = data.get("metadata", {})
-                if parsed.text_content:
-                    parsed.word_count = len(parsed.text_content.split())
-
-            elif metadata.file_type == FileType.DOCX:
-                data = parser.parse_docx(file_path)
-                parsed.text_content = data.get("text")
-                parsed.structured_data = {"tables": data.get("tables", [])}
-                if parsed.text_content:
-                    parsed.word_count = len(parsed.text_content.split())
-
-            elif metadata.file_type == FileType.XLSX:
-                data = parser.parse_xlsx(file_path)
-                parsed.structured_data = data
-                parsed.text_content = str(data)
-
-            elif metadata.file_type == FileType.MARKDOWN:
-                data = parser.parse_markdown(content)
-                parsed.text_content = data.get("text")
-                parsed.structured_data = {"headers": data.get("headers", [])}
-                if parsed.text_content:
-                    parsed.word_count = len(parsed.text_content.split())
-
-            elif metadata.file_type == FileType.HTML:
-                data = parser.parse_html(content)
-                parsed.text_content = data.get("text")
-                parsed.structured_data = {
-                    "links": data.get("links", []),
-                    "images": data.get("images", []),
-                }
-                parsed.metadata = {"title": data.get("title")}
-                if parsed.text_content:
-                    parsed.word_count = len(parsed.text_content.split())
-
-            else:
-                parsed.text_content = (
-                    f"Parsing not supported for {metadata.file_type.value}"
-                )
+            # Parse in the worker pool; identical content is parsed once
+            fields = await self._parse_by_hash(
+                metadata.hash_sha256, file_path, metadata.file_type
+            )
+            for name, value in fields.items():
+                setattr(parsed, name, value)
 
             parsed.status = ParsingStatus.COMPLETED
             parsed.parsed_at = datetime.now()
@@ -521,11 +758,20 @@ class FileManager:
         if not metadata:
             raise ValueError(f"File {file_id} not found")
 
-        file_path = os.path.join(self.storage_path, f"{file_id}_{metadata.filename}")
+        digest = metadata.hash_sha256
 
         try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            # Remove the blob once no file references it
+            refs = self.blob_refs.get(digest, 1) - 1
+            if refs <= 0:
+                self.blob_refs.pop(digest, None)
+                blob_path = self._blob_path(digest)
+                if os.path.exists(blob_path):
+                    os.remove(blob_path)
+                for key in [k for k in self.parse_cache if k.startswith(digest)]:
+                    self.parse_cache_bytes -= self.parse_cache.pop(key)[1]
+            else:
+                self.blob_refs[digest] = refs
 
             del self.files[file_id]
 
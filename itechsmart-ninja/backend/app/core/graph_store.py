@@ -0,0 +1,532 @@
+"""
+Compact Graph Store for iTechSmart Ninja
+Integer-id CSR adjacency, bidirectional BFS, union-find components and a
+trigram name index backing the knowledge graph
+"""
+
+import base64
+import logging
+from array import array
+from collections import defaultdict
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Compact when pending (delta + deleted) edges exceed this share of live edges
+COMPACTION_RATIO = 0.25
+MIN_COMPACTION_EDGES = 1024
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Return the set of character trigrams of a lowercased string"""
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _encode(values: array) -> str:
+    return base64.b64encode(values.tobytes()).decode("ascii")
+
+
+def _decode(typecode: str, data: str) -> array:
+    values = array(typecode)
+    values.frombytes(base64.b64decode(data))
+    return values
+
+
+class GraphStore:
+    """
+    Directed multigraph keyed by string ids, stored as integer ids
+
+    Edges live in flat arrays (source, target, weight). Adjacency is a
+    compressed sparse row (CSR) index rebuilt lazily; edges added since the
+    last rebuild sit in small per-node delta lists and deletions are
+    tombstones, so mutations are O(1) and reads never copy adjacency lists.
+    """
+
+    def __init__(self):
+        # Nodes
+        self._node_keys: List[Optional[str]] = []
+        self._node_index: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._out_degree = array("l")
+        self._in_degree = array("l")
+        self._trigram_index: Dict[str, Set[int]] = defaultdict(set)
+
+        # Edges
+        self._edge_keys: List[Optional[str]] = []
+        self._edge_index: Dict[str, int] = {}
+        self._src = array("l")
+        self._dst = array("l")
+        self._weight = array("d")
+        self._edge_alive = bytearray()
+        self._live_edges = 0
+
+        # CSR adjacency covering nodes < _csr_nodes and edges < _csr_edges
+        self._csr_nodes = 0
+        self._csr_edges = 0
+        self._out_offsets = array("l", [0])
+        self._out_edges = array("l")
+        self._in_offsets = array("l", [0])
+        self._in_edges = array("l")
+        self._out_delta: Dict[int, List[int]] = {}
+        self._in_delta: Dict[int, List[int]] = {}
+        self._pending = 0
+
+        self._version = 0
+        self._components: Optional[Tuple[int, List[List[int]]]] = None
+
+    # ------------------------------------------------------------------
+    # Nodes
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._node_index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._node_index
+
+    @property
+    def edge_count(self) -> int:
+        return self._live_edges
+
+    def add_node(self, key: str, name: str = "") -> int:
+        """Register a node and index its name"""
+        if key in self._node_index:
+            raise ValueError(f"Node {key} already exists")
+
+        node = len(self._node_keys)
+        self._node_keys.append(key)
+        self._node_index[key] = node
+        self._out_degree.append(0)
+        self._in_degree.append(0)
+
+        name = name.lower()
+        self._names.append(name)
+        for gram in _trigrams(name):
+            self._trigram_index[gram].add(node)
+
+        self._version += 1
+        return node
+
+    def rename_node(self, key: str, name: str):
+        """Re-index a node under a new name"""
+        node = self._node_index[key]
+        old = self._names[node]
+        name = name.lower()
+        for gram in _trigrams(old) - _trigrams(name):
+            postings = self._trigram_index.get(gram)
+            if postings is not None:
+                postings.discard(node)
+                if not postings:
+                    del self._trigram_index[gram]
+        for gram in _trigrams(name) - _trigrams(old):
+            self._trigram_index[gram].add(node)
+        self._names[node] = name
+
+    def remove_node(self, key: str):
+        """Remove a node; its incident edges must already be removed"""
+        node = self._node_index[key]
+        if self._out_degree[node] or self._in_degree[node]:
+            raise ValueError(f"Node {key} still has relationships")
+        del self._node_index[key]
+
+        for gram in _trigrams(self._names[node]):
+            postings = self._trigram_index.get(gram)
+            if postings is not None:
+                postings.discard(node)
+                if not postings:
+                    del self._trigram_index[gram]
+
+        self._node_keys[node] = None
+        self._names[node] = ""
+        self._out_delta.pop(node, None)
+        self._in_delta.pop(node, None)
+        self._version += 1
+
+    def degree(self, key: str) -> int:
+        node = self._node_index[key]
+        return self._out_degree[node] + self._in_degree[node]
+
+    def node_keys(self) -> Iterator[str]:
+        """Iterate live node keys in insertion order"""
+        return (key for key in self._node_keys if key is not None)
+
+    # ------------------------------------------------------------------
+    # Edges
+    # ------------------------------------------------------------------
+
+    def add_edge(self, key: str, source: str, target: str, weight: float = 1.0) -> int:
+        """Add a directed edge between two existing nodes"""
+        if key in self._edge_index:
+            raise ValueError(f"Edge {key} already exists")
+
+        src = self._node_index[source]
+        dst = self._node_index[target]
+
+        edge = len(self._edge_keys)
+        self._edge_keys.append(key)
+        self._edge_index[key] = edge
+        self._src.append(src)
+        self._dst.append(dst)
+        self._weight.append(weight)
+        self._edge_alive.append(1)
+
+        self._out_delta.setdefault(src, []).append(edge)
+        self._in_delta.setdefault(dst, []).append(edge)
+        self._out_degree[src] += 1
+        self._in_degree[dst] += 1
+
+        self._live_edges += 1
+        self._pending += 1
+        self._version += 1
+        return edge
+
+    def remove_edge(self, key: str):
+        """Tombstone an edge in O(1)"""
+        edge = self._edge_index.pop(key)
+        self._edge_alive[edge] = 0
+        self._edge_keys[edge] = None
+        self._out_degree[self._src[edge]] -= 1
+        self._in_degree[self._dst[edge]] -= 1
+
+        self._live_edges -= 1
+        self._pending += 1
+        self._version += 1
+
+    def edge_weight(self, key: str) -> float:
+        return self._weight[self._edge_index[key]]
+
+    def set_edge_weight(self, key: str, weight: float):
+        self._weight[self._edge_index[key]] = weight
+
+    def incident_edges(self, key: str) -> List[str]:
+        """Keys of all edges touching a node (self-loops reported once)"""
+        node = self._node_index[key]
+        edges = list(self._iter_out(node))
+        edges.extend(e for e in self._iter_in(node) if self._src[e] != node)
+        return [self._edge_keys[e] for e in edges]
+
+    def neighbors(
+        self,
+        key: str,
+        direction: str = "both",
+        edge_filter: Optional[Callable[[str], bool]] = None,
+    ) -> List[str]:
+        """Distinct neighbor keys in the given direction"""
+        node = self._node_index[key]
+        seen: Dict[int, None] = {}
+
+        if direction in ("outgoing", "both"):
+            for edge in self._iter_out(node):
+                if edge_filter is None or edge_filter(self._edge_keys[edge]):
+                    seen[self._dst[edge]] = None
+        if direction in ("incoming", "both"):
+            for edge in self._iter_in(node):
+                if edge_filter is None or edge_filter(self._edge_keys[edge]):
+                    seen[self._src[edge]] = None
+
+        return [self._node_keys[n] for n in seen]
+
+    def _iter_out(self, node: int) -> Iterator[int]:
+        alive = self._edge_alive
+        if node < self._csr_nodes:
+            edges = self._out_edges
+            for i in range(self._out_offsets[node], self._out_offsets[node + 1]):
+                edge = edges[i]
+                if alive[edge]:
+                    yield edge
+        for edge in self._out_delta.get(node, ()):
+            if alive[edge]:
+                yield edge
+
+    def _iter_in(self, node: int) -> Iterator[int]:
+        alive = self._edge_alive
+        if node < self._csr_nodes:
+            edges = self._in_edges
+            for i in range(self._in_offsets[node], self._in_offsets[node + 1]):
+                edge = edges[i]
+                if alive[edge]:
+                    yield edge
+        for edge in self._in_delta.get(node, ()):
+            if alive[edge]:
+                yield edge
+
+    # ------------------------------------------------------------------
+    # CSR maintenance
+    # ------------------------------------------------------------------
+
+    def maybe_compact(self):
+        """Rebuild the CSR index once enough edits have accumulated"""
+        threshold = max(MIN_COMPACTION_EDGES, int(self._live_edges * COMPACTION_RATIO))
+        if self._pending > threshold:
+            self.compact()
+
+    def compact(self):
+        """Drop tombstoned edges and rebuild both CSR indexes"""
+        if self._live_edges != len(self._edge_keys):
+            keep = [e for e in range(len(self._edge_keys)) if self._edge_alive[e]]
+            self._edge_keys = [self._edge_keys[e] for e in keep]
+            self._src = array("l", (self._src[e] for e in keep))
+            self._dst = array("l", (self._dst[e] for e in keep))
+            self._weight = array("d", (self._weight[e] for e in keep))
+            self._edge_alive = bytearray(b"\x01") * len(keep)
+            self._edge_index = {key: i for i, key in enumerate(self._edge_keys)}
+
+        node_count = len(self._node_keys)
+        self._out_offsets, self._out_edges = self._build_csr(self._src, node_count)
+        self._in_offsets, self._in_edges = self._build_csr(self._dst, node_count)
+        self._csr_nodes = node_count
+        self._csr_edges = len(self._edge_keys)
+        self._out_delta = {}
+        self._in_delta = {}
+        self._pending = 0
+
+    @staticmethod
+    def _build_csr(endpoints: array, node_count: int) -> Tuple[array, array]:
+        """Counting sort of edge ids by endpoint"""
+        offsets = array("l", bytes(array("l").itemsize * (node_count + 1)))
+        for node in endpoints:
+            offsets[node + 1] += 1
+        for i in range(node_count):
+            offsets[i + 1] += offsets[i]
+
+        cursor = offsets[:-1]
+        edges = array("l", bytes(array("l").itemsize * len(endpoints)))
+        for edge, node in enumerate(endpoints):
+            edges[cursor[node]] = edge
+            cursor[node] += 1
+        return offsets, edges
+
+    # ------------------------------------------------------------------
+    # Traversal
+    # ------------------------------------------------------------------
+
+    def shortest_path(
+        self, source: str, target: str, max_depth: int
+    ) -> Optional[Tuple[List[str], List[str], float]]:
+        """
+        Directed shortest path via bidirectional BFS
+
+        Returns (node keys, edge keys, total weight) or None when no path
+        of at most ``max_depth`` edges exists.
+        """
+        start = self._node_index.get(source)
+        goal = self._node_index.get(target)
+        if start is None or goal is None:
+            return None
+        if start == goal:
+            return [source], [], 0.0
+
+        self.maybe_compact()
+
+        # node -> (parent node, edge) on each side
+        forward: Dict[int, Tuple[int, int]] = {start: (-1, -1)}
+        backward: Dict[int, Tuple[int, int]] = {goal: (-1, -1)}
+        forward_frontier = [start]
+        backward_frontier = [goal]
+        depth = 0
+
+        while forward_frontier and backward_frontier and depth < max_depth:
+            depth += 1
+            expand_forward = len(forward_frontier) <= len(backward_frontier)
+            meeting = None
+
+            if expand_forward:
+                next_frontier = []
+                for node in forward_frontier:
+                    for edge in self._iter_out(node):
+                        nxt = self._dst[edge]
+                        if nxt in forward:
+                            continue
+                        forward[nxt] = (node, edge)
+                        if nxt in backward:
+                            meeting = nxt
+                            break
+                        next_frontier.append(nxt)
+                    if meeting is not None:
+                        break
+                forward_frontier = next_frontier
+            else:
+                next_frontier = []
+                for node in backward_frontier:
+                    for edge in self._iter_in(node):
+                        prev = self._src[edge]
+                        if prev in backward:
+                            continue
+                        backward[prev] = (node, edge)
+                        if prev in forward:
+                            meeting = prev
+                            break
+                        next_frontier.append(prev)
+                    if meeting is not None:
+                        break
+                backward_frontier = next_frontier
+
+            if meeting is not None:
+                return self._join_path(meeting, forward, backward)
+
+        return None
+
+    def _join_path(
+        self,
+        meeting: int,
+        forward: Dict[int, Tuple[int, int]],
+        backward: Dict[int, Tuple[int, int]],
+    ) -> Tuple[List[str], List[str], float]:
+        nodes: List[int] = []
+        edges: List[int] = []
+
+        node = meeting
+        while node != -1:
+            nodes.append(node)
+            parent, edge = forward[node]
+            if edge != -1:
+                edges.append(edge)
+            node = parent
+        nodes.reverse()
+        edges.reverse()
+
+        parent, edge = backward[meeting]
+        while edge != -1:
+            edges.append(edge)
+            nodes.append(parent)
+            parent, edge = backward[parent]
+
+        return (
+            [self._node_keys[n] for n in nodes],
+            [self._edge_keys[e] for e in edges],
+            sum(self._weight[e] for e in edges),
+        )
+
+    def connected_components(self) -> List[List[str]]:
+        """Weakly connected components via union-find, cached per version"""
+        if self._components is None or self._components[0] != self._version:
+            self._components = (self._version, self._union_find())
+        return [[self._node_keys[n] for n in comp] for comp in self._components[1]]
+
+    def _union_find(self) -> List[List[int]]:
+        parent = array("l", range(len(self._node_keys)))
+        size = array("l", [1]) * len(self._node_keys)
+
+        def find(x: int) -> int:
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        alive = self._edge_alive
+        for edge in range(len(self._edge_keys)):
+            if not alive[edge]:
+                continue
+            a = find(self._src[edge])
+            b = find(self._dst[edge])
+            if a == b:
+                continue
+            if size[a] < size[b]:
+                a, b = b, a
+            parent[b] = a
+            size[a] += size[b]
+
+        groups: Dict[int, List[int]] = {}
+        for node, key in enumerate(self._node_keys):
+            if key is not None:
+                groups.setdefault(find(node), []).append(node)
+        return list(groups.values())
+
+    # ------------------------------------------------------------------
+    # Name search
+    # ------------------------------------------------------------------
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        node_filter: Optional[Callable[[str], bool]] = None,
+    ) -> List[str]:
+        """Substring search over node names using the trigram index"""
+        query = query.lower()
+
+        if len(query) < 3:
+            candidates = (n for n, key in enumerate(self._node_keys) if key is not None)
+        else:
+            postings = []
+            for gram in _trigrams(query):
+                nodes = self._trigram_index.get(gram)
+                if not nodes:
+                    return []
+                postings.append(nodes)
+            postings.sort(key=len)
+            matched = set(postings[0])
+            for nodes in postings[1:]:
+                matched &= nodes
+                if not matched:
+                    return []
+            candidates = sorted(matched)
+
+        results = []
+        for node in candidates:
+            if query not in self._names[node]:
+                continue
+            key = self._node_keys[node]
+            if node_filter is not None and not node_filter(key):
+                continue
+            results.append(key)
+            if len(results) >= limit:
+                break
+        return results
+
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+
+    def to_snapshot(self) -> Dict[str, object]:
+        """Serialize the compacted store, CSR arrays included"""
+        self.compact()
+        return {
+            "node_keys": self._node_keys,
+            "names": self._names,
+            "edge_keys": self._edge_keys,
+            "src": _encode(self._src),
+            "dst": _encode(self._dst),
+            "weight": _encode(self._weight),
+            "out_offsets": _encode(self._out_offsets),
+            "out_edges": _encode(self._out_edges),
+            "in_offsets": _encode(self._in_offsets),
+            "in_edges": _encode(self._in_edges),
+        }
+
+    @classmethod
+    def from_snapshot(cls, data: Dict[str, object]) -> "GraphStore":
+        """Restore a store without re-sorting adjacency"""
+        store = cls()
+        store._node_keys = list(data["node_keys"])
+        store._names = list(data["names"])
+        store._node_index = {
+            key: n for n, key in enumerate(store._node_keys) if key is not None
+        }
+        store._edge_keys = list(data["edge_keys"])
+        store._edge_index = {key: e for e, key in enumerate(store._edge_keys)}
+        store._src = _decode("l", data["src"])
+        store._dst = _decode("l", data["dst"])
+        store._weight = _decode("d", data["weight"])
+        store._edge_alive = bytearray(b"\x01") * len(store._edge_keys)
+        store._live_edges = len(store._edge_keys)
+
+        store._out_offsets = _decode("l", data["out_offsets"])
+        store._out_edges = _decode("l", data["out_edges"])
+        store._in_offsets = _decode("l", data["in_offsets"])
+        store._in_edges = _decode("l", data["in_edges"])
+        store._csr_nodes = len(store._node_keys)
+        store._csr_edges = len(store._edge_keys)
+
+        for node in range(len(store._node_keys)):
+            store._out_degree.append(
+                store._out_offsets[node + 1] - store._out_offsets[node]
+            )
+            store._in_degree.append(
+                store._in_offsets[node + 1] - store._in_offsets[node]
+            )
+        for node, name in enumerate(store._names):
+            if store._node_keys[node] is not None:
+                for gram in _trigrams(name):
+                    store._trigram_index[gram].add(node)
+        return store
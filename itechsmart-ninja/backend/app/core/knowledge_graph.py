@@ -3,13 +3,18 @@ Knowledge Graph Integration for iTechSmart Ninja
 Provides entity extraction, relationship mapping, and graph-based knowledge management
 """
 
+import gzip
+import heapq
+import json
 import logging
+import os
 import uuid
 from typing import Dict, List, Optional, Any, Set, Tuple
 from datetime import datetime
 from dataclasses import dataclass, asdict, field
 from enum import Enum
-import json
+
+from .graph_store import GraphStore
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +74,19 @@ class Entity:
             "created_by": self.created_by,
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Entity":
+        return cls(
+            entity_id=data["entity_id"],
+            name=data["name"],
+            entity_type=EntityType(data["entity_type"]),
+            properties=data["properties"],
+            metadata=data["metadata"],
+            created_at=datetime.fromisoformat(data["created_at"]),
+            updated_at=datetime.fromisoformat(data["updated_at"]),
+            created_by=data["created_by"],
+        )
+
 
 @dataclass
 class Relationship:
@@ -97,6 +115,20 @@ class Relationship:
             "created_by": self.created_by,
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Relationship":
+        return cls(
+            relationship_id=data["relationship_id"],
+            source_id=data["source_id"],
+            target_id=data["target_id"],
+            relation_type=RelationType(data["relation_type"]),
+            properties=data["properties"],
+            weight=data["weight"],
+            created_at=datetime.fromisoformat(data["created_at"]),
+            updated_at=datetime.fromisoformat(data["updated_at"]),
+            created_by=data["created_by"],
+        )
+
 
 @dataclass
 class GraphPath:
@@ -172,9 +204,8 @@ class KnowledgeGraph:
         """Initialize knowledge graph"""
         self.entities: Dict[str, Entity] = {}
         self.relationships: Dict[str, Relationship] = {}
-        # Adjacency lists for efficient graph traversal
-        self.outgoing: Dict[str, List[str]] = {}  # entity_id -> [relationship_ids]
-        self.incoming: Dict[str, List[str]] = {}  # entity_id -> [relationship_ids]
+        # Integer-id CSR adjacency and name index for traversal and search
+        self.store = GraphStore()
         logger.info("KnowledgeGraph initialized successfully")
 
     async def create_entity(
@@ -212,8 +243,7 @@ class KnowledgeGraph:
         )
 
         self.entities[entity_id] = entity
-        self.outgoing[entity_id] = []
-        self.incoming[entity_id] = []
+        self.store.add_node(entity_id, name)
 
         logger.info(f"Entity {entity_id} created: {name}")
         return entity
@@ -261,10 +291,7 @@ class KnowledgeGraph:
         )
 
         self.relationships[relationship_id] = relationship
-
-        # Update adjacency lists
-        self.outgoing[source_id].append(relationship_id)
-        self.incoming[target_id].append(relationship_id)
+        self.store.add_edge(relationship_id, source_id, target_id, relationship.weight)
 
         logger.info(
             f"Relationship {relationship_id} created: {source_id} -> {target_id}"
@@ -279,6 +306,7 @@ class KnowledgeGraph:
 
         if "name" in updates:
             entity.name = updates["name"]
+            self.store.rename_node(entity_id, entity.name)
         if "properties" in updates:
             entity.properties.update(updates["properties"])
         if "metadata" in updates:
@@ -295,23 +323,12 @@ class KnowledgeGraph:
             raise ValueError(f"Entity {entity_id} not found")
 
         # Delete all relationships involving this entity
-        relationships_to_delete = []
-
-        # Outgoing relationships
-        for rel_id in self.outgoing.get(entity_id, []):
-            relationships_to_delete.append(rel_id)
-
-        # Incoming relationships
-        for rel_id in self.incoming.get(entity_id, []):
-            relationships_to_delete.append(rel_id)
-
-        for rel_id in relationships_to_delete:
+        for rel_id in self.store.incident_edges(entity_id):
             await self.delete_relationship(rel_id)
 
         # Delete entity
         del self.entities[entity_id]
-        del self.outgoing[entity_id]
-        del self.incoming[entity_id]
+        self.store.remove_node(entity_id)
 
         logger.info(f"Entity {entity_id} deleted")
         return True
@@ -321,13 +338,8 @@ class KnowledgeGraph:
         if relationship_id not in self.relationships:
             raise ValueError(f"Relationship {relationship_id} not found")
 
-        relationship = self.relationships[relationship_id]
-
-        # Remove from adjacency lists
-        self.outgoing[relationship.source_id].remove(relationship_id)
-        self.incoming[relationship.target_id].remove(relationship_id)
-
-        # Delete relationship
+        # Tombstone in the adjacency index, then delete relationship
+        self.store.remove_edge(relationship_id)
         del self.relationships[relationship_id]
 
         logger.info(f"Relationship {relationship_id} deleted")
@@ -351,20 +363,12 @@ class KnowledgeGraph:
         Returns:
             List of matching entities
         """
-        query_lower = query.lower()
-        results = []
-
-        for entity in self.entities.values():
-            if entity_type and entity.entity_type != entity_type:
-                continue
+        type_filter = None
+        if entity_type:
+            type_filter = lambda eid: self.entities[eid].entity_type == entity_type
 
-            if query_lower in entity.name.lower():
-                results.append(entity)
-
-            if len(results) >= limit:
-                break
-
-        return results
+        matches = self.store.search(query, limit, type_filter)
+        return [self.entities[eid] for eid in matches]
 
     async def get_neighbors(
         self,
@@ -386,22 +390,13 @@ class KnowledgeGraph:
         if entity_id not in self.entities:
             raise ValueError(f"Entity {entity_id} not found")
 
-        neighbor_ids = set()
-
-        # Outgoing relationships
-        if direction in ["outgoing", "both"]:
-            for rel_id in self.outgoing.get(entity_id, []):
-                rel = self.relationships[rel_id]
-                if relation_type is None or rel.relation_type == relation_type:
-                    neighbor_ids.add(rel.target_id)
-
-        # Incoming relationships
-        if direction in ["incoming", "both"]:
-            for rel_id in self.incoming.get(entity_id, []):
-                rel = self.relationships[rel_id]
-                if relation_type is None or rel.relation_type == relation_type:
-                    neighbor_ids.add(rel.source_id)
+        relation_filter = None
+        if relation_type is not None:
+            relation_filter = (
+                lambda rid: self.relationships[rid].relation_type == relation_type
+            )
 
+        neighbor_ids = self.store.neighbors(entity_id, direction, relation_filter)
         return [self.entities[nid] for nid in neighbor_ids]
 
     async def find_path(
@@ -431,43 +426,20 @@ class KnowledgeGraph:
                 length=0,
             )
 
-        # BFS
-        queue = [(start_id, [start_id], [], 0.0)]
-        visited = {start_id}
-
-        while queue:
-            current_id, path, rels, weight = queue.pop(0)
-
-            if len(path) > max_depth:
-                continue
+        # Bidirectional BFS over the CSR index
+        found = self.store.shortest_path(start_id, end_id, max_depth)
+        if found is None:
+            return None
 
-            # Check outgoing relationships
-            for rel_id in self.outgoing.get(current_id, []):
-                rel = self.relationships[rel_id]
-                next_id = rel.target_id
-
-                if next_id == end_id:
-                    return GraphPath(
-                        start_entity_id=start_id,
-                        end_entity_id=end_id,
-                        path=path + [next_id],
-                        relationships=rels + [rel_id],
-                        total_weight=weight + rel.weight,
-                        length=len(path),
-                    )
-
-                if next_id not in visited:
-                    visited.add(next_id)
-                    queue.append(
-                        (
-                            next_id,
-                            path + [next_id],
-                            rels + [rel_id],
-                            weight + rel.weight,
-                        )
-                    )
-
-        return None
+        path, relationships, total_weight = found
+        return GraphPath(
+            start_entity_id=start_id,
+            end_entity_id=end_id,
+            path=path,
+            relationships=relationships,
+            total_weight=total_weight,
+            length=len(relationships),
+        )
 
     async def find_clusters(
         self, min_size: int = 3, max_clusters: int = 10
@@ -482,48 +454,24 @@ class KnowledgeGraph:
         Returns:
             List of clusters
         """
-        # Simple clustering based on connectivity
-        visited = set()
+        # Connected components via union-find
         clusters = []
 
-        for entity_id in self.entities:
-            if entity_id in visited:
+        for component in self.store.connected_components():
+            if len(component) < min_size:
                 continue
 
-            # BFS to find connected component
-            cluster_entities = []
-            queue = [entity_id]
-            component_visited = {entity_id}
-
-            while queue:
-                current_id = queue.pop(0)
-                cluster_entities.append(current_id)
-
-                # Get neighbors
-                neighbors = await self.get_neighbors(current_id, "both")
-                for neighbor in neighbors:
-                    if neighbor.entity_id not in component_visited:
-                        component_visited.add(neighbor.entity_id)
-                        queue.append(neighbor.entity_id)
-
-            visited.update(component_visited)
-
-            if len(cluster_entities) >= min_size:
-                # Find center (most connected entity)
-                center_id = max(
-                    cluster_entities,
-                    key=lambda eid: len(self.outgoing.get(eid, []))
-                    + len(self.incoming.get(eid, [])),
-                )
+            # Find center (most connected entity)
+            center_id = max(component, key=self.store.degree)
 
-                cluster = GraphCluster(
-                    cluster_id=str(uuid.uuid4()),
-                    name=f"Cluster {len(clusters) + 1}",
-                    entities=cluster_entities,
-                    center_entity_id=center_id,
-                    cohesion_score=len(cluster_entities) / len(self.entities),
-                )
-                clusters.append(cluster)
+            cluster = GraphCluster(
+                cluster_id=str(uuid.uuid4()),
+                name=f"Cluster {len(clusters) + 1}",
+                entities=component,
+                center_entity_id=center_id,
+                cohesion_score=len(component) / len(self.entities),
+            )
+            clusters.append(cluster)
 
             if len(clusters) >= max_clusters:
                 break
@@ -543,12 +491,9 @@ class KnowledgeGraph:
             relation_type_counts[rel_type] = relation_type_counts.get(rel_type, 0) + 1
 
         # Calculate connections per entity
-        connection_counts = []
-        for entity_id in self.entities:
-            connections = len(self.outgoing.get(entity_id, [])) + len(
-                self.incoming.get(entity_id, [])
-            )
-            connection_counts.append((entity_id, connections))
+        connection_counts = [
+            (entity_id, self.store.degree(entity_id)) for entity_id in self.entities
+        ]
 
         avg_connections = (
             sum(c for _, c in connection_counts) / len(self.entities)
@@ -557,9 +502,7 @@ class KnowledgeGraph:
         )
 
         # Most connected entities
-        most_connected = sorted(connection_counts, key=lambda x: x[1], reverse=True)[
-            :10
-        ]
+        most_connected = heapq.nlargest(10, connection_counts, key=lambda x: x[1])
 
         return GraphStats(
             total_entities=len(self.entities),
@@ -582,36 +525,25 @@ class KnowledgeGraph:
         try:
             # Import entities
             for entity_data in data.get("entities", []):
-                entity = Entity(
-                    entity_id=entity_data["entity_id"],
-                    name=entity_data["name"],
-                    entity_type=EntityType(entity_data["entity_type"]),
-                    properties=entity_data["properties"],
-                    metadata=entity_data["metadata"],
-                    created_at=datetime.fromisoformat(entity_data["created_at"]),
-                    updated_at=datetime.fromisoformat(entity_data["updated_at"]),
-                    created_by=entity_data["created_by"],
-                )
+                entity = Entity.from_dict(entity_data)
+                if entity.entity_id in self.store:
+                    self.store.rename_node(entity.entity_id, entity.name)
+                else:
+                    self.store.add_node(entity.entity_id, entity.name)
                 self.entities[entity.entity_id] = entity
-                self.outgoing[entity.entity_id] = []
-                self.incoming[entity.entity_id] = []
 
             # Import relationships
             for rel_data in data.get("relationships", []):
-                rel = Relationship(
-                    relationship_id=rel_data["relationship_id"],
-                    source_id=rel_data["source_id"],
-                    target_id=rel_data["target_id"],
-                    relation_type=RelationType(rel_data["relation_type"]),
-                    properties=rel_data["properties"],
-                    weight=rel_data["weight"],
-                    created_at=datetime.fromisoformat(rel_data["created_at"]),
-                    updated_at=datetime.fromisoformat(rel_data["updated_at"]),
-                    created_by=rel_data["created_by"],
-                )
+                rel = Relationship.from_dict(rel_data)
+                if rel.relationship_id in self.relationships:
+                    self.store.remove_edge(rel.relationship_id)
                 self.relationships[rel.relationship_id] = rel
-                self.outgoing[rel.source_id].append(rel.relationship_id)
-                self.incoming[rel.target_id].append(rel.relationship_id)
+                self.store.add_edge(
+                    rel.relationship_id, rel.source_id, rel.target_id, rel.weight
+                )
+
+            # Build the CSR index once for the whole batch
+            self.store.compact()
 
             logger.info("Graph imported successfully")
             return True
@@ -620,6 +552,64 @@ class KnowledgeGraph:
             logger.error(f"Failed to import graph: {e}")
             raise
 
+    async def save_snapshot(self, path: str) -> int:
+        """
+        Persist graph records and adjacency arrays to a gzip snapshot
+
+        Args:
+            path: Snapshot file path
+
+        Returns:
+            Size of the written snapshot in bytes
+        """
+        data = await self.export_graph()
+        data["store"] = self.store.to_snapshot()
+
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+        size = os.path.getsize(path)
+        logger.info(f"Graph snapshot saved to {path} ({size} bytes)")
+        return size
+
+    async def load_snapshot(self, path: str) -> bool:
+        """
+        Replace the graph with a snapshot written by save_snapshot
+
+        Args:
+            path: Snapshot file path
+
+        Returns:
+            True on success
+        """
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+
+        graph = KnowledgeGraph()
+        if "store" not in data:
+            await graph.import_graph(data)
+        else:
+            for entity_data in data.get("entities", []):
+                entity = Entity.from_dict(entity_data)
+                graph.entities[entity.entity_id] = entity
+            for rel_data in data.get("relationships", []):
+                rel = Relationship.from_dict(rel_data)
+                graph.relationships[rel.relationship_id] = rel
+            # Adjacency arrays are restored as-is, no re-sorting needed
+            graph.store = GraphStore.from_snapshot(data["store"])
+
+        self.entities = graph.entities
+        self.relationships = graph.relationships
+        self.store = graph.store
+
+        logger.info(
+            f"Graph snapshot loaded from {path}: {len(self.entities)} entities, "
+            f"{len(self.relationships)} relationships"
+        )
+        return True
+
 
 # Global knowledge graph instance
 _knowledge_graph: Optional[KnowledgeGraph] = None
@@ -0,0 +1,201 @@
+"""
+Retrieval Indexes for iTechSmart Ninja Context Memory
+Incremental BM25 inverted index and timestamp-ordered recency index
+"""
+
+import bisect
+import heapq
+import math
+import re
+from collections import Counter
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class InvertedIndex:
+    """
+    Incremental inverted index with Okapi BM25 scoring
+
+    Postings are updated on every add/remove, so queries only touch the
+    documents that share a term with the query. A query term also matches
+    indexed terms it is a prefix of ("deploy" finds "deployment"), found by
+    bisecting a sorted vocabulary; those matches are scored at
+    ``prefix_weight`` so exact matches rank first.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75, prefix_weight: float = 0.5):
+        self.k1 = k1
+        self.b = b
+        self.prefix_weight = prefix_weight
+        self.postings: Dict[str, Dict[str, int]] = {}  # term -> {doc_id: tf}
+        self.vocabulary: List[str] = []  # sorted postings keys
+        self.doc_terms: Dict[str, Dict[str, int]] = {}  # doc_id -> {term: tf}
+        self.doc_lengths: Dict[str, int] = {}
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self.doc_lengths
+
+    def add(self, doc_id: str, text: str):
+        """Index a document, replacing any previous version"""
+        if doc_id in self.doc_lengths:
+            self.remove(doc_id)
+
+        tokens = tokenize(text)
+        terms = dict(Counter(tokens))
+        for term, tf in terms.items():
+            docs = self.postings.get(term)
+            if docs is None:
+                docs = self.postings[term] = {}
+                bisect.insort(self.vocabulary, term)
+            docs[doc_id] = tf
+
+        self.doc_terms[doc_id] = terms
+        self.doc_lengths[doc_id] = len(tokens)
+        self.total_length += len(tokens)
+
+    def remove(self, doc_id: str):
+        """Drop a document from all postings"""
+        terms = self.doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+
+        for term in terms:
+            docs = self.postings.get(term)
+            if docs is not None:
+                docs.pop(doc_id, None)
+                if not docs:
+                    del self.postings[term]
+                    del self.vocabulary[bisect.bisect_left(self.vocabulary, term)]
+
+        self.total_length -= self.doc_lengths.pop(doc_id)
+
+    def clear(self):
+        self.postings.clear()
+        self.vocabulary.clear()
+        self.doc_terms.clear()
+        self.doc_lengths.clear()
+        self.total_length = 0
+
+    def score(
+        self, query: str, doc_filter: Optional[Callable[[str], bool]] = None
+    ) -> Dict[str, float]:
+        """BM25 scores for every document matching at least one query term"""
+        doc_count = len(self.doc_lengths)
+        if not doc_count:
+            return {}
+
+        avg_length = self.total_length / doc_count or 1.0
+        k1, b = self.k1, self.b
+        scores: Dict[str, float] = {}
+
+        matched: Dict[str, float] = {}  # indexed term -> weight
+        for query_term in set(tokenize(query)):
+            for term in self.expand(query_term):
+                weight = 1.0 if term == query_term else self.prefix_weight
+                matched[term] = max(matched.get(term, 0.0), weight)
+
+        for term, weight in matched.items():
+            docs = self.postings[term]
+            df = len(docs)
+            idf = weight * math.log(1.0 + (doc_count - df + 0.5) / (df + 0.5))
+
+            for doc_id, tf in docs.items():
+                if doc_filter is not None and not doc_filter(doc_id):
+                    continue
+                norm = k1 * (1.0 - b + b * self.doc_lengths[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (k1 + 1) / (
+                    tf + norm
+                )
+
+        return scores
+
+    def expand(self, prefix: str) -> List[str]:
+        """Indexed terms starting with ``prefix``"""
+        vocabulary = self.vocabulary
+        terms = []
+        index = bisect.bisect_left(vocabulary, prefix)
+        while index < len(vocabulary) and vocabulary[index].startswith(prefix):
+            terms.append(vocabulary[index])
+            index += 1
+        return terms
+
+    def top(
+        self,
+        query: str,
+        limit: int,
+        doc_filter: Optional[Callable[[str], bool]] = None,
+        tie_breaker: Optional[Callable[[str], object]] = None,
+    ) -> List[Tuple[str, float]]:
+        """Highest scoring (doc_id, score) pairs"""
+        scores = self.score(query, doc_filter)
+        if tie_breaker is None:
+            return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return heapq.nlargest(
+            limit, scores.items(), key=lambda item: (item[1], tie_breaker(item[0]))
+        )
+
+
+class RecencyIndex:
+    """
+    Timestamp-ordered index of ids
+
+    In-order inserts append in O(1); out-of-order inserts (imports) use
+    bisection. Removals are lazy and the list is compacted once half of it
+    is stale, so newest-first scans never sort.
+    """
+
+    def __init__(self):
+        self._keys: List[Tuple[datetime, int, str]] = []
+        self._live: Dict[str, Tuple[datetime, int, str]] = {}
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def add(self, item_id: str, timestamp: datetime):
+        if item_id in self._live:
+            self.remove(item_id)
+
+        self._seq += 1
+        key = (timestamp, self._seq, item_id)
+        self._live[item_id] = key
+
+        if not self._keys or self._keys[-1] <= key:
+            self._keys.append(key)
+        else:
+            bisect.insort(self._keys, key)
+
+    def remove(self, item_id: str):
+        if self._live.pop(item_id, None) is None:
+            return
+        if len(self._keys) > 2 * len(self._live) + 64:
+            self._keys = [key for key in self._keys if self._live.get(key[2]) == key]
+
+    def clear(self):
+        self._keys.clear()
+        self._live.clear()
+
+    def newest(self) -> Iterator[str]:
+        """Iterate ids from newest to oldest"""
+        live = self._live
+        for key in reversed(self._keys):
+            if live.get(key[2]) == key:
+                yield key[2]
+
+    def oldest(self) -> Iterator[str]:
+        """Iterate ids from oldest to newest"""
+        live = self._live
+        for key in self._keys:
+            if live.get(key[2]) == key:
+                yield key[2]
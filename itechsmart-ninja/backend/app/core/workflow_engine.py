@@ -6,7 +6,8 @@ Provides workflow creation, execution, and management
 import asyncio
 import logging
 import uuid
-from typing import Dict, List, Optional, Any, Callable
+from collections import deque
+from typing import Deque, Dict, List, Optional, Any, Callable, Set
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict, field
 from enum import Enum
@@ -26,6 +27,13 @@ class WorkflowStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+class ExecutionMode(str, Enum):
+    """Workflow execution modes"""
+
+    SEQUENTIAL = "sequential"  # Follow next_action links one at a time
+    DAG = "dag"  # Run actions concurrently once their dependencies finish
+
+
 class TriggerType(str, Enum):
     """Workflow trigger types"""
 
@@ -90,6 +98,7 @@ class WorkflowAction:
     config: Dict[str, Any]
     next_action: Optional[str] = None
     on_error: Optional[str] = None
+    depends_on: List[str] = field(default_factory=list)  # Upstream IDs (DAG mode)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -99,6 +108,7 @@ class WorkflowAction:
             "config": self.config,
             "next_action": self.next_action,
             "on_error": self.on_error,
+            "depends_on": self.depends_on,
         }
 
 
@@ -149,6 +159,7 @@ class Workflow:
     updated_at: datetime
     version: int = 1
     tags: List[str] = field(default_factory=list)
+    execution_mode: ExecutionMode = ExecutionMode.SEQUENTIAL
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -163,6 +174,7 @@ class Workflow:
             "updated_at": self.updated_at.isoformat(),
             "version": self.version,
             "tags": self.tags,
+            "execution_mode": self.execution_mode.value,
         }
 
 
@@ -176,7 +188,7 @@ class WorkflowExecution:
     started_at: datetime
     completed_at: Optional[datetime]
     trigger_data: Dict[str, Any]
-    execution_log: List[Dict[str, Any]]
+    execution_log: Deque[Dict[str, Any]]  # Bounded; oldest entries dropped
     result: Optional[Dict[str, Any]]
     error_message: Optional[str]
 
@@ -190,20 +202,47 @@ class WorkflowExecution:
                 self.completed_at.isoformat() if self.completed_at else None
             ),
             "trigger_data": self.trigger_data,
-            "execution_log": self.execution_log,
+            "execution_log": list(self.execution_log),
             "result": self.result,
             "error_message": self.error_message,
         }
 
 
+# Default per-action-type concurrency limits shared by all executions
+DEFAULT_CONCURRENCY_LIMITS: Dict[ActionType, int] = {
+    ActionType.HTTP_REQUEST: 20,
+    ActionType.RUN_CODE: 4,
+    ActionType.SEND_EMAIL: 10,
+    ActionType.SEND_NOTIFICATION: 20,
+    ActionType.CREATE_FILE: 10,
+    ActionType.AI_TASK: 5,
+}
+
+
 class WorkflowEngine:
     """Manages workflow creation and execution"""
 
-    def __init__(self):
-        """Initialize workflow engine"""
+    def __init__(
+        self,
+        concurrency_limits: Optional[Dict[ActionType, int]] = None,
+        max_log_entries: int = 1000,
+    ):
+        """
+        Initialize workflow engine
+
+        Args:
+            concurrency_limits: Max concurrent actions per action type
+            max_log_entries: Max execution_log entries kept per execution
+        """
         self.workflows: Dict[str, Workflow] = {}
         self.executions: Dict[str, WorkflowExecution] = {}
         self.action_handlers: Dict[ActionType, Callable] = {}
+        self.concurrency_limits = {
+            **DEFAULT_CONCURRENCY_LIMITS,
+            **(concurrency_limits or {}),
+        }
+        self.max_log_entries = max_log_entries
+        self._semaphores: Dict[ActionType, asyncio.Semaphore] = {}
         self._register_default_handlers()
         logger.info("WorkflowEngine initialized successfully")
 
@@ -230,6 +269,7 @@ class WorkflowEngine:
         actions: List[WorkflowAction],
         created_by: str,
         tags: Optional[List[str]] = None,
+        execution_mode: ExecutionMode = ExecutionMode.SEQUENTIAL,
     ) -> Workflow:
         """
         Create a new workflow
@@ -241,10 +281,14 @@ class WorkflowEngine:
             actions: List of workflow actions
             created_by: User ID
             tags: Optional tags
+            execution_mode: Sequential next_action chain or dependency DAG
 
         Returns:
             Workflow object
         """
+        if execution_mode == ExecutionMode.DAG:
+            self._build_dag(actions)
+
         workflow_id = str(uuid.uuid4())
 
         workflow = Workflow(
@@ -258,6 +302,7 @@ class WorkflowEngine:
             created_at=datetime.now(),
             updated_at=datetime.now(),
             tags=tags or [],
+            execution_mode=execution_mode,
         )
 
         self.workflows[workflow_id] = workflow
@@ -320,7 +365,7 @@ class WorkflowEngine:
             started_at=datetime.now(),
             completed_at=None,
             trigger_data=trigger_data or {},
-            execution_log=[],
+            execution_log=deque(maxlen=self.max_log_entries),
             result=None,
             error_message=None,
         )
@@ -331,73 +376,10 @@ class WorkflowEngine:
             # Execute workflow actions
             context = {"trigger_data": trigger_data or {}}
 
-            # Start with first action
-            current_action_id = (
-                workflow.actions[0].action_id if workflow.actions else None
-            )
-
-            while current_action_id:
-                action = next(
-                    (a for a in workflow.actions if a.action_id == current_action_id),
-                    None,
-                )
-                if not action:
-                    break
-
-                # Log action start
-                execution.execution_log.append(
-                    {
-                        "timestamp": datetime.now().isoformat(),
-                        "action_id": action.action_id,
-                        "action_type": action.action_type.value,
-                        "status": "started",
-                    }
-                )
-
-                try:
-                    # Execute action
-                    handler = self.action_handlers.get(action.action_type)
-                    if handler:
-                        result = await handler(action, context)
-                        context[action.action_id] = result
-
-                        # Log action success
-                        execution.execution_log.append(
-                            {
-                                "timestamp": datetime.now().isoformat(),
-                                "action_id": action.action_id,
-                                "action_type": action.action_type.value,
-                                "status": "completed",
-                                "result": result,
-                            }
-                        )
-
-                        # Move to next action
-                        current_action_id = action.next_action
-                    else:
-                        raise ValueError(
-                            f"No handler for action type: {action.action_type}"
-                        )
-
-                except Exception as e:
-                    logger.error(f"Error executing action {action.action_id}: {e}")
-
-                    # Log action error
-                    execution.execution_log.append(
-                        {
-                            "timestamp": datetime.now().isoformat(),
-                            "action_id": action.action_id,
-                            "action_type": action.action_type.value,
-                            "status": "failed",
-                            "error": str(e),
-                        }
-                    )
-
-                    # Handle error
-                    if action.on_error:
-                        current_action_id = action.on_error
-                    else:
-                        raise
+            if workflow.execution_mode == ExecutionMode.DAG:
+                await self._execute_dag(workflow, execution, context)
+            else:
+                await self._execute_sequential(workflow, execution, context)
 
             # Workflow completed successfully
             execution.status = WorkflowStatus.COMPLETED
@@ -414,6 +396,288 @@ class WorkflowEngine:
 
         return execution
 
+    async def _execute_sequential(
+        self,
+        workflow: Workflow,
+        execution: WorkflowExecution,
+        context: Dict[str, Any],
+    ):
+        """Follow next_action links from the first action"""
+        actions_by_id = {a.action_id: a for a in workflow.actions}
+
+        # Start with first action
+        current_action_id = workflow.actions[0].action_id if workflow.actions else None
+
+        while current_action_id:
+            action = actions_by_id.get(current_action_id)
+            if not action:
+                break
+
+            try:
+                context[action.action_id] = await self._run_action(
+                    action, context, execution
+                )
+                # Move to next action
+                current_action_id = action.next_action
+
+            except Exception:
+                # Handle error
+                if action.on_error:
+                    current_action_id = action.on_error
+                else:
+                    raise
+
+    async def _execute_dag(
+        self,
+        workflow: Workflow,
+        execution: WorkflowExecution,
+        context: Dict[str, Any],
+    ):
+        """
+        Run every action as soon as all of its upstream actions finished
+
+        depends_on parents must all succeed; next_action parents only need
+        one to succeed, so an action reached from both an action and its
+        on_error handler runs on either path. A failed action with an
+        on_error handler schedules that handler; a handler whose actions all
+        succeed is never run. Actions whose upstream can no longer be met are
+        logged as skipped. A failure without a handler cancels in-flight
+        actions and fails the execution.
+        """
+        actions_by_id = {a.action_id: a for a in workflow.actions}
+        upstream, downstream, handlers = self._build_dag(workflow.actions)
+        pending = {aid: len(parents) for aid, parents in upstream.items()}
+        triggers = {handler: 0 for handler in handlers}
+        for action in workflow.actions:
+            if action.on_error in triggers:
+                triggers[action.on_error] += 1
+
+        ready = [aid for aid, count in pending.items() if count == 0]
+        running: Dict[asyncio.Task, str] = {}
+        scheduled: Set[str] = set()
+        succeeded: Set[str] = set()
+        skipped: Set[str] = set()
+
+        def resolve(action_id: str, failed: bool = False):
+            """Release downstream actions once action_id will not run again"""
+            stack = [(action_id, failed)]
+            while stack:
+                parent, parent_failed = stack.pop()
+                on_error = actions_by_id[parent].on_error
+                if on_error in triggers and not parent_failed:
+                    triggers[on_error] -= 1
+                    if triggers[on_error] == 0 and on_error not in scheduled:
+                        # No action can fail into this handler any more
+                        stack.append((on_error, False))
+                for child in downstream.get(parent, ()):
+                    pending[child] -= 1
+                    if pending[child]:
+                        continue
+                    parents = upstream[child]
+                    if all(
+                        parent_id in succeeded
+                        for parent_id, required in parents.items()
+                        if required
+                    ) and (
+                        all(parents.values())
+                        or any(parent_id in succeeded for parent_id in parents)
+                    ):
+                        ready.append(child)
+                    else:
+                        skipped.add(child)
+                        self._log(execution, actions_by_id[child], "skipped")
+                        stack.append((child, False))
+
+        try:
+            while ready or running:
+                for action_id in ready:
+                    if action_id in scheduled:
+                        continue
+                    scheduled.add(action_id)
+                    action = actions_by_id[action_id]
+                    task = asyncio.create_task(
+                        self._run_action(action, context, execution)
+                    )
+                    running[task] = action_id
+                ready = []
+                if not running:
+                    continue
+
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    action_id = running.pop(task)
+                    action = actions_by_id[action_id]
+                    error = task.exception()
+
+                    if error is None:
+                        context[action_id] = task.result()
+                        succeeded.add(action_id)
+                        resolve(action_id)
+                        continue
+
+                    if not action.on_error:
+                        raise error
+
+                    # Route to the error handler; downstream actions that
+                    # needed this one are skipped as their turn comes
+                    ready.append(action.on_error)
+                    resolve(action_id, failed=True)
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        stranded = set(upstream) - scheduled - skipped
+        if stranded:
+            raise RuntimeError(
+                f"Workflow actions never became runnable: {sorted(stranded)}"
+            )
+
+    def _build_dag(self, actions: List[WorkflowAction]):
+        """
+        Build dependency maps for DAG execution
+
+        next_action links count as dependency edges, so sequential
+        workflows also run in DAG mode. Actions referenced only as on_error
+        targets are handlers and run only when triggered. on_error targets
+        must exist, and following dependencies and on_error links together
+        must never lead back to an action.
+
+        Returns:
+            (upstream, downstream, handlers) where upstream maps each
+            scheduled action to its parent IDs, flagged True for depends_on
+            parents that must succeed and False for next_action parents
+        """
+        actions_by_id = {a.action_id: a for a in actions}
+        if len(actions_by_id) != len(actions):
+            raise ValueError("Duplicate action IDs in workflow")
+
+        handlers = {a.on_error for a in actions if a.on_error} - {
+            a.next_action for a in actions if a.next_action
+        }
+        upstream: Dict[str, Dict[str, bool]] = {
+            a.action_id: {} for a in actions if a.action_id not in handlers
+        }
+        downstream: Dict[str, List[str]] = {}
+
+        def link(parent: str, child: str, required: bool):
+            if parent not in actions_by_id:
+                raise ValueError(f"Action {child} depends on unknown action {parent}")
+            if child not in upstream:
+                return
+            if parent not in upstream[child]:
+                downstream.setdefault(parent, []).append(child)
+            upstream[child][parent] = upstream[child].get(parent, False) or required
+
+        for action in actions:
+            for parent in action.depends_on:
+                link(parent, action.action_id, True)
+            if action.next_action:
+                if action.next_action not in actions_by_id:
+                    raise ValueError(
+                        f"Action {action.action_id} links to unknown action "
+                        f"{action.next_action}"
+                    )
+                link(action.action_id, action.next_action, False)
+            if action.on_error and action.on_error not in actions_by_id:
+                raise ValueError(
+                    f"Action {action.action_id} routes errors to unknown action "
+                    f"{action.on_error}"
+                )
+
+        # Kahn's algorithm over dependency and on_error edges to reject
+        # cycles up front
+        edges = {
+            a.action_id: downstream.get(a.action_id, [])
+            + ([a.on_error] if a.on_error else [])
+            for a in actions
+        }
+        indegree = {aid: 0 for aid in actions_by_id}
+        for children in edges.values():
+            for child in children:
+                indegree[child] += 1
+        queue = deque(aid for aid, count in indegree.items() if count == 0)
+        visited = 0
+        while queue:
+            aid = queue.popleft()
+            visited += 1
+            for child in edges[aid]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    queue.append(child)
+        if visited != len(actions_by_id):
+            raise ValueError(
+                "Workflow action dependencies or error handlers contain a cycle"
+            )
+
+        return upstream, downstream, handlers
+
+    async def _run_action(
+        self,
+        action: WorkflowAction,
+        context: Dict[str, Any],
+        execution: WorkflowExecution,
+    ) -> Any:
+        """Run one action under its type's concurrency limit, logging progress"""
+        handler = self.action_handlers.get(action.action_type)
+
+        async with self._get_semaphore(action.action_type):
+            # Log action start
+            self._log(execution, action, "started")
+
+            try:
+                if not handler:
+                    raise ValueError(
+                        f"No handler for action type: {action.action_type}"
+                    )
+                result = await handler(action, context)
+
+            except asyncio.CancelledError:
+                self._log(execution, action, "cancelled")
+                raise
+
+            except Exception as e:
+                logger.error(f"Error executing action {action.action_id}: {e}")
+
+                # Log action error
+                self._log(execution, action, "failed", error=str(e))
+                raise
+
+        # Log action success
+        self._log(execution, action, "completed", result=result)
+        return result
+
+    def _get_semaphore(self, action_type: ActionType) -> asyncio.Semaphore:
+        """Get the shared semaphore enforcing an action type's limit"""
+        semaphore = self._semaphores.get(action_type)
+        if semaphore is None:
+            # Unlisted types (conditional, delay, ...) are effectively unbounded
+            limit = self.concurrency_limits.get(action_type, 1000)
+            semaphore = asyncio.Semaphore(limit)
+            self._semaphores[action_type] = semaphore
+        return semaphore
+
+    def _log(
+        self,
+        execution: WorkflowExecution,
+        action: WorkflowAction,
+        status: str,
+        **details: Any,
+    ):
+        """Append an entry to the bounded execution log"""
+        execution.execution_log.append(
+            {
+                "timestamp": datetime.now().isoformat(),
+                "action_id": action.action_id,
+                "action_type": action.action_type.value,
+                "status": status,
+                **details,
+            }
+        )
+
     # Action Handlers
     async def _handle_http_request(
         self, action: WorkflowAction, context: Dict[str, Any]
@@ -13,6 +13,8 @@ from anthropic import Anthropic
 from openai import OpenAI
 import google.generativeai as genai
 
+from app.integrations.response_cache import CompletionCache, make_cache_key
+
 
 class ModelProvider(str, Enum):
     """AI Model Providers"""
@@ -95,10 +97,14 @@ class EnhancedAIProviderManager:
     Implements SuperNinja-equivalent capabilities
     """
 
-    def __init__(self):
+    def __init__(self, cache: Optional[CompletionCache] = None):
         self.models: Dict[str, AIModel] = {}
         self.provider_clients: Dict[ModelProvider, Any] = {}
         self.usage_stats: Dict[str, Dict[str, Any]] = {}
+        self.cache = cache or CompletionCache(
+            max_entries=int(os.getenv("AI_RESPONSE_CACHE_SIZE", "1024")),
+            cache_dir=os.getenv("AI_RESPONSE_CACHE_DIR") or None,
+        )
         self._initialize_models()
         self._initialize_clients()
 
@@ -619,10 +625,17 @@ class EnhancedAIProviderManager:
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
         stream: bool = False,
+        use_cache: Optional[bool] = None,
     ) -> Dict[str, Any]:
         """
         Generate completion using specified model
         Universal interface for all providers
+
+        Non-streaming responses are cached by (model, normalized messages,
+        temperature, max_tokens) and identical concurrent requests share one
+        provider call. By default only deterministic (temperature 0) calls
+        are cached; pass use_cache=True to cache sampled calls as well, or
+        use_cache=False to always call the provider.
         """
         model = self.get_model(model_id)
         if not model:
@@ -637,11 +650,51 @@ class EnhancedAIProviderManager:
                 "total_requests": 0,
                 "total_tokens": 0,
                 "total_cost": 0.0,
+                "cache_hits": 0,
+                "latency_saved_ms": 0.0,
+                "cost_saved": 0.0,
             }
 
         self.usage_stats[model_id]["total_requests"] += 1
 
-        # Route to appropriate provider
+        if use_cache is None:
+            use_cache = temperature == 0
+        if stream or not use_cache:
+            return await self._route_completion(
+                model, messages, temperature, max_tokens, stream
+            )
+
+        key = make_cache_key(model_id, messages, temperature, max_tokens)
+        result, entry = await self.cache.get_or_compute(
+            key,
+            lambda: self._route_completion(
+                model, messages, temperature, max_tokens, False
+            ),
+        )
+
+        if entry is None:
+            return result
+
+        # Update stats
+        stats = self.usage_stats[model_id]
+        stats["cache_hits"] += 1
+        stats["latency_saved_ms"] += entry["latency_ms"]
+        stats["cost_saved"] += result.get("cost", 0.0) or 0.0
+
+        # A cached answer costs nothing
+        result["cost"] = 0.0
+        result["cached"] = True
+        return result
+
+    async def _route_completion(
+        self,
+        model: AIModel,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        stream: bool,
+    ) -> Dict[str, Any]:
+        """Route a completion request to the model's provider"""
         if model.provider == ModelProvider.OPENAI:
             return await self._generate_openai(
                 model, messages, temperature, max_tokens, stream
@@ -900,6 +953,10 @@ class EnhancedAIProviderManager:
             return self.usage_stats.get(model_id, {})
         return self.usage_stats
 
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get response cache hit/miss and latency-saved statistics"""
+        return self.cache.get_stats()
+
     def compare_models(
         self,
         model_ids: List[str],
@@ -0,0 +1,242 @@
+"""
+Completion Response Cache
+LRU response cache with optional on-disk tier and single-flight coalescing
+of identical in-flight completion requests
+"""
+
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_messages(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Canonical form of a message list for cache keys
+
+    Roles are lowercased, text content has line endings unified and outer
+    whitespace stripped, and keys are sorted when serialized, so prompts that
+    differ only in formatting share a key.
+    """
+    normalized = []
+    for message in messages:
+        item = {}
+        for key, value in message.items():
+            if isinstance(value, str):
+                value = value.replace("\r\n", "\n").strip()
+                if key == "role":
+                    value = value.lower()
+            item[key] = value
+        normalized.append(item)
+    return normalized
+
+
+def make_cache_key(
+    model_id: str,
+    messages: List[Dict[str, Any]],
+    temperature: float,
+    max_tokens: Optional[int],
+) -> str:
+    """Stable hash of (model, normalized messages, temperature, max_tokens)"""
+    payload = json.dumps(
+        [model_id, normalize_messages(messages), round(temperature, 4), max_tokens],
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CompletionCache:
+    """
+    Two-tier cache for completion responses
+
+    The memory tier is an LRU bounded by ``max_entries``; the optional disk
+    tier stores one JSON file per key under ``cache_dir`` and survives
+    restarts. Entries older than ``ttl_seconds`` are treated as misses.
+    Concurrent requests for the same key share a single provider call.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: Optional[float] = 3600,
+        cache_dir: Optional[str] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.cache_dir = cache_dir
+
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        self.stats = {
+            "hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "evictions": 0,
+            "latency_saved_ms": 0.0,
+            "cost_saved": 0.0,
+        }
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expired(self, entry: Dict[str, Any]) -> bool:
+        return (
+            self.ttl_seconds is not None
+            and time.time() - entry["created_at"] > self.ttl_seconds
+        )
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._disk_path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {key}: {e}")
+            return None
+
+    def _write_disk(self, key: str, entry: Dict[str, Any]):
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False, default=str)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to persist cache entry {key}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _remember(self, key: str, entry: Dict[str, Any]):
+        """Insert into the memory tier, evicting least recently used entries"""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached entry for a key, promoting disk hits into memory"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if not self._expired(entry):
+                self._entries.move_to_end(key)
+                return entry
+            del self._entries[key]
+
+        if self.cache_dir:
+            entry = self._read_disk(key)
+            if entry is not None and not self._expired(entry):
+                self.stats["disk_hits"] += 1
+                self._remember(key, entry)
+                return entry
+
+        return None
+
+    def put(
+        self, key: str, response: Dict[str, Any], latency_ms: float
+    ) -> Dict[str, Any]:
+        """Store a response with the latency it took to produce"""
+        entry = {
+            "response": copy.deepcopy(response),
+            "latency_ms": latency_ms,
+            "created_at": time.time(),
+        }
+        self._remember(key, entry)
+        if self.cache_dir:
+            self._write_disk(key, entry)
+        return entry
+
+    def _record_hit(self, entry: Dict[str, Any]):
+        self.stats["hits"] += 1
+        self.stats["latency_saved_ms"] += entry["latency_ms"]
+        self.stats["cost_saved"] += entry["response"].get("cost", 0.0) or 0.0
+
+    async def get_or_compute(
+        self, key: str, compute: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """
+        Return the cached response for a key or compute it once
+
+        Args:
+            key: Cache key from make_cache_key
+            compute: Coroutine factory performing the provider call
+
+        Returns:
+            Tuple of (response, entry); entry is None when this call ran the
+            provider itself, otherwise the cache entry that served it. Hits
+            return a copy, so callers may mutate the response freely
+        """
+        entry = self.get(key)
+        if entry is not None:
+            self._record_hit(entry)
+            return copy.deepcopy(entry["response"]), entry
+
+        task = self._inflight.get(key)
+        owner = task is None
+        if owner:
+            self.stats["misses"] += 1
+            # Detached from the caller, so cancelling the caller that started
+            # the call doesn't cancel it for everyone waiting on it
+            task = asyncio.ensure_future(self._compute(key, compute))
+            task.add_done_callback(self._consume_exception)
+            self._inflight[key] = task
+
+        response, entry = await asyncio.shield(task)
+        if owner:
+            return response, None
+
+        self.stats["coalesced"] += 1
+        self._record_hit(entry)
+        return copy.deepcopy(response), entry
+
+    async def _compute(
+        self, key: str, compute: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Run the provider call and cache its response"""
+        try:
+            start = time.perf_counter()
+            response = await compute()
+            latency_ms = (time.perf_counter() - start) * 1000
+            return response, self.put(key, response, latency_ms)
+        finally:
+            self._inflight.pop(key, None)
+
+    @staticmethod
+    def _consume_exception(task: asyncio.Future):
+        # Every caller may have been cancelled; don't log the error as unseen
+        if not task.cancelled():
+            task.exception()
+
+    def clear(self):
+        """Drop the memory tier (the disk tier is left in place)"""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "latency_saved_ms": round(self.stats["latency_saved_ms"], 2),
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+            "disk_enabled": bool(self.cache_dir),
+        }
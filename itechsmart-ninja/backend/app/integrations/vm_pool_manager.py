@@ -10,6 +10,8 @@ import uuid
 from datetime import datetime
 import json
 
+from .warm_pool import WarmInterpreterPool
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,7 +20,12 @@ class VMPoolManager:
     Manages pool of virtual machines for concurrent execution
     """
 
-    def __init__(self, max_vms_per_user: int = 10, max_total_vms: int = 100):
+    def __init__(
+        self,
+        max_vms_per_user: int = 10,
+        max_total_vms: int = 100,
+        warm_pool: Optional[WarmInterpreterPool] = None,
+    ):
         self.max_vms_per_user = max_vms_per_user
         self.max_total_vms = max_total_vms
         self.active_vms: Dict[str, Any] = {}
@@ -42,6 +49,11 @@ class VMPoolManager:
             "dotnet": "mcr.microsoft.com/dotnet/sdk:8.0",
         }
 
+        # Pre-started interpreters for local execution (started on first use)
+        self.warm_pool = warm_pool or WarmInterpreterPool(
+            memory_limit_mb=self.default_memory_limit
+        )
+
         # Initialize Docker client
         self.docker_client = None
         self._init_docker()
@@ -384,9 +396,9 @@ class VMPoolManager:
             else:
                 cmd = code
 
-            # Execute command
-            exec_result = container.exec_run(
-                cmd=f"/bin/sh -c &quot;{cmd}&quot;", demux=True
+            # Execute command off the event loop so batches run concurrently
+            exec_result = await asyncio.to_thread(
+                container.exec_run, cmd=f"/bin/sh -c &quot;{cmd}&quot;", demux=True
             )
 
             stdout = (
@@ -408,29 +420,13 @@ class VMPoolManager:
     async def _execute_locally(
         self, language: str, code: str, timeout: int
     ) -> Dict[str, Any]:
-        """Execute code locally (fallback)"""
+        """Execute code locally on a warm interpreter (fallback)"""
         try:
-            import subprocess
-
-            if language == "python":
-                cmd = ["python", "-c", code]
-            elif language == "nodejs":
-                cmd = ["node", "-e", code]
-            else:
+            if not self.warm_pool.supports(language):
                 raise ValueError(f"Local execution not supported for {language}")
 
-            result = subprocess.run(
-                cmd, capture_output=True, text=True, timeout=timeout
-            )
-
-            return {
-                "output": result.stdout,
-                "error": result.stderr,
-                "exit_code": result.returncode,
-            }
+            return await self.warm_pool.execute(language, code, timeout)
 
-        except subprocess.TimeoutExpired:
-            return {"output": "", "error": "Execution timeout", "exit_code": 124}
         except Exception as e:
             return {"output": "", "error": str(e), "exit_code": 1}
 
@@ -613,6 +609,7 @@ class VMPoolManager:
                 "available_slots": self.max_total_vms - total_vms,
                 "users_with_vms": len(self.user_vm_count),
                 "docker_available": self.docker_client is not None,
+                "warm_pool": self.warm_pool.get_status(),
             }
 
         except Exception as e:
@@ -0,0 +1,552 @@
+"""
+Warm Interpreter Pool
+Keeps pre-started, resource-limited interpreters per language so code
+execution skips interpreter startup
+"""
+
+from typing import Dict, Any, List, Optional
+from abc import ABC, abstractmethod
+import logging
+import asyncio
+import json
+import os
+import shutil
+import signal
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+
+# Python fork server: reads one JSON request per line from stdin and forks a
+# fresh child for every execution, so the server itself never runs user code
+# and nothing one run does (monkeypatching, globals, open files) is visible
+# to the next. The child's fds 1 and 2 are temporary files, which captures
+# output from os.system and C extensions too. The server enforces the timeout
+# by killing the child's session and answers with one JSON line on stdout.
+PYTHON_FORK_SERVER = r"""
+import json, os, resource, signal, sys, tempfile, threading, time, traceback
+# Keep private copies of the protocol pipes; user code sees /dev/null
+inp, out = os.fdopen(os.dup(0)), os.fdopen(os.dup(1), "w")
+devnull = os.open(os.devnull, os.O_RDWR)
+for fd in (0, 1, 2):
+    os.dup2(devnull, fd)
+MAX_OUTPUT = int(sys.argv[1])
+
+def run(request):
+    exit_code = 1
+    try:
+        os.setsid()
+        inp.close()
+        out.close()
+        cpu = int(request["timeout"]) + 1
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu))
+        exit_code = 0
+        try:
+            exec(compile(request["code"], "<vm>", "exec"), {"__name__": "__main__"})
+            for thread in threading.enumerate():
+                if thread is not threading.main_thread() and not thread.daemon:
+                    thread.join()
+        except SystemExit as e:
+            if isinstance(e.code, int) or e.code is None:
+                exit_code = e.code or 0
+            else:
+                print(e.code, file=sys.stderr)
+                exit_code = 1
+        except BaseException:
+            traceback.print_exc()
+            exit_code = 1
+        sys.stdout.flush()
+        sys.stderr.flush()
+    finally:
+        os._exit(exit_code & 0xFF)
+
+def read(f):
+    f.seek(0)
+    data = f.read(MAX_OUTPUT + 1)
+    text = data[:MAX_OUTPUT].decode("utf-8", "replace")
+    return text + "\n[output truncated]" if len(data) > MAX_OUTPUT else text
+
+def kill(pid):
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+print(json.dumps({"ready": True}), file=out, flush=True)
+for line in inp:
+    request = json.loads(line)
+    with tempfile.TemporaryFile() as stdout, tempfile.TemporaryFile() as stderr:
+        pid = os.fork()
+        if pid == 0:
+            os.dup2(stdout.fileno(), 1)
+            os.dup2(stderr.fileno(), 2)
+            run(request)
+        deadline = time.monotonic() + request["timeout"]
+        delay, timed_out = 0.0005, False
+        while True:
+            waited, status = os.waitpid(pid, os.WNOHANG)
+            if waited:
+                break
+            if time.monotonic() >= deadline:
+                timed_out = True
+                kill(pid)
+                os.kill(pid, signal.SIGKILL)
+                waited, status = os.waitpid(pid, 0)
+                break
+            time.sleep(delay)
+            delay = min(delay * 2, 0.01)
+        # Processes the run started in the background die with it
+        kill(pid)
+        exit_code = os.waitstatus_to_exitcode(status)
+        result = {
+            "output": read(stdout),
+            "error": "Execution timeout" if timed_out else read(stderr),
+            "exit_code": 124 if timed_out else (exit_code if exit_code >= 0 else 128 - exit_code),
+        }
+    print(json.dumps(result), file=out, flush=True)
+"""
+
+# Node worker: runs exactly one program, read from stdin, as a regular
+# CommonJS module (real process, require, timers) on its own stdout/stderr,
+# and exits when the event loop drains, so output from async callbacks is
+# captured too. The pool keeps spares started and never reuses one.
+NODE_ONE_SHOT = r"""
+const Module = require("module");
+const path = require("path");
+process.stdout.write(JSON.stringify({ ready: true }) + "\n");
+const chunks = [];
+process.stdin.on("data", (chunk) => chunks.push(chunk));
+process.stdin.on("end", () => {
+  const filename = path.join(process.cwd(), "vm.js");
+  const program = new Module(filename, null);
+  program.filename = filename;
+  program.paths = Module._nodeModulePaths(process.cwd());
+  program._compile(Buffer.concat(chunks).toString("utf8"), filename);
+});
+"""
+
+# Max bytes of captured output per stream
+MAX_OUTPUT_BYTES = 1024 * 1024
+# Max bytes of a single fork-server response line (escaped output)
+STREAM_LIMIT = 16 * 1024 * 1024
+# Extra time the pool gives the fork server beyond the execution timeout
+SERVER_GRACE_SECONDS = 5
+
+
+def _timeout_result() -> Dict[str, Any]:
+    return {"output": "", "error": "Execution timeout", "exit_code": 124}
+
+
+class WarmWorker(ABC):
+    """A pre-started interpreter process"""
+
+    reusable = False
+
+    def __init__(self, language: str, process: asyncio.subprocess.Process):
+        self.language = language
+        self.process = process
+        self.runs = 0
+        self.started_at = time.monotonic()
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None
+
+    @abstractmethod
+    async def execute(self, code: str, timeout: float) -> Dict[str, Any]:
+        """Run code and return its output, error and exit code"""
+        pass
+
+    def signal_kill(self):
+        """Send SIGKILL to the process and everything in its session"""
+        if self.alive:
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                self.process.kill()
+
+    async def kill(self):
+        """Kill the process and reap it"""
+        self.signal_kill()
+        try:
+            await self.process.wait()
+        except Exception:
+            pass
+
+
+class ForkServerWorker(WarmWorker):
+    """Python fork server; runs every execution in a fresh child process"""
+
+    reusable = True
+
+    async def execute(self, code: str, timeout: float) -> Dict[str, Any]:
+        """Send code over stdin and wait for the JSON result line"""
+        request = {"code": code, "timeout": timeout}
+        self.process.stdin.write((json.dumps(request) + "\n").encode("utf-8"))
+        await self.process.stdin.drain()
+
+        line = await asyncio.wait_for(
+            self.process.stdout.readline(), timeout + SERVER_GRACE_SECONDS
+        )
+        if not line:
+            raise RuntimeError(f"{self.language} worker exited unexpectedly")
+
+        self.runs += 1
+        return json.loads(line)
+
+
+class OneShotWorker(WarmWorker):
+    """Interpreter started ahead of time that runs a single program"""
+
+    async def execute(self, code: str, timeout: float) -> Dict[str, Any]:
+        """Feed the program on stdin and collect its output until it exits"""
+        self.runs += 1
+        self.process.stdin.write(code.encode("utf-8"))
+        await self.process.stdin.drain()
+        self.process.stdin.close()
+
+        try:
+            output, error, exit_code = await asyncio.wait_for(
+                asyncio.gather(
+                    _read_limited(self.process.stdout),
+                    _read_limited(self.process.stderr),
+                    self.process.wait(),
+                ),
+                timeout,
+            )
+        finally:
+            # Background processes the program started die with it
+            await self.kill()
+
+        if exit_code < 0:
+            exit_code = 128 - exit_code
+        return {"output": output, "error": error, "exit_code": exit_code}
+
+
+async def _read_limited(stream: asyncio.StreamReader) -> str:
+    """Read a stream to EOF, keeping at most MAX_OUTPUT_BYTES"""
+    chunks, size = [], 0
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            break
+        if size < MAX_OUTPUT_BYTES:
+            chunks.append(chunk[: MAX_OUTPUT_BYTES - size])
+        size += len(chunk)
+    text = b"".join(chunks).decode("utf-8", errors="replace")
+    return text + "\n[output truncated]" if size > MAX_OUTPUT_BYTES else text
+
+
+class WarmInterpreterPool:
+    """
+    Pool of pre-started interpreter workers per language
+
+    Callers queue for an idle worker instead of spawning a process. No
+    interpreter state is shared between executions: Python workers are
+    fork servers that run each execution in a fresh child, and Node
+    workers run a single program each and are replaced afterwards. Workers
+    that die, time out or reach ``max_runs`` are replaced in the
+    background.
+    """
+
+    def __init__(
+        self,
+        pool_sizes: Optional[Dict[str, int]] = None,
+        max_runs: int = 1000,
+        memory_limit_mb: int = 512,
+    ):
+        self.pool_sizes = pool_sizes or {"python": 2, "nodejs": 2}
+        self.max_runs = max_runs
+        self.memory_limit_mb = memory_limit_mb
+
+        self._idle: Dict[str, asyncio.Queue] = {}
+        self._workers: Dict[str, List[WarmWorker]] = {}
+        self._spawning: Dict[str, int] = {}
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._background: set = set()
+
+        self.stats = {
+            "executions": 0,
+            "recycled": 0,
+            "timeouts": 0,
+            "spawned": 0,
+            "spawn_failures": 0,
+            "spawn_ms_total": 0.0,
+        }
+
+    def _command(self, language: str) -> Optional[List[str]]:
+        """Interpreter command line for a language, None if unavailable"""
+        if language == "python":
+            return [
+                sys.executable,
+                "-u",
+                "-c",
+                PYTHON_FORK_SERVER,
+                str(MAX_OUTPUT_BYTES),
+            ]
+        if language == "nodejs":
+            node = shutil.which("node")
+            if node:
+                return [
+                    node,
+                    f"--max-old-space-size={self.memory_limit_mb}",
+                    "-e",
+                    NODE_ONE_SHOT,
+                ]
+        return None
+
+    def supports(self, language: str) -> bool:
+        return language in self.pool_sizes and self._command(language) is not None
+
+    def _limit_resources(self):
+        """Apply an address-space limit in the child (POSIX only)"""
+        try:
+            import resource
+
+            limit = self.memory_limit_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except Exception:
+            pass
+
+    async def _spawn(self, language: str) -> WarmWorker:
+        """Start an interpreter and wait until it reports ready"""
+        start = time.perf_counter()
+        command = self._command(language)
+        if command is None:
+            raise RuntimeError(f"No interpreter available for {language}")
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=(
+                asyncio.subprocess.DEVNULL
+                if language == "python"
+                else asyncio.subprocess.PIPE
+            ),
+            limit=STREAM_LIMIT,
+            start_new_session=True,
+            # V8 reserves far more address space than it uses; node is
+            # bounded by --max-old-space-size instead
+            preexec_fn=self._limit_resources if language == "python" else None,
+        )
+        worker_class = ForkServerWorker if language == "python" else OneShotWorker
+        worker = worker_class(language, process)
+
+        try:
+            ready = await asyncio.wait_for(process.stdout.readline(), 30)
+        except asyncio.TimeoutError:
+            ready = b""
+        except BaseException:
+            await worker.kill()
+            raise
+        if not ready:
+            await worker.kill()
+            raise RuntimeError(f"Failed to start {language} worker")
+
+        self.stats["spawned"] += 1
+        self.stats["spawn_ms_total"] += (time.perf_counter() - start) * 1000
+        self._workers.setdefault(language, []).append(worker)
+        return worker
+
+    async def start(self, languages: Optional[List[str]] = None):
+        """Pre-spawn workers for the given (default: all configured) languages"""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+
+        async with self._start_lock:
+            for language in languages or list(self.pool_sizes):
+                if language in self._idle or not self.supports(language):
+                    continue
+
+                queue: asyncio.Queue = asyncio.Queue()
+                workers = await asyncio.gather(
+                    *(self._spawn(language) for _ in range(self.pool_sizes[language]))
+                )
+                for worker in workers:
+                    queue.put_nowait(worker)
+                self._idle[language] = queue
+                logger.info(f"Warm pool started {len(workers)} {language} workers")
+
+    async def execute(
+        self, language: str, code: str, timeout: float = 300
+    ) -> Dict[str, Any]:
+        """
+        Execute code on a warm worker, queueing until one is idle
+
+        Args:
+            language: Worker language
+            code: Code to execute
+            timeout: Execution timeout in seconds; also bounds the wait for
+                an idle worker
+
+        Returns:
+            Dict with output, error and exit_code
+        """
+        if language not in self._idle:
+            await self.start([language])
+        if language not in self._idle:
+            raise ValueError(f"Warm pool not available for {language}")
+
+        worker = await self._acquire(language, timeout)
+        if worker is None:
+            return {
+                "output": "",
+                "error": f"No {language} worker became available within {timeout}s",
+                "exit_code": 1,
+            }
+        self.stats["executions"] += 1
+
+        try:
+            result = await worker.execute(code, timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            self._replace(worker)
+            return _timeout_result()
+        except asyncio.CancelledError:
+            self._replace(worker)
+            raise
+        except Exception as e:
+            self._replace(worker)
+            return {"output": "", "error": str(e), "exit_code": 1}
+
+        if result["exit_code"] == 124 and result["error"] == "Execution timeout":
+            self.stats["timeouts"] += 1
+        if worker.reusable and worker.alive and worker.runs < self.max_runs:
+            self._idle[language].put_nowait(worker)
+        else:
+            self._replace(worker)
+
+        return result
+
+    async def _acquire(self, language: str, timeout: float) -> Optional[WarmWorker]:
+        """Next live idle worker, or None if none frees up within ``timeout``"""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                worker = await asyncio.wait_for(
+                    self._idle[language].get(), max(deadline - time.monotonic(), 0)
+                )
+            except asyncio.TimeoutError:
+                # Respawns may have failed; try again for later callers
+                self._top_up(language)
+                return None
+            if worker.alive:
+                return worker
+            self._replace(worker)
+
+    def _replace(self, worker: WarmWorker):
+        """Kill a worker and spawn its replacement in the background"""
+        self.stats["recycled"] += 1
+        workers = self._workers.get(worker.language, [])
+        if worker in workers:
+            workers.remove(worker)
+        worker.signal_kill()
+        self._background_task(worker.kill())
+        self._top_up(worker.language)
+
+    def _top_up(self, language: str):
+        """Spawn workers until the language is back at its pool size"""
+        missing = (
+            self.pool_sizes[language]
+            - len(self._workers.get(language, []))
+            - self._spawning.get(language, 0)
+        )
+        for _ in range(missing):
+            self._spawning[language] = self._spawning.get(language, 0) + 1
+            self._background_task(self._respawn(language))
+
+    async def _respawn(self, language: str):
+        try:
+            fresh = await self._spawn(language)
+            queue = self._idle.get(language)
+            if queue is None:
+                await fresh.kill()  # pool shut down meanwhile
+            else:
+                queue.put_nowait(fresh)
+        except Exception as e:
+            self.stats["spawn_failures"] += 1
+            logger.error(f"Failed to respawn {language} worker: {e}")
+        finally:
+            self._spawning[language] -= 1
+
+    def _background_task(self, coroutine):
+        task = asyncio.ensure_future(coroutine)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def shutdown(self):
+        """Kill every worker"""
+        tasks = list(self._background)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._idle.clear()
+        for workers in self._workers.values():
+            for worker in workers:
+                await worker.kill()
+        self._workers.clear()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Pool sizes, idle counts and counters"""
+        spawned = self.stats["spawned"]
+        return {
+            "languages": {
+                language: {
+                    "workers": len(self._workers.get(language, [])),
+                    "idle": queue.qsize(),
+                }
+                for language, queue in self._idle.items()
+            },
+            **self.stats,
+            "avg_spawn_ms": (
+                round(self.stats["spawn_ms_total"] / spawned, 2) if spawned else 0
+            ),
+        }
+
+    async def benchmark_startup(
+        self, language: str = "python", iterations: int = 10
+    ) -> Dict[str, Any]:
+        """
+        Compare cold-start (new process per run) with warm-pool latency
+
+        Args:
+            language: Language to benchmark
+            iterations: Executions per mode
+
+        Returns:
+            Median latencies in milliseconds
+        """
+        code = 'print("ok")' if language == "python" else 'console.log("ok")'
+        flag = "-c" if language == "python" else "-e"
+        interpreter = self._command(language)[0]
+
+        cold = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            process = await asyncio.create_subprocess_exec(
+                interpreter,
+                flag,
+                code,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            await process.communicate()
+            cold.append((time.perf_counter() - start) * 1000)
+
+        await self.start([language])
+        warm = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            await self.execute(language, code, timeout=30)
+            warm.append((time.perf_counter() - start) * 1000)
+
+        cold.sort()
+        warm.sort()
+        return {
+            "language": language,
+            "iterations": iterations,
+            "cold_start_ms": round(cold[len(cold) // 2], 2),
+            "warm_pool_ms": round(warm[len(warm) // 2], 2),
+            "speedup": round(cold[len(cold) // 2] / max(warm[len(warm) // 2], 1e-6), 1),
+        }
@@ -6,15 +6,19 @@ Tracks and analyzes system performance, user activity, and resource usage
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from enum import Enum
-from collections import defaultdict, deque
+from collections import defaultdict
 import time
 import psutil
 import logging
 from dataclasses import dataclass, asdict
 import statistics
 
+from .metric_store import MetricBucket, MetricSeries
+
 logger = logging.getLogger(__name__)
 
+EPOCH = datetime(1970, 1, 1)
+
 
 class MetricType(str, Enum):
     """Types of metrics tracked"""
@@ -109,11 +113,26 @@ class UserActivityMetrics:
 
 
 class MetricCollector:
-    """Collects and stores metrics"""
+    """
+    Collects and stores metrics
+
+    Each metric keeps its most recent ``max_points`` raw points in an
+    array-backed ring buffer, plus per-minute and per-hour buckets with
+    count/sum/min/max and a quantile sketch. Statistics are answered from the
+    buckets, so memory stays flat and queries cost O(buckets) rather than
+    O(points).
+    """
 
-    def __init__(self, max_points: int = 10000):
+    def __init__(
+        self,
+        max_points: int = 10000,
+        minute_retention: int = 180,
+        hour_retention: int = 720,
+    ):
         self.max_points = max_points
-        self.metrics: Dict[str, deque] = defaultdict(lambda: deque(maxlen=max_points))
+        self.metrics: Dict[str, MetricSeries] = defaultdict(
+            lambda: MetricSeries(max_points, minute_retention, hour_retention)
+        )
         self.counters: Dict[str, float] = defaultdict(float)
         self.gauges: Dict[str, float] = defaultdict(float)
 
@@ -122,23 +141,20 @@ class MetricCollector:
     ):
         """Record counter metric (cumulative)"""
         self.counters[name] += value
-        point = MetricPoint(timestamp=datetime.utcnow(), value=value, tags=tags or {})
-        self.metrics[name].append(point)
+        self.metrics[name].add(time.time(), value, tags)
 
     def record_gauge(
         self, name: str, value: float, tags: Optional[Dict[str, str]] = None
     ):
         """Record gauge metric (current value)"""
         self.gauges[name] = value
-        point = MetricPoint(timestamp=datetime.utcnow(), value=value, tags=tags or {})
-        self.metrics[name].append(point)
+        self.metrics[name].add(time.time(), value, tags)
 
     def record_histogram(
         self, name: str, value: float, tags: Optional[Dict[str, str]] = None
     ):
         """Record histogram metric (distribution)"""
-        point = MetricPoint(timestamp=datetime.utcnow(), value=value, tags=tags or {})
-        self.metrics[name].append(point)
+        self.metrics[name].add(time.time(), value, tags)
 
     def get_counter(self, name: str) -> float:
         """Get current counter value"""
@@ -154,21 +170,31 @@ class MetricCollector:
         start_time: Optional[datetime] = None,
         end_time: Optional[datetime] = None,
     ) -> List[MetricPoint]:
-        """Get metrics within time range"""
-        points = self.metrics.get(name, deque())
-
-        if not start_time and not end_time:
-            return list(points)
-
-        filtered = []
-        for point in points:
-            if start_time and point.timestamp < start_time:
-                continue
-            if end_time and point.timestamp > end_time:
-                continue
-            filtered.append(point)
+        """Get raw metrics within time range (most recent max_points only)"""
+        series = self.metrics.get(name)
+        if series is None:
+            return []
+
+        return [
+            MetricPoint(
+                timestamp=datetime.utcfromtimestamp(timestamp), value=value, tags=tags
+            )
+            for timestamp, value, tags in series.points.between(
+                _to_timestamp(start_time), _to_timestamp(end_time)
+            )
+        ]
 
-        return filtered
+    def get_bucket(
+        self,
+        name: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> MetricBucket:
+        """Get merged aggregate bucket for a time range"""
+        series = self.metrics.get(name)
+        if series is None:
+            return MetricBucket()
+        return series.aggregate(_to_timestamp(start_time), _to_timestamp(end_time))
 
     def get_statistics(
         self,
@@ -176,41 +202,17 @@ class MetricCollector:
         start_time: Optional[datetime] = None,
         end_time: Optional[datetime] = None,
     ) -> Dict[str, float]:
-        """Get statistical summary of metrics"""
-        points = self.get_metrics(name, start_time, end_time)
-
-        if not points:
-            return {
-                "count": 0,
-                "sum": 0.0,
-                "mean": 0.0,
-                "min": 0.0,
-                "max": 0.0,
-                "stddev": 0.0,
-            }
+        """Get statistical summary of metrics (percentiles are sketch estimates)"""
+        return self.get_bucket(name, start_time, end_time).summary()
 
-        values = [p.value for p in points]
-
-        return {
-            "count": len(values),
-            "sum": sum(values),
-            "mean": statistics.mean(values),
-            "min": min(values),
-            "max": max(values),
-            "stddev": statistics.stdev(values) if len(values) > 1 else 0.0,
-            "median": statistics.median(values),
-            "p50": statistics.median(values),
-            "p95": self._percentile(values, 0.95),
-            "p99": self._percentile(values, 0.99),
-        }
 
-    def _percentile(self, values: List[float], percentile: float) -> float:
-        """Calculate percentile"""
-        if not values:
-            return 0.0
-        sorted_values = sorted(values)
-        index = int(len(sorted_values) * percentile)
-        return sorted_values[min(index, len(sorted_values) - 1)]
+def _to_timestamp(value: Optional[datetime]) -> Optional[float]:
+    """Convert a naive-UTC (or aware) datetime to epoch seconds"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return (value - EPOCH).total_seconds()
+    return value.timestamp()
 
 
 class SystemMonitor:
@@ -289,7 +291,7 @@ class APIMonitor:
     def __init__(self, collector: MetricCollector):
         self.collector = collector
         self.endpoint_stats: Dict[str, Dict[str, Any]] = defaultdict(
-            lambda: {"requests": [], "errors": 0, "total": 0}
+            lambda: {"errors": 0, "total": 0}
         )
 
     def record_request(
@@ -306,32 +308,19 @@ class APIMonitor:
             self.collector.record_counter(f"api.errors.{key}", 1.0)
             self.endpoint_stats[key]["errors"] += 1
 
-        # Store request data
-        self.endpoint_stats[key]["requests"].append(
-            {
-                "timestamp": datetime.utcnow(),
-                "response_time_ms": response_time_ms,
-                "status_code": status_code,
-            }
-        )
         self.endpoint_stats[key]["total"] += 1
 
-        # Keep only last 1000 requests per endpoint
-        if len(self.endpoint_stats[key]["requests"]) > 1000:
-            self.endpoint_stats[key]["requests"].pop(0)
-
     def get_endpoint_metrics(
         self, endpoint: str, method: str, time_range: TimeRange = TimeRange.LAST_HOUR
     ) -> APIMetrics:
         """Get metrics for specific endpoint"""
         key = f"{method}:{endpoint}"
-        stats = self.endpoint_stats.get(key, {"requests": [], "errors": 0, "total": 0})
 
-        # Filter by time range
+        # Aggregate the time range from pre-computed buckets
         cutoff_time = self._get_cutoff_time(time_range)
-        requests = [r for r in stats["requests"] if r["timestamp"] >= cutoff_time]
+        timings = self.collector.get_bucket(f"api.response_time.{key}", cutoff_time)
 
-        if not requests:
+        if not timings.count:
             return APIMetrics(
                 endpoint=endpoint,
                 method=method,
@@ -348,9 +337,10 @@ class APIMonitor:
                 requests_per_minute=0.0,
             )
 
-        response_times = [r["response_time_ms"] for r in requests]
-        failed = sum(1 for r in requests if r["status_code"] >= 400)
-        successful = len(requests) - failed
+        total = timings.count
+        failed = min(
+            self.collector.get_bucket(f"api.errors.{key}", cutoff_time).count, total
+        )
 
         # Calculate time span
         time_span_minutes = (datetime.utcnow() - cutoff_time).total_seconds() / 60
@@ -358,18 +348,18 @@ class APIMonitor:
         return APIMetrics(
             endpoint=endpoint,
             method=method,
-            total_requests=len(requests),
-            successful_requests=successful,
+            total_requests=total,
+            successful_requests=total - failed,
             failed_requests=failed,
-            avg_response_time_ms=statistics.mean(response_times),
-            min_response_time_ms=min(response_times),
-            max_response_time_ms=max(response_times),
-            p50_response_time_ms=statistics.median(response_times),
-            p95_response_time_ms=self._percentile(response_times, 0.95),
-            p99_response_time_ms=self._percentile(response_times, 0.99),
-            error_rate=failed / len(requests) if requests else 0.0,
+            avg_response_time_ms=timings.total / total,
+            min_response_time_ms=timings.min,
+            max_response_time_ms=timings.max,
+            p50_response_time_ms=timings.quantile(0.5),
+            p95_response_time_ms=timings.quantile(0.95),
+            p99_response_time_ms=timings.quantile(0.99),
+            error_rate=failed / total,
             requests_per_minute=(
-                len(requests) / time_span_minutes if time_span_minutes > 0 else 0.0
+                total / time_span_minutes if time_span_minutes > 0 else 0.0
             ),
         )
 
@@ -392,14 +382,6 @@ class APIMonitor:
         else:
             return now - timedelta(hours=1)
 
-    def _percentile(self, values: List[float], percentile: float) -> float:
-        """Calculate percentile"""
-        if not values:
-            return 0.0
-        sorted_values = sorted(values)
-        index = int(len(sorted_values) * percentile)
-        return sorted_values[min(index, len(sorted_values) - 1)]
-
 
 class UserActivityMonitor:
     """Monitors user activity and behavior"""
@@ -7,9 +7,13 @@ from typing import Dict, List, Optional, Any, Set
 from datetime import datetime
 from enum import Enum
 from dataclasses import dataclass, asdict
+import bisect
+import heapq
 import uuid
 import logging
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+
+from app.core.memory_index import tokenize
 
 logger = logging.getLogger(__name__)
 
@@ -185,22 +189,92 @@ class ReadReceipt:
         }
 
 
+class MessageSearchIndex:
+    """
+    Incremental inverted index over one channel's messages
+
+    Documents are message positions in the channel, so newest-first ranking
+    is a max over positions. Query words match indexed words by prefix via a
+    sorted vocabulary.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Set[int]] = {}  # term -> positions
+        self.doc_terms: Dict[int, Set[str]] = {}  # position -> terms
+        self.vocabulary: List[str] = []  # sorted terms
+
+    def add(self, position: int, text: str):
+        """Index a message, replacing any previous version"""
+        self.remove(position)
+
+        terms = set(tokenize(text))
+        for term in terms:
+            docs = self.postings.get(term)
+            if docs is None:
+                docs = self.postings[term] = set()
+                bisect.insort(self.vocabulary, term)
+            docs.add(position)
+        self.doc_terms[position] = terms
+
+    def remove(self, position: int):
+        """Drop a message from all postings"""
+        for term in self.doc_terms.pop(position, ()):
+            docs = self.postings[term]
+            docs.discard(position)
+            if not docs:
+                del self.postings[term]
+                del self.vocabulary[bisect.bisect_left(self.vocabulary, term)]
+
+    def _prefix_matches(self, prefix: str) -> Set[int]:
+        """Positions of messages containing a word starting with prefix"""
+        matches: Set[int] = set()
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        for term in self.vocabulary[start:]:
+            if not term.startswith(prefix):
+                break
+            matches |= self.postings[term]
+        return matches
+
+    def search(self, query: str, limit: int) -> List[int]:
+        """Newest positions matching every query word"""
+        candidates: Optional[Set[int]] = None
+
+        # Longer words are usually rarer, so intersect them first
+        for term in sorted(set(tokenize(query)), key=len, reverse=True):
+            matches = self._prefix_matches(term)
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                return []
+
+        if candidates is None:
+            return []
+        return heapq.nlargest(limit, candidates)
+
+
 class ChatService:
     """Manages chat and collaboration features"""
 
-    def __init__(self):
+    def __init__(self, max_receipt_messages: int = 10000):
         self.channels: Dict[str, Channel] = {}
         self.messages: Dict[str, Message] = {}
         self.channel_messages: Dict[str, List[str]] = defaultdict(
             list
         )  # channel_id -> message_ids
+        self.message_positions: Dict[str, int] = {}  # message_id -> channel index
+        self.thread_replies: Dict[str, List[str]] = defaultdict(
+            list
+        )  # parent_message_id -> reply ids
+        self.search_indexes: Dict[str, MessageSearchIndex] = defaultdict(
+            MessageSearchIndex
+        )  # channel_id -> index
         self.user_channels: Dict[str, Set[str]] = defaultdict(
             set
         )  # user_id -> channel_ids
         self.typing_indicators: Dict[str, List[TypingIndicator]] = defaultdict(list)
-        self.read_receipts: Dict[str, List[ReadReceipt]] = defaultdict(
-            list
-        )  # message_id -> receipts
+        self.max_receipt_messages = max_receipt_messages
+        self.read_receipts: "OrderedDict[str, Dict[str, ReadReceipt]]" = (
+            OrderedDict()
+        )  # message_id -> {user_id: receipt}, least recently read first
         self.pinned_messages: Dict[str, List[str]] = defaultdict(
             list
         )  # channel_id -> message_ids
@@ -301,14 +375,17 @@ class ChatService:
             for member_id in channel.members:
                 self.user_channels[member_id].discard(channel_id)
 
-            # Delete messages
+            # Delete messages and their index entries
             message_ids = self.channel_messages.get(channel_id, [])
             for message_id in message_ids:
-                if message_id in self.messages:
-                    del self.messages[message_id]
+                self.messages.pop(message_id, None)
+                self.message_positions.pop(message_id, None)
+                self.thread_replies.pop(message_id, None)
+                self.read_receipts.pop(message_id, None)
 
             del self.channels[channel_id]
-            del self.channel_messages[channel_id]
+            self.channel_messages.pop(channel_id, None)
+            self.search_indexes.pop(channel_id, None)
 
             logger.info(f"Deleted channel {channel_id}")
 
@@ -441,10 +518,14 @@ class ChatService:
             )
 
             self.messages[message_id] = message
+            position = len(self.channel_messages[channel_id])
             self.channel_messages[channel_id].append(message_id)
+            self.message_positions[message_id] = position
+            self.search_indexes[channel_id].add(position, content)
 
             # Update thread count if reply
             if parent_message_id:
+                self.thread_replies[parent_message_id].append(message_id)
                 parent = self.messages.get(parent_message_id)
                 if parent:
                     parent.thread_count += 1
@@ -474,6 +555,9 @@ class ChatService:
         try:
             message.content = new_content
             message.edited_at = datetime.utcnow()
+            self.search_indexes[message.channel_id].add(
+                self.message_positions[message_id], new_content
+            )
 
             logger.info(f"Edited message {message_id}")
 
@@ -500,6 +584,9 @@ class ChatService:
         try:
             message.deleted_at = datetime.utcnow()
             message.content = "[deleted]"
+            self.search_indexes[message.channel_id].remove(
+                self.message_positions[message_id]
+            )
 
             logger.info(f"Deleted message {message_id}")
 
@@ -593,15 +680,29 @@ class ChatService:
     def get_messages(
         self, channel_id: str, limit: int = 50, before: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """Get messages from channel"""
+        """
+        Get messages from channel, newest first
+
+        Args:
+            channel_id: Channel ID
+            limit: Max messages to return
+            before: Cursor; only messages older than this message ID are
+                returned (pass the last ID of the previous page)
+        """
         message_ids = self.channel_messages.get(channel_id, [])
 
+        # Resolve the cursor to its position in the channel
+        end = len(message_ids)
+        if before:
+            position = self.message_positions.get(before)
+            if position is None or position >= end or message_ids[position] != before:
+                return []
+            end = position
+
         messages = []
-        for message_id in reversed(message_ids):
-            message = self.messages.get(message_id)
+        for index in range(end - 1, -1, -1):
+            message = self.messages.get(message_ids[index])
             if message and not message.deleted_at:
-                if before and message.message_id == before:
-                    break
                 messages.append(message.to_dict())
                 if len(messages) >= limit:
                     break
@@ -611,33 +712,38 @@ class ChatService:
     def get_thread_messages(
         self, parent_message_id: str, limit: int = 50
     ) -> List[Dict[str, Any]]:
-        """Get thread replies"""
+        """Get thread replies, oldest first"""
         replies = []
 
-        for message in self.messages.values():
-            if (
-                message.parent_message_id == parent_message_id
-                and not message.deleted_at
-            ):
+        for message_id in self.thread_replies.get(parent_message_id, []):
+            message = self.messages.get(message_id)
+            if message and not message.deleted_at:
                 replies.append(message.to_dict())
+                if len(replies) >= limit:
+                    break
 
-        # Sort by timestamp
-        replies.sort(key=lambda x: x["timestamp"])
-
-        return replies[:limit]
+        return replies
 
     def mark_as_read(self, message_id: str, user_id: str) -> Dict[str, Any]:
-        """Mark message as read"""
+        """Mark message as read (first read per user is kept)"""
         message = self.messages.get(message_id)
         if not message:
             return {"success": False, "error": "Message not found"}
 
         try:
-            receipt = ReadReceipt(
-                user_id=user_id, message_id=message_id, read_at=datetime.utcnow()
-            )
+            receipts = self.read_receipts.get(message_id)
+            if receipts is None:
+                receipts = self.read_receipts[message_id] = {}
+            self.read_receipts.move_to_end(message_id)
+
+            if user_id not in receipts:
+                receipts[user_id] = ReadReceipt(
+                    user_id=user_id, message_id=message_id, read_at=datetime.utcnow()
+                )
 
-            self.read_receipts[message_id].append(receipt)
+            # Keep receipts for the most recently read messages only
+            while len(self.read_receipts) > self.max_receipt_messages:
+                self.read_receipts.popitem(last=False)
 
             return {"success": True}
 
@@ -645,6 +751,10 @@ class ChatService:
             logger.error(f"Failed to mark as read: {e}")
             return {"success": False, "error": str(e)}
 
+    def get_read_receipts(self, message_id: str) -> List[ReadReceipt]:
+        """Get read receipts for a message"""
+        return list(self.read_receipts.get(message_id, {}).values())
+
     def set_typing_indicator(self, channel_id: str, user_id: str) -> Dict[str, Any]:
         """Set typing indicator"""
         try:
@@ -685,19 +795,21 @@ class ChatService:
     def search_messages(
         self, channel_id: str, query: str, limit: int = 20
     ) -> List[Dict[str, Any]]:
-        """Search messages in channel"""
-        message_ids = self.channel_messages.get(channel_id, [])
-        results = []
+        """
+        Search messages in channel, newest first
 
-        query_lower = query.lower()
+        Every word in the query must prefix-match a word in the message.
+        """
+        message_ids = self.channel_messages.get(channel_id, [])
+        index = self.search_indexes.get(channel_id)
+        if index is None:
+            return []
 
-        for message_id in reversed(message_ids):
-            message = self.messages.get(message_id)
+        results = []
+        for position in index.search(query, limit):
+            message = self.messages.get(message_ids[position])
             if message and not message.deleted_at:
-                if query_lower in message.content.lower():
-                    results.append(message.to_dict())
-                    if len(results) >= limit:
-                        break
+                results.append(message.to_dict())
 
         return results
 
@@ -0,0 +1,300 @@
+"""
+Metric Storage for Performance Analytics
+Array-backed ring buffers, per-minute/per-hour aggregates and quantile sketches
+"""
+
+import math
+from array import array
+from collections import deque
+from typing import Deque, Dict, Iterator, Optional, Tuple
+
+MINUTE = 60
+HOUR = 3600
+
+
+class QuantileSketch:
+    """
+    Log-bucketed quantile sketch with bounded relative error
+
+    Values are counted in buckets whose bounds grow geometrically by
+    gamma = (1 + alpha) / (1 - alpha), so quantiles are accurate to within
+    ``alpha`` relative error. Sketches merge by adding bucket counts. Once
+    more than ``max_bins`` buckets are in use the lowest ones are collapsed,
+    which only costs accuracy in the low tail.
+    """
+
+    __slots__ = ("alpha", "gamma", "log_gamma", "max_bins", "bins", "negative", "zeros")
+
+    MIN_VALUE = 1e-9
+
+    def __init__(self, alpha: float = 0.02, max_bins: int = 128):
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self.log_gamma = math.log(self.gamma)
+        self.max_bins = max_bins
+        self.bins: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zeros = 0
+
+    @property
+    def count(self) -> int:
+        return sum(self.bins.values()) + sum(self.negative.values()) + self.zeros
+
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self.log_gamma)
+
+    def _value(self, key: int) -> float:
+        return 2 * self.gamma**key / (self.gamma + 1)
+
+    def add(self, value: float, count: int = 1):
+        if value > self.MIN_VALUE:
+            key = self._key(value)
+            self.bins[key] = self.bins.get(key, 0) + count
+            if len(self.bins) > self.max_bins:
+                self._collapse()
+        elif value < -self.MIN_VALUE:
+            key = self._key(-value)
+            self.negative[key] = self.negative.get(key, 0) + count
+        else:
+            self.zeros += count
+
+    def _collapse(self):
+        """Fold the lowest positive buckets into the lowest one kept"""
+        keys = sorted(self.bins)
+        excess = keys[: len(keys) - self.max_bins + 1]
+        target = keys[len(excess)]
+        self.bins[target] += sum(self.bins.pop(key) for key in excess)
+
+    def merge(self, other: "QuantileSketch"):
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        for key, count in other.negative.items():
+            self.negative[key] = self.negative.get(key, 0) + count
+        self.zeros += other.zeros
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def _ordered(self) -> Iterator[Tuple[float, int]]:
+        """(representative value, count) pairs in ascending value order"""
+        for key in sorted(self.negative, reverse=True):
+            yield -self._value(key), self.negative[key]
+        if self.zeros:
+            yield 0.0, self.zeros
+        for key in sorted(self.bins):
+            yield self._value(key), self.bins[key]
+
+    def quantile(self, q: float) -> float:
+        """Value at quantile q (nearest-rank, 0 <= q <= 1)"""
+        total = self.count
+        if not total:
+            return 0.0
+
+        rank = min(int(total * q), total - 1)
+        seen = 0
+        value = 0.0
+        for value, count in self._ordered():
+            seen += count
+            if seen > rank:
+                return value
+        return value
+
+
+class MetricBucket:
+    """Pre-aggregated count/sum/min/max and sketch for one time window"""
+
+    __slots__ = ("start", "count", "total", "total_sq", "min", "max", "sketch")
+
+    def __init__(self, start: float = 0.0):
+        self.start = start
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sketch = QuantileSketch()
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        self.total_sq += value * value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.sketch.add(value)
+
+    def merge(self, other: "MetricBucket"):
+        self.count += other.count
+        self.total += other.total
+        self.total_sq += other.total_sq
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+
+    def summary(self) -> Dict[str, float]:
+        """Statistics in the shape MetricCollector.get_statistics returns"""
+        if not self.count:
+            return {
+                "count": 0,
+                "sum": 0.0,
+                "mean": 0.0,
+                "min": 0.0,
+                "max": 0.0,
+                "stddev": 0.0,
+            }
+
+        mean = self.total / self.count
+        variance = 0.0
+        if self.count > 1:
+            variance = max(0.0, (self.total_sq - self.total * mean) / (self.count - 1))
+
+        median = self.quantile(0.5)
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": mean,
+            "min": self.min,
+            "max": self.max,
+            "stddev": math.sqrt(variance),
+            "median": median,
+            "p50": median,
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+    def quantile(self, q: float) -> float:
+        """Sketch quantile clamped to the exact min/max"""
+        if not self.count:
+            return 0.0
+        return min(max(self.sketch.quantile(q), self.min), self.max)
+
+
+class RingBuffer:
+    """
+    Fixed-capacity ring of (timestamp, value) pairs
+
+    Stored in two ``array('d')`` columns that grow to ``capacity`` and then
+    overwrite the oldest slot. Timestamps are kept non-decreasing so range
+    lookups binary search the logical order.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.timestamps = array("d")
+        self.values = array("d")
+        self.head = 0  # physical slot of the oldest point once full
+        self.tags: Dict[int, Dict[str, str]] = {}  # sparse: slot -> tags
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def _slot(self, index: int) -> int:
+        return (self.head + index) % self.capacity
+
+    def append(self, timestamp: float, value: float, tags: Optional[Dict] = None):
+        if self.timestamps:
+            last = self.timestamps[self._slot(len(self.timestamps) - 1)]
+            timestamp = max(timestamp, last)
+
+        if len(self.timestamps) < self.capacity:
+            slot = len(self.timestamps)
+            self.timestamps.append(timestamp)
+            self.values.append(value)
+        else:
+            slot = self.head
+            self.timestamps[slot] = timestamp
+            self.values[slot] = value
+            self.head = (self.head + 1) % self.capacity
+            self.tags.pop(slot, None)
+
+        if tags:
+            self.tags[slot] = tags
+
+    def _lower_bound(self, timestamp: float) -> int:
+        """First logical index with a timestamp >= the given one"""
+        lo, hi = 0, len(self.timestamps)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.timestamps[self._slot(mid)] < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def between(
+        self, start: Optional[float] = None, end: Optional[float] = None
+    ) -> Iterator[Tuple[float, float, Dict[str, str]]]:
+        """(timestamp, value, tags) for points with start <= ts <= end"""
+        first = self._lower_bound(start) if start is not None else 0
+        for index in range(first, len(self.timestamps)):
+            slot = self._slot(index)
+            timestamp = self.timestamps[slot]
+            if end is not None and timestamp > end:
+                break
+            yield timestamp, self.values[slot], self.tags.get(slot, {})
+
+
+class MetricSeries:
+    """
+    Raw recent points plus per-minute and per-hour aggregates for one metric
+
+    Range statistics merge at most ``minute_retention`` + ``hour_retention``
+    buckets regardless of how many points were recorded; minute buckets are
+    used where retained and hour buckets cover older ranges.
+    """
+
+    def __init__(
+        self,
+        max_points: int = 10000,
+        minute_retention: int = 180,
+        hour_retention: int = 720,
+    ):
+        self.points = RingBuffer(max_points)
+        self.minutes: Deque[MetricBucket] = deque(maxlen=minute_retention)
+        self.hours: Deque[MetricBucket] = deque(maxlen=hour_retention)
+
+    def add(self, timestamp: float, value: float, tags: Optional[Dict] = None):
+        self.points.append(timestamp, value, tags)
+        self._bucket(self.minutes, timestamp, MINUTE).add(value)
+        self._bucket(self.hours, timestamp, HOUR).add(value)
+
+    @staticmethod
+    def _bucket(buckets: Deque[MetricBucket], timestamp: float, width: int):
+        start = timestamp // width * width
+        if not buckets or buckets[-1].start < start:
+            buckets.append(MetricBucket(start))
+            return buckets[-1]
+
+        # Late point: walk back to its window (or the oldest retained one)
+        for bucket in reversed(buckets):
+            if bucket.start <= start:
+                return bucket
+        return buckets[0]
+
+    def aggregate(
+        self, start: Optional[float] = None, end: Optional[float] = None
+    ) -> MetricBucket:
+        """Merge the buckets overlapping [start, end] (minute resolution)"""
+        result = MetricBucket()
+        start = -math.inf if start is None else start
+        end = math.inf if end is None else end
+
+        # Hour buckets fill in history older than the minute tier
+        split = -math.inf
+        if self.minutes and start < self.minutes[0].start:
+            split = math.ceil(self.minutes[0].start / HOUR) * HOUR
+            for bucket in reversed(self.hours):
+                if bucket.start >= split or bucket.start > end:
+                    continue
+                if bucket.start + HOUR <= start:
+                    break
+                result.merge(bucket)
+
+        for bucket in reversed(self.minutes):
+            if bucket.start > end:
+                continue
+            if bucket.start + MINUTE <= start or bucket.start < split:
+                break
+            result.merge(bucket)
+
+        return result
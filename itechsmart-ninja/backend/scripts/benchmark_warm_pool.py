@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Warm Pool Startup Benchmark
+Compares spawning an interpreter per execution with the warm interpreter pool
+"""
+
+import asyncio
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.integrations.warm_pool import WarmInterpreterPool
+
+
+async def run_benchmark(iterations: int):
+    """Benchmark every language the pool supports on this host"""
+    pool = WarmInterpreterPool()
+    try:
+        for language in pool.pool_sizes:
+            if not pool.supports(language):
+                print(f"{language:<8} skipped (interpreter not installed)")
+                continue
+
+            result = await pool.benchmark_startup(language, iterations)
+            print(
+                f"{language:<8} cold {result['cold_start_ms']:>8.2f} ms   "
+                f"warm {result['warm_pool_ms']:>7.2f} ms   "
+                f"{result['speedup']}x faster"
+            )
+    finally:
+        await pool.shutdown()
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print("⚡ iTechSmart Ninja - Warm Pool Startup Benchmark")
+    print("=" * 50)
+    asyncio.run(run_benchmark(iterations))
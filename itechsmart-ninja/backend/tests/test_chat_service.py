@@ -0,0 +1,79 @@
+"""
+Tests for Chat Service message indexes
+"""
+
+import pytest
+from app.services.chat_service import ChatService
+
+
+@pytest.fixture
+def chat():
+    """Create chat service with one channel"""
+    service = ChatService(max_receipt_messages=2)
+    channel = service.create_channel("ws-1", "general", "alice", members=["bob"])
+    service.channel_id = channel["channel"]["channel_id"]
+    return service
+
+
+def _send(chat, content, user="alice", parent=None):
+    response = chat.send_message(
+        chat.channel_id, user, content, parent_message_id=parent
+    )
+    return response["message"]["message_id"]
+
+
+def test_cursor_pagination(chat):
+    """Test pages follow each other without gaps or overlap"""
+    ids = [_send(chat, f"message {i}") for i in range(7)]
+    chat.delete_message(ids[3], "alice")
+
+    first = chat.get_messages(chat.channel_id, limit=3)
+    second = chat.get_messages(chat.channel_id, limit=3, before=first[-1]["message_id"])
+
+    assert [m["message_id"] for m in first] == [ids[6], ids[5], ids[4]]
+    assert [m["message_id"] for m in second] == [ids[2], ids[1], ids[0]]
+
+
+def test_thread_index(chat):
+    """Test replies come from the parent index in order"""
+    parent = _send(chat, "question")
+    replies = [_send(chat, f"answer {i}", "bob", parent) for i in range(3)]
+    _send(chat, "unrelated")
+
+    thread = chat.get_thread_messages(parent)
+
+    assert [m["message_id"] for m in thread] == replies
+    assert chat.messages[parent].thread_count == 3
+
+
+def test_search_tracks_edits_and_deletes(chat):
+    """Test the inverted index follows message updates"""
+    first = _send(chat, "Deploy the billing service")
+    second = _send(chat, "billing dashboard is slow")
+
+    assert [m["message_id"] for m in chat.search_messages(chat.channel_id, "bill")] == [
+        second,
+        first,
+    ]
+
+    chat.edit_message(first, "alice", "Deploy the search service")
+    chat.delete_message(second, "alice")
+
+    assert chat.search_messages(chat.channel_id, "billing") == []
+    results = chat.search_messages(chat.channel_id, "deploy serv")
+    assert [m["message_id"] for m in results] == [first]
+
+
+def test_read_receipts_bounded(chat):
+    """Test receipts dedupe per user and keep recent messages only"""
+    ids = [_send(chat, f"message {i}") for i in range(3)]
+
+    chat.mark_as_read(ids[0], "bob")
+    chat.mark_as_read(ids[0], "bob")
+    assert len(chat.get_read_receipts(ids[0])) == 1
+
+    chat.mark_as_read(ids[1], "bob")
+    chat.mark_as_read(ids[2], "bob")
+
+    assert chat.get_read_receipts(ids[0]) == []
+    assert len(chat.read_receipts) == 2
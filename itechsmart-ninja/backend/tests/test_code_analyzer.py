@@ -0,0 +1,87 @@
+"""
+Tests for incremental Code Analyzer
+"""
+
+import pytest
+from app.core.code_analyzer import CodeAnalyzer, analyze_source
+
+
+SAMPLE = """
+def build(items=[]):
+    out = ""
+    for item in items:
+        for part in item:
+            for char in part:
+                out += char
+    try:
+        return eval(out)
+    except:
+        print("failed")
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Create a small project tree"""
+    backend = tmp_path / "backend"
+    backend.mkdir()
+    (backend / "sample.py").write_text(SAMPLE)
+    (backend / "clean.py").write_text('"""Clean module"""\n\nVALUE = 1\n')
+    return tmp_path
+
+
+def test_single_pass_checks():
+    """Test the fused visitor reports every check category"""
+    analysis = analyze_source(SAMPLE)
+
+    quality = {issue["type"] for issue in analysis["quality_issues"]}
+    performance = [issue["type"] for issue in analysis["performance_issues"]]
+    security = {issue["type"] for issue in analysis["security_issues"]}
+    practices = {issue["type"] for issue in analysis["best_practices"]}
+
+    assert "nested_loops" in quality
+    # One concatenation issue per enclosing loop
+    assert performance.count("string_concat_in_loop") == 3
+    assert "dangerous_function" in security
+    assert practices == {"mutable_default", "bare_except", "print_statement"}
+    assert analysis["complexity"]["max_function_complexity"] == 5
+
+
+def test_syntax_error_reported():
+    """Test unparsable source returns an error"""
+    assert "error" in analyze_source("def broken(:\n")
+
+
+def test_incremental_reanalysis(project):
+    """Test only changed files are re-analyzed across runs"""
+    cache_path = project / "cache.json"
+
+    first = CodeAnalyzer(project, cache_path=cache_path).analyze_project()
+    assert first["files_analyzed"] == 2
+    assert first["files_reanalyzed"] == 2
+
+    # A fresh analyzer picks up the persisted cache
+    second = CodeAnalyzer(project, cache_path=cache_path).analyze_project()
+    assert second["files_reanalyzed"] == 0
+    assert second["issues"] == first["issues"]
+
+    (project / "backend" / "clean.py").write_text("def f():\n    print(1)\n")
+    third = CodeAnalyzer(project, cache_path=cache_path).analyze_project()
+    assert third["files_reanalyzed"] == 1
+    assert len(third["issues"]["quality"]) == len(first["issues"]["quality"])
+
+
+def test_parallel_matches_serial(project):
+    """Test process pool fan-out returns the same results"""
+    for i in range(10):
+        (project / "backend" / f"module_{i}.py").write_text(f"{SAMPLE}\nX = {i + 2}\n")
+
+    serial = CodeAnalyzer(
+        project, cache_path=project / "serial.json", max_workers=1
+    ).analyze_project()
+    parallel = CodeAnalyzer(
+        project, cache_path=project / "parallel.json", max_workers=2
+    ).analyze_project()
+
+    assert parallel["files_reanalyzed"] == 12
+    assert parallel["files"] == serial["files"]
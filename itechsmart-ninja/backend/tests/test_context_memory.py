@@ -0,0 +1,74 @@
+"""
+Tests for Context Memory retrieval indexes
+"""
+
+import pytest
+from app.core.context_memory import ContextMemory, ContextType, MemoryPriority
+
+
+@pytest.fixture
+def memory():
+    """Create context memory instance"""
+    return ContextMemory("session-1")
+
+
+def test_search_ranks_by_bm25(memory):
+    """Test entries mentioning the query more often rank first"""
+    memory.add("deploy the service")
+    best = memory.add("deploy deploy deploy now")
+    memory.add("unrelated note")
+
+    results = memory.search("deploy")
+
+    assert len(results) == 2
+    assert results[0].entry_id == best
+
+
+def test_search_matches_word_prefixes(memory):
+    """Test a query term finds longer words it prefixes"""
+    exact = memory.add("deploy to staging")
+    longer = memory.add("deployment finished")
+    memory.add("rollback started")
+
+    results = memory.search("deploy")
+
+    assert [entry.entry_id for entry in results] == [exact, longer]
+    assert memory.search("deployments") == []
+
+
+def test_search_filters_by_context_type(memory):
+    """Test the context type filter"""
+    memory.add("build the image", context_type=ContextType.TASK)
+    conversation = memory.add("build failed", context_type=ContextType.CONVERSATION)
+
+    results = memory.search("build", context_type=ContextType.CONVERSATION)
+
+    assert [entry.entry_id for entry in results] == [conversation]
+
+
+def test_reimport_does_not_duplicate_indexes(memory):
+    """Test re-adding an existing entry id replaces its index entries"""
+    entry_id = memory.add("alpha beta", tags=["greek"])
+    exported = memory.export()
+    exported["entries"][0]["content"] = "gamma"
+
+    memory.import_data(exported)
+
+    assert memory.index["greek"] == [entry_id]
+    assert memory.search("alpha") == []
+    assert [entry.entry_id for entry in memory.search("gamma")] == [entry_id]
+    assert len(memory.text_index) == 1
+    assert "alpha" not in memory.text_index.vocabulary
+    assert len(memory._eviction_seqs) == 1
+
+
+def test_compress_evicts_low_priority_first():
+    """Test eviction removes the lowest priority, oldest entries"""
+    memory = ContextMemory("session-1", max_entries=2)
+    low = memory.add("first", priority=MemoryPriority.LOW)
+    high = memory.add("second", priority=MemoryPriority.HIGH)
+    normal = memory.add("third", priority=MemoryPriority.NORMAL)
+
+    assert set(memory.entries) == {high, normal}
+    assert memory.search("first") == []
+    assert low not in memory.token_counts
@@ -0,0 +1,84 @@
+"""
+Tests for the File Manager parse cache
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from app.core.file_parser import FileManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Create file manager with a small parse cache"""
+    executor = ThreadPoolExecutor(max_workers=2)
+    yield FileManager(
+        storage_path=str(tmp_path), parse_executor=executor, max_cached_parses=2
+    )
+    executor.shutdown()
+
+
+async def _upload(manager, name, data):
+    return await manager.upload_file(name, json.dumps(data).encode(), "user-1")
+
+
+@pytest.mark.asyncio
+async def test_identical_content_is_parsed_once(manager):
+    """Test files with the same content share one cache entry"""
+    first = await _upload(manager, "a.json", {"x": 1})
+    second = await _upload(manager, "b.json", {"x": 1})
+
+    parsed_first = await manager.parse_file(first.file_id)
+    parsed_second = await manager.parse_file(second.file_id)
+
+    assert parsed_first.structured_data == parsed_second.structured_data == {"x": 1}
+    assert len(manager.parse_cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_parse_results_are_read_only(manager):
+    """Test files sharing a cached parse can't mutate it for each other"""
+    first = await _upload(manager, "a.json", {"items": [1, 2]})
+    second = await _upload(manager, "b.json", {"items": [1, 2]})
+
+    parsed_first = await manager.parse_file(first.file_id)
+    with pytest.raises(TypeError):
+        parsed_first.structured_data["items"] = [3]
+    with pytest.raises(AttributeError):
+        parsed_first.structured_data["items"].append(3)
+    parsed_first.metadata["own"] = True
+    parsed_second = await manager.parse_file(second.file_id)
+
+    assert parsed_second.structured_data == {"items": (1, 2)}
+    assert json.loads(json.dumps(parsed_second.structured_data)) == {"items": [1, 2]}
+    assert "own" not in parsed_second.metadata
+
+
+@pytest.mark.asyncio
+async def test_parse_cache_evicts_least_recently_used(manager):
+    """Test the parse cache stays within max_cached_parses"""
+    files = [await _upload(manager, f"{i}.json", {"i": i}) for i in range(3)]
+
+    await manager.parse_file(files[0].file_id)
+    await manager.parse_file(files[1].file_id)
+    await manager.parse_file(files[0].file_id)
+    await manager.parse_file(files[2].file_id)
+
+    cached = {key.split(":")[0] for key in manager.parse_cache}
+    assert cached == {files[0].hash_sha256, files[2].hash_sha256}
+
+
+@pytest.mark.asyncio
+async def test_parse_cache_stays_within_byte_budget(manager):
+    """Test large results are evicted or never cached"""
+    small = await _upload(manager, "small.json", {"i": 1})
+    large = await _upload(manager, "large.json", {"text": "x" * 10_000})
+
+    await manager.parse_file(small.file_id)
+    manager.max_cache_bytes = manager.parse_cache_bytes + 1000
+    parsed = await manager.parse_file(large.file_id)
+
+    assert parsed.structured_data["text"] == "x" * 10_000
+    assert len(manager.parse_cache) == 1
+    assert manager.parse_cache_bytes <= manager.max_cache_bytes
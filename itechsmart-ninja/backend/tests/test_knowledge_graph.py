@@ -0,0 +1,131 @@
+"""
+Tests for Knowledge Graph and its compact graph store
+"""
+
+import pytest
+from app.core.graph_store import GraphStore
+from app.core.knowledge_graph import KnowledgeGraph, EntityType, RelationType
+
+
+@pytest.fixture
+def graph():
+    """Create knowledge graph instance"""
+    return KnowledgeGraph()
+
+
+async def _chain(graph, names):
+    """Create entities linked in a chain"""
+    entities = [
+        await graph.create_entity(name, EntityType.CONCEPT, "user-1") for name in names
+    ]
+    for a, b in zip(entities, entities[1:]):
+        await graph.create_relationship(
+            a.entity_id, b.entity_id, RelationType.RELATED_TO, "user-1", weight=0.5
+        )
+    return entities
+
+
+@pytest.mark.asyncio
+async def test_find_path_shortest(graph):
+    """Test bidirectional BFS finds the shortest directed path"""
+    a, b, c, d = await _chain(graph, ["A", "B", "C", "D"])
+    await graph.create_relationship(
+        a.entity_id, d.entity_id, RelationType.DEPENDS_ON, "user-1"
+    )
+
+    path = await graph.find_path(a.entity_id, d.entity_id)
+
+    assert path.path == [a.entity_id, d.entity_id]
+    assert path.length == 1
+    assert await graph.find_path(d.entity_id, a.entity_id) is None
+
+
+@pytest.mark.asyncio
+async def test_find_path_respects_max_depth(graph):
+    """Test paths longer than max_depth are not returned"""
+    entities = await _chain(graph, ["A", "B", "C", "D"])
+
+    path = await graph.find_path(entities[0].entity_id, entities[-1].entity_id)
+    assert path.length == 3
+    assert path.total_weight == pytest.approx(1.5)
+
+    assert (
+        await graph.find_path(entities[0].entity_id, entities[-1].entity_id, 2)
+    ) is None
+
+
+@pytest.mark.asyncio
+async def test_delete_relationship_updates_traversal(graph):
+    """Test deleted relationships are no longer traversed"""
+    a, b = await _chain(graph, ["A", "B"])
+    rel_id = next(iter(graph.relationships))
+
+    await graph.delete_relationship(rel_id)
+
+    assert await graph.get_neighbors(a.entity_id) == []
+    assert await graph.find_path(a.entity_id, b.entity_id) is None
+
+
+@pytest.mark.asyncio
+async def test_find_clusters(graph):
+    """Test connected components become clusters"""
+    await _chain(graph, ["A", "B", "C"])
+    await _chain(graph, ["X", "Y"])
+
+    clusters = await graph.find_clusters(min_size=3)
+
+    assert len(clusters) == 1
+    assert len(clusters[0].entities) == 3
+
+
+@pytest.mark.asyncio
+async def test_search_entities_trigram_index(graph):
+    """Test name search through the trigram index"""
+    await graph.create_entity("PostgreSQL", EntityType.TECHNOLOGY, "user-1")
+    await graph.create_entity("Postman", EntityType.PRODUCT, "user-1")
+    renamed = await graph.create_entity("Redis", EntityType.TECHNOLOGY, "user-1")
+    await graph.update_entity(renamed.entity_id, {"name": "Postgres Replica"})
+
+    results = await graph.search_entities("postg")
+    assert [e.name for e in results] == ["PostgreSQL", "Postgres Replica"]
+
+    results = await graph.search_entities("post", EntityType.PRODUCT)
+    assert [e.name for e in results] == ["Postman"]
+
+    assert await graph.search_entities("redis") == []
+
+
+@pytest.mark.asyncio
+async def test_snapshot_roundtrip(graph, tmp_path):
+    """Test snapshot persistence restores entities and adjacency"""
+    a, b, c = await _chain(graph, ["A", "B", "C"])
+    snapshot = str(tmp_path / "graph.snapshot.gz")
+
+    await graph.save_snapshot(snapshot)
+    restored = KnowledgeGraph()
+    await restored.load_snapshot(snapshot)
+
+    assert len(restored.entities) == 3
+    path = await restored.find_path(a.entity_id, c.entity_id)
+    assert path.path == [a.entity_id, b.entity_id, c.entity_id]
+
+
+def test_store_remove_node_with_edges_keeps_node():
+    """Test a refused node removal leaves the node intact"""
+    store = GraphStore()
+    store.add_node("a", "alpha")
+    store.add_node("b", "beta")
+    store.add_edge("e", "a", "b")
+
+    with pytest.raises(ValueError):
+        store.remove_node("a")
+
+    assert "a" in store
+    assert store.degree("a") == 1
+    with pytest.raises(ValueError):
+        store.add_node("a")
+
+    store.remove_edge("e")
+    store.remove_node("a")
+    assert "a" not in store
+    assert list(store.node_keys()) == ["b"]
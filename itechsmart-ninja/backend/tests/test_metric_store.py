@@ -0,0 +1,69 @@
+"""
+Tests for the analytics metric store
+"""
+
+import random
+
+import pytest
+from app.services.metric_store import (
+    HOUR,
+    MINUTE,
+    MetricSeries,
+    QuantileSketch,
+    RingBuffer,
+)
+
+
+def test_sketch_relative_error():
+    """Test sketch quantiles stay within the configured relative error"""
+    rng = random.Random(7)
+    values = sorted(rng.lognormvariate(3, 1) for _ in range(20000))
+    sketch = QuantileSketch(alpha=0.02)
+    for value in values:
+        sketch.add(value)
+
+    for q in (0.5, 0.95, 0.99):
+        exact = values[int(len(values) * q)]
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.05)
+    assert len(sketch.bins) <= sketch.max_bins
+
+
+def test_ring_buffer_wraps_and_filters():
+    """Test the ring keeps the newest points and range lookups bisect"""
+    ring = RingBuffer(capacity=5)
+    for i in range(8):
+        ring.append(float(i), i * 10.0, {"i": str(i)} if i == 7 else None)
+
+    assert len(ring) == 5
+    assert [ts for ts, _, _ in ring.between()] == [3.0, 4.0, 5.0, 6.0, 7.0]
+    assert [v for _, v, _ in ring.between(4.5, 6.0)] == [50.0, 60.0]
+    assert list(ring.between(7.0))[0][2] == {"i": "7"}
+
+
+def test_series_aggregates_by_bucket():
+    """Test range statistics come from minute buckets"""
+    series = MetricSeries(max_points=10)
+    base = 1_000 * HOUR
+    for minute in range(10):
+        for value in (1.0, 2.0, 3.0):
+            series.add(base + minute * MINUTE, value + minute)
+
+    everything = series.aggregate()
+    assert everything.count == 30
+    assert everything.min == 1.0 and everything.max == 12.0
+
+    last_two = series.aggregate(base + 8 * MINUTE)
+    assert last_two.count == 6
+    assert last_two.summary()["mean"] == pytest.approx(10.5)
+
+
+def test_series_falls_back_to_hour_buckets():
+    """Test history older than the minute tier is served by hour buckets"""
+    series = MetricSeries(minute_retention=60, hour_retention=48)
+    base = 1_000 * HOUR
+    for minute in range(5 * 60):
+        series.add(base + minute * MINUTE, 1.0)
+
+    assert len(series.minutes) == 60
+    assert series.aggregate(base).count == 5 * 60
+    assert series.aggregate(base + 4 * HOUR).count == 60
@@ -0,0 +1,110 @@
+"""
+Tests for concurrent plan execution in the Multi-Agent Orchestrator
+"""
+
+import asyncio
+
+import pytest
+from app.agents.orchestrator import MultiAgentOrchestrator, TaskPlan
+
+
+class FakeAgent:
+    """Agent that sleeps and records concurrency"""
+
+    def __init__(self, delay: float = 0.05, fail_on: str = None):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.active = 0
+        self.max_active = 0
+        self.tasks = []
+
+    async def execute(self, task):
+        self.tasks.append(task)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if task["description"] == self.fail_on:
+                raise RuntimeError("agent failed")
+            return {"success": True, "output": task["description"]}
+        finally:
+            self.active -= 1
+
+    def get_status(self):
+        return {}
+
+
+@pytest.fixture
+def orchestrator():
+    """Create orchestrator with fake agents"""
+    orchestrator = MultiAgentOrchestrator(agent_concurrency={"coder": 2})
+    orchestrator.agents = {
+        "researcher": FakeAgent(),
+        "coder": FakeAgent(),
+        "writer": FakeAgent(),
+    }
+    return orchestrator
+
+
+@pytest.mark.asyncio
+async def test_independent_steps_run_concurrently(orchestrator):
+    """Test ready steps are dispatched together"""
+    plan = TaskPlan("task-1", "parallel")
+    plan.add_step("researcher", "search", "research")
+    plan.add_step("coder", "generate", "code")
+    plan.add_step("writer", "document", "docs", dependencies=[1, 2])
+
+    result = await asyncio.wait_for(orchestrator._execute_plan(plan), 0.5)
+
+    assert result["success"] is True
+    assert result["steps_completed"] == 3
+    writer_task = orchestrator.agents["writer"].tasks[0]
+    assert set(writer_task["context"]) == {"step_1", "step_2"}
+
+
+@pytest.mark.asyncio
+async def test_per_agent_concurrency_cap(orchestrator):
+    """Test an agent never runs more steps than its cap"""
+    plan = TaskPlan("task-2", "fan out")
+    for i in range(5):
+        plan.add_step("coder", "generate", f"module {i}")
+
+    result = await orchestrator._execute_plan(plan)
+
+    assert result["success"] is True
+    assert orchestrator.agents["coder"].max_active == 2
+
+
+@pytest.mark.asyncio
+async def test_progress_reported_per_step(orchestrator):
+    """Test progress callbacks stream as steps finish"""
+    events = []
+
+    async def on_progress(event):
+        events.append(event)
+
+    plan = TaskPlan("task-3", "progress")
+    plan.add_step("researcher", "search", "a")
+    plan.add_step("writer", "document", "b", dependencies=[1])
+
+    await orchestrator._execute_plan(plan, on_progress)
+
+    assert [e["current_step"] for e in events] == [1, 2]
+    assert events[-1]["progress"] == 100
+
+
+@pytest.mark.asyncio
+async def test_failure_cancels_remaining_steps(orchestrator):
+    """Test the first failure cancels in-flight and pending steps"""
+    orchestrator.agents["researcher"] = FakeAgent(delay=0.01, fail_on="boom")
+    orchestrator.agents["coder"] = FakeAgent(delay=1.0)
+
+    plan = TaskPlan("task-4", "failure")
+    plan.add_step("researcher", "search", "boom")
+    plan.add_step("coder", "generate", "slow")
+    plan.add_step("writer", "document", "docs", dependencies=[1, 2])
+
+    result = await asyncio.wait_for(orchestrator._execute_plan(plan), 0.5)
+
+    assert result["success"] is False
+    assert [s["status"] for s in plan.steps] == ["failed", "cancelled", "cancelled"]
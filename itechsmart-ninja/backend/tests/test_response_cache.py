@@ -0,0 +1,180 @@
+"""
+Tests for the completion response cache
+"""
+
+import asyncio
+
+import pytest
+from app.integrations.enhanced_ai_providers import (
+    EnhancedAIProviderManager,
+    ModelProvider,
+)
+from app.integrations.response_cache import CompletionCache, make_cache_key
+
+
+class FakeProvider:
+    """Local stand-in for a model provider"""
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.calls = 0
+
+    async def complete(self, prompt: str):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"content": f"echo: {prompt}", "cost": 0.25}
+
+
+def _key(content: str, temperature: float = 0.0):
+    return make_cache_key(
+        "fake-model", [{"role": "user", "content": content}], temperature, None
+    )
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_skips_provider():
+    """Test repeated prompts are served from memory"""
+    cache = CompletionCache()
+    provider = FakeProvider()
+
+    first, entry = await cache.get_or_compute(
+        _key("hello"), lambda: provider.complete("hello")
+    )
+    second, hit = await cache.get_or_compute(
+        _key("  hello\r\n"), lambda: provider.complete("hello")
+    )
+
+    assert entry is None and hit is not None
+    assert first == second
+    assert provider.calls == 1
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["latency_saved_ms"] > 0
+    assert stats["cost_saved"] == pytest.approx(0.25)
+
+
+def test_key_covers_sampling_parameters():
+    """Test temperature and max_tokens produce distinct keys"""
+    messages = [{"role": "user", "content": "hi"}]
+
+    assert make_cache_key("m", messages, 0.0, None) != make_cache_key(
+        "m", messages, 0.7, None
+    )
+    assert make_cache_key("m", messages, 0.0, None) != make_cache_key(
+        "m", messages, 0.0, 256
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_coalesce():
+    """Test identical in-flight requests share one provider call"""
+    cache = CompletionCache()
+    provider = FakeProvider(delay=0.05)
+
+    results = await asyncio.gather(
+        *(
+            cache.get_or_compute(_key("plan"), lambda: provider.complete("plan"))
+            for _ in range(5)
+        )
+    )
+
+    assert provider.calls == 1
+    assert {r[0]["content"] for r in results} == {"echo: plan"}
+    assert cache.get_stats()["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+async def test_cancelled_owner_does_not_cancel_followers():
+    """Test followers still get the result when the first caller is cancelled"""
+    cache = CompletionCache()
+    provider = FakeProvider(delay=0.05)
+
+    def compute():
+        return provider.complete("plan")
+
+    owner = asyncio.ensure_future(cache.get_or_compute(_key("plan"), compute))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(cache.get_or_compute(_key("plan"), compute))
+    await asyncio.sleep(0)
+    owner.cancel()
+
+    response, entry = await follower
+
+    assert owner.cancelled()
+    assert response["content"] == "echo: plan"
+    assert entry is not None
+    assert provider.calls == 1
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_call_is_not_cached():
+    """Test provider errors propagate to followers and are retried"""
+    cache = CompletionCache()
+    calls = 0
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError("rate limited")
+
+    results = await asyncio.gather(
+        cache.get_or_compute(_key("x"), failing),
+        cache.get_or_compute(_key("x"), failing),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert calls == 1
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_and_disk_tier(tmp_path):
+    """Test evicted entries are recovered from the disk tier"""
+    cache = CompletionCache(max_entries=1, cache_dir=str(tmp_path))
+    provider = FakeProvider(delay=0)
+
+    await cache.get_or_compute(_key("a"), lambda: provider.complete("a"))
+    await cache.get_or_compute(_key("b"), lambda: provider.complete("b"))
+    assert len(cache) == 1
+
+    restarted = CompletionCache(cache_dir=str(tmp_path))
+    response, entry = await restarted.get_or_compute(
+        _key("a"), lambda: provider.complete("a")
+    )
+
+    assert entry is not None
+    assert response["content"] == "echo: a"
+    assert provider.calls == 2
+    assert restarted.get_stats()["disk_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_manager_caches_only_deterministic_calls_by_default():
+    """Test sampled completions are not cached unless requested"""
+    manager = EnhancedAIProviderManager(cache=CompletionCache())
+    manager.provider_clients[ModelProvider.OPENAI] = object()
+    provider = FakeProvider(delay=0)
+
+    async def route(model, messages, temperature, max_tokens, stream):
+        return await provider.complete(messages[-1]["content"])
+
+    manager._route_completion = route
+    messages = [{"role": "user", "content": "hi"}]
+
+    for _ in range(2):
+        await manager.generate_completion("gpt-4o-mini", messages, temperature=0.7)
+    assert provider.calls == 2
+
+    for _ in range(2):
+        await manager.generate_completion("gpt-4o-mini", messages, temperature=0)
+    assert provider.calls == 3
+
+    for _ in range(2):
+        await manager.generate_completion(
+            "gpt-4o-mini", messages, temperature=0.7, use_cache=True
+        )
+    assert provider.calls == 4
@@ -0,0 +1,149 @@
+"""
+Tests for the Warm Interpreter Pool
+"""
+
+import shutil
+
+import pytest
+import pytest_asyncio
+from app.integrations.warm_pool import WarmInterpreterPool
+
+
+@pytest_asyncio.fixture
+async def pool():
+    """Create a warm pool with one worker per language"""
+    pool = WarmInterpreterPool(pool_sizes={"python": 1, "nodejs": 1})
+    yield pool
+    await pool.shutdown()
+
+
+requires_node = pytest.mark.skipif(shutil.which("node") is None, reason="no node")
+
+
+@pytest.mark.asyncio
+async def test_python_runs_are_isolated(pool):
+    """Test state changed by one run is not visible to the next"""
+    first = await pool.execute(
+        "python",
+        "import builtins, json\n"
+        "builtins.print = lambda *a, **k: None\n"
+        "json.dumps = lambda *a, **k: 'hijacked'\n"
+        "secret = 42\n",
+        timeout=10,
+    )
+    second = await pool.execute(
+        "python",
+        "import json\nprint(json.dumps([1]), 'secret' in globals())",
+        timeout=10,
+    )
+
+    assert first["exit_code"] == 0
+    assert second == {"output": "[1] False\n", "error": "", "exit_code": 0}
+    assert pool.get_status()["languages"]["python"]["workers"] == 1
+
+
+@pytest.mark.asyncio
+async def test_python_captures_fd_level_output(pool):
+    """Test output written straight to fds 1 and 2 is captured"""
+    result = await pool.execute(
+        "python",
+        "import os\n"
+        "print('from print', flush=True)\n"
+        "os.system('echo from shell')\n"
+        "os.write(2, b'raw stderr\\n')\n",
+        timeout=10,
+    )
+
+    assert result["output"] == "from print\nfrom shell\n"
+    assert result["error"] == "raw stderr\n"
+    assert result["exit_code"] == 0
+
+
+@pytest.mark.asyncio
+async def test_python_reports_errors_and_exit_codes(pool):
+    """Test exceptions and sys.exit map to exit codes"""
+    error = await pool.execute("python", "raise ValueError('boom')", timeout=10)
+    exited = await pool.execute("python", "import sys\nsys.exit(3)", timeout=10)
+
+    assert error["exit_code"] == 1
+    assert "ValueError: boom" in error["error"]
+    assert exited["exit_code"] == 3
+
+
+@pytest.mark.asyncio
+async def test_python_timeout_keeps_worker_usable(pool):
+    """Test a timed out run is killed and the next run succeeds"""
+    result = await pool.execute(
+        "python", "import time\nprint('started', flush=True)\ntime.sleep(30)", 0.5
+    )
+    after = await pool.execute("python", "print('ok')", timeout=10)
+
+    assert result["exit_code"] == 124
+    assert result["error"] == "Execution timeout"
+    assert after["output"] == "ok\n"
+    assert pool.get_status()["timeouts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_dead_worker_is_respawned(pool):
+    """Test a worker killed outside the pool is replaced"""
+    await pool.start(["python"])
+    worker = pool._workers["python"][0]
+    await worker.kill()
+
+    result = await pool.execute("python", "print('ok')", timeout=10)
+
+    assert result["output"] == "ok\n"
+    assert pool._workers["python"][0] is not worker
+    assert pool.get_status()["recycled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_waiting_for_worker_times_out(pool, monkeypatch):
+    """Test callers give up when no worker frees up in time"""
+    await pool.start(["python"])
+    worker = pool._workers["python"][0]
+
+    async def fail(language):
+        raise RuntimeError("cannot spawn")
+
+    monkeypatch.setattr(pool, "_spawn", fail)
+    await worker.kill()
+
+    result = await pool.execute("python", "print('ok')", timeout=0.2)
+
+    assert result["exit_code"] == 1
+    assert "No python worker became available" in result["error"]
+
+
+@requires_node
+@pytest.mark.asyncio
+async def test_node_captures_async_output(pool):
+    """Test process and output from later callbacks are available"""
+    result = await pool.execute(
+        "nodejs",
+        "process.stdout.write('sync\\n');\n"
+        "setTimeout(() => console.log('later'), 50);\n"
+        "Promise.resolve().then(() => console.error('microtask'));\n",
+        timeout=10,
+    )
+
+    assert result == {
+        "output": "sync\nlater\n",
+        "error": "microtask\n",
+        "exit_code": 0,
+    }
+
+
+@requires_node
+@pytest.mark.asyncio
+async def test_node_runs_are_isolated(pool):
+    """Test node workers are never reused"""
+    await pool.execute("nodejs", "globalThis.leak = 1; Array.prototype.x = 1", 10)
+    result = await pool.execute(
+        "nodejs", "console.log(typeof leak, [].x, process.exitCode)", timeout=10
+    )
+    timeout = await pool.execute("nodejs", "setInterval(() => {}, 1000)", 0.5)
+
+    assert result["output"] == "undefined undefined undefined\n"
+    assert timeout["exit_code"] == 124
@@ -0,0 +1,176 @@
+"""
+Tests for the core Workflow Engine and its DAG execution mode
+"""
+
+import asyncio
+
+import pytest
+from app.core.workflow_engine import (
+    ActionType,
+    ExecutionMode,
+    TriggerType,
+    WorkflowAction,
+    WorkflowEngine,
+    WorkflowStatus,
+    WorkflowTrigger,
+)
+
+
+@pytest.fixture
+def engine():
+    """Create workflow engine instance"""
+    return WorkflowEngine()
+
+
+def _action(action_id, action_type=ActionType.LOOP, **kwargs):
+    """Create an action with a loop config unless told otherwise"""
+    config = kwargs.pop("config", {"items": [action_id]})
+    return WorkflowAction(action_id, action_type, action_id, config, **kwargs)
+
+
+async def _create(engine, actions, mode=ExecutionMode.DAG):
+    return await engine.create_workflow(
+        "wf",
+        "test",
+        WorkflowTrigger(TriggerType.MANUAL, {}),
+        actions,
+        "user-1",
+        execution_mode=mode,
+    )
+
+
+@pytest.mark.asyncio
+async def test_dag_runs_independent_actions_concurrently(engine):
+    """Test actions without dependencies overlap"""
+    actions = [
+        _action("a", ActionType.DELAY, config={"seconds": 0.1}),
+        _action("b", ActionType.DELAY, config={"seconds": 0.1}),
+        _action("c", depends_on=["a", "b"]),
+    ]
+    workflow = await _create(engine, actions)
+
+    start = asyncio.get_running_loop().time()
+    execution = await engine.execute_workflow(workflow.workflow_id)
+    elapsed = asyncio.get_running_loop().time() - start
+
+    assert execution.status == WorkflowStatus.COMPLETED
+    assert execution.result["c"] == [{"processed": "c"}]
+    assert elapsed < 0.19
+
+
+@pytest.mark.asyncio
+async def test_dag_routes_failures_to_on_error(engine):
+    """Test a failed action runs its handler and skips its downstream"""
+    actions = [
+        _action("fail", ActionType.CONDITIONAL, config={}, on_error="handler"),
+        _action("after", depends_on=["fail"]),
+        _action("handler"),
+    ]
+    workflow = await _create(engine, actions)
+
+    execution = await engine.execute_workflow(workflow.workflow_id)
+
+    assert execution.status == WorkflowStatus.COMPLETED
+    assert "handler" in execution.result
+    assert "after" not in execution.result
+    statuses = {
+        entry["action_id"]: entry["status"] for entry in execution.execution_log
+    }
+    assert statuses["after"] == "skipped"
+
+
+@pytest.mark.asyncio
+async def test_dag_rejects_unknown_on_error_target(engine):
+    """Test on_error targets must exist"""
+    with pytest.raises(ValueError, match="unknown action missing"):
+        await _create(engine, [_action("a", on_error="missing")])
+
+
+@pytest.mark.asyncio
+async def test_dag_rejects_on_error_cycles(engine):
+    """Test error handlers may not route back into themselves or upstream"""
+    with pytest.raises(ValueError, match="cycle"):
+        await _create(engine, [_action("a", on_error="a")])
+
+    with pytest.raises(ValueError, match="cycle"):
+        await _create(
+            engine,
+            [
+                _action("a"),
+                _action("b", depends_on=["a"], on_error="h"),
+                _action("h", on_error="a"),
+            ],
+        )
+
+    with pytest.raises(ValueError, match="cycle"):
+        await _create(
+            engine, [_action("a", depends_on=["b"]), _action("b", depends_on=["a"])]
+        )
+
+
+@pytest.mark.asyncio
+async def test_sequential_mode_skips_dag_validation(engine):
+    """Test sequential workflows keep following next_action links"""
+    actions = [_action("a", next_action="b"), _action("b")]
+    workflow = await _create(engine, actions, mode=ExecutionMode.SEQUENTIAL)
+
+    execution = await engine.execute_workflow(workflow.workflow_id)
+
+    assert execution.status == WorkflowStatus.COMPLETED
+    assert set(execution.result) == {"trigger_data", "a", "b"}
+
+
+@pytest.mark.asyncio
+async def test_dag_runs_actions_shared_with_an_unused_handler(engine):
+    """Test an action reached from both an action and its handler still runs"""
+    actions = [
+        _action("a", next_action="b", on_error="h"),
+        _action("h", next_action="b"),
+        _action("b"),
+    ]
+    workflow = await _create(engine, actions)
+
+    execution = await engine.execute_workflow(workflow.workflow_id)
+
+    assert execution.status == WorkflowStatus.COMPLETED
+    assert set(execution.result) == {"trigger_data", "a", "b"}
+
+
+@pytest.mark.asyncio
+async def test_dag_continues_through_handler_after_failure(engine):
+    """Test the handler's next_action runs when the failed action shared it"""
+    actions = [
+        _action("a", ActionType.CONDITIONAL, config={}, next_action="b", on_error="h"),
+        _action("h", next_action="c"),
+        _action("c", next_action="b"),
+        _action("b"),
+        _action("only_on_error", depends_on=["h"]),
+    ]
+    workflow = await _create(engine, actions)
+
+    execution = await engine.execute_workflow(workflow.workflow_id)
+
+    assert execution.status == WorkflowStatus.COMPLETED
+    assert {"h", "c", "b", "only_on_error"} <= set(execution.result)
+    assert "a" not in execution.result
+
+
+@pytest.mark.asyncio
+async def test_dag_skips_handler_branch_when_unused(engine):
+    """Test actions that only follow an unused handler are logged as skipped"""
+    actions = [
+        _action("a", on_error="h"),
+        _action("h", next_action="c"),
+        _action("c"),
+    ]
+    workflow = await _create(engine, actions)
+
+    execution = await engine.execute_workflow(workflow.workflow_id)
+
+    assert execution.status == WorkflowStatus.COMPLETED
+    assert set(execution.result) == {"trigger_data", "a"}
+    statuses = {
+        entry["action_id"]: entry["status"] for entry in execution.execution_log
+    }
+    assert statuses["c"] == "skipped"
+    assert "h" not in statuses
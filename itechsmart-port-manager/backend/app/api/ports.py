@@ -19,6 +19,10 @@ class PortAssignment(BaseModel):
     force: bool = False
 
 
+class BulkPortAssignment(BaseModel):
+    service_ids: List[str]
+
+
 class PortReassignment(BaseModel):
     service_id: str
     new_port: Optional[int] = None
@@ -71,6 +75,23 @@ async def assign_port(assignment: PortAssignment):
     }
 
 
+@router.post("/assign/bulk")
+async def assign_ports_bulk(assignment: BulkPortAssignment):
+    """Assign available ports to many services at once"""
+    port_manager = get_port_manager()
+    results = await port_manager.assign_ports(assignment.service_ids)
+
+    assigned = {s: port for s, (ok, port, _) in results.items() if ok}
+    failed = {s: message for s, (ok, _, message) in results.items() if not ok}
+
+    return {
+        "success": not failed,
+        "total": len(results),
+        "assigned": assigned,
+        "failed": failed,
+    }
+
+
 @router.post("/reassign")
 async def reassign_port(reassignment: PortReassignment):
     """Reassign a service to a different port"""
@@ -0,0 +1,160 @@
+"""
+Port Allocator - Free-port bookkeeping and concurrent system probing
+"""
+
+import asyncio
+import logging
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Port states in the bitmap
+FREE = 0
+ASSIGNED = 1
+RESERVED = 2
+BUSY = 3
+
+
+class PortBitmap:
+    """
+    State of every port in a range, one byte per port
+
+    Finding the next free port is a C-level ``bytearray.find`` rather than a
+    scan over Python sets. Ports found bound by another process are marked
+    BUSY for ``busy_ttl`` seconds so allocations skip them without probing
+    them again.
+    """
+
+    def __init__(self, low: int, high: int, busy_ttl: float = 30.0):
+        self.low = low
+        self.high = high
+        self.busy_ttl = busy_ttl
+        self._state = bytearray(max(high - low, 0))
+        self._busy_until: Dict[int, float] = {}
+
+    def __contains__(self, port: int) -> bool:
+        return self.low <= port < self.high
+
+    def state(self, port: int) -> Optional[int]:
+        """State of a port (None outside the range)"""
+        return self._state[port - self.low] if port in self else None
+
+    def set(self, port: int, state: int):
+        """Set the state of a port; ports outside the range are ignored"""
+        if port in self:
+            self._state[port - self.low] = state
+            self._busy_until.pop(port, None)
+
+    def mark_busy(self, port: int):
+        """Remember that a free port is bound by another process"""
+        if self.state(port) == FREE:
+            self._state[port - self.low] = BUSY
+            self._busy_until[port] = time.monotonic() + self.busy_ttl
+
+    def clear(self):
+        """Mark every port free"""
+        self._state = bytearray(len(self._state))
+        self._busy_until.clear()
+
+    def candidates(
+        self, start: int, count: int, exclude: Optional[Set[int]] = None
+    ) -> List[int]:
+        """
+        The first ``count`` free ports from ``start`` upwards
+
+        Args:
+            start: Lowest port to consider
+            count: Number of ports wanted
+            exclude: Ports to skip even if free
+        """
+        self._expire()
+        exclude = exclude or set()
+        ports: List[int] = []
+        index = max(start, self.low) - self.low
+        while len(ports) < count:
+            index = self._state.find(FREE, index)
+            if index < 0:
+                break
+            port = self.low + index
+            if port not in exclude:
+                ports.append(port)
+            index += 1
+        return ports
+
+    def _expire(self):
+        if not self._busy_until:
+            return
+        now = time.monotonic()
+        for port in [p for p, until in self._busy_until.items() if until <= now]:
+            del self._busy_until[port]
+            self._state[port - self.low] = FREE
+
+
+class PortProber:
+    """
+    Checks ports for system availability concurrently
+
+    Each probe is a ``bind`` attempt; batches of ports are split across a
+    thread pool so a sweep over hundreds of ports neither runs one bind
+    after another nor blocks the event loop. Batches of up to
+    ``chunk_size`` ports are cheaper to probe inline than to hand off.
+    """
+
+    def __init__(self, max_workers: int = 32, host: str = "", chunk_size: int = 16):
+        self.max_workers = max_workers
+        self.host = host
+        self.chunk_size = chunk_size
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @staticmethod
+    def is_available(port: int, host: str = "") -> bool:
+        """Check if a port can be bound on this host"""
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+                s.bind((host, port))
+                return True
+        except OSError:
+            return False
+
+    async def probe(self, ports: Iterable[int]) -> Dict[int, bool]:
+        """
+        Check many ports at once
+
+        Returns:
+            Availability of each port
+        """
+        ports = list(dict.fromkeys(ports))
+        if len(ports) <= self.chunk_size:
+            return self._probe_chunk(ports)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="port-probe"
+            )
+
+        workers = min(self.max_workers, -(-len(ports) // self.chunk_size))
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    self._executor, self._probe_chunk, ports[i::workers]
+                )
+                for i in range(workers)
+            )
+        )
+
+        availability: Dict[int, bool] = {}
+        for result in results:
+            availability.update(result)
+        return availability
+
+    def close(self):
+        """Stop the probe threads"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _probe_chunk(self, ports: List[int]) -> Dict[int, bool]:
+        return {port: self.is_available(port, self.host) for port in ports}
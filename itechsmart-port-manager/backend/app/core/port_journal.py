@@ -0,0 +1,151 @@
+"""
+Port Journal - Append-only persistence for port configuration changes
+"""
+
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PortJournal:
+    """
+    Snapshot file plus an append-only journal of changes
+
+    Every change is appended to the journal as one JSON line with an
+    increasing sequence number, so an assignment costs one small write
+    instead of rewriting the whole configuration. ``compact`` writes a new
+    snapshot atomically and truncates the journal; the snapshot records the
+    last sequence number it contains, so entries left behind by a crash
+    between the two steps are not applied twice.
+    """
+
+    def __init__(
+        self, snapshot_path: Path, compact_every: int = 1000, fsync: bool = True
+    ):
+        self.snapshot_path = Path(snapshot_path)
+        self.path = self.snapshot_path.with_suffix(".journal")
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self.seq = 0
+        self.pending = 0  # Entries appended since the last compaction
+
+    def exists(self) -> bool:
+        return self.snapshot_path.exists() or self.path.exists()
+
+    @property
+    def needs_compaction(self) -> bool:
+        return self.pending >= self.compact_every
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Read the snapshot and position the sequence after it
+
+        Returns:
+            Snapshot contents, or None if there is no snapshot
+        """
+        self.seq, self.pending = 0, 0
+        if not self.snapshot_path.exists():
+            return None
+        with open(self.snapshot_path, "r") as f:
+            snapshot = json.load(f)
+        self.seq = snapshot.get("journal_seq", 0)
+        return snapshot
+
+    def replay(self) -> Iterator[Dict[str, Any]]:
+        """
+        Journal entries newer than the loaded snapshot, in order
+
+        A partial last line left by a crash mid-append is cut off first, so
+        the next append starts on a line of its own.
+        """
+        if not self.path.exists():
+            return
+        self._truncate_partial_line()
+        with open(self.path, "r") as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    logger.warning(
+                        f"Skipping unreadable journal line {line_number} in {self.path}"
+                    )
+                    continue
+                if entry.get("seq", 0) <= self.seq:
+                    continue
+                self.seq = entry["seq"]
+                self.pending += 1
+                yield entry
+
+    def _truncate_partial_line(self, chunk_size: int = 4096):
+        """Cut the journal back to the end of its last complete line"""
+        with open(self.path, "rb+") as f:
+            end = f.seek(0, os.SEEK_END)
+            if end == 0:
+                return
+            f.seek(end - 1)
+            if f.read(1) == b"\n":
+                return
+
+            keep, position = 0, end
+            while position > 0:
+                start = max(0, position - chunk_size)
+                f.seek(start)
+                newline = f.read(position - start).rfind(b"\n")
+                if newline != -1:
+                    keep = start + newline + 1
+                    break
+                position = start
+
+            logger.warning(
+                f"Dropping {end - keep} bytes of a partial last line in {self.path}"
+            )
+            f.truncate(keep)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+
+    def append(self, entries: List[Dict[str, Any]]):
+        """Append entries with one write (and one fsync)"""
+        if not entries:
+            return
+        lines = []
+        for entry in entries:
+            self.seq += 1
+            lines.append(json.dumps({"seq": self.seq, **entry}) + "\n")
+        with open(self.path, "a") as f:
+            f.write("".join(lines))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        self.pending += len(entries)
+
+    def compact(self, state: Dict[str, Any]):
+        """
+        Replace the snapshot with ``state`` and empty the journal
+
+        Args:
+            state: Full configuration to snapshot
+        """
+        state = {**state, "journal_seq": self.seq}
+        directory = self.snapshot_path.parent
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(state, f, indent=2)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        with open(self.path, "w"):
+            pass
+        self.pending = 0
@@ -5,10 +5,12 @@ Port Manager Core - Handles port allocation, conflict detection, and management
 import asyncio
 import json
 import logging
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 from datetime import datetime
 from pathlib import Path
-import socket
+
+from app.core.port_allocator import ASSIGNED, FREE, RESERVED, PortBitmap, PortProber
+from app.core.port_journal import PortJournal
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +29,13 @@ class PortManager:
         self.port_range = (8000, 9000)  # Default port range
         self.lock = asyncio.Lock()
 
+        # Free-port bitmap, concurrent bind probes and journaled persistence
+        self.allocator = PortBitmap(*self.port_range)
+        self.prober = PortProber()
+        self.probe_batch = 64
+        self.journal = PortJournal(self.config_file)
+        self._port_owners: Dict[int, List[str]] = {}
+
         # Default port assignments for all 26 iTechSmart products
         self.default_ports = {
             # Foundation Products
@@ -67,10 +76,11 @@ class PortManager:
         logger.info("Initializing Port Manager...")
 
         # Load existing configuration or use defaults
-        if self.config_file.exists():
+        if self.journal.exists():
             await self.load_configuration()
         else:
             self.port_assignments = self.default_ports.copy()
+            self._rebuild_index()
             await self.save_configuration()
 
         # Initialize port history
@@ -83,68 +93,93 @@ class PortManager:
         )
 
     async def load_configuration(self):
-        """Load port configuration from file"""
+        """Load the configuration snapshot and replay the journal over it"""
         try:
-            with open(self.config_file, "r") as f:
-                config = json.load(f)
-                self.port_assignments = config.get(
-                    "port_assignments", self.default_ports
-                )
-                self.port_history = config.get("port_history", {})
-                self.reserved_ports = set(config.get("reserved_ports", []))
-                logger.info(f"Loaded configuration from {self.config_file}")
+            config = self.journal.load() or {}
+            self.port_assignments = config.get(
+                "port_assignments", self.default_ports.copy()
+            )
+            self.port_history = config.get("port_history", {})
+            self.reserved_ports = set(config.get("reserved_ports", []))
+            self._rebuild_index()
+
+            replayed = 0
+            for entry in self.journal.replay():
+                self._apply(entry)
+                replayed += 1
+            logger.info(
+                f"Loaded configuration from {self.config_file} "
+                f"({replayed} journal entries)"
+            )
         except Exception as e:
             logger.error(f"Failed to load configuration: {e}")
             self.port_assignments = self.default_ports.copy()
+            self._rebuild_index()
 
     async def save_configuration(self):
-        """Save port configuration to file"""
+        """Save the full port configuration and compact the journal"""
         try:
-            config = {
-                "port_assignments": self.port_assignments,
-                "port_history": self.port_history,
-                "reserved_ports": list(self.reserved_ports),
-                "last_updated": datetime.utcnow().isoformat(),
-            }
-            with open(self.config_file, "w") as f:
-                json.dump(config, f, indent=2)
+            self.journal.compact(
+                {
+                    "port_assignments": self.port_assignments,
+                    "port_history": self.port_history,
+                    "reserved_ports": list(self.reserved_ports),
+                    "last_updated": datetime.utcnow().isoformat(),
+                }
+            )
             logger.info(f"Saved configuration to {self.config_file}")
         except Exception as e:
             logger.error(f"Failed to save configuration: {e}")
 
     def is_port_available(self, port: int) -> bool:
         """Check if a port is available on the system"""
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.bind(("", port))
-                return True
-        except OSError:
-            return False
+        return PortProber.is_available(port)
 
     def is_port_in_use(self, port: int) -> bool:
         """Check if a port is already assigned to a service"""
-        return port in self.port_assignments.values()
+        return bool(self._port_owners.get(port))
 
     async def find_available_port(
         self, start_port: int = None, exclude_ports: Set[int] = None
     ) -> Optional[int]:
         """Find an available port in the configured range"""
-        if start_port is None:
-            start_port = self.port_range[0]
-
-        if exclude_ports is None:
-            exclude_ports = set()
+        ports = await self.find_available_ports(1, start_port, exclude_ports)
+        return ports[0] if ports else None
 
-        # Combine reserved ports and excluded ports
-        unavailable_ports = (
-            self.reserved_ports | exclude_ports | set(self.port_assignments.values())
-        )
+    async def find_available_ports(
+        self, count: int, start_port: int = None, exclude_ports: Set[int] = None
+    ) -> List[int]:
+        """
+        Find up to ``count`` available ports in the configured range
 
-        for port in range(start_port, self.port_range[1]):
-            if port not in unavailable_ports and self.is_port_available(port):
-                return port
+        Free ports come from the bitmap (assigned and reserved ports are
+        never candidates) and are probed against the system in concurrent
+        batches; ports found bound elsewhere are skipped for a while.
+        Returns the lowest available ports, in ascending order.
+        """
+        if start_port is None:
+            start_port = self.port_range[0]
 
-        return None
+        found: List[int] = []
+        batch = count
+        while len(found) < count:
+            window = self.allocator.candidates(
+                start_port, max(count - len(found), batch), exclude_ports
+            )
+            if not window:
+                break
+
+            availability = await self.prober.probe(window)
+            for port in window:
+                if availability[port]:
+                    found.append(port)
+                else:
+                    self.allocator.mark_busy(port)
+            start_port = window[-1] + 1
+            # Widen the window while probes keep hitting busy ports
+            batch = min(batch * 2, self.probe_batch)
+
+        return found[:count]
 
     async def assign_port(
         self, service_id: str, port: int = None, force: bool = False
@@ -154,7 +189,8 @@ class PortManager:
         Returns: (success, port, message)
         """
         async with self.lock:
-            # If no port specified, find an available one
+            # If no port specified, find an available one (already probed)
+            probed = port is None
             if port is None:
                 port = await self.find_available_port()
                 if port is None:
@@ -162,30 +198,20 @@ class PortManager:
 
             # Check if port is available
             if not force:
-                if not self.is_port_available(port):
+                if not probed and not self.is_port_available(port):
                     return False, port, f"Port {port} is already in use by system"
 
                 if self.is_port_in_use(port):
-                    current_service = next(
-                        (s for s, p in self.port_assignments.items() if p == port), None
-                    )
+                    current_service = self._port_owners[port][0]
                     return (
                         False,
                         port,
                         f"Port {port} is already assigned to {current_service}",
                     )
 
-            # Assign the port
-            old_port = self.port_assignments.get(service_id)
-            self.port_assignments[service_id] = port
-
-            # Update history
-            if service_id not in self.port_history:
-                self.port_history[service_id] = []
-            self.port_history[service_id].append(port)
-
-            # Save configuration
-            await self.save_configuration()
+            # Assign the port and journal the change
+            old_port = self._assign(service_id, port)
+            await self._record([{"op": "assign", "service": service_id, "port": port}])
 
             message = f"Assigned port {port} to {service_id}"
             if old_port:
@@ -194,6 +220,40 @@ class PortManager:
             logger.info(message)
             return True, port, message
 
+    async def assign_ports(
+        self, service_ids: List[str]
+    ) -> Dict[str, Tuple[bool, int, str]]:
+        """
+        Assign available ports to many services at once
+
+        All ports are found with one concurrent probe sweep and the
+        assignments are journaled with a single write.
+        Returns: {service_id: (success, port, message)}
+        """
+        async with self.lock:
+            service_ids = list(dict.fromkeys(service_ids))
+            ports = await self.find_available_ports(len(service_ids))
+
+            results: Dict[str, Tuple[bool, int, str]] = {}
+            entries = []
+            for index, service_id in enumerate(service_ids):
+                if index >= len(ports):
+                    results[service_id] = (False, 0, "No available ports in range")
+                    continue
+
+                port = ports[index]
+                old_port = self._assign(service_id, port)
+                entries.append({"op": "assign", "service": service_id, "port": port})
+
+                message = f"Assigned port {port} to {service_id}"
+                if old_port:
+                    message += f" (previously {old_port})"
+                results[service_id] = (True, port, message)
+
+            await self._record(entries)
+            logger.info(f"Assigned {len(entries)} of {len(service_ids)} ports in bulk")
+            return results
+
     async def reassign_port(
         self, service_id: str, new_port: int = None
     ) -> Tuple[bool, int, str]:
@@ -242,9 +302,10 @@ class PortManager:
                     }
                 )
 
-        # Check for system-level conflicts
+        # Check for system-level conflicts, probing all assigned ports at once
+        availability = await self.prober.probe(self.port_assignments.values())
         for service, port in self.port_assignments.items():
-            if not self.is_port_available(port):
+            if not availability[port]:
                 conflicts.append(
                     {
                         "type": "system_conflict",
@@ -311,7 +372,8 @@ class PortManager:
             return False
 
         self.reserved_ports.add(port)
-        await self.save_configuration()
+        self._sync_port(port)
+        await self._record([{"op": "reserve", "port": port}])
         return True
 
     async def unreserve_port(self, port: int) -> bool:
@@ -320,18 +382,24 @@ class PortManager:
             return False
 
         self.reserved_ports.remove(port)
-        await self.save_configuration()
+        self._sync_port(port)
+        await self._record([{"op": "unreserve", "port": port}])
         return True
 
     async def get_port_statistics(self) -> Dict:
         """Get statistics about port usage"""
         total_services = len(self.port_assignments)
-        used_ports = len(set(self.port_assignments.values()))
-        available_ports = sum(
-            1
+        used_ports = len(self._port_owners)
+        unassigned = [
+            p
             for p in range(self.port_range[0], self.port_range[1])
-            if self.is_port_available(p) and not self.is_port_in_use(p)
-        )
+            if not self.is_port_in_use(p)
+        ]
+        availability = await self.prober.probe(unassigned)
+        available_ports = sum(availability.values())
+        for port, available in availability.items():
+            if not available:
+                self.allocator.mark_busy(port)
 
         return {
             "total_services": total_services,
@@ -370,6 +438,7 @@ class PortManager:
                 self.port_history = config.get("port_history", {})
                 self.reserved_ports = set(config.get("reserved_ports", []))
 
+            self._rebuild_index()
             await self.save_configuration()
             logger.info(f"Configuration restored from {backup_file}")
             return True
@@ -384,6 +453,7 @@ class PortManager:
             service: [port] for service, port in self.default_ports.items()
         }
         self.reserved_ports = set()
+        self._rebuild_index()
         await self.save_configuration()
         logger.info("Port assignments reset to defaults")
         return True
@@ -391,4 +461,65 @@ class PortManager:
     async def shutdown(self):
         """Shutdown port manager"""
         await self.save_configuration()
+        self.prober.close()
         logger.info("Port Manager shutdown complete")
+
+    # Helper methods
+
+    def _assign(self, service_id: str, port: int) -> Optional[int]:
+        """Point a service at a port, keeping history and indexes current"""
+        old_port = self.port_assignments.get(service_id)
+        self.port_assignments[service_id] = port
+        self.port_history.setdefault(service_id, []).append(port)
+
+        if old_port is not None:
+            owners = self._port_owners.get(old_port, [])
+            if service_id in owners:
+                owners.remove(service_id)
+            if not owners:
+                self._port_owners.pop(old_port, None)
+            self._sync_port(old_port)
+        self._port_owners.setdefault(port, []).append(service_id)
+        self._sync_port(port)
+        return old_port
+
+    def _apply(self, entry: Dict[str, Any]):
+        """Apply a journal entry"""
+        op = entry.get("op")
+        if op == "assign":
+            self._assign(entry["service"], entry["port"])
+        elif op == "reserve":
+            self.reserved_ports.add(entry["port"])
+            self._sync_port(entry["port"])
+        elif op == "unreserve":
+            self.reserved_ports.discard(entry["port"])
+            self._sync_port(entry["port"])
+        else:
+            logger.warning(f"Ignoring unknown journal entry: {entry}")
+
+    async def _record(self, entries: List[Dict[str, Any]]):
+        """Journal changes, compacting once the journal grows long"""
+        try:
+            self.journal.append(entries)
+        except Exception as e:
+            logger.error(f"Failed to journal configuration change: {e}")
+            return
+        if self.journal.needs_compaction:
+            await self.save_configuration()
+
+    def _rebuild_index(self):
+        """Rebuild the port owner index and bitmap from the configuration"""
+        self.allocator.clear()
+        self._port_owners = {}
+        for service, port in self.port_assignments.items():
+            self._port_owners.setdefault(port, []).append(service)
+        for port in self.reserved_ports | set(self._port_owners):
+            self._sync_port(port)
+
+    def _sync_port(self, port: int):
+        if self._port_owners.get(port):
+            self.allocator.set(port, ASSIGNED)
+        elif port in self.reserved_ports:
+            self.allocator.set(port, RESERVED)
+        else:
+            self.allocator.set(port, FREE)
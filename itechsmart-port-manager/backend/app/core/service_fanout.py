@@ -0,0 +1,393 @@
+"""
+Service Fan-out - Concurrent health checks and batched port-change notifications
+"""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class HealthChecker:
+    """
+    Health checks of suite services, run concurrently and cached
+
+    Checks share the communicator's keep-alive connection pool and at most
+    ``max_concurrency`` run at once. Results (healthy or not) are cached for
+    ``ttl`` seconds and concurrent checks of the same service share one
+    request, so an unreachable service costs one short timeout per TTL
+    instead of a full timeout on every sweep.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        max_concurrency: int = 16,
+        ttl: float = 10.0,
+        timeout: float = 2.0,
+        url_template: str = "http://{service_id}:{port}/health",
+    ):
+        self.client = client
+        self.ttl = ttl
+        self.timeout = httpx.Timeout(timeout, connect=min(timeout, 1.0))
+        self.url_template = url_template
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._cache: Dict[Tuple[str, int], Tuple[float, bool]] = {}
+        self._inflight: Dict[Tuple[str, int], asyncio.Future] = {}
+
+    async def check(self, service_id: str, port: int) -> bool:
+        """Whether a service answers its health endpoint (cached)"""
+        key = (service_id, port)
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._probe(key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # One caller being cancelled must not cancel the check for the others
+        return await asyncio.shield(task)
+
+    async def check_many(self, targets: Dict[str, int]) -> Dict[str, bool]:
+        """
+        Check many services at once
+
+        Args:
+            targets: {service_id: port}
+
+        Returns:
+            {service_id: healthy}
+        """
+        results = await asyncio.gather(
+            *(self.check(service_id, port) for service_id, port in targets.items())
+        )
+        return dict(zip(targets, results))
+
+    def invalidate(self, service_id: Optional[str] = None):
+        """Forget cached results for a service (or for all services)"""
+        if service_id is None:
+            self._cache.clear()
+            return
+        for key in [key for key in self._cache if key[0] == service_id]:
+            del self._cache[key]
+
+    async def _probe(self, key: Tuple[str, int]) -> bool:
+        service_id, port = key
+        url = self.url_template.format(service_id=service_id, port=port)
+        async with self._semaphore:
+            try:
+                response = await self.client.get(url, timeout=self.timeout)
+                healthy = response.status_code == 200
+            except Exception:
+                healthy = False
+        self._cache[key] = (time.monotonic() + self.ttl, healthy)
+        return healthy
+
+
+class PortChangeNotifier:
+    """
+    Delivers port-change notifications in batches, with a durable outbox
+
+    Notifications are collected for ``window`` seconds and coalesced per
+    service (first old port, last new port) into one event per target. A
+    single change is sent as the plain ``port_changed`` notification; more
+    are sent as one ``ports_changed`` event listing every change.
+
+    Events a target fails to accept are kept in a small JSON-lines outbox
+    next to the port configuration and retried with exponential backoff,
+    across restarts. While a target has events waiting, new events for it
+    queue behind them so it never sees changes out of order.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        targets: List[str],
+        outbox_path: Path,
+        window: float = 0.25,
+        max_batch: int = 100,
+        timeout: float = 5.0,
+        retry_interval: float = 5.0,
+        max_backoff: float = 300.0,
+        max_attempts: int = 20,
+        max_outbox: int = 1000,
+    ):
+        self.client = client
+        self.targets = targets
+        self.outbox_path = Path(outbox_path)
+        self.window = window
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self.max_backoff = max_backoff
+        self.max_attempts = max_attempts
+        self.max_outbox = max_outbox
+
+        self._pending: List[Dict[str, Any]] = []
+        self._outbox: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def outbox_size(self) -> int:
+        return sum(len(entries) for entries in self._outbox.values())
+
+    def start(self):
+        """Load the outbox and start the delivery worker"""
+        if self._worker is not None:
+            return
+        self._load_outbox()
+        self._wakeup = asyncio.Event()
+        self._worker = asyncio.create_task(self._run())
+        if self.outbox_size:
+            logger.info(f"Retrying {self.outbox_size} undelivered port-change events")
+
+    def notify(self, notification: Dict[str, Any]):
+        """Queue a port-change notification for the next batch"""
+        self._pending.append(notification)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def flush(self):
+        """Deliver queued notifications now"""
+        await self._deliver_pending()
+
+    async def stop(self, timeout: float = 5.0):
+        """Stop the worker, delivering what is queued (the rest stays in the outbox)"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        try:
+            await asyncio.wait_for(self._deliver_pending(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Timed out delivering port-change events on shutdown")
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.retry_interval)
+                # Let the rest of the burst arrive before sending
+                await asyncio.sleep(self.window)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self._deliver_pending()
+                await self._retry_outbox()
+            except Exception as e:
+                logger.error(f"Error delivering port-change events: {e}")
+
+    # Helper methods
+
+    async def _deliver_pending(self):
+        if not self._pending:
+            return
+        notifications, self._pending = self._pending, []
+        changes = self._coalesce(notifications)
+        if not changes:
+            return
+        events = [
+            self._event(changes[i : i + self.max_batch])
+            for i in range(0, len(changes), self.max_batch)
+        ]
+
+        queued = False
+        for url in self.targets:
+            if self._outbox.get(url):
+                for event in events:
+                    self._enqueue(url, event)
+                queued = True
+        fresh = [url for url in self.targets if not self._outbox.get(url)]
+
+        sent = {url: 0 for url in fresh}
+        try:
+            results = await asyncio.gather(
+                *(self._send_in_order(url, events, sent) for url in fresh)
+            )
+        except asyncio.CancelledError:
+            # Stopped mid-delivery: keep what wasn't sent for the next start
+            for url in fresh:
+                for event in events[sent[url] :]:
+                    self._enqueue(url, event)
+            self._save_outbox()
+            raise
+        for url, undelivered in zip(fresh, results):
+            for event in undelivered:
+                self._enqueue(url, event, attempts=1)
+                queued = True
+            if not undelivered:
+                logger.info(f"Sent {len(changes)} port change(s) to {url}")
+        if queued:
+            self._save_outbox()
+
+    async def _send_in_order(
+        self, url: str, events: List[Dict[str, Any]], sent: Dict[str, int]
+    ) -> List[Dict[str, Any]]:
+        """
+        Send events one after another, counting deliveries in ``sent[url]``
+
+        Returns:
+            The events not delivered
+        """
+        for index, event in enumerate(events):
+            if not await self._send(url, event):
+                return events[index:]
+            sent[url] = index + 1
+        return []
+
+    async def _retry_outbox(self):
+        now = time.time()
+        due = [
+            url
+            for url, entries in self._outbox.items()
+            if entries and entries[0]["next_attempt"] <= now
+        ]
+        if not due:
+            return
+        await asyncio.gather(*(self._retry_target(url) for url in due))
+        self._outbox = {
+            url: entries for url, entries in self._outbox.items() if entries
+        }
+        self._save_outbox()
+
+    async def _retry_target(self, url: str):
+        entries = self._outbox[url]
+        while entries:
+            entry = entries[0]
+            if await self._send(url, entry["event"]):
+                entries.popleft()
+                continue
+            entry["attempts"] += 1
+            if entry["attempts"] >= self.max_attempts:
+                logger.error(
+                    f"Dropping port-change event for {url} after "
+                    f"{entry['attempts']} attempts"
+                )
+                entries.popleft()
+                continue
+            entry["next_attempt"] = time.time() + self._backoff(entry["attempts"])
+            return
+
+    async def _send(self, url: str, event: Dict[str, Any]) -> bool:
+        """
+        POST one event
+
+        Returns:
+            False if the event should be retried
+        """
+        try:
+            response = await self.client.post(url, json=event, timeout=self.timeout)
+        except Exception as e:
+            logger.warning(f"Could not notify {url}: {e}")
+            return False
+        if response.status_code >= 500 or response.status_code == 429:
+            logger.warning(f"{url} returned {response.status_code} for port change")
+            return False
+        if response.status_code >= 400:
+            # Retrying a rejected event would not change the answer
+            logger.warning(f"{url} rejected port change: {response.status_code}")
+        return True
+
+    def _enqueue(self, url: str, event: Dict[str, Any], attempts: int = 0):
+        entries = self._outbox.setdefault(url, deque())
+        entries.append(
+            {
+                "url": url,
+                "event": event,
+                "attempts": attempts,
+                "next_attempt": time.time() + self._backoff(max(attempts, 1)),
+            }
+        )
+        overflow = self.outbox_size - self.max_outbox
+        while overflow > 0:
+            # Drop from the longest queue first; its target is the one down
+            longest = max(self._outbox.values(), key=len)
+            longest.popleft()
+            overflow -= 1
+            logger.warning("Port-change outbox full; dropping the oldest event")
+
+    def _backoff(self, attempts: int) -> float:
+        return min(self.retry_interval * 2 ** (attempts - 1), self.max_backoff)
+
+    @staticmethod
+    def _coalesce(notifications: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        One change per service: its first old port and last new port
+
+        Services that ended up back on their original port are left out.
+        """
+        changes: Dict[str, Dict[str, Any]] = {}
+        for notification in notifications:
+            service_id = notification["service_id"]
+            if service_id in changes:
+                changes[service_id].update(
+                    new_port=notification["new_port"],
+                    timestamp=notification["timestamp"],
+                )
+            else:
+                changes[service_id] = dict(notification)
+        return [
+            change
+            for change in changes.values()
+            if change.get("old_port") != change.get("new_port")
+        ]
+
+    @staticmethod
+    def _event(changes: List[Dict[str, Any]]) -> Dict[str, Any]:
+        if len(changes) == 1:
+            return changes[0]
+        return {
+            "event": "ports_changed",
+            "changes": changes,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+
+    def _load_outbox(self):
+        self._outbox = {}
+        if not self.outbox_path.exists():
+            return
+        with open(self.outbox_path, "r") as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    logger.warning(
+                        f"Skipping unreadable outbox line {line_number} in "
+                        f"{self.outbox_path}"
+                    )
+                    continue
+                self._outbox.setdefault(entry["url"], deque()).append(entry)
+
+    def _save_outbox(self):
+        """Rewrite the outbox atomically (it is small by construction)"""
+        directory = self.outbox_path.parent
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                for entries in self._outbox.values():
+                    for entry in entries:
+                        f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.outbox_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
@@ -8,6 +8,8 @@ import logging
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
+from app.core.service_fanout import HealthChecker, PortChangeNotifier
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,11 +20,29 @@ class SuiteCommunicator:
 
     def __init__(self, port_manager):
         self.port_manager = port_manager
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # One pooled client; health checks and notifications reuse its
+        # keep-alive connections
+        self.client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(
+                max_connections=64, max_keepalive_connections=32, keepalive_expiry=30.0
+            ),
+        )
         self.service_status: Dict[str, Dict] = {}
         self.hub_url = "http://itechsmart-enterprise:8001"
         self.ninja_url = "http://itechsmart-ninja:8002"
 
+        # Concurrent cached health checks and batched port-change events
+        self.health = HealthChecker(self.client)
+        self.notifier = PortChangeNotifier(
+            self.client,
+            [
+                f"{self.hub_url}/api/v1/events/port-change",
+                f"{self.ninja_url}/api/v1/events/port-change",
+            ],
+            outbox_path=port_manager.config_file.with_suffix(".outbox"),
+        )
+
         # Service endpoints for port updates
         self.service_endpoints = {
             "itechsmart-enterprise": "http://itechsmart-enterprise:{port}/api/config/update-port",
@@ -56,6 +76,7 @@ class SuiteCommunicator:
     async def initialize(self):
         """Initialize suite communicator"""
         logger.info("Initializing Suite Communicator...")
+        self.notifier.start()
         await self.discover_services()
         logger.info("Suite Communicator initialized")
 
@@ -81,9 +102,15 @@ class SuiteCommunicator:
 
         # Fallback: check all known services
         if not discovered:
+            targets = {}
             for service_id in self.service_endpoints.keys():
                 port = await self.port_manager.get_service_port(service_id)
-                if port and await self.check_service_health(service_id, port):
+                if port:
+                    targets[service_id] = port
+
+            health = await self.health.check_many(targets)
+            for service_id, is_healthy in health.items():
+                if is_healthy:
                     discovered.append(service_id)
                     self.service_status[service_id] = {
                         "status": "available",
@@ -94,13 +121,8 @@ class SuiteCommunicator:
         return discovered
 
     async def check_service_health(self, service_id: str, port: int) -> bool:
-        """Check if a service is healthy and responding"""
-        try:
-            url = f"http://{service_id}:{port}/health"
-            response = await self.client.get(url, timeout=5.0)
-            return response.status_code == 200
-        except Exception:
-            return False
+        """Check if a service is healthy and responding (cached briefly)"""
+        return await self.health.check(service_id, port)
 
     async def update_service_port(
         self, service_id: str, new_port: int
@@ -146,6 +168,7 @@ class SuiteCommunicator:
                 success, port, message = await self.port_manager.assign_port(
                     service_id, new_port, force=True
                 )
+                self.health.invalidate(service_id)
 
                 return {
                     "success": True,
@@ -197,7 +220,12 @@ class SuiteCommunicator:
     async def broadcast_port_change(
         self, service_id: str, old_port: int, new_port: int
     ):
-        """Broadcast port change to Enterprise Hub and Ninja"""
+        """
+        Broadcast port change to Enterprise Hub and Ninja
+
+        The notification is queued and sent with any other changes made in
+        the same short window; failed deliveries are retried from the outbox.
+        """
         notification = {
             "event": "port_changed",
             "service_id": service_id,
@@ -205,28 +233,8 @@ class SuiteCommunicator:
             "new_port": new_port,
             "timestamp": datetime.utcnow().isoformat(),
         }
-
-        # Notify Enterprise Hub
-        try:
-            await self.client.post(
-                f"{self.hub_url}/api/v1/events/port-change",
-                json=notification,
-                timeout=5.0,
-            )
-            logger.info(f"Notified Hub about port change for {service_id}")
-        except Exception as e:
-            logger.warning(f"Could not notify Hub: {e}")
-
-        # Notify Ninja
-        try:
-            await self.client.post(
-                f"{self.ninja_url}/api/v1/events/port-change",
-                json=notification,
-                timeout=5.0,
-            )
-            logger.info(f"Notified Ninja about port change for {service_id}")
-        except Exception as e:
-            logger.warning(f"Could not notify Ninja: {e}")
+        self.notifier.notify(notification)
+        logger.info(f"Queued port change notification for {service_id}")
 
     async def get_service_status(self, service_id: str) -> Dict:
         """Get current status of a service"""
@@ -245,14 +253,19 @@ class SuiteCommunicator:
 
     async def get_all_service_status(self) -> List[Dict]:
         """Get status of all services"""
-        statuses = []
         assignments = await self.port_manager.get_all_assignments()
+        health = await self.health.check_many(assignments)
+        checked = datetime.utcnow().isoformat()
 
-        for service_id in assignments.keys():
-            status = await self.get_service_status(service_id)
-            statuses.append(status)
-
-        return statuses
+        return [
+            {
+                "service_id": service_id,
+                "port": port,
+                "status": "healthy" if health[service_id] else "unhealthy",
+                "last_checked": checked,
+            }
+            for service_id, port in assignments.items()
+        ]
 
     async def restart_service(self, service_id: str) -> Dict:
         """Request service restart (via Hub or direct)"""
@@ -319,5 +332,6 @@ class SuiteCommunicator:
 
     async def shutdown(self):
         """Shutdown suite communicator"""
+        await self.notifier.stop()
         await self.client.aclose()
         logger.info("Suite Communicator shutdown complete")
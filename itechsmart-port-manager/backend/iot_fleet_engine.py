@@ -7,6 +7,7 @@ import asyncio
 import json
 import logging
 import math
+import uuid
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
@@ -20,12 +21,19 @@ import pandas as pd
 from sklearn.ensemble import IsolationForest, RandomForestRegressor
 from sklearn.preprocessing import StandardScaler
 from shapely.geometry import Point, Polygon
-import geopy.distance
 from paho.mqtt.client import MQTTClient
 
+from iot_ingestion import MicroBatcher
+from iot_rolling_stats import RollingStats
+from iot_route_optimizer import RouteOptimizer, RouteProblem
+from iot_spatial_index import SpatialIndex
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Readings above these values raise a maintenance alert
+MAINTENANCE_THRESHOLDS = {"vibration": 8.0, "temperature": 90.0}
+
 
 class AssetType(Enum):
     VEHICLE = "vehicle"
@@ -105,6 +113,23 @@ class IoTFleetEngine:
         self.mqtt_client = None
         self.alert_handlers = {}
         self.prediction_models = {}
+        self.ingestion = MicroBatcher(
+            self.process_sensor_batch,
+            max_batch_size=config.get("ingest_batch_size", 5000),
+            max_delay=config.get("ingest_max_delay_ms", 50) / 1000,
+            max_pending=config.get("ingest_max_pending", 100_000),
+            max_retries=config.get("ingest_max_retries", 3),
+        )
+        self.sensor_stats = RollingStats(
+            alpha=config.get("anomaly_ewma_alpha", 2 / 101),
+            snapshot_path=config.get("stats_snapshot_path", "sensor_stats.npz"),
+        )
+        # Batch alerts that failed to store, retried with the next batch
+        self._undelivered_alerts: List[FleetAlert] = []
+        self.max_undelivered_alerts = config.get("max_undelivered_alerts", 10_000)
+        self._snapshot_task = None
+        self.spatial_index = SpatialIndex(cell_deg=config.get("spatial_cell_deg", 0.1))
+        self.route_optimizer = RouteOptimizer(max_workers=config.get("route_workers"))
 
     async def initialize(self):
         """Initialize all connections and services"""
@@ -132,6 +157,22 @@ class IoTFleetEngine:
             # Initialize ML models
             await self._initialize_prediction_models()
 
+            # Rolling sensor statistics, warm-started from the last snapshot
+            restored = self.sensor_stats.load()
+            logger.info(f"Restored statistics for {restored} asset sensors")
+            self._snapshot_task = asyncio.create_task(
+                self._snapshot_sensor_stats(
+                    self.config.get("stats_snapshot_interval", 60)
+                )
+            )
+
+            # Latest asset positions, kept current by the GPS ingest path
+            indexed = await self._load_spatial_index()
+            logger.info(f"Indexed positions of {indexed} assets")
+
+            # Micro-batched sensor ingestion
+            await self.ingestion.start()
+
             logger.info("IoT Fleet Engine initialized successfully")
 
         except Exception as e:
@@ -192,6 +233,18 @@ class IoTFleetEngine:
                     asset.status,
                 )
 
+            self.spatial_index.set_info(
+                asset.asset_id,
+                name=asset.name,
+                type=asset.asset_type.value,
+                status=asset.status,
+                health_score=asset.health_score,
+            )
+            if asset.current_location:
+                self._index_locations(
+                    [asset.asset_id], [asset.current_location], [asset.last_updated]
+                )
+
             # Cache asset data
             cache_key = f"asset:{asset.asset_id}"
             self.redis_client.setex(
@@ -206,7 +259,18 @@ class IoTFleetEngine:
             raise
 
     async def process_sensor_data(self, sensor_data: Dict[str, Any]) -> bool:
-        """Process incoming sensor data from IoT devices"""
+        """
+        Accept incoming sensor data from IoT devices
+
+        Readings are buffered and processed in micro-batches by
+        ``process_sensor_batch`` while the ingestion pipeline is running
+        (and immediately otherwise).
+
+        Returns:
+            True once the reading is accepted; a buffered reading is stored
+            later and may still end up in the ingestion dead-letter buffer.
+            False for malformed data.
+        """
         try:
             reading = SensorReading(
                 reading_id=sensor_data["reading_id"],
@@ -218,20 +282,10 @@ class IoTFleetEngine:
                 metadata=sensor_data.get("metadata", {}),
             )
 
-            # Store sensor reading
-            await self._store_sensor_reading(reading)
-
-            # Update asset status based on sensor data
-            await self._update_asset_from_sensor(reading)
-
-            # Check for anomalies
-            await self._detect_anomalies(reading)
-
-            # Predictive maintenance check
-            await self._predictive_maintenance_check(reading)
-
-            # Update real-time dashboard data
-            await self._update_dashboard_data(reading)
+            if self.ingestion.running:
+                await self.ingestion.submit(reading)
+            else:
+                await self.process_sensor_batch([reading])
 
             return True
 
@@ -239,78 +293,162 @@ class IoTFleetEngine:
             logger.error(f"Error processing sensor data: {e}")
             return False
 
-    async def get_fleet_locations(self) -> List[Dict[str, Any]]:
-        """Get real-time locations of all fleet assets"""
-        try:
-            query = """
-                SELECT asset_id, name, asset_type, current_location, 
-                       last_updated, status, health_score
-                FROM assets 
-                WHERE current_location IS NOT NULL
-                AND last_updated > NOW() - INTERVAL '1 hour'
-            """
+    async def process_sensor_batch(self, readings: List[SensorReading]) -> int:
+        """
+        Process a micro-batch of sensor readings
 
-            async with self.db_pool.acquire() as conn:
-                rows = await conn.fetch(query)
+        The batch is bulk-inserted, location and fuel updates are coalesced
+        to the latest value per asset, and anomaly and maintenance checks run
+        over the whole batch against the rolling statistics.
 
-            fleet_locations = []
-            for row in rows:
-                fleet_locations.append(
-                    {
-                        "asset_id": row["asset_id"],
-                        "name": row["name"],
-                        "type": row["asset_type"],
-                        "location": (
-                            json.loads(row["current_location"])
-                            if row["current_location"]
-                            else None
-                        ),
-                        "last_updated": row["last_updated"].isoformat(),
-                        "status": row["status"],
-                        "health_score": float(row["health_score"]),
-                    }
-                )
+        Only the storage steps can raise, and they can safely run again, so
+        the ingestion pipeline may retry a failed batch. Statistics are
+        updated and alerts raised once, after the storage steps succeed;
+        alerts that fail to store are kept and retried with the next batch.
+
+        Returns:
+            Number of readings processed
+        """
+        if not readings:
+            return 0
+
+        # Store sensor readings, then update asset status and the dashboard
+        await self._store_sensor_readings(readings)
+        await asyncio.gather(
+            self._update_assets_from_sensors(readings),
+            self._update_dashboard_data(readings),
+        )
+
+        # Check anomalies and maintenance indicators
+        alerts = self._detect_anomalies(readings)
+        alerts += self._predictive_maintenance_check(readings)
+        await self._deliver_alerts(alerts)
+
+        return len(readings)
 
-            return fleet_locations
+    async def get_fleet_locations(self) -> List[Dict[str, Any]]:
+        """Get real-time locations of all fleet assets"""
+        try:
+            slots = self.spatial_index.all(max_age=3600)
+            return [
+                self._location_entry(entry)
+                for entry in self.spatial_index.describe(slots)
+            ]
 
         except Exception as e:
             logger.error(f"Error getting fleet locations: {e}")
             return []
 
+    async def find_assets_near(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        max_age: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Assets within ``radius_km`` of a point, nearest first
+
+        Args:
+            lat: Latitude of the point
+            lon: Longitude of the point
+            radius_km: Search radius in kilometres
+            max_age: Only assets whose position is at most this many seconds old
+        """
+        found = self.spatial_index.radius(lat, lon, radius_km, max_age)
+        entries = self.spatial_index.describe(found["slots"], found["distance_km"])
+        return [self._location_entry(entry) for entry in entries]
+
+    async def find_nearest_assets(
+        self, lat: float, lon: float, k: int = 5, max_age: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """The ``k`` assets nearest to a point, nearest first"""
+        found = self.spatial_index.nearest(lat, lon, k, max_age)
+        entries = self.spatial_index.describe(found["slots"], found["distance_km"])
+        return [self._location_entry(entry) for entry in entries]
+
+    async def find_assets_in_region(
+        self,
+        region: Tuple[float, float, float, float],
+        max_age: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Assets inside ``region = (lat_min, lat_max, lon_min, lon_max)``"""
+        slots = self.spatial_index.bbox(*region, max_age=max_age)
+        return [
+            self._location_entry(entry) for entry in self.spatial_index.describe(slots)
+        ]
+
     async def optimize_routes(
         self,
         start_location: Tuple[float, float],
         destinations: List[Tuple[float, float]],
         constraints: Dict[str, Any] = None,
     ) -> Dict[str, Any]:
-        """Optimize multi-stop routes using advanced algorithms"""
+        """
+        Optimize multi-stop routes for one or more vehicles
+
+        The solve runs in the route optimizer's process pool. Supported
+        constraints: ``vehicles``, ``vehicle_capacity`` with per-destination
+        ``demands``, ``time_windows`` as (earliest, latest) minutes after
+        departure, ``service_times`` in minutes, ``avg_speed`` in km/h,
+        ``return_to_depot`` and ``time_limit`` (seconds of local search).
+        ``optimized_route`` is the first vehicle's route; ``routes`` lists
+        all of them.
+        """
         try:
             if not destinations:
                 return {"optimized_route": [], "total_distance": 0, "estimated_time": 0}
 
-            # Simple nearest neighbor algorithm (in production, use more sophisticated algorithms)
-            unvisited = destinations.copy()
-            current_location = start_location
-            optimized_route = [current_location]
-            total_distance = 0
+            constraints = constraints or {}
+            avg_speed = constraints.get("avg_speed", 60)
+            return_to_depot = constraints.get("return_to_depot", False)
+            service_times = constraints.get("service_times")
+            if isinstance(service_times, (int, float)):
+                service_times = [service_times] * len(destinations)
+
+            solution = await self.route_optimizer.solve(
+                RouteProblem(
+                    depot=tuple(start_location),
+                    stops=[tuple(location) for location in destinations],
+                    vehicles=constraints.get("vehicles", 1),
+                    capacity=constraints.get("vehicle_capacity"),
+                    demands=constraints.get("demands"),
+                    time_windows=constraints.get("time_windows"),
+                    service_times=service_times,
+                    speed_kmh=avg_speed,
+                    return_to_depot=return_to_depot,
+                    time_limit=constraints.get(
+                        "time_limit", self.config.get("route_time_limit", 1.0)
+                    ),
+                )
+            )
 
-            while unvisited:
-                nearest = self._find_nearest_location(current_location, unvisited)
-                distance = geopy.distance.geodesic(current_location, nearest).kilometers
-                total_distance += distance
-                optimized_route.append(nearest)
-                unvisited.remove(nearest)
-                current_location = nearest
+            routes = []
+            for route in solution["routes"]:
+                stops = [destinations[stop] for stop in route["stops"]]
+                routes.append(
+                    {
+                        "vehicle": route["vehicle"],
+                        "route": [start_location, *stops]
+                        + ([start_location] if return_to_depot else []),
+                        "distance": round(route["distance"], 2),
+                        "load": route["load"],
+                        "duration": round(route["duration"], 2),
+                    }
+                )
 
             # Estimate time based on average speed (50 km/h for urban, 80 km/h for highway)
-            avg_speed = constraints.get("avg_speed", 60) if constraints else 60
+            total_distance = solution["total_distance"]
             estimated_time = (total_distance / avg_speed) * 60  # minutes
 
             return {
-                "optimized_route": optimized_route,
+                "optimized_route": (routes[0]["route"] if routes else [start_location]),
                 "total_distance": round(total_distance, 2),
                 "estimated_time": round(estimated_time, 2),
                 "waypoints": len(destinations),
+                "routes": routes,
+                "unassigned": [destinations[stop] for stop in solution["unassigned"]],
+                "solve_time": round(solution["solve_time"], 3),
             }
 
         except Exception as e:
@@ -323,59 +461,55 @@ class IoTFleetEngine:
         """Generate geospatial heatmap data for fleet activity"""
         try:
             # region = (lat_min, lat_max, lon_min, lon_max)
-            lat_min, lat_max, lon_min, lon_max = region
-
-            query = (
-                """
-                SELECT current_location, asset_type
-                FROM assets 
-                WHERE current_location IS NOT NULL
-                AND last_updated > NOW() - INTERVAL '%s hours'
-                AND CAST(JSON_EXTRACT(current_location, '$.lat') AS FLOAT) 
-                    BETWEEN $2 AND $3
-                AND CAST(JSON_EXTRACT(current_location, '$.lon') AS FLOAT) 
-                    BETWEEN $4 AND $5
-            """
-                % time_period
+            slots = self.spatial_index.bbox(*region, max_age=time_period * 3600)
+            lats, lons = self.spatial_index.positions(slots)
+
+            # Grid cells (~1km), truncated toward zero as cell labels always were
+            grid_size = 0.01
+            cells = np.stack(
+                [np.trunc(lats / grid_size), np.trunc(lons / grid_size)], axis=1
+            ).astype(np.int64)
+            cells, cell_index, counts = np.unique(
+                cells, axis=0, return_inverse=True, return_counts=True
+            )
+            asset_types, type_index = np.unique(
+                np.array(
+                    self.spatial_index.attribute(slots, "type", "unknown"), dtype=str
+                ),
+                return_inverse=True,
             )
 
-            async with self.db_pool.acquire() as conn:
-                rows = await conn.fetch(query, lat_min, lat_max, lon_min, lon_max)
-
-            # Create grid cells for heatmap
-            grid_size = 0.01  # ~1km grid
-            heatmap_data = {}
-
-            for row in rows:
-                location = json.loads(row["current_location"])
-                lat, lon = location["lat"], location["lon"]
-
-                # Calculate grid cell
-                grid_lat = int(lat / grid_size) * grid_size
-                grid_lon = int(lon / grid_size) * grid_size
-                grid_key = f"{grid_lat:.3f},{grid_lon:.3f}"
-
-                if grid_key not in heatmap_data:
-                    heatmap_data[grid_key] = {
-                        "lat": grid_lat,
-                        "lon": grid_lon,
-                        "count": 0,
-                        "asset_types": {},
+            # Asset count per (cell, asset type)
+            by_type = np.bincount(
+                cell_index.ravel() * len(asset_types) + type_index.ravel(),
+                minlength=len(cells) * len(asset_types),
+            ).reshape(len(cells), len(asset_types))
+            asset_types = asset_types.tolist()
+
+            heatmap_data = []
+            for (grid_lat, grid_lon), count, type_counts in zip(
+                cells.tolist(), counts.tolist(), by_type.tolist()
+            ):
+                heatmap_data.append(
+                    {
+                        "lat": grid_lat * grid_size,
+                        "lon": grid_lon * grid_size,
+                        "count": count,
+                        "asset_types": {
+                            asset_type: type_count
+                            for asset_type, type_count in zip(asset_types, type_counts)
+                            if type_count
+                        },
                     }
-
-                heatmap_data[grid_key]["count"] += 1
-                asset_type = row["asset_type"]
-                heatmap_data[grid_key]["asset_types"][asset_type] = (
-                    heatmap_data[grid_key]["asset_types"].get(asset_type, 0) + 1
                 )
 
             return {
                 "region": region,
                 "time_period_hours": time_period,
-                "grid_data": list(heatmap_data.values()),
-                "total_assets": len(rows),
+                "grid_data": heatmap_data,
+                "total_assets": len(slots),
                 "hotspots": sorted(
-                    heatmap_data.values(), key=lambda x: x["count"], reverse=True
+                    heatmap_data, key=lambda x: x["count"], reverse=True
                 )[:10],
             }
 
@@ -501,18 +635,10 @@ class IoTFleetEngine:
             logger.error(f"Error getting fleet analytics: {e}")
             return {}
 
-    async def _store_sensor_reading(self, reading: SensorReading):
-        """Store sensor reading in database"""
-        query = """
-            INSERT INTO sensor_readings 
-            (reading_id, asset_id, sensor_type, timestamp, value, unit, metadata)
-            VALUES ($1, $2, $3, $4, $5, $6, $7)
-            ON CONFLICT (reading_id) DO NOTHING
-        """
-
-        async with self.db_pool.acquire() as conn:
-            await conn.execute(
-                query,
+    async def _store_sensor_readings(self, readings: List[SensorReading]):
+        """Bulk-insert sensor readings, skipping ones already stored"""
+        records = [
+            (
                 reading.reading_id,
                 reading.asset_id,
                 reading.sensor_type.value,
@@ -521,125 +647,233 @@ class IoTFleetEngine:
                 reading.unit,
                 json.dumps(reading.metadata) if reading.metadata else None,
             )
+            for reading in readings
+        ]
+        columns = [
+            "reading_id",
+            "asset_id",
+            "sensor_type",
+            "timestamp",
+            "value",
+            "unit",
+            "metadata",
+        ]
 
-    async def _update_asset_from_sensor(self, reading: SensorReading):
-        """Update asset status based on sensor data"""
-        if reading.sensor_type == SensorType.GPS:
-            # Update asset location
-            location_data = {
-                "lat": reading.metadata.get("lat", reading.value),
-                "lon": reading.metadata.get("lon", 0),
-                "accuracy": reading.metadata.get("accuracy", 0),
-            }
-
-            query = """
-                UPDATE assets 
-                SET current_location = $1, last_updated = $2
-                WHERE asset_id = $3
-            """
+        async with self.db_pool.acquire() as conn:
+            if len(records) < self.config.get("ingest_copy_threshold", 500):
+                await conn.executemany(
+                    """
+                    INSERT INTO sensor_readings
+                    (reading_id, asset_id, sensor_type, timestamp, value, unit, metadata)
+                    VALUES ($1, $2, $3, $4, $5, $6, $7)
+                    ON CONFLICT (reading_id) DO NOTHING
+                    """,
+                    records,
+                )
+                return
 
-            async with self.db_pool.acquire() as conn:
+            # COPY into a staging table, then merge so duplicates are skipped
+            async with conn.transaction():
                 await conn.execute(
-                    query,
-                    json.dumps(location_data),
-                    reading.timestamp,
-                    reading.asset_id,
+                    """
+                    CREATE TEMP TABLE IF NOT EXISTS sensor_readings_stage
+                    (LIKE sensor_readings INCLUDING DEFAULTS)
+                    ON COMMIT DELETE ROWS
+                    """
+                )
+                await conn.copy_records_to_table(
+                    "sensor_readings_stage", records=records, columns=columns
                 )
-
-        elif reading.sensor_type == SensorType.FUEL_LEVEL:
-            # Update fuel efficiency
-            query = """
-                UPDATE assets 
-                SET fuel_level = $1, last_updated = $2
-                WHERE asset_id = $3
-            """
-
-            async with self.db_pool.acquire() as conn:
                 await conn.execute(
-                    query, reading.value, reading.timestamp, reading.asset_id
+                    """
+                    INSERT INTO sensor_readings
+                    (reading_id, asset_id, sensor_type, timestamp, value, unit, metadata)
+                    SELECT reading_id, asset_id, sensor_type, timestamp, value, unit,
+                           metadata
+                    FROM sensor_readings_stage
+                    ON CONFLICT (reading_id) DO NOTHING
+                    """
                 )
 
-    async def _detect_anomalies(self, reading: SensorReading):
-        """Detect anomalies in sensor data"""
-        try:
-            # Get recent readings for comparison
-            query = """
-                SELECT value, timestamp
-                FROM sensor_readings
-                WHERE asset_id = $1 AND sensor_type = $2
-                AND timestamp > NOW() - INTERVAL '24 hours'
-                ORDER BY timestamp DESC
-                LIMIT 100
-            """
+    async def _update_assets_from_sensors(self, readings: List[SensorReading]):
+        """Update asset location and fuel level from the latest reading per asset"""
+        locations: Dict[str, SensorReading] = {}
+        fuel_levels: Dict[str, SensorReading] = {}
+        for reading in readings:
+            if reading.sensor_type == SensorType.GPS:
+                latest = locations
+            elif reading.sensor_type == SensorType.FUEL_LEVEL:
+                latest = fuel_levels
+            else:
+                continue
+            current = latest.get(reading.asset_id)
+            if current is None or reading.timestamp >= current.timestamp:
+                latest[reading.asset_id] = reading
 
-            async with self.db_pool.acquire() as conn:
-                rows = await conn.fetch(
-                    query, reading.asset_id, reading.sensor_type.value
+        if not locations and not fuel_levels:
+            return
+
+        positions = {
+            asset_id: {
+                "lat": reading.metadata.get("lat", reading.value),
+                "lon": reading.metadata.get("lon", 0),
+                "accuracy": reading.metadata.get("accuracy", 0),
+            }
+            for asset_id, reading in locations.items()
+        }
+        self._index_locations(
+            list(positions),
+            list(positions.values()),
+            [reading.timestamp for reading in locations.values()],
+        )
+        location_updates = [
+            (json.dumps(positions[asset_id]), reading.timestamp, asset_id)
+            for asset_id, reading in locations.items()
+        ]
+        fuel_updates = [
+            (reading.value, reading.timestamp, reading.asset_id)
+            for reading in fuel_levels.values()
+        ]
+
+        # GREATEST keeps last_updated at the newest of the two updates
+        async with self.db_pool.acquire() as conn:
+            if location_updates:
+                await conn.executemany(
+                    """
+                    UPDATE assets
+                    SET current_location = $1, last_updated = GREATEST(last_updated, $2)
+                    WHERE asset_id = $3
+                    """,
+                    location_updates,
+                )
+            if fuel_updates:
+                await conn.executemany(
+                    """
+                    UPDATE assets
+                    SET fuel_level = $1, last_updated = GREATEST(last_updated, $2)
+                    WHERE asset_id = $3
+                    """,
+                    fuel_updates,
                 )
 
-            if len(rows) < 10:
-                return
+    def _detect_anomalies(self, readings: List[SensorReading]) -> List[FleetAlert]:
+        """Detect anomalies in sensor data against rolling in-memory statistics"""
+        alerts = []
+        try:
+            anomalous, means, stds = self.sensor_stats.observe(
+                [r.asset_id for r in readings],
+                [r.sensor_type.value for r in readings],
+                np.array([r.value for r in readings]),
+                np.array([r.timestamp.timestamp() for r in readings]),
+            )
 
-            values = [float(row["value"]) for row in rows]
-
-            # Simple anomaly detection using standard deviation
-            mean_val = np.mean(values)
-            std_val = np.std(values)
-
-            if abs(reading.value - mean_val) > 3 * std_val:
-                # Anomaly detected
-                await self._create_alert(
-                    asset_id=reading.asset_id,
-                    alert_type="sensor_anomaly",
-                    severity=AlertSeverity.MEDIUM,
-                    message=f"Anomaly detected in {reading.sensor_type.value}: {reading.value} (normal range: {mean_val:.2f} ± {2*std_val:.2f})",
-                    metadata={
-                        "sensor_type": reading.sensor_type.value,
-                        "anomaly_value": reading.value,
-                        "normal_range": [
-                            mean_val - 2 * std_val,
-                            mean_val + 2 * std_val,
-                        ],
-                    },
+            for index in np.flatnonzero(anomalous):
+                reading, mean_val, std_val = readings[index], means[index], stds[index]
+                alerts.append(
+                    self._build_alert(
+                        asset_id=reading.asset_id,
+                        alert_type="sensor_anomaly",
+                        source_id=reading.reading_id,
+                        severity=AlertSeverity.MEDIUM,
+                        message=f"Anomaly detected in {reading.sensor_type.value}: {reading.value} (normal range: {mean_val:.2f} ± {2*std_val:.2f})",
+                        metadata={
+                            "sensor_type": reading.sensor_type.value,
+                            "anomaly_value": reading.value,
+                            "normal_range": [
+                                float(mean_val - 2 * std_val),
+                                float(mean_val + 2 * std_val),
+                            ],
+                        },
+                    )
                 )
 
         except Exception as e:
             logger.error(f"Error detecting anomalies: {e}")
 
-    async def _predictive_maintenance_check(self, reading: SensorReading):
+        return alerts
+
+    async def _snapshot_sensor_stats(self, interval: float):
+        """Periodically write rolling statistics to disk for warm restarts"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                # Copy on the event loop, write in a worker thread
+                state = self.sensor_stats.snapshot_state()
+                await asyncio.to_thread(self.sensor_stats.save, state)
+            except Exception as e:
+                logger.error(f"Error saving sensor statistics snapshot: {e}")
+
+    def _predictive_maintenance_check(
+        self, readings: List[SensorReading]
+    ) -> List[FleetAlert]:
         """Check for predictive maintenance indicators"""
-        if reading.sensor_type == SensorType.VIBRATION:
-            if reading.value > 8.0:  # High vibration threshold
-                await self._create_alert(
-                    asset_id=reading.asset_id,
-                    alert_type="maintenance_required",
-                    severity=AlertSeverity.HIGH,
-                    message=f"High vibration detected: {reading.value} - immediate maintenance recommended",
-                    metadata={"vibration_level": reading.value},
+        types = np.array([r.sensor_type.value for r in readings])
+        values = np.array([r.value for r in readings])
+        limits = np.array([MAINTENANCE_THRESHOLDS.get(t, np.inf) for t in types])
+
+        alerts = []
+        for index in np.flatnonzero(values > limits):
+            reading = readings[index]
+            if reading.sensor_type == SensorType.VIBRATION:
+                alerts.append(
+                    self._build_alert(
+                        asset_id=reading.asset_id,
+                        alert_type="maintenance_required",
+                        source_id=reading.reading_id,
+                        severity=AlertSeverity.HIGH,
+                        message=f"High vibration detected: {reading.value} - immediate maintenance recommended",
+                        metadata={"vibration_level": reading.value},
+                    )
                 )
-
-        elif reading.sensor_type == SensorType.TEMPERATURE:
-            if reading.value > 90.0:  # High temperature threshold
-                await self._create_alert(
-                    asset_id=reading.asset_id,
-                    alert_type="overheating_risk",
-                    severity=AlertSeverity.HIGH,
-                    message=f"High temperature detected: {reading.value}°C",
-                    metadata={"temperature": reading.value},
+            else:
+                alerts.append(
+                    self._build_alert(
+                        asset_id=reading.asset_id,
+                        alert_type="overheating_risk",
+                        source_id=reading.reading_id,
+                        severity=AlertSeverity.HIGH,
+                        message=f"High temperature detected: {reading.value}°C",
+                        metadata={"temperature": reading.value},
+                    )
                 )
 
-    async def _create_alert(
+        return alerts
+
+    async def _deliver_alerts(self, alerts: List[FleetAlert]):
+        """Store batch alerts, keeping ones that fail for the next batch"""
+        alerts = self._undelivered_alerts + alerts
+        self._undelivered_alerts = []
+        try:
+            await self._create_alerts(alerts)
+        except Exception as e:
+            logger.error(f"Error storing {len(alerts)} alerts: {e}")
+            dropped = len(alerts) - self.max_undelivered_alerts
+            if dropped > 0:
+                logger.error(f"Undelivered alert buffer full; dropping {dropped}")
+                alerts = alerts[dropped:]
+            self._undelivered_alerts = alerts + self._undelivered_alerts
+
+    def _build_alert(
         self,
         asset_id: str,
         alert_type: str,
         severity: AlertSeverity,
         message: str,
         metadata: Dict[str, Any] = None,
-    ):
-        """Create fleet alert"""
-        alert_id = f"alert_{datetime.now().timestamp()}"
+        source_id: Optional[str] = None,
+    ) -> FleetAlert:
+        """
+        Build a fleet alert
 
-        alert = FleetAlert(
+        Alerts raised for a source such as a sensor reading get an ID derived
+        from it, so storing the same alert twice keeps one row.
+        """
+        if source_id is None:
+            alert_id = f"alert_{uuid.uuid4().hex}"
+        else:
+            key = uuid.uuid5(uuid.NAMESPACE_URL, f"{source_id}:{alert_type}")
+            alert_id = f"alert_{key.hex}"
+        return FleetAlert(
             alert_id=alert_id,
             asset_id=asset_id,
             alert_type=alert_type,
@@ -649,61 +883,105 @@ class IoTFleetEngine:
             metadata=metadata,
         )
 
+    async def _create_alert(
+        self,
+        asset_id: str,
+        alert_type: str,
+        severity: AlertSeverity,
+        message: str,
+        metadata: Dict[str, Any] = None,
+    ):
+        """Create fleet alert"""
+        await self._create_alerts(
+            [self._build_alert(asset_id, alert_type, severity, message, metadata)]
+        )
+
+    async def _create_alerts(self, alerts: List[FleetAlert]):
+        """Store fleet alerts in one round trip and publish them"""
+        if not alerts:
+            return
+
         query = """
             INSERT INTO fleet_alerts 
             (alert_id, asset_id, alert_type, severity, message, timestamp, metadata)
             VALUES ($1, $2, $3, $4, $5, $6, $7)
+            ON CONFLICT (alert_id) DO NOTHING
         """
 
         async with self.db_pool.acquire() as conn:
-            await conn.execute(
+            await conn.executemany(
                 query,
-                alert.alert_id,
-                alert.asset_id,
-                alert.alert_type,
-                alert.severity.value,
-                alert.message,
-                alert.timestamp,
-                json.dumps(alert.metadata) if alert.metadata else None,
+                [
+                    (
+                        alert.alert_id,
+                        alert.asset_id,
+                        alert.alert_type,
+                        alert.severity.value,
+                        alert.message,
+                        alert.timestamp,
+                        json.dumps(alert.metadata) if alert.metadata else None,
+                    )
+                    for alert in alerts
+                ],
             )
 
-        # Publish alert to MQTT for real-time notifications
-        alert_data = {
-            "alert_id": alert.alert_id,
-            "asset_id": alert.asset_id,
-            "type": alert.alert_type,
-            "severity": alert.severity.value,
-            "message": alert.message,
-            "timestamp": alert.timestamp.isoformat(),
-        }
+        # Publish alerts to MQTT for real-time notifications
+        await asyncio.gather(
+            *(
+                self.mqtt_client.publish(
+                    "fleet/alerts",
+                    json.dumps(
+                        {
+                            "alert_id": alert.alert_id,
+                            "asset_id": alert.asset_id,
+                            "type": alert.alert_type,
+                            "severity": alert.severity.value,
+                            "message": alert.message,
+                            "timestamp": alert.timestamp.isoformat(),
+                        }
+                    ),
+                )
+                for alert in alerts
+            )
+        )
 
-        await self.mqtt_client.publish("fleet/alerts", json.dumps(alert_data))
+    async def _update_dashboard_data(self, readings: List[SensorReading]):
+        """Update real-time dashboard data with the latest reading per sensor"""
+        latest: Dict[str, Dict[str, SensorReading]] = {}
+        for reading in readings:
+            latest.setdefault(reading.asset_id, {})[reading.sensor_type.value] = reading
 
-    async def _update_dashboard_data(self, reading: SensorReading):
-        """Update real-time dashboard data"""
-        dashboard_key = f"dashboard:{reading.asset_id}"
+        dashboard_keys = [f"dashboard:{asset_id}" for asset_id in latest]
 
         # Get current dashboard data
-        current_data = self.redis_client.get(dashboard_key)
-        if current_data:
-            dashboard_data = json.loads(current_data)
-        else:
-            dashboard_data = {
-                "asset_id": reading.asset_id,
-                "last_update": None,
-                "sensors": {},
-            }
+        current = self.redis_client.mget(dashboard_keys)
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        for dashboard_key, current_data, (asset_id, sensors) in zip(
+            dashboard_keys, current, latest.items()
+        ):
+            if current_data:
+                dashboard_data = json.loads(current_data)
+            else:
+                dashboard_data = {
+                    "asset_id": asset_id,
+                    "last_update": None,
+                    "sensors": {},
+                }
 
-        # Update with latest reading
-        dashboard_data["last_update"] = reading.timestamp.isoformat()
-        dashboard_data["sensors"][reading.sensor_type.value] = {
-            "value": reading.value,
-            "unit": reading.unit,
-            "timestamp": reading.timestamp.isoformat(),
-        }
+            # Update with latest readings
+            last_update = max(reading.timestamp for reading in sensors.values())
+            dashboard_data["last_update"] = last_update.isoformat()
+            for sensor_type, reading in sensors.items():
+                dashboard_data["sensors"][sensor_type] = {
+                    "value": reading.value,
+                    "unit": reading.unit,
+                    "timestamp": reading.timestamp.isoformat(),
+                }
 
-        # Cache for 1 minute
-        self.redis_client.setex(dashboard_key, 60, json.dumps(dashboard_data))
+            # Cache for 1 minute
+            pipe.setex(dashboard_key, 60, json.dumps(dashboard_data))
+        pipe.execute()
 
     async def _initialize_prediction_models(self):
         """Initialize ML prediction models"""
@@ -713,20 +991,68 @@ class IoTFleetEngine:
             "demo_model": IsolationForest(contamination=0.1, random_state=42)
         }
 
-    def _find_nearest_location(
-        self, current: Tuple[float, float], locations: List[Tuple[float, float]]
-    ) -> Tuple[float, float]:
-        """Find nearest location from current position"""
-        nearest = locations[0]
-        min_distance = geopy.distance.geodesic(current, nearest).kilometers
+    async def _load_spatial_index(self) -> int:
+        """Index the last known position and attributes of every asset"""
+        query = """
+            SELECT asset_id, name, asset_type, current_location,
+                   last_updated, status, health_score
+            FROM assets
+        """
 
-        for location in locations[1:]:
-            distance = geopy.distance.geodesic(current, location).kilometers
-            if distance < min_distance:
-                min_distance = distance
-                nearest = location
+        async with self.db_pool.acquire() as conn:
+            rows = await conn.fetch(query)
+
+        located = [row for row in rows if row["current_location"]]
+        for row in rows:
+            self.spatial_index.set_info(
+                row["asset_id"],
+                name=row["name"],
+                type=row["asset_type"],
+                status=row["status"],
+                health_score=float(row["health_score"]),
+            )
+        self._index_locations(
+            [row["asset_id"] for row in located],
+            [json.loads(row["current_location"]) for row in located],
+            [row["last_updated"] for row in located],
+        )
+        return len(self.spatial_index)
 
-        return nearest
+    def _index_locations(
+        self,
+        asset_ids: List[str],
+        locations: List[Dict[str, float]],
+        timestamps: List[datetime],
+    ):
+        """Record asset positions in the spatial index"""
+        self.spatial_index.update(
+            asset_ids,
+            [location["lat"] for location in locations],
+            [location["lon"] for location in locations],
+            [timestamp.timestamp() for timestamp in timestamps],
+        )
+        for asset_id, location in zip(asset_ids, locations):
+            self.spatial_index.set_info(asset_id, accuracy=location.get("accuracy", 0))
+
+    @staticmethod
+    def _location_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Spatial index result in the shape of ``get_fleet_locations``"""
+        location_entry = {
+            "asset_id": entry["asset_id"],
+            "name": entry.get("name"),
+            "type": entry.get("type"),
+            "location": {
+                "lat": entry["lat"],
+                "lon": entry["lon"],
+                "accuracy": entry.get("accuracy", 0),
+            },
+            "last_updated": datetime.fromtimestamp(entry["updated"]).isoformat(),
+            "status": entry.get("status"),
+            "health_score": entry.get("health_score"),
+        }
+        if "distance_km" in entry:
+            location_entry["distance_km"] = round(entry["distance_km"], 3)
+        return location_entry
 
     def _extract_failure_features(self, sensor_data: Dict[str, List]) -> List[float]:
         """Extract features for failure prediction"""
@@ -800,6 +1126,12 @@ class IoTFleetEngine:
 
     async def close(self):
         """Close all connections"""
+        # Flush buffered readings before the connections go away
+        await self.ingestion.stop()
+        if self._snapshot_task:
+            self._snapshot_task.cancel()
+            self.sensor_stats.save()
+        self.route_optimizer.close()
         if self.db_pool:
             await self.db_pool.close()
         if self.redis_client:
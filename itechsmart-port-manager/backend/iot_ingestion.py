@@ -0,0 +1,184 @@
+"""
+iTechSmart IoT Fleet - Micro-batched Ingestion
+Buffers high-rate sensor readings and hands them to a handler in batches
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class MicroBatcher:
+    """
+    Collects submitted items into micro-batches
+
+    A batch is flushed when it reaches ``max_batch_size`` items or when
+    ``max_delay`` seconds have passed since its first item arrived,
+    whichever comes first. At most ``max_pending`` items wait in the
+    buffer; ``submit`` blocks beyond that so producers are slowed down
+    instead of exhausting memory. Batches are handled one at a time, in
+    arrival order.
+
+    A batch whose handler raises is retried up to ``max_retries`` times
+    with exponential backoff. Every retry, and every replay, runs the whole
+    handler again, so a handler must only raise from steps that are safe
+    to repeat and do anything that isn't (counting, notifying) after them.
+    A batch that still fails is passed to ``dead_letter`` or, without one,
+    kept in ``dead_letters`` (at most ``max_dead_letters`` batches) for
+    ``replay_dead_letters``.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[List[Any]], Awaitable[Any]],
+        max_batch_size: int = 5000,
+        max_delay: float = 0.05,
+        max_pending: int = 100_000,
+        max_retries: int = 3,
+        retry_delay: float = 0.5,
+        dead_letter: Optional[Callable[[List[Any], Exception], Awaitable[Any]]] = None,
+        max_dead_letters: int = 100,
+    ):
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.dead_letter = dead_letter
+        self.dead_letters: Deque[List[Any]] = deque(maxlen=max_dead_letters)
+        self._queue: asyncio.Queue = asyncio.Queue(max_pending)
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {
+            "items": 0,
+            "batches": 0,
+            "largest_batch": 0,
+            "errors": 0,
+            "retries": 0,
+            "dead_lettered": 0,
+            "dropped": 0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    async def start(self):
+        """Start the flush loop"""
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Flush everything submitted so far and stop the flush loop"""
+        if self.running:
+            await self._queue.put(_STOP)
+            await self._task
+        self._task = None
+
+    async def submit(self, item: Any):
+        """Add an item, waiting while the buffer is full"""
+        await self._queue.put(item)
+
+    def submit_nowait(self, item: Any) -> bool:
+        """Add an item if there is room; returns False when the buffer is full"""
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+
+            batch = [item]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Any]):
+        self.stats["items"] += len(batch)
+        self.stats["batches"] += 1
+        self.stats["largest_batch"] = max(self.stats["largest_batch"], len(batch))
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.stats["retries"] += 1
+                await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+            try:
+                await self.handler(batch)
+                return
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(
+                    f"Error handling batch of {len(batch)} items "
+                    f"(attempt {attempt + 1}/{self.max_retries + 1}): {e}"
+                )
+                error = e
+        await self._dead_letter(batch, error)
+
+    async def _dead_letter(self, batch: List[Any], error: Exception):
+        """Hand a batch that kept failing to the dead-letter store"""
+        self.stats["dead_lettered"] += 1
+        if self.dead_letter is not None:
+            try:
+                await self.dead_letter(batch, error)
+                return
+            except Exception as e:
+                logger.error(f"Dead-letter handler failed: {e}")
+        if len(self.dead_letters) == self.dead_letters.maxlen:
+            self.stats["dropped"] += len(self.dead_letters[0])
+            logger.error(
+                f"Dead-letter buffer full; dropping {len(self.dead_letters[0])} items"
+            )
+        self.dead_letters.append(batch)
+
+    async def replay_dead_letters(self) -> int:
+        """
+        Hand buffered dead-letter batches to the handler again
+
+        Batches that fail again go back through retry and dead-lettering.
+
+        Returns:
+            Number of batches replayed
+        """
+        batches = list(self.dead_letters)
+        self.dead_letters.clear()
+        for batch in batches:
+            await self._flush(batch)
+        return len(batches)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Throughput counters and current buffer depth"""
+        return {
+            **self.stats,
+            "pending": self.pending,
+            "running": self.running,
+            "dead_letter_batches": len(self.dead_letters),
+        }
@@ -0,0 +1,257 @@
+"""
+iTechSmart IoT Fleet - Rolling Sensor Statistics
+In-memory streaming moments per (asset, sensor) for O(1) anomaly checks,
+with snapshots to disk for warm restarts
+"""
+
+import logging
+import os
+import tempfile
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class RollingStats:
+    """
+    Streaming statistics of every (asset_id, sensor_type) pair
+
+    Each pair owns one slot in a set of parallel NumPy arrays holding its
+    lifetime moments (Welford count/mean/M2) and exponentially weighted
+    moments (EWMA mean/variance). The EWMA with ``alpha = 2 / (N + 1)``
+    tracks roughly the last N readings and is what anomaly checks use.
+    A pair that has been silent for longer than ``max_gap`` seconds starts
+    over, like a time-windowed query would.
+    """
+
+    def __init__(
+        self,
+        alpha: float = 2 / 101,
+        threshold: float = 3.0,
+        min_samples: int = 10,
+        max_gap: float = 24 * 3600,
+        capacity: int = 1024,
+        snapshot_path: Optional[str] = None,
+    ):
+        self.alpha = alpha
+        self.threshold = threshold
+        self.min_samples = min_samples
+        self.max_gap = max_gap
+        self.snapshot_path = snapshot_path
+        self._slots: Dict[Tuple[str, str], int] = {}
+        self._keys: list = []
+        self._allocate(capacity)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def observe(
+        self,
+        asset_ids: Sequence[str],
+        sensor_types: Sequence[str],
+        values: np.ndarray,
+        timestamps: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Check readings against their pair's statistics, then fold them in
+
+        Readings are checked against the moments as they stood before the
+        reading arrived. Several readings of one pair in the same call are
+        applied in order.
+
+        Args:
+            asset_ids: Asset of each reading
+            sensor_types: Sensor type of each reading
+            values: Reading values
+            timestamps: Reading times as POSIX seconds
+
+        Returns:
+            ``(anomalous, mean, std)`` per reading; mean/std are the EWMA
+            moments the reading was checked against
+        """
+        values = np.asarray(values, dtype=float)
+        timestamps = np.asarray(timestamps, dtype=float)
+        slots = self._lookup(asset_ids, sensor_types)
+
+        anomalous = np.zeros(len(values), dtype=bool)
+        means = np.zeros(len(values))
+        stds = np.zeros(len(values))
+
+        # Readings of the same pair must be applied one after another; the
+        # k-th reading of every pair in the batch is applied in round k
+        for batch in self._rounds(slots):
+            slot, x, t = slots[batch], values[batch], timestamps[batch]
+
+            stale = (self._count[slot] > 0) & (t - self._last_seen[slot] > self.max_gap)
+            if stale.any():
+                self._reset(slot[stale])
+
+            mean = self._ewma_mean[slot]
+            std = np.sqrt(self._ewma_var[slot])
+            ready = self._count[slot] >= self.min_samples
+            anomalous[batch] = ready & (np.abs(x - mean) > self.threshold * std)
+            means[batch] = mean
+            stds[batch] = std
+
+            self._update(slot, x, t)
+
+        return anomalous, means, stds
+
+    def get(self, asset_id: str, sensor_type: str) -> Optional[Dict[str, Any]]:
+        """Current statistics of one pair"""
+        slot = self._slots.get((asset_id, sensor_type))
+        if slot is None:
+            return None
+        count = int(self._count[slot])
+        return {
+            "asset_id": asset_id,
+            "sensor_type": sensor_type,
+            "count": count,
+            "mean": float(self._mean[slot]),
+            "std": float(np.sqrt(self._m2[slot] / count)) if count else 0.0,
+            "ewma_mean": float(self._ewma_mean[slot]),
+            "ewma_std": float(np.sqrt(self._ewma_var[slot])),
+            "last_seen": float(self._last_seen[slot]),
+        }
+
+    def snapshot_state(self) -> Dict[str, np.ndarray]:
+        """Copy of the statistics, safe to write from another thread"""
+        n = len(self._keys)
+        asset_ids, sensor_types = zip(*self._keys) if n else ((), ())
+        return {
+            "asset_ids": np.array(asset_ids, dtype=str),
+            "sensor_types": np.array(sensor_types, dtype=str),
+            "count": self._count[:n].copy(),
+            "mean": self._mean[:n].copy(),
+            "m2": self._m2[:n].copy(),
+            "ewma_mean": self._ewma_mean[:n].copy(),
+            "ewma_var": self._ewma_var[:n].copy(),
+            "last_seen": self._last_seen[:n].copy(),
+        }
+
+    def save(self, state: Optional[Dict[str, np.ndarray]] = None) -> bool:
+        """
+        Write a snapshot to ``snapshot_path`` atomically
+
+        Args:
+            state: Result of ``snapshot_state`` (taken now if omitted)
+        """
+        if not self.snapshot_path:
+            return False
+        state = state if state is not None else self.snapshot_state()
+        directory = os.path.dirname(os.path.abspath(self.snapshot_path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **state)
+            os.replace(tmp_path, self.snapshot_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return True
+
+    def load(self) -> int:
+        """
+        Restore statistics from ``snapshot_path``
+
+        Returns:
+            Number of (asset, sensor) pairs restored
+        """
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return 0
+        try:
+            with np.load(self.snapshot_path) as snapshot:
+                state = {name: snapshot[name] for name in snapshot.files}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable stats snapshot: {e}")
+            return 0
+
+        n = len(state["count"])
+        self._keys = []
+        self._allocate(max(n * 2, 1024))
+        self._keys = list(
+            zip(state["asset_ids"].tolist(), state["sensor_types"].tolist())
+        )
+        self._slots = {key: slot for slot, key in enumerate(self._keys)}
+        for name in ("count", "mean", "m2", "ewma_mean", "ewma_var", "last_seen"):
+            getattr(self, f"_{name}")[:n] = state[name]
+        return n
+
+    # Helper methods
+
+    def _allocate(self, capacity: int):
+        n = len(self._keys)
+
+        def grow(array: Optional[np.ndarray], dtype) -> np.ndarray:
+            resized = np.zeros(capacity, dtype=dtype)
+            if array is not None:
+                keep = min(n, len(array))
+                resized[:keep] = array[:keep]
+            return resized
+
+        self._count = grow(getattr(self, "_count", None), np.int64)
+        for name in ("_mean", "_m2", "_ewma_mean", "_ewma_var", "_last_seen"):
+            setattr(self, name, grow(getattr(self, name, None), np.float64))
+
+    def _lookup(
+        self, asset_ids: Sequence[str], sensor_types: Sequence[str]
+    ) -> np.ndarray:
+        slots = np.empty(len(asset_ids), dtype=np.int64)
+        for index, key in enumerate(zip(asset_ids, sensor_types)):
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = len(self._keys)
+                self._slots[key] = slot
+                self._keys.append(key)
+            slots[index] = slot
+        if len(self._keys) > len(self._count):
+            self._allocate(max(len(self._keys), 2 * len(self._count)))
+        return slots
+
+    @staticmethod
+    def _rounds(slots: np.ndarray):
+        """Reading indexes grouped so no group repeats a slot, in arrival order"""
+        if len(slots) == 0:
+            return
+        order = np.argsort(slots, kind="stable")
+        ordered = slots[order]
+        positions = np.arange(len(slots))
+        first = np.r_[True, ordered[1:] != ordered[:-1]]
+        group_start = np.maximum.accumulate(np.where(first, positions, 0))
+        rank = np.empty(len(slots), dtype=np.int64)
+        rank[order] = positions - group_start
+
+        by_rank = np.argsort(rank, kind="stable")
+        bounds = np.cumsum(np.bincount(rank))
+        yield from np.split(by_rank, bounds[:-1])
+
+    def _reset(self, slots: np.ndarray):
+        for array in (self._mean, self._m2, self._ewma_mean, self._ewma_var):
+            array[slots] = 0.0
+        self._count[slots] = 0
+
+    def _update(self, slots: np.ndarray, x: np.ndarray, t: np.ndarray):
+        first = self._count[slots] == 0
+
+        # Welford lifetime moments
+        count = self._count[slots] + 1
+        delta = x - self._mean[slots]
+        mean = self._mean[slots] + delta / count
+        self._m2[slots] += delta * (x - mean)
+        self._mean[slots] = mean
+        self._count[slots] = count
+
+        # Exponentially weighted moments; the first reading seeds the mean
+        diff = x - self._ewma_mean[slots]
+        increment = self.alpha * diff
+        self._ewma_var[slots] = np.where(
+            first,
+            0.0,
+            (1 - self.alpha) * (self._ewma_var[slots] + diff * increment),
+        )
+        self._ewma_mean[slots] = np.where(first, x, self._ewma_mean[slots] + increment)
+        self._last_seen[slots] = np.maximum(self._last_seen[slots], t)
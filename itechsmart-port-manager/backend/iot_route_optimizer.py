@@ -0,0 +1,338 @@
+"""
+iTechSmart IoT Fleet - Route Optimization
+Multi-vehicle routing with capacity and time-window constraints, solved by
+nearest-neighbour construction and 2-opt/Or-opt local search
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from iot_spatial_index import haversine_km
+
+logger = logging.getLogger(__name__)
+
+EPSILON = 1e-9
+
+# Improving moves checked against time windows per position before giving up
+MAX_CANDIDATES = 8
+
+
+@dataclass
+class RouteProblem:
+    """
+    Stops to visit from a depot with a fleet of identical vehicles
+
+    Times are minutes after departure from the depot. ``time_windows``,
+    ``demands`` and ``service_times`` are given per stop, in stop order.
+    """
+
+    depot: Tuple[float, float]
+    stops: List[Tuple[float, float]]
+    vehicles: int = 1
+    capacity: Optional[float] = None
+    demands: Optional[List[float]] = None
+    time_windows: Optional[List[Tuple[float, float]]] = None
+    service_times: Optional[List[float]] = None
+    speed_kmh: float = 60.0
+    return_to_depot: bool = False
+    time_limit: float = 1.0
+
+
+def solve_routes(problem: RouteProblem) -> Dict[str, Any]:
+    """
+    Solve a routing problem (runs in worker processes)
+
+    Returns:
+        Routes as stop indexes, their distance/load/duration, stops no
+        vehicle could serve, and solver statistics
+    """
+    return RouteSolver(problem).solve()
+
+
+class RouteSolver:
+    """
+    Local search over the routes of one problem
+
+    Nodes are numbered 0 (depot), 1..n (stops) and n + 1 (route end). The
+    route end is the depot again for closed routes; for open routes every
+    node reaches it at no cost, so the same moves optimize both. Distances
+    are computed once as a haversine matrix, and each 2-opt/Or-opt step
+    scores every candidate move of a position with NumPy before applying
+    the best feasible one.
+    """
+
+    def __init__(self, problem: RouteProblem):
+        self.problem = problem
+        n = len(problem.stops)
+        self.end = n + 1
+        points = np.array([problem.depot, *problem.stops], dtype=float).reshape(-1, 2)
+
+        self.dist = np.zeros((n + 2, n + 2))
+        self.dist[: n + 1, : n + 1] = haversine_km(
+            points[:, None, 0],
+            points[:, None, 1],
+            points[None, :, 0],
+            points[None, :, 1],
+        )
+        self.dist[n + 1, : n + 1] = self.dist[0, : n + 1]
+        if problem.return_to_depot:
+            self.dist[: n + 1, n + 1] = self.dist[: n + 1, 0]
+        self.travel = self.dist / problem.speed_kmh * 60
+
+        def per_node(values, default: float) -> np.ndarray:
+            array = np.full(n + 2, default, dtype=float)
+            array[[0, n + 1]] = 0.0
+            if values is not None:
+                array[1 : n + 1] = values
+            return array
+
+        self.demand = per_node(problem.demands, 0.0)
+        self.service = per_node(problem.service_times, 0.0)
+        self.capacity = problem.capacity if problem.capacity is not None else np.inf
+        self.earliest = np.zeros(n + 2)
+        self.latest = np.full(n + 2, np.inf)
+        if problem.time_windows is not None:
+            windows = np.array(problem.time_windows, dtype=float).reshape(-1, 2)
+            self.earliest[1 : n + 1] = windows[:, 0]
+            self.latest[1 : n + 1] = windows[:, 1]
+        self.timed = problem.time_windows is not None
+
+        self.deadline = 0.0
+        self._edges = None
+
+    def solve(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        self.deadline = started + self.problem.time_limit
+        routes, unassigned = self._construct()
+        initial_distance = sum(self._distance(route) for route in routes)
+
+        passes = 0
+        while not self._expired():
+            passes += 1
+            improved = False
+            for index, route in enumerate(routes):
+                routes[index], changed = self._two_opt(route)
+                improved |= changed
+            improved |= self._or_opt(routes)
+            if not improved:
+                break
+
+        results = []
+        for vehicle, route in enumerate(routes):
+            if len(route) <= 2:
+                continue
+            _, duration = self._schedule(route)
+            results.append(
+                {
+                    "vehicle": vehicle,
+                    "stops": (route[1:-1] - 1).tolist(),
+                    "distance": float(self._distance(route)),
+                    "load": float(self.demand[route].sum()),
+                    "duration": float(duration),
+                }
+            )
+
+        return {
+            "routes": results,
+            "unassigned": (unassigned - 1).tolist(),
+            "total_distance": float(sum(route["distance"] for route in results)),
+            "initial_distance": float(initial_distance),
+            "passes": passes,
+            "solve_time": time.perf_counter() - started,
+        }
+
+    # Construction
+
+    def _construct(self) -> Tuple[List[np.ndarray], np.ndarray]:
+        """Each vehicle in turn serves the soonest reachable feasible stop"""
+        unvisited = np.ones(self.end + 1, dtype=bool)
+        unvisited[[0, self.end]] = False
+        routes = []
+
+        for _ in range(max(self.problem.vehicles, 1)):
+            route, load, clock, node = [0], 0.0, 0.0, 0
+            while True:
+                arrival = np.maximum(
+                    clock + self.service[node] + self.travel[node], self.earliest
+                )
+                feasible = (
+                    unvisited
+                    & (load + self.demand <= self.capacity)
+                    & (arrival <= self.latest)
+                )
+                if not feasible.any():
+                    break
+                node = int(np.argmin(np.where(feasible, arrival, np.inf)))
+                route.append(node)
+                unvisited[node] = False
+                load += self.demand[node]
+                clock = arrival[node]
+            route.append(self.end)
+            routes.append(np.array(route, dtype=np.int64))
+
+        return routes, np.flatnonzero(unvisited)
+
+    # Local search
+
+    def _two_opt(self, route: np.ndarray) -> Tuple[np.ndarray, bool]:
+        """Reverse the segments that shorten the route"""
+        dist, improved, i = self.dist, False, 0
+        while i < len(route) - 3 and not self._expired():
+            a, b = route[i], route[i + 1]
+            c, d = route[i + 2 : -1], route[i + 3 :]
+            gain = dist[a, b] + dist[c, d] - dist[a][c] - dist[b][d]
+
+            applied = False
+            for k in self._best(gain > EPSILON, -gain):
+                j = i + 2 + k
+                candidate = route.copy()
+                candidate[i + 1 : j + 1] = route[i + 1 : j + 1][::-1]
+                if not self.timed or self._schedule(candidate)[0]:
+                    route, applied = candidate, True
+                    break
+            if applied:
+                improved = True
+                self._edges = None
+            else:
+                i += 1
+        return route, improved
+
+    def _or_opt(self, routes: List[np.ndarray]) -> bool:
+        """Move segments of up to three stops to their cheapest position"""
+        improved = False
+        for r in range(len(routes)):
+            i = 1
+            while i < len(routes[r]) - 1 and not self._expired():
+                moved = any(
+                    self._move_segment(routes, r, i, length)
+                    for length in (1, 2, 3)
+                    if i + length <= len(routes[r]) - 1
+                )
+                if moved:
+                    improved = True
+                else:
+                    i += 1
+        return improved
+
+    def _move_segment(
+        self, routes: List[np.ndarray], r: int, i: int, length: int
+    ) -> bool:
+        dist = self.dist
+        route = routes[r]
+        segment = route[i : i + length]
+        first, last = segment[0], segment[-1]
+        before, after = route[i - 1], route[i + length]
+        removal = dist[before, first] + dist[last, after] - dist[before, after]
+
+        if self._edges is None:
+            self._edges = self._edge_arrays(routes)
+        u, v, length_uv, owner, position, loads = self._edges
+
+        # Row gathers: distances are symmetric except towards the route end,
+        # which only ever appears as ``v``
+        forward = dist[first][u] + dist[last][v] - length_uv
+        backward = dist[last][u] + dist[first][v] - length_uv
+        delta = np.minimum(forward, backward) - removal
+        # Edges touching the segment, and routes the segment would overload
+        invalid = (owner == r) & (position >= i - 1) & (position <= i + length - 1)
+        invalid |= (owner != r) & (
+            loads[owner] + self.demand[segment].sum() > self.capacity
+        )
+
+        for k in self._best(~invalid & (delta < -EPSILON), delta):
+            target, at = int(owner[k]), int(position[k])
+            moved = segment[::-1] if backward[k] < forward[k] else segment
+            source = np.concatenate([route[:i], route[i + length :]])
+            if target == r:
+                at = at if at < i else at - length
+                source = np.concatenate([source[: at + 1], moved, source[at + 1 :]])
+                changed = {r: source}
+            else:
+                destination = routes[target]
+                changed = {
+                    r: source,
+                    target: np.concatenate(
+                        [destination[: at + 1], moved, destination[at + 1 :]]
+                    ),
+                }
+            if self.timed and not all(
+                self._schedule(candidate)[0] for candidate in changed.values()
+            ):
+                continue
+            for index, candidate in changed.items():
+                routes[index] = candidate
+            self._edges = None
+            return True
+        return False
+
+    # Helper methods
+
+    def _best(self, mask: np.ndarray, cost: np.ndarray) -> List[int]:
+        """Indexes where ``mask`` holds, lowest cost first"""
+        candidates = np.flatnonzero(mask)
+        if len(candidates) == 0:
+            return []
+        order = np.argsort(cost[candidates], kind="stable")
+        limit = MAX_CANDIDATES if self.timed else 1
+        return candidates[order[:limit]].tolist()
+
+    def _edge_arrays(self, routes: List[np.ndarray]):
+        u = np.concatenate([route[:-1] for route in routes])
+        v = np.concatenate([route[1:] for route in routes])
+        owner = np.concatenate(
+            [np.full(len(route) - 1, index) for index, route in enumerate(routes)]
+        )
+        position = np.concatenate([np.arange(len(route) - 1) for route in routes])
+        loads = np.array([self.demand[route].sum() for route in routes])
+        return u, v, self.dist[u, v], owner, position, loads
+
+    def _schedule(self, route: np.ndarray) -> Tuple[bool, float]:
+        """Whether every stop is reached within its window, and the finish time"""
+        clock = 0.0
+        nodes = route.tolist()
+        for previous, node in zip(nodes[:-1], nodes[1:]):
+            clock = max(
+                clock + self.service[previous] + self.travel[previous, node],
+                self.earliest[node],
+            )
+            if clock > self.latest[node] + EPSILON:
+                return False, clock
+        return True, clock
+
+    def _distance(self, route: np.ndarray) -> float:
+        return self.dist[route[:-1], route[1:]].sum()
+
+    def _expired(self) -> bool:
+        return time.perf_counter() >= self.deadline
+
+
+class RouteOptimizer:
+    """
+    Runs route solves in a process pool
+
+    Solving is CPU-bound; running it in worker processes keeps the event
+    loop serving requests and lets several solves proceed in parallel.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    async def solve(self, problem: RouteProblem) -> Dict[str, Any]:
+        """Solve ``problem`` in a worker process"""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, solve_routes, problem)
+
+    def close(self):
+        """Shut the worker processes down"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
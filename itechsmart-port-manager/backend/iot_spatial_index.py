@@ -0,0 +1,310 @@
+"""
+iTechSmart IoT Fleet - Spatial Index
+In-memory grid index of the latest asset positions with vectorized
+radius, bounding-box and nearest-neighbour queries
+"""
+
+import itertools
+import math
+import time
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+HALF_CIRCUMFERENCE_KM = math.pi * EARTH_RADIUS_KM
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Great-circle distance in kilometres; arguments broadcast like NumPy"""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class SpatialIndex:
+    """
+    Latest position of every asset, bucketed into a uniform lat/lon grid
+
+    Positions live in parallel NumPy arrays indexed by slot; each grid cell
+    keeps the set of slots inside it. Queries collect the slots of the few
+    cells overlapping the search area and filter them exactly with
+    vectorized haversine, falling back to one vectorized scan of all
+    positions when the area spans too many cells.
+    """
+
+    MAX_CELLS_PER_QUERY = 4096
+
+    def __init__(self, cell_deg: float = 0.1, capacity: int = 1024):
+        self.cell_deg = cell_deg
+        self._rows = int(math.ceil(180 / cell_deg))
+        self._cols = int(math.ceil(360 / cell_deg))
+        self._slots: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self._free: List[int] = []
+        self._cells: Dict[int, Set[int]] = {}
+        self.info: Dict[str, Dict[str, Any]] = {}
+        self._lat = np.zeros(capacity)
+        self._lon = np.zeros(capacity)
+        self._updated = np.zeros(capacity)
+        self._cell = np.full(capacity, -1, dtype=np.int64)
+        self._active = np.zeros(capacity, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, asset_id: str) -> bool:
+        return asset_id in self._slots
+
+    def update(
+        self,
+        asset_ids: Sequence[str],
+        lats: Sequence[float],
+        lons: Sequence[float],
+        timestamps: Sequence[float],
+    ):
+        """
+        Record asset positions
+
+        A position older than the one already indexed for the asset is
+        ignored, so out-of-order readings can't move an asset backwards.
+
+        Args:
+            asset_ids: Assets
+            lats: Latitudes in degrees
+            lons: Longitudes in degrees
+            timestamps: Position times as POSIX seconds
+        """
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        timestamps = np.asarray(timestamps, dtype=float)
+        cells = self._cell_ids(lats, lons)
+
+        for index, asset_id in enumerate(asset_ids):
+            slot = self._slots.get(asset_id)
+            if slot is None:
+                slot = self._allocate(asset_id)
+            elif timestamps[index] < self._updated[slot]:
+                continue
+
+            cell = int(cells[index])
+            previous = int(self._cell[slot])
+            if previous != cell:
+                if previous >= 0:
+                    self._cells[previous].discard(slot)
+                self._cells.setdefault(cell, set()).add(slot)
+                self._cell[slot] = cell
+
+            self._lat[slot] = lats[index]
+            self._lon[slot] = lons[index]
+            self._updated[slot] = timestamps[index]
+
+    def set_info(self, asset_id: str, **attributes: Any):
+        """Attach attributes (name, type, status...) to an asset"""
+        self.info.setdefault(asset_id, {}).update(attributes)
+
+    def attribute(self, slots: np.ndarray, name: str, default: Any = None) -> list:
+        """One attribute of every slot"""
+        return [
+            self.info.get(self._ids[slot], {}).get(name, default)
+            for slot in slots.tolist()
+        ]
+
+    def remove(self, asset_id: str) -> bool:
+        """Drop an asset from the index"""
+        slot = self._slots.pop(asset_id, None)
+        if slot is None:
+            return False
+        cell = int(self._cell[slot])
+        if cell >= 0:
+            self._cells[cell].discard(slot)
+        self._cell[slot] = -1
+        self._active[slot] = False
+        self._updated[slot] = 0.0
+        self._ids[slot] = None
+        self.info.pop(asset_id, None)
+        self._free.append(slot)
+        return True
+
+    def get(self, asset_id: str) -> Optional[Dict[str, Any]]:
+        """Indexed position of one asset"""
+        slot = self._slots.get(asset_id)
+        if slot is None:
+            return None
+        return self.describe(np.array([slot]))[0]
+
+    def all(self, max_age: Optional[float] = None) -> np.ndarray:
+        """Slots of all indexed assets (updated within ``max_age`` seconds)"""
+        slots = np.flatnonzero(self._active)
+        return self._fresh(slots, max_age)
+
+    def bbox(
+        self,
+        lat_min: float,
+        lat_max: float,
+        lon_min: float,
+        lon_max: float,
+        max_age: Optional[float] = None,
+    ) -> np.ndarray:
+        """Slots of assets inside a lat/lon box (bounds inclusive)"""
+        slots = self._candidates(lat_min, lat_max, lon_min, lon_max)
+        lat, lon = self._lat[slots], self._lon[slots]
+        inside = (
+            (lat >= lat_min) & (lat <= lat_max) & (lon >= lon_min) & (lon <= lon_max)
+        )
+        return self._fresh(slots[inside], max_age)
+
+    def radius(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        max_age: Optional[float] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Assets within ``radius_km`` of a point, nearest first
+
+        Returns:
+            ``{"slots": ..., "distance_km": ...}``
+        """
+        if radius_km >= HALF_CIRCUMFERENCE_KM:
+            slots = self.all(max_age)
+        else:
+            dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+            if abs(lat) + dlat >= 90:
+                lon_min, lon_max = -180.0, 180.0
+            else:
+                dlon = math.degrees(
+                    math.asin(
+                        min(
+                            1.0,
+                            math.sin(radius_km / EARTH_RADIUS_KM)
+                            / math.cos(math.radians(lat)),
+                        )
+                    )
+                )
+                lon_min, lon_max = lon - dlon, lon + dlon
+            slots = self._fresh(
+                self._candidates(lat - dlat, lat + dlat, lon_min, lon_max), max_age
+            )
+
+        distances = haversine_km(lat, lon, self._lat[slots], self._lon[slots])
+        within = distances <= radius_km
+        slots, distances = slots[within], distances[within]
+        order = np.argsort(distances, kind="stable")
+        return {"slots": slots[order], "distance_km": distances[order]}
+
+    def nearest(
+        self, lat: float, lon: float, k: int = 1, max_age: Optional[float] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        The ``k`` assets nearest to a point, nearest first
+
+        The search radius starts at one grid cell and doubles until it holds
+        ``k`` assets.
+
+        Returns:
+            ``{"slots": ..., "distance_km": ...}``
+        """
+        radius_km = self.cell_deg * 111.2
+        while True:
+            found = self.radius(lat, lon, radius_km, max_age)
+            if len(found["slots"]) >= k or radius_km >= HALF_CIRCUMFERENCE_KM:
+                return {name: values[:k] for name, values in found.items()}
+            radius_km *= 2
+
+    def describe(
+        self, slots: np.ndarray, distances: Optional[np.ndarray] = None
+    ) -> List[Dict[str, Any]]:
+        """Query results as dictionaries"""
+        results = []
+        columns = [
+            slots.tolist(),
+            self._lat[slots].tolist(),
+            self._lon[slots].tolist(),
+            self._updated[slots].tolist(),
+        ]
+        for slot, lat, lon, updated in zip(*columns):
+            results.append(
+                {
+                    "asset_id": self._ids[slot],
+                    "lat": lat,
+                    "lon": lon,
+                    "updated": updated,
+                    **self.info.get(self._ids[slot], {}),
+                }
+            )
+        if distances is not None:
+            for result, distance in zip(results, distances.tolist()):
+                result["distance_km"] = distance
+        return results
+
+    def positions(self, slots: np.ndarray):
+        """Latitudes and longitudes of slots"""
+        return self._lat[slots], self._lon[slots]
+
+    # Helper methods
+
+    def _allocate(self, asset_id: str) -> int:
+        if self._free:
+            slot = self._free.pop()
+            self._ids[slot] = asset_id
+        else:
+            slot = len(self._ids)
+            self._ids.append(asset_id)
+            if slot >= len(self._lat):
+                self._grow(2 * len(self._lat))
+        self._slots[asset_id] = slot
+        self._active[slot] = True
+        return slot
+
+    def _grow(self, capacity: int):
+        def grow(array: np.ndarray, fill) -> np.ndarray:
+            resized = np.full(capacity, fill, dtype=array.dtype)
+            resized[: len(array)] = array
+            return resized
+
+        self._lat = grow(self._lat, 0.0)
+        self._lon = grow(self._lon, 0.0)
+        self._updated = grow(self._updated, 0.0)
+        self._cell = grow(self._cell, -1)
+        self._active = grow(self._active, False)
+
+    def _cell_ids(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        rows = np.clip(
+            np.floor((lats + 90) / self.cell_deg).astype(np.int64), 0, self._rows - 1
+        )
+        cols = np.floor((lons + 180) / self.cell_deg).astype(np.int64) % self._cols
+        return rows * self._cols + cols
+
+    def _candidates(
+        self, lat_min: float, lat_max: float, lon_min: float, lon_max: float
+    ) -> np.ndarray:
+        """Slots in the grid cells overlapping a box (longitudes may wrap)"""
+        row_min, row_max = (
+            int(np.clip(math.floor((lat + 90) / self.cell_deg), 0, self._rows - 1))
+            for lat in (lat_min, lat_max)
+        )
+        col_min = math.floor((lon_min + 180) / self.cell_deg)
+        col_max = math.floor((lon_max + 180) / self.cell_deg)
+        col_count = min(col_max - col_min + 1, self._cols)
+        cell_count = (row_max - row_min + 1) * col_count
+
+        if cell_count > min(self.MAX_CELLS_PER_QUERY, len(self._slots)):
+            return np.flatnonzero(self._active)
+
+        cols = [(col_min + offset) % self._cols for offset in range(col_count)]
+        cells = (
+            self._cells.get(row * self._cols + col, ())
+            for row in range(row_min, row_max + 1)
+            for col in cols
+        )
+        return np.fromiter(itertools.chain.from_iterable(cells), dtype=np.int64)
+
+    def _fresh(self, slots: np.ndarray, max_age: Optional[float]) -> np.ndarray:
+        if max_age is None:
+            return slots
+        return slots[self._updated[slots] >= time.time() - max_age]
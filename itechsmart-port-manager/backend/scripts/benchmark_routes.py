@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Route Optimization Benchmark
+Compares the route optimizer with the previous nearest-neighbour routing on
+random 50-2000 stop instances, with and without fleet constraints
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from iot_route_optimizer import RouteProblem, solve_routes
+
+DEPOT = (33.74, -118.26)
+SIZES = (50, 100, 200, 500, 1000, 2000)
+# geodesic nearest-neighbour is O(n^2) geodesic calls; skip it above this
+BASELINE_MAX_STOPS = 500
+
+
+def make_stops(n: int, seed: int = 7):
+    """Random stops within ~40km of the depot"""
+    rng = np.random.default_rng(seed + n)
+    lats = rng.uniform(DEPOT[0] - 0.35, DEPOT[0] + 0.35, n)
+    lons = rng.uniform(DEPOT[1] - 0.4, DEPOT[1] + 0.4, n)
+    return list(zip(lats.tolist(), lons.tolist()))
+
+
+def nearest_neighbour(start, destinations):
+    """The routing optimize_routes used before the optimizer"""
+    import geopy.distance
+
+    unvisited = destinations.copy()
+    current = start
+    total = 0.0
+    while unvisited:
+        nearest = min(
+            unvisited, key=lambda p: geopy.distance.geodesic(current, p).kilometers
+        )
+        total += geopy.distance.geodesic(current, nearest).kilometers
+        unvisited.remove(nearest)
+        current = nearest
+    return total
+
+
+def run_benchmark(time_limit: float):
+    print(
+        f"{'stops':>6} {'baseline km':>12} {'base s':>8} {'optimized km':>13} "
+        f"{'gain':>6} {'solve s':>8} {'passes':>7}"
+    )
+    for n in SIZES:
+        stops = make_stops(n)
+        baseline, baseline_seconds = "-", "-"
+        if n <= BASELINE_MAX_STOPS:
+            try:
+                start = time.perf_counter()
+                baseline = nearest_neighbour(DEPOT, stops)
+                baseline_seconds = f"{time.perf_counter() - start:.2f}"
+            except ImportError:
+                pass
+
+        result = solve_routes(RouteProblem(DEPOT, stops, time_limit=time_limit))
+        reference = baseline if baseline != "-" else result["initial_distance"]
+        gain = 1 - result["total_distance"] / reference
+        baseline = f"{baseline:.1f}" if baseline != "-" else baseline
+        print(
+            f"{n:>6} {baseline:>12} {baseline_seconds:>8} "
+            f"{result['total_distance']:>13.1f} {gain:>6.1%} "
+            f"{result['solve_time']:>8.2f} {result['passes']:>7}"
+        )
+
+    print(
+        "(gain is measured against the construction route where the baseline is skipped)"
+    )
+    print("-" * 70)
+    print("Capacity + time windows (20 stops per vehicle, 2h windows, 5min service)")
+    for n in SIZES:
+        rng = np.random.default_rng(n)
+        opens = rng.uniform(0, 360, n)
+        problem = RouteProblem(
+            DEPOT,
+            make_stops(n),
+            vehicles=max(n // 20, 1) + 2,
+            capacity=40,
+            demands=rng.integers(1, 3, n).tolist(),
+            time_windows=[(t, t + 120) for t in opens.tolist()],
+            service_times=[5] * n,
+            speed_kmh=40,
+            return_to_depot=True,
+            time_limit=time_limit,
+        )
+        result = solve_routes(problem)
+        print(
+            f"{n:>6} stops  {len(result['routes']):>4} routes  "
+            f"{len(result['unassigned']):>4} unassigned  "
+            f"{result['initial_distance']:>9.1f} -> {result['total_distance']:>9.1f} km  "
+            f"{result['solve_time']:>6.2f} s"
+        )
+
+
+if __name__ == "__main__":
+    limit = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    print("🚚 iTechSmart IoT Fleet - Route Optimization Benchmark")
+    print("=" * 70)
+    run_benchmark(limit)